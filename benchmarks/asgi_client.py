@@ -0,0 +1,49 @@
+"""
+A minimal in-process ASGI client, for the benchmarks and tests of the ASGI serving mode.
+
+Requests are sent by calling the app directly with a scope and receive and send callables, without a server or
+a socket, so only the cost of the app is measured.
+"""
+
+
+async def asgi_request(asgi_app, method, path, body=b"", content_type=b"application/json"):
+    """
+    Send a request to an ASGI app.
+
+    Returns:
+        tuple: The status code and the body of the response.
+    """
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", content_type),
+            (b"content-length", str(len(body)).encode()),
+            (b"host", b"testserver"),
+        ],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+    await asgi_app(scope, receive, send)
+    return messages[0]["status"], b"".join(message.get("body", b"") for message in messages[1:])
@@ -0,0 +1,87 @@
+"""
+Benchmark of the vectorized batch fee calculation against the scalar Order path.
+
+Run from the repository root:
+    python -m benchmarks.batch_benchmark
+
+For every batch size, the per-order cost is reported for:
+  - scalar: constructing one Order per row and calling calculate_total_delivery_fee().
+  - batch: constructing one OrderBatch (validation included) and calling calculate_total_delivery_fees().
+  - engine: calculate_total_delivery_fees() alone, on an already validated OrderBatch.
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+import numpy as np
+from fee_calculator.Order import Order
+from fee_calculator.batch import OrderBatch
+
+BATCH_SIZES = (1_000, 100_000, 1_000_000)
+# The scalar path is too slow to be worth timing on the largest batches
+MAX_SCALAR_SIZE = 100_000
+
+
+def generate_columns(size, seed=0):
+    """
+    Generate random order columns covering every fee rule.
+
+    Args:
+        size (int): Number of orders.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        dict: The order columns, as accepted by OrderBatch.
+    """
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    minutes = rng.integers(0, 7 * 24 * 60, size).tolist()
+    return {
+        "cart_value": rng.integers(1, 25000, size).tolist(),
+        "delivery_distance": rng.integers(1, 5000, size).tolist(),
+        "number_of_items": rng.integers(1, 20, size).tolist(),
+        "time": [(start + timedelta(minutes=m)).isoformat() for m in minutes],
+    }
+
+
+def time_per_order(function, size):
+    """
+    Time a function and return its cost per order in microseconds.
+    """
+    start = perf_counter()
+    function()
+    return (perf_counter() - start) / size * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=BATCH_SIZES, help="Batch sizes to time."
+    )
+    args = parser.parse_args()
+
+    print(f"{'orders':>10} {'scalar us':>10} {'batch us':>10} {'engine us':>10}")
+    for size in args.sizes:
+        columns = generate_columns(size)
+        rows = list(zip(*columns.values()))
+
+        scalar = float("nan")
+        if size <= MAX_SCALAR_SIZE:
+            scalar = time_per_order(
+                lambda: [
+                    Order(
+                        cart_value=c, delivery_distance=d, number_of_items=n, time=t
+                    ).calculate_total_delivery_fee()
+                    for c, d, n, t in rows
+                ],
+                size,
+            )
+        batch = time_per_order(
+            lambda: OrderBatch(**columns).calculate_total_delivery_fees(), size
+        )
+        order_batch = OrderBatch(**columns)
+        engine = time_per_order(order_batch.calculate_total_delivery_fees, size)
+        print(f"{size:>10} {scalar:>10.3f} {batch:>10.3f} {engine:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
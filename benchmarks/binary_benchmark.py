@@ -0,0 +1,170 @@
+"""
+Benchmark of the binary quote protocol over a Unix domain socket against POST / over HTTP.
+
+Run from the repository root:
+    python -m benchmarks.binary_benchmark
+
+A server with a single prefork worker is started with fee_calculator.serve, listening on a local port and on a
+Unix domain socket of a temporary directory. The valid orders of generated traffic are then quoted one at a
+time by POST / on a keep-alive connection and by the binary protocol, and pipelined by the binary protocol.
+The round-trip latency percentiles and the throughput are reported for every case.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from time import perf_counter, sleep
+from benchmarks.load_test import percentile
+from benchmarks.traffic import DEFAULT_MIX, generate_traffic
+from fee_calculator.binary import QuoteClient
+
+NUMBER_OF_ORDERS = 5000
+PIPELINED_BATCH = 1000
+STARTUP_TIMEOUT = 30
+
+
+def free_port():
+    """
+    Return a local TCP port that nothing listens on.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(path, port):
+    """
+    Start a server with one prefork worker, and wait until it accepts connections on both listeners.
+
+    Returns:
+        subprocess.Popen: The server process.
+    """
+    environment = {**os.environ, "FEE_CALCULATOR_QUOTE_SOCKET": path}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "fee_calculator.serve", "--host", "127.0.0.1", "--port", str(port), "--workers", "1"],
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = perf_counter() + STARTUP_TIMEOUT
+    while perf_counter() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            QuoteClient(path).close()
+            return server
+        except OSError:
+            sleep(0.1)
+    server.kill()
+    raise RuntimeError("The server did not start")
+
+
+def report(name, seconds, latencies, count):
+    """
+    Print the throughput and the latency percentiles of a case.
+    """
+    latencies = sorted(latencies)
+    p50, p99 = (percentile(latencies, fraction) * 1e6 for fraction in (0.5, 0.99))
+    print(f"{name:<28}{count / seconds:>12.0f}{p50:>10.1f}{p99:>10.1f}")
+
+
+def http_quotes(port, bodies):
+    """
+    Quote every body with POST /, one at a time on a keep-alive connection.
+
+    Returns:
+        tuple: The seconds it took, and the round-trip latency of every request in seconds.
+    """
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Content-Type": "application/json"}
+    latencies = []
+    start = perf_counter()
+    for body in bodies:
+        sent = perf_counter()
+        connection.request("POST", "/", body, headers)
+        connection.getresponse().read()
+        latencies.append(perf_counter() - sent)
+    seconds = perf_counter() - start
+    connection.close()
+    return seconds, latencies
+
+
+def binary_quotes(path, orders):
+    """
+    Quote every order with the binary protocol, one at a time.
+
+    Returns:
+        tuple: The seconds it took, and the round-trip latency of every request in seconds.
+    """
+    latencies = []
+    with QuoteClient(path) as client:
+        start = perf_counter()
+        for order in orders:
+            sent = perf_counter()
+            client.quote(*order)
+            latencies.append(perf_counter() - sent)
+        seconds = perf_counter() - start
+    return seconds, latencies
+
+
+def pipelined_quotes(path, orders):
+    """
+    Quote the orders with the binary protocol, PIPELINED_BATCH at a time.
+
+    Returns:
+        tuple: The seconds it took, and the round-trip latency of every batch in seconds.
+    """
+    latencies = []
+    with QuoteClient(path) as client:
+        start = perf_counter()
+        for index in range(0, len(orders), PIPELINED_BATCH):
+            sent = perf_counter()
+            client.quote_many(orders[index : index + PIPELINED_BATCH])
+            latencies.append(perf_counter() - sent)
+        seconds = perf_counter() - start
+    return seconds, latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.binary_benchmark",
+        description="Compare the binary quote protocol with POST /.",
+    )
+    parser.add_argument("--orders", type=int, default=NUMBER_OF_ORDERS, help="Number of orders of every case.")
+    args = parser.parse_args(argv)
+
+    payloads = generate_traffic(args.orders, mix={**DEFAULT_MIX, "invalid": 0})
+    bodies = [json.dumps(payload) for payload in payloads]
+    orders = [
+        (
+            payload["cart_value"],
+            payload["delivery_distance"],
+            payload["number_of_items"],
+            datetime.fromisoformat(payload["time"]),
+        )
+        for payload in payloads
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "quote.sock")
+        port = free_port()
+        server = start_server(path, port)
+        try:
+            # Warm-up of both listeners
+            http_quotes(port, bodies[:100])
+            binary_quotes(path, orders[:100])
+            print(f"{'':<28}{'quotes/s':>12}{'p50 us':>10}{'p99 us':>10}")
+            report("POST /, one at a time", *http_quotes(port, bodies), len(bodies))
+            report("binary, one at a time", *binary_quotes(path, orders), len(orders))
+            seconds, latencies = pipelined_quotes(path, orders)
+            report(f"binary, {PIPELINED_BATCH} pipelined", seconds, latencies, len(orders))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
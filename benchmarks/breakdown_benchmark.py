@@ -0,0 +1,87 @@
+"""
+Microbenchmark of the single-pass fee breakdown against the total-only pricing it replaced.
+
+Run from the repository root:
+    python -m benchmarks.breakdown_benchmark
+
+The total-only path is the former Tariff.total_fee(), summing the fee component methods and looking the rush
+multiplier up in a single minute-of-week table, as the rush calendar did before. Tariff.breakdown()
+returns every component and the total in one pass, and Tariff.total_fee() is now the total of the breakdown.
+The cases are timed in interleaved rounds, so that noise on a busy machine affects them alike.
+"""
+from functools import partial
+from .tariff_benchmark import NUMBER_OF_ORDERS, best_ns_per_quote, generate_orders
+from fee_calculator.rush import MINUTES_PER_DAY
+from fee_calculator.tariff import DEFAULT_TARIFF
+
+ROUNDS = 20
+
+
+class FormerRushCalendar:
+    """
+    The rush calendar lookup before the per-day tables, for a calendar without time zone nor exceptions.
+    """
+
+    def __init__(self, calendar):
+        self.zone = None
+        self.exceptions = {}
+        self.multipliers = calendar.multipliers
+        self.week = b"".join(table or bytes(MINUTES_PER_DAY) for table in calendar.days)
+
+    def code(self, time):
+        if self.zone is not None:
+            time = time.astimezone(self.zone)
+        if self.exceptions:
+            table = self.exceptions.get(time.date())
+            if table is not None:
+                return table[time.hour * 60 + time.minute]
+        return self.week[
+            (time.isoweekday() - 1) * MINUTES_PER_DAY + time.hour * 60 + time.minute
+        ]
+
+    def rush_fee(self, fee, time):
+        code = self.code(time)
+        if code:
+            return round(fee * self.multipliers[code])
+        return fee
+
+
+def component_total_fee(tariff, calendar, cart_value, delivery_distance, number_of_items, time):
+    """
+    Calculate the total delivery fee from the fee component methods, like Tariff.total_fee() used to.
+    """
+    if cart_value >= tariff.free_delivery_cart_value:
+        return 0
+
+    fee = (
+        tariff.distance_fee(delivery_distance)
+        + tariff.small_order_surcharge(cart_value)
+        + tariff.item_surcharge(number_of_items)
+    )
+    fee = calendar.rush_fee(fee, time)
+
+    if fee > tariff.max_possible_delivery_fee:
+        return tariff.max_possible_delivery_fee
+    return fee
+
+
+def main():
+    orders = generate_orders(NUMBER_OF_ORDERS)
+    former_total_fee = partial(
+        component_total_fee, DEFAULT_TARIFF, FormerRushCalendar(DEFAULT_TARIFF.rush_calendar)
+    )
+    cases = [
+        ("total only (former)", former_total_fee),
+        ("breakdown", DEFAULT_TARIFF.breakdown),
+        ("total of the breakdown", DEFAULT_TARIFF.total_fee),
+    ]
+    best = {name: float("inf") for name, _ in cases}
+    for _ in range(ROUNDS):
+        for name, function in cases:
+            best[name] = min(best[name], best_ns_per_quote(function, orders))
+    for name, ns in best.items():
+        print(f"{name:<28}{ns:>10.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
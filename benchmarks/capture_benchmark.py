@@ -0,0 +1,67 @@
+"""
+Benchmark of the overhead of the traffic capture on POST /.
+
+Run from the repository root:
+    python -m benchmarks.capture_benchmark
+
+Generated traffic is dispatched to the Flask app, in request contexts built beforehand so that the test client
+does not hide the cost of the view, without and with the traffic capture to a temporary directory. The cases
+are timed in interleaved rounds, so that noise on a busy machine affects them alike, and the best time per
+request of every case is reported, with the time of TrafficCapture.record() alone, which the noise of the
+dispatch can hide, and the size of the capture per request.
+"""
+import json
+import os
+import tempfile
+from time import perf_counter
+from timeit import repeat
+from unittest import mock
+from benchmarks.traffic import generate_traffic
+from fee_calculator.app import app
+from fee_calculator.capture import TrafficCapture
+
+NUMBER_OF_REQUESTS = 2000
+ROUNDS = 10
+
+
+def us_per_request(bodies, capture):
+    """
+    Return the time, in microseconds, of dispatching one POST / request with the given traffic capture.
+    """
+    contexts = [
+        app.test_request_context("/", method="POST", data=body, content_type="application/json")
+        for body in bodies
+    ]
+    with mock.patch("fee_calculator.app.CAPTURE", capture):
+        start = perf_counter()
+        for context in contexts:
+            with context:
+                app.full_dispatch_request()
+        seconds = perf_counter() - start
+    return seconds / len(bodies) * 1e6
+
+
+def main():
+    bodies = [json.dumps(payload) for payload in generate_traffic(NUMBER_OF_REQUESTS)]
+    with tempfile.TemporaryDirectory() as directory:
+        capture = TrafficCapture(directory)
+        best = {"capture off": float("inf"), "capture on": float("inf")}
+        for _ in range(ROUNDS):
+            best["capture off"] = min(best["capture off"], us_per_request(bodies, None))
+            best["capture on"] = min(best["capture on"], us_per_request(bodies, capture))
+        body, response = bodies[0].encode(), b'{"delivery_fee": 710, "pricing_version": "default"}'
+        record_seconds = min(
+            repeat(
+                lambda: capture.record("application/json", body, 200, response), number=NUMBER_OF_REQUESTS, repeat=5
+            )
+        )
+        capture.close()
+        bytes_per_request = os.path.getsize(capture.path) / capture.records
+    for name, us in best.items():
+        print(f"{name:<16}{us:>10.1f} us/request")
+    print(f"{'record() alone':<16}{record_seconds / NUMBER_OF_REQUESTS * 1e6:>10.1f} us/request")
+    print(f"{'capture size':<16}{bytes_per_request:>10.0f} bytes/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark of the latency/throughput trade-off of coalescing the POST / requests of the ASGI serving mode.
+
+Run from the repository root:
+    python -m benchmarks.coalesce_benchmark
+
+Generated traffic is sent in-process to the ASGI app, by a number of concurrent clients that each send their
+next request as soon as the previous one is answered. Every request goes through uvicorn's WSGI adapter and
+the Flask app, or is coalesced with the requests of the other clients within a window. The coalescer with a
+batch of a single order, priced as soon as it arrives, is the baseline of the window itself. The throughput and
+the median and 99th percentile latencies are reported for every number of clients and window: with a single
+client there is nothing to coalesce with, and the window is added to every request, while with many clients
+the batches fill up and the thread hand-off and the Flask overhead are paid by nobody. The added wait is
+bounded by the window: a request never waits longer than the window before its batch is priced.
+"""
+import asyncio
+import json
+import warnings
+from time import perf_counter
+from uvicorn.middleware.wsgi import WSGIMiddleware
+from benchmarks.asgi_client import asgi_request
+from benchmarks.traffic import generate_traffic
+from fee_calculator.app import app
+from fee_calculator.coalesce import CoalescingApp, OrderCoalescer
+
+NUMBER_OF_REQUESTS = 2000
+CLIENTS = (1, 8, 32, 128)
+WINDOWS_MS = (0.5, 1.0, 2.0)
+MAX_BATCH = 64
+
+
+async def run_clients(asgi_app, bodies, clients):
+    """
+    Send the bodies with concurrent clients.
+
+    Returns:
+        tuple: The seconds it took, and the latency of every request in seconds.
+    """
+    latencies = []
+    iterator = iter(bodies)
+
+    async def client():
+        for body in iterator:
+            start = perf_counter()
+            await asgi_request(asgi_app, "POST", "/", body)
+            latencies.append(perf_counter() - start)
+
+    start = perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return perf_counter() - start, latencies
+
+
+def percentile(values, fraction):
+    """
+    Return the nearest-rank percentile of a sorted list.
+    """
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+def main():
+    # The adapter warns about its deprecation on every instantiation
+    warnings.simplefilter("ignore", DeprecationWarning)
+    bodies = [json.dumps(payload).encode() for payload in generate_traffic(NUMBER_OF_REQUESTS)]
+    wsgi_app = WSGIMiddleware(app)
+    cases = {
+        "per request": lambda: wsgi_app,
+        # The coalesced path without the window: every order is priced alone, as soon as it arrives
+        "coalescer, batch of 1": lambda: CoalescingApp(wsgi_app, OrderCoalescer(max_batch=1)),
+    }
+    for window_ms in WINDOWS_MS:
+        cases[f"coalesced, {window_ms:g} ms"] = lambda window_ms=window_ms: CoalescingApp(
+            wsgi_app, OrderCoalescer(window_ms / 1000, MAX_BATCH)
+        )
+
+    print(f"{'clients':>7}  {'mode':<22}{'requests/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'mean batch':>12}")
+    for clients in CLIENTS:
+        for name, make_app in cases.items():
+            asgi_app = make_app()
+            seconds, latencies = asyncio.run(run_clients(asgi_app, bodies, clients))
+            latencies.sort()
+            coalescer = getattr(asgi_app, "coalescer", None)
+            mean_batch = f"{coalescer.orders / coalescer.batches:.1f}" if coalescer else "-"
+            print(
+                f"{clients:>7}  {name:<22}{len(bodies) / seconds:>12.0f}"
+                f"{percentile(latencies, 0.5) * 1e3:>10.2f}{percentile(latencies, 0.99) * 1e3:>10.2f}"
+                f"{mean_batch:>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark of the cold start of the entry points: the time from a fresh interpreter to the first quote.
+
+Run from the repository root:
+    python -m benchmarks.cold_start_benchmark --runs 10 --budget-ms 100
+
+Every run starts a new interpreter with -X importtime, which imports an entry point and answers one quote:
+the serverless handler (fee_calculator.serverless) and the Flask app through its test client. The time to
+first response is measured inside the interpreter, from before the import to the response, and the wall time
+of the whole process, interpreter startup included, by this script. The import time of the last run is
+broken down by top-level package, which shows what a new import costs.
+
+The command exits with status 1 when the median time to first response of the serverless handler exceeds the
+budget, so it can guard the cold start in CI.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from time import perf_counter
+
+DEFAULT_RUNS = 10
+DEFAULT_BUDGET_MS = 100
+TOP_PACKAGES = 8
+
+ORDER = '{"cart_value": 790, "delivery_distance": 2235, "number_of_items": 4, "time": "2024-01-15T13:00:00Z"}'
+# Every script prints its time to first response, in milliseconds
+ENTRY_POINTS = {
+    "serverless handler": f"""
+from time import perf_counter
+start = perf_counter()
+from fee_calculator.serverless import handler
+assert handler({{"rawPath": "/", "body": {ORDER!r}}})["statusCode"] == 200
+print((perf_counter() - start) * 1e3)
+""",
+    "flask app": f"""
+from time import perf_counter
+start = perf_counter()
+from fee_calculator.app import app
+assert app.test_client().post("/", data={ORDER!r}, content_type="application/json").status_code == 200
+print((perf_counter() - start) * 1e3)
+""",
+}
+
+
+def cold_start(script):
+    """
+    Run the script in a fresh interpreter.
+
+    Returns:
+        tuple: The time to first response and the wall time of the process, in milliseconds, and the
+        -X importtime report.
+    """
+    start = perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (perf_counter() - start) * 1e3
+    return float(result.stdout), wall_ms, result.stderr
+
+
+def import_breakdown(report):
+    """
+    Sum the self import times of an -X importtime report by top-level package.
+
+    Returns:
+        Counter: The import time in milliseconds, keyed by top-level package.
+    """
+    packages = Counter()
+    for line in report.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        packages[fields[2].strip().split(".")[0]] += int(fields[0]) / 1e3
+    return packages
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.cold_start_benchmark")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Interpreters started per entry point.")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="Budget of the median time to first response of the serverless handler.",
+    )
+    args = parser.parse_args()
+
+    medians = {}
+    for name, script in ENTRY_POINTS.items():
+        runs = [cold_start(script) for _ in range(args.runs)]
+        first_response = [run[0] for run in runs]
+        wall = [run[1] for run in runs]
+        medians[name] = statistics.median(first_response)
+        print(
+            f"{name}: first response {medians[name]:.1f} ms median, {min(first_response):.1f} ms best, "
+            f"process {statistics.median(wall):.1f} ms median"
+        )
+        for package, ms in import_breakdown(runs[-1][2]).most_common(TOP_PACKAGES):
+            print(f"    {package:<24}{ms:>8.1f} ms")
+
+    within_budget = medians["serverless handler"] <= args.budget_ms
+    print(
+        f"serverless handler {'within' if within_budget else 'OVER'} the budget of {args.budget_ms:g} ms"
+    )
+    return 0 if within_budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
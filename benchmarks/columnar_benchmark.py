@@ -0,0 +1,65 @@
+"""
+Benchmark of the column-wise validation of bulk orders against validating every row with Order.
+
+Run from the repository root:
+    python -m benchmarks.columnar_benchmark
+
+Generated traffic with 0%, 5% and 20% of invalid rows is validated the way fee_calculator.bulk did it,
+Order(**record) for every row with the error details of every ValidationError, and with validate_columns(),
+which only raises for the rows whose time only pydantic can judge. The two are timed in interleaved
+rounds, so that noise on a busy machine affects them alike, and the best time per row of every share is
+reported.
+"""
+from timeit import timeit
+from pydantic import ValidationError
+from benchmarks.traffic import DEFAULT_MIX, generate_traffic
+from fee_calculator.Order import Order
+from fee_calculator.columnar import record_columns, validate_columns
+from fee_calculator.errors import validation_error_details
+
+NUMBER_OF_ROWS = 10000
+ROUNDS = 15
+INVALID_SHARES = (0.0, 0.05, 0.2)
+
+
+def validate_rows(records):
+    """
+    Validate every record with Order, collecting the error details of the invalid ones.
+    """
+    errors = {}
+    for row, record in enumerate(records):
+        try:
+            Order(**record)
+        except ValidationError as error:
+            errors[row] = validation_error_details(error)
+    return errors
+
+
+def validate_by_column(records):
+    """
+    Validate the records column by column.
+    """
+    return validate_columns(record_columns(records))[2]
+
+
+def us_per_row(functions, records):
+    """
+    Return the best time per row, in microseconds, of validating the records with every function.
+    """
+    best = [float("inf")] * len(functions)
+    for _ in range(ROUNDS):
+        for index, function in enumerate(functions):
+            best[index] = min(best[index], timeit(lambda: function(records), number=1))
+    return [seconds / len(records) * 1e6 for seconds in best]
+
+
+def main():
+    print(f"{'invalid rows':<14}{'Order us/row':>14}{'columns us/row':>16}{'speedup':>9}")
+    for share in INVALID_SHARES:
+        records = generate_traffic(NUMBER_OF_ROWS, mix={**DEFAULT_MIX, "invalid": share})
+        rows, columns = us_per_row((validate_rows, validate_by_column), records)
+        print(f"{share:<14.0%}{rows:>14.2f}{columns:>16.2f}{rows / columns:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
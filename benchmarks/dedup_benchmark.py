@@ -0,0 +1,70 @@
+"""
+Benchmark of the response cache of POST /, keyed by the hash of the raw request body.
+
+Run from the repository root:
+    python -m benchmarks.dedup_benchmark
+
+Generated traffic is dispatched to the Flask app, in request contexts built beforehand so that the test client
+does not hide the cost of the view, without the response cache, and with the cache in the memory of the
+process or shared through a memory-mapped file. With an empty cache every lookup misses, which is the cost
+of the cache alone; the same bodies are then sent again, like client retries, and the lookups hit. The cases
+are timed in interleaved rounds, so that noise on a busy machine affects them alike, and the best time per
+request and the hit rate of every case are reported.
+"""
+import json
+import tempfile
+from time import perf_counter
+from unittest import mock
+from benchmarks.traffic import generate_traffic
+from fee_calculator.app import app
+from fee_calculator.dedup import ResponseCache
+
+NUMBER_OF_REQUESTS = 2000
+ROUNDS = 10
+# The slots of the shared file are direct-mapped, so colliding bodies evict each other: with many more slots
+# than bodies few of them collide
+SHARED_SLOTS = 8 * NUMBER_OF_REQUESTS
+
+
+def us_per_request(bodies, cache):
+    """
+    Return the time, in microseconds, of dispatching one POST / request with the given response cache.
+    """
+    contexts = [
+        app.test_request_context("/", method="POST", data=body, content_type="application/json")
+        for body in bodies
+    ]
+    with mock.patch("fee_calculator.app.RESPONSE_CACHE", cache):
+        start = perf_counter()
+        for context in contexts:
+            with context:
+                app.full_dispatch_request()
+        seconds = perf_counter() - start
+    return seconds / len(bodies) * 1e6
+
+
+def main():
+    bodies = [json.dumps(payload) for payload in generate_traffic(NUMBER_OF_REQUESTS)]
+    with tempfile.TemporaryDirectory() as directory:
+        caches = {
+            "in memory": ResponseCache(NUMBER_OF_REQUESTS),
+            "shared file": ResponseCache(SHARED_SLOTS, directory=directory),
+        }
+        best = {"cache off": float("inf")}
+        hit_rates = {"cache off": 0.0}
+        for _ in range(ROUNDS):
+            best["cache off"] = min(best["cache off"], us_per_request(bodies, ResponseCache(0)))
+            for name, cache in caches.items():
+                cache.clear()
+                for case in ("empty", "retries"):
+                    hits = cache.hits
+                    us = us_per_request(bodies, cache)
+                    best[f"{name}, {case}"] = min(best.get(f"{name}, {case}", float("inf")), us)
+                    hit_rates[f"{name}, {case}"] = (cache.hits - hits) / len(bodies)
+    print(f"{'':<24}{'us/request':>12}{'hit rate':>10}")
+    for name, us in best.items():
+        print(f"{name:<24}{us:>12.1f}{hit_rates[name]:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark of the construct and price throughput of the pydantic Order and the fast validation path.
+
+Run from the repository root:
+    python -m benchmarks.fast_order_benchmark
+
+Every payload is validated and priced the way the app does it: Order(**data) for the pydantic path,
+and parse_order(data) for the fast path. Invalid payloads fall back to pydantic on the fast path,
+so their cost is reported separately.
+"""
+from timeit import repeat
+from fee_calculator.Order import Order
+from fee_calculator.fast_order import parse_order
+from pydantic import ValidationError
+
+NUMBER = 20000
+REPEAT = 5
+
+VALID_PAYLOAD = {
+    "cart_value": 790,
+    "delivery_distance": 2235,
+    "number_of_items": 4,
+    "time": "2024-01-15T13:00:00Z",
+}
+INVALID_PAYLOAD = {
+    "cart_value": "790",
+    "delivery_distance": -1,
+    "number_of_items": 4,
+    "time": "2024-01-15T13:00:00Z",
+}
+
+
+def orders_per_second(construct, data):
+    """
+    Return the best throughput, in orders per second, of constructing and pricing an order from the data.
+    """
+
+    def construct_and_price():
+        try:
+            construct(data).calculate_total_delivery_fee()
+        except ValidationError:
+            pass
+
+    best = min(repeat(construct_and_price, number=NUMBER, repeat=REPEAT))
+    return NUMBER / best
+
+
+def main():
+    print(f"{'':<10}{'pydantic/s':>14}{'fast/s':>14}{'speedup':>9}")
+    for name, data in (("valid", VALID_PAYLOAD), ("invalid", INVALID_PAYLOAD)):
+        pydantic = orders_per_second(lambda data: Order(**data), data)
+        fast = orders_per_second(parse_order, data)
+        print(f"{name:<10}{pydantic:>14,.0f}{fast:>14,.0f}{fast / pydantic:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
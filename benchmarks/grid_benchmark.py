@@ -0,0 +1,68 @@
+"""
+Benchmark of the pricing grid against pricing its cells one at a time, by grid size.
+
+Run from the repository root:
+    python -m benchmarks.grid_benchmark
+
+Every grid is a cart at a rush hour time, by delivery distance (every 10 m) and number of items. The cell loop
+calls Tariff.total_fee() once per cell, like one POST / per cell without the HTTP overhead. The size of the
+fees in JSON is reported for every encoding.
+"""
+import json
+from datetime import datetime, timezone
+from timeit import repeat
+from fee_calculator.grid import FeeGrid
+from fee_calculator.tariff import DEFAULT_TARIFF
+
+GRID_SHAPES = ((100, 20), (1000, 50), (10000, 100))
+REPEAT = 5
+TIME = datetime(2024, 1, 26, 16, tzinfo=timezone.utc)
+
+
+def cell_loop(grid):
+    """
+    Price every cell of the grid with Tariff.total_fee().
+    """
+    return [
+        [
+            DEFAULT_TARIFF.total_fee(grid.cart_value, distance, items, grid.time)
+            for items in range(grid.number_of_items.start, grid.number_of_items.stop)
+        ]
+        for distance in range(grid.delivery_distance.start, grid.delivery_distance.stop, 10)
+    ]
+
+
+def best_seconds(function):
+    """
+    Return the best time, in seconds, of calling the function.
+    """
+    return min(repeat(function, number=1, repeat=REPEAT))
+
+
+def main():
+    print(
+        f"{'cells':>10}{'cell loop ms':>14}{'grid ms':>10}"
+        f"{'dense kB':>10}{'rle kB':>9}{'typed kB':>10}"
+    )
+    for rows, columns in GRID_SHAPES:
+        grid = FeeGrid(
+            cart_value=790,
+            delivery_distance={"start": 1, "stop": rows * 10 + 1, "step": 10},
+            number_of_items={"start": 1, "stop": columns + 1},
+            time=TIME,
+        )
+        loop_ms = best_seconds(lambda: cell_loop(grid)) * 1e3
+        grid_ms = best_seconds(lambda: grid.calculate_fees(DEFAULT_TARIFF)) * 1e3
+        fees = grid.calculate_fees(DEFAULT_TARIFF)
+        sizes = [
+            len(json.dumps(grid.model_copy(update={"encoding": encoding}).encode_fees(fees))) / 1e3
+            for encoding in ("dense", "rle", "typed")
+        ]
+        print(
+            f"{rows * columns:>10}{loop_ms:>14.2f}{grid_ms:>10.2f}"
+            f"{sizes[0]:>10.1f}{sizes[1]:>9.1f}{sizes[2]:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Local HTTP load test of a running fee calculator server.
+
+Run from the repository root, against a server started separately:
+    python -m benchmarks.load_test --url http://127.0.0.1:5001/ --concurrency 32 --duration 10
+
+Every client thread keeps one keep-alive connection open and sends POST requests back to back, cycling
+through a mix of payloads. The throughput and the latency percentiles are reported at the end.
+"""
+import argparse
+import http.client
+import json
+import threading
+from time import perf_counter
+from urllib.parse import urlsplit
+
+PAYLOADS = [
+    {"cart_value": 790, "delivery_distance": 2235, "number_of_items": 4, "time": "2024-01-15T13:00:00Z"},
+    {"cart_value": 991, "delivery_distance": 1000, "number_of_items": 4, "time": "2024-01-26T15:00:00Z"},
+    {"cart_value": 1500, "delivery_distance": 1501, "number_of_items": 14, "time": "2024-01-26T18:59:59Z"},
+    {"cart_value": 20000, "delivery_distance": 1000, "number_of_items": 4, "time": "2024-01-28T13:00:00Z"},
+]
+
+
+def percentile(sorted_values, fraction):
+    """
+    Return the value at the given fraction (0 to 1) of a sorted list.
+    """
+    if not sorted_values:
+        return float("nan")
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_client(url, bodies, deadline, latencies, errors):
+    """
+    Send requests on one keep-alive connection until the deadline, recording the latency of each request.
+    """
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+    headers = {"Content-Type": "application/json"}
+    index = 0
+    while perf_counter() < deadline:
+        body = bodies[index % len(bodies)]
+        index += 1
+        start = perf_counter()
+        try:
+            connection.request("POST", parts.path or "/", body, headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            connection.close()
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+            continue
+        latencies.append(perf_counter() - start)
+        if response.status != 200:
+            errors.append(response.status)
+    connection.close()
+
+
+def load_test(url, concurrency, duration):
+    """
+    Run the load test.
+
+    Returns:
+        dict: The number of requests and errors, the throughput in requests per second and the latency
+        percentiles in milliseconds.
+    """
+    bodies = [json.dumps(payload) for payload in PAYLOADS]
+    latencies, errors = [], []
+    deadline = perf_counter() + duration
+    threads = [
+        threading.Thread(target=run_client, args=(url, bodies, deadline, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP load test of a running fee calculator server.")
+    parser.add_argument("--url", default="http://127.0.0.1:5001/", help="URL of the POST endpoint.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Number of concurrent connections.")
+    parser.add_argument("--duration", type=float, default=10, help="Duration of the test in seconds.")
+    args = parser.parse_args()
+
+    result = load_test(args.url, args.concurrency, args.duration)
+    print(
+        f"{result['requests']} requests, {result['errors']} errors, "
+        f"{result['requests_per_second']:.0f} req/s, "
+        f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark of the overhead of the POST / instrumentation.
+
+Run from the repository root:
+    python -m benchmarks.metrics_benchmark
+
+The instrumentation of a request is the five perf_counter_ns() calls around its stages, observe_stages()
+and count_request(). Its cost per request is reported for in-memory metrics and for memory-mapped
+per-process files, next to the cost of a whole POST / request through the Flask test client.
+"""
+import tempfile
+from time import perf_counter_ns
+from timeit import repeat
+from fee_calculator.app import app
+from fee_calculator.metrics import Metrics
+
+NUMBER = 100000
+REPEAT = 5
+
+
+def instrumentation_ns(metrics):
+    """
+    Return the best cost, in nanoseconds, of instrumenting one request.
+    """
+
+    def instrument():
+        start = perf_counter_ns()
+        parsed = perf_counter_ns()
+        validated = perf_counter_ns()
+        priced = perf_counter_ns()
+        metrics.observe_stages(start, parsed, validated, priced, perf_counter_ns())
+        metrics.count_request(200)
+
+    return min(repeat(instrument, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e9
+
+
+def request_ns():
+    """
+    Return the best cost, in nanoseconds, of a whole POST / request through the Flask test client.
+    """
+    client = app.test_client()
+    payload = {
+        "cart_value": 790,
+        "delivery_distance": 2235,
+        "number_of_items": 4,
+        "time": "2024-01-15T13:00:00Z",
+    }
+    number = 2000
+    return min(repeat(lambda: client.post("/", json=payload), number=number, repeat=REPEAT)) / number * 1e9
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        results = {
+            "instrumentation, in memory": instrumentation_ns(Metrics()),
+            "instrumentation, memory-mapped": instrumentation_ns(Metrics(directory)),
+            "whole POST / request": request_ns(),
+        }
+    for name, ns in results.items():
+        print(f"{name:<34}{ns / 1000:>10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark of the reconciliation throughput by number of worker processes.
+
+Run from the repository root:
+    python -m benchmarks.reconcile_benchmark --rows 20000000
+
+Random order columns are written to a temporary directory, then reconciled with 1, 2, 4, ... worker
+processes up to the number of CPUs. Every run reports its throughput and its speedup over a single worker,
+which should grow almost linearly with the number of cores, the workers sharing the mapped columns and
+writing disjoint rows of the output. For comparison, the throughput of pricing Order objects one at a time
+is measured on a sample of the rows.
+"""
+import argparse
+import os
+import tempfile
+from time import perf_counter
+import numpy as np
+from fee_calculator.Order import Order
+from fee_calculator.reconcile import DEFAULT_SHARD_SIZE, reconcile, write_columns
+from fee_calculator.tariff import DEFAULT_TARIFF
+
+DEFAULT_ROWS = 10_000_000
+ORDER_SAMPLE = 20000
+
+
+def generate_columns(size, seed=0):
+    """
+    Generate random valid order columns over a month.
+    """
+    random = np.random.default_rng(seed)
+    return {
+        "cart_value": random.integers(1, 25000, size),
+        "delivery_distance": random.integers(1, 6000, size),
+        "number_of_items": random.integers(1, 30, size),
+        "time": np.datetime64("2024-01-01T00:00:00")
+        + random.integers(0, 31 * 24 * 60 * 60, size).astype("timedelta64[s]"),
+    }
+
+
+def orders_per_second(columns):
+    """
+    Measure the throughput of validating and pricing Order objects one at a time.
+    """
+    rows = [
+        {
+            "cart_value": int(cart_value),
+            "delivery_distance": int(delivery_distance),
+            "number_of_items": int(number_of_items),
+            "time": f"{time}Z",
+        }
+        for cart_value, delivery_distance, number_of_items, time in zip(
+            *(column[:ORDER_SAMPLE] for column in columns.values())
+        )
+    ]
+    start = perf_counter()
+    for row in rows:
+        Order(**row).calculate_total_delivery_fee(DEFAULT_TARIFF)
+    return len(rows) / (perf_counter() - start)
+
+
+def worker_counts():
+    """
+    Return 1, 2, 4, ... up to the number of CPUs, which is always included.
+    """
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.reconcile_benchmark")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Number of generated orders.")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="Rows per shard.")
+    parser.add_argument(
+        "--workers",
+        type=lambda value: [int(count) for count in value.split(",")],
+        default=None,
+        help="Comma-separated numbers of workers, 1, 2, 4, ... up to the number of CPUs by default.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        columns = generate_columns(args.rows)
+        write_columns(os.path.join(directory, "orders"), **columns)
+        print(f"Order objects: {orders_per_second(columns):,.0f} rows/s")
+        del columns
+
+        print(f"{'workers':>8}{'seconds':>10}{'rows/s':>16}{'speedup':>9}")
+        single = None
+        for workers in args.workers or worker_counts():
+            start = perf_counter()
+            reconcile(
+                os.path.join(directory, "orders"),
+                os.path.join(directory, "fees.npy"),
+                DEFAULT_TARIFF,
+                workers,
+                args.shard_size,
+            )
+            seconds = perf_counter() - start
+            single = single or seconds
+            print(f"{workers:>8}{seconds:>10.2f}{args.rows / seconds:>16,.0f}{single / seconds:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Replay of captured POST / traffic (see fee_calculator.capture) against a running fee calculator server.
+
+Run from the repository root, against a server started separately:
+    python -m benchmarks.replay captures/ --url http://127.0.0.1:5001/ --concurrency 16 --speed 2
+
+The captured requests are sent with their content type and body, in the order and at the pace they were
+captured, multiplied by the speed (0 sends them as fast as possible), by client threads that each keep one
+keep-alive connection open. Every response is compared with the captured one: the status code, and the body,
+as JSON when both are JSON. The throughput, the latency percentiles and the mismatches are reported, and the
+exit status is 1 when any response differs or fails, so a serving change can be load tested and regression
+checked with production traffic offline.
+"""
+import argparse
+import http.client
+import json
+import sys
+import threading
+from itertools import islice
+from time import perf_counter, sleep
+from urllib.parse import urlsplit
+from benchmarks.load_test import percentile
+from fee_calculator.capture import read_capture
+
+PERCENTILES = (0.5, 0.9, 0.99)
+SHOWN_MISMATCHES = 5
+
+
+def same_response(expected, actual):
+    """
+    Check that a response body is the captured one, comparing the JSON values when both are JSON.
+    """
+    if expected == actual:
+        return True
+    try:
+        return json.loads(expected) == json.loads(actual)
+    except ValueError:
+        return False
+
+
+def replay(records, url, concurrency=16, speed=1.0):
+    """
+    Send captured requests to a server, and compare the responses with the captured ones.
+
+    Args:
+        records (list): The captured records, as read by fee_calculator.capture.read_capture(), in time order.
+        url (str): The URL of the POST / endpoint of the server.
+        concurrency (int): The number of concurrent connections.
+        speed (float): The multiple of the captured pace the requests are sent at, 0 to send them as fast as
+            possible.
+
+    Returns:
+        dict: The number of requests, errors and mismatches, the throughput in requests per second, the latency
+        percentiles in milliseconds, and the first mismatches, with the captured and the actual responses.
+    """
+    parts = urlsplit(url)
+    start_time = records[0][0] if records else 0.0
+    latencies, errors, mismatches = [], [], []
+    lock = threading.Lock()
+    next_index = 0
+
+    def run_client():
+        nonlocal next_index
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+        while True:
+            with lock:
+                index = next_index
+                next_index += 1
+            if index >= len(records):
+                break
+            timestamp, content_type, body, status, expected = records[index]
+            if speed > 0:
+                delay = start + (timestamp - start_time) / speed - perf_counter()
+                if delay > 0:
+                    sleep(delay)
+            headers = {"Content-Type": content_type} if content_type else {}
+            sent = perf_counter()
+            try:
+                connection.request("POST", parts.path or "/", body, headers)
+                response = connection.getresponse()
+                actual = response.read()
+            except (OSError, http.client.HTTPException) as error:
+                errors.append((index, repr(error)))
+                connection.close()
+                connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+                continue
+            latencies.append(perf_counter() - sent)
+            if response.status != status or not same_response(expected, actual):
+                mismatches.append(
+                    {
+                        "index": index,
+                        "request": body.decode(errors="replace"),
+                        "captured": [status, expected.decode(errors="replace")],
+                        "replayed": [response.status, actual.decode(errors="replace")],
+                    }
+                )
+        connection.close()
+
+    threads = [threading.Thread(target=run_client) for _ in range(concurrency)]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - start
+
+    latencies.sort()
+    mismatches.sort(key=lambda mismatch: mismatch["index"])
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "mismatches": len(mismatches),
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        **{
+            f"p{round(fraction * 100)}_ms": percentile(latencies, fraction) * 1000
+            for fraction in PERCENTILES
+        },
+        "first_mismatches": mismatches[:SHOWN_MISMATCHES],
+    }
+
+
+def main(argv=None):
+    """
+    Replay a capture from the command line.
+
+    Returns:
+        int: The exit status, 1 if any response differs from the captured one or failed, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.replay",
+        description="Replay captured POST / traffic against a running fee calculator server.",
+    )
+    parser.add_argument("capture", help="Capture directory (FEE_CALCULATOR_CAPTURE_DIR of the captured server).")
+    parser.add_argument("--url", default="http://127.0.0.1:5001/", help="URL of the POST / endpoint.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent connections.")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Multiple of the captured pace, e.g. 2 for twice as fast, 0 for as fast as possible.",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Number of captured requests replayed.")
+    args = parser.parse_args(argv)
+
+    records = list(islice(read_capture(args.capture), args.limit))
+    if not records:
+        parser.error(f"no captured requests in {args.capture}")
+    result = replay(records, args.url, args.concurrency, args.speed)
+    print(
+        f"{result['requests']} requests, {result['errors']} errors, {result['mismatches']} mismatches, "
+        f"{result['requests_per_second']:.0f} req/s, p50 {result['p50_ms']:.2f} ms, "
+        f"p90 {result['p90_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms"
+    )
+    for mismatch in result["first_mismatches"]:
+        print(json.dumps(mismatch))
+    return 1 if result["errors"] or result["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
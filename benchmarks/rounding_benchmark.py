@@ -0,0 +1,85 @@
+"""
+Microbenchmark of the integer rush fee arithmetic against the float multiplier and round() it replaced.
+
+Run from the repository root:
+    python -m benchmarks.rounding_benchmark
+
+The rush fee of random fees is calculated with the float multiplier and round(), and with the multiplier in
+basis points, rounded half up or half even, as inlined in Tariff.breakdown(). Half up is a single integer
+floor division, half even adds a check for the half cents. The latency per quote of Tariff.breakdown() is then
+reported for orders in the rush hours, with either rounding mode.
+"""
+from datetime import datetime
+from random import Random
+from timeit import repeat
+from fee_calculator.constants import *
+from fee_calculator.money import HALF_BASIS_POINTS, to_basis_points
+from fee_calculator.tariff import DEFAULT_TARIFF, Tariff
+
+NUMBER_OF_FEES = 10000
+REPEAT = 7
+FRIDAY_RUSH = datetime.fromisoformat("2024-01-26T16:00:00Z")
+
+FLOAT_ROUND = """
+for fee in fees:
+    round(fee * multiplier)
+"""
+HALF_UP = """
+for fee in fees:
+    (fee * basis_points + HALF_BASIS_POINTS) // BASIS_POINTS
+"""
+HALF_EVEN = """
+for fee in fees:
+    scaled = fee * basis_points
+    rush_fee = (scaled + HALF_BASIS_POINTS) // BASIS_POINTS
+    if rush_fee & 1 and scaled % BASIS_POINTS == HALF_BASIS_POINTS:
+        rush_fee -= 1
+"""
+
+
+def best_ns(statement, namespace, count):
+    """
+    Return the best time per item, in nanoseconds, of a statement looping over count items.
+    """
+    return min(repeat(statement, globals=namespace, number=1, repeat=REPEAT)) / count * 1e9
+
+
+def main():
+    random = Random(0)
+    fees = [random.randint(0, MAX_POSSIBLE_DELIVERY_FEE * CENTS_PER_EUR) for _ in range(NUMBER_OF_FEES)]
+    namespace = {
+        "fees": fees,
+        "multiplier": RUSH_FEE_MULTIPLIER,
+        "basis_points": to_basis_points(RUSH_FEE_MULTIPLIER),
+        "HALF_BASIS_POINTS": HALF_BASIS_POINTS,
+        "BASIS_POINTS": BASIS_POINTS,
+    }
+    results = {
+        name: best_ns(statement, namespace, len(fees))
+        for name, statement in (
+            ("float multiplier, round()", FLOAT_ROUND),
+            ("basis points, half up", HALF_UP),
+            ("basis points, half even", HALF_EVEN),
+        )
+    }
+    float_ns = results["float multiplier, round()"]
+    print(f"{'rush fee':<36}{'ns':>8}{'speedup':>9}")
+    for name, ns in results.items():
+        print(f"{name:<36}{ns:>8.1f}{float_ns / ns:>8.2f}x")
+
+    orders = [
+        (random.randint(1, 19999), random.randint(1, 5000), random.randint(1, 20), FRIDAY_RUSH)
+        for _ in range(NUMBER_OF_FEES)
+    ]
+    print(f"\n{'breakdown, rush hours':<36}{'ns':>8}")
+    for name, tariff in (
+        ("half up (default)", DEFAULT_TARIFF),
+        ("half even", Tariff(rush_rounding="half_even")),
+    ):
+        namespace = {"orders": orders, "breakdown": tariff.breakdown}
+        ns = best_ns("for order in orders: breakdown(*order)", namespace, len(orders))
+        print(f"{name:<36}{ns:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
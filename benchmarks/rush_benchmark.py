@@ -0,0 +1,88 @@
+"""
+Microbenchmark of the rush calendar lookup against a loop over the rush hour rules, by number of windows.
+
+Run from the repository root:
+    python -m benchmarks.rush_benchmark
+
+Calendars of 1 to 1000 random weekly windows, and as many exception dates, are looked up for the same delivery
+times. The compiled calendar costs the same whatever the number of windows, while the loop grows with it.
+"""
+from datetime import datetime, timedelta, timezone
+from random import Random
+from timeit import repeat
+from fee_calculator.rush import MINUTES_PER_DAY, RushCalendar
+
+WINDOW_COUNTS = (1, 10, 100, 1000)
+NUMBER_OF_TIMES = 1000
+REPEAT = 15
+TIME_ZONE = "Europe/Helsinki"
+
+
+def generate_windows(size, random):
+    """
+    Generate random weekly windows of up to 4 hours.
+
+    Returns:
+        list: Tuples of the ISO weekdays, the start and end minutes and the multiplier of every window.
+    """
+    windows = []
+    for _ in range(size):
+        start = random.randrange(MINUTES_PER_DAY - 240)
+        windows.append(
+            (
+                (random.randint(1, 7),),
+                start,
+                start + random.randint(15, 240),
+                random.choice((1.1, 1.2, 1.5)),
+            )
+        )
+    return windows
+
+
+def loop_multiplier(windows, time):
+    """
+    Look up the multiplier of a time by scanning the windows, the last matching one winning.
+    """
+    minute = time.hour * 60 + time.minute
+    day = time.isoweekday()
+    for days, start, end, multiplier in reversed(windows):
+        if day in days and start <= minute < end:
+            return multiplier
+    return None
+
+
+def best_ns_per_lookup(function, times):
+    """
+    Return the best time per lookup, in nanoseconds, of calling the function on every time.
+    """
+    best = min(repeat(lambda: [function(time) for time in times], number=1, repeat=REPEAT))
+    return best / len(times) * 1e9
+
+
+def main():
+    random = Random(0)
+    start = datetime(2024, 1, 22, tzinfo=timezone.utc)
+    times = [
+        start + timedelta(minutes=random.randrange(365 * MINUTES_PER_DAY))
+        for _ in range(NUMBER_OF_TIMES)
+    ]
+
+    print(f"{'windows':>8}{'loop ns':>12}{'calendar ns':>13}{'+ time zone ns':>16}{'+ exceptions ns':>17}")
+    for count in WINDOW_COUNTS:
+        windows = generate_windows(count, random)
+        _, first_start, first_end, first_multiplier = windows[0]
+        exceptions = {
+            (start + timedelta(days=day)).date(): [(first_start, first_end, first_multiplier)]
+            for day in random.sample(range(365), min(count, 365))
+        }
+        loop_ns = best_ns_per_lookup(lambda time: loop_multiplier(windows, time), times)
+        calendar_ns = best_ns_per_lookup(RushCalendar(windows).multiplier, times)
+        zone_ns = best_ns_per_lookup(RushCalendar(windows, tz=TIME_ZONE).multiplier, times)
+        exceptions_ns = best_ns_per_lookup(
+            RushCalendar(windows, exceptions, TIME_ZONE).multiplier, times
+        )
+        print(f"{count:>8}{loop_ns:>12.1f}{calendar_ns:>13.1f}{zone_ns:>16.1f}{exceptions_ns:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
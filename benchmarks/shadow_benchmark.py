@@ -0,0 +1,61 @@
+"""
+Benchmark of the latency that shadow pricing adds to POST /.
+
+Run from the repository root:
+    python -m benchmarks.shadow_benchmark
+
+Generated traffic is sent through the Flask test client without shadow pricing, and with a candidate
+schedule evaluating every order (sample rate 1, the worst case) or a tenth of them. The cases are timed in
+interleaved rounds, so that noise on a busy machine affects them alike, and the best time per request of
+every case is reported. The background thread is drained between rounds, and its drops are reported: with
+one order per request, it keeps up with the requests and nothing is dropped.
+"""
+from time import perf_counter
+from unittest import mock
+from benchmarks.traffic import generate_traffic
+from fee_calculator.app import app
+from fee_calculator.shadow import ShadowPricer
+from fee_calculator.tariff import Tariff
+
+NUMBER_OF_REQUESTS = 2000
+ROUNDS = 10
+CANDIDATE = Tariff(base_delivery_fee=2.5, rush_fee_multiplier=1.3, version="candidate")
+
+
+def us_per_request(client, payloads, shadow):
+    """
+    Return the time, in microseconds, of one POST / request with the given shadow pricer.
+    """
+    with mock.patch("fee_calculator.app.SHADOW", shadow):
+        start = perf_counter()
+        for payload in payloads:
+            client.post("/", json=payload)
+        seconds = perf_counter() - start
+        if shadow is not None:
+            shadow.join()
+    return seconds / len(payloads) * 1e6
+
+
+def main():
+    client = app.test_client()
+    payloads = generate_traffic(NUMBER_OF_REQUESTS)
+    cases = {"shadow pricing off": None}
+    for sample_rate in (1.0, 0.1):
+        shadow = ShadowPricer(CANDIDATE, sample_rate)
+        shadow.start()
+        cases[f"shadow pricing, sample rate {sample_rate:g}"] = shadow
+
+    best = {name: float("inf") for name in cases}
+    for _ in range(ROUNDS):
+        for name, shadow in cases.items():
+            best[name] = min(best[name], us_per_request(client, payloads, shadow))
+    for name, us in best.items():
+        print(f"{name:<36}{us:>10.1f} us/request")
+    for name, shadow in cases.items():
+        if shadow is not None:
+            stats = shadow.stats()
+            print(f"{name}: {stats['evaluated']} evaluated, {stats['dropped']} dropped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Benchmark suite of the hot path: model construction, every fee component, the total fee, the fee breakdown
+and the HTTP route.
+
+Run from the repository root:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.25
+
+Every case runs over the same generated traffic (see benchmarks.traffic) and reports its best time per
+operation over several repeats. The results are printed and optionally written as JSON. When a baseline
+file is given, the run fails (exit status 1) if any case is slower than its baseline by more than the
+threshold, so pricing changes cannot silently slow down the hot path.
+"""
+import argparse
+import json
+import platform
+import sys
+from time import perf_counter_ns
+from pydantic import ValidationError
+from fee_calculator.Order import Order
+from fee_calculator.app import app
+from fee_calculator.fast_order import parse_order
+from fee_calculator.tariff import DEFAULT_TARIFF
+from .traffic import generate_traffic
+
+DEFAULT_SIZE = 2000
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25
+
+
+def is_valid(payload):
+    """
+    Check whether a payload is accepted by Order.
+    """
+    try:
+        Order(**payload)
+    except ValidationError:
+        return False
+    return True
+
+
+def construct_orders(payloads):
+    for payload in payloads:
+        Order(**payload)
+
+
+def construct_invalid_orders(payloads):
+    for payload in payloads:
+        try:
+            Order(**payload)
+        except ValidationError:
+            pass
+
+
+def parse_orders(payloads):
+    for payload in payloads:
+        parse_order(payload)
+
+
+def build_cases(payloads):
+    """
+    Build the benchmark cases over the generated traffic.
+
+    Args:
+        payloads (list): The generated request payloads, valid and invalid.
+
+    Returns:
+        dict: Tuples of the function to time and its number of operations, keyed by the case name.
+    """
+    valid = [payload for payload in payloads if is_valid(payload)]
+    invalid = [payload for payload in payloads if not is_valid(payload)]
+    orders = [Order(**payload) for payload in valid]
+    client = app.test_client()
+
+    def post_index():
+        for payload in payloads:
+            client.post("/", json=payload)
+
+    return {
+        "order_construction_valid": (lambda: construct_orders(valid), len(valid)),
+        "order_construction_invalid": (lambda: construct_invalid_orders(invalid), len(invalid)),
+        "parse_order_valid": (lambda: parse_orders(valid), len(valid)),
+        "calculate_distance_fee": (
+            lambda: [order.calculate_distance_fee() for order in orders],
+            len(orders),
+        ),
+        "calculate_small_order_surcharge": (
+            lambda: [order.calculate_small_order_surcharge() for order in orders],
+            len(orders),
+        ),
+        "calculate_item_surcharge": (
+            lambda: [order.calculate_item_surcharge() for order in orders],
+            len(orders),
+        ),
+        "calculate_friday_rush": (
+            lambda: [order.calculate_friday_rush(1000) for order in orders],
+            len(orders),
+        ),
+        "calculate_total_delivery_fee": (
+            lambda: [order.calculate_total_delivery_fee() for order in orders],
+            len(orders),
+        ),
+        "tariff_total_fee": (
+            lambda: [
+                DEFAULT_TARIFF.total_fee(
+                    order.cart_value, order.delivery_distance, order.number_of_items, order.time
+                )
+                for order in orders
+            ],
+            len(orders),
+        ),
+        "tariff_breakdown": (
+            lambda: [
+                DEFAULT_TARIFF.breakdown(
+                    order.cart_value, order.delivery_distance, order.number_of_items, order.time
+                )
+                for order in orders
+            ],
+            len(orders),
+        ),
+        "post_index": (post_index, len(payloads)),
+    }
+
+
+def run_cases(cases, repeat):
+    """
+    Time every case.
+
+    Args:
+        cases (dict): The cases, as built by build_cases().
+        repeat (int): Number of runs of every case, the best one is kept.
+
+    Returns:
+        dict: The best time per operation in nanoseconds and the number of operations, keyed by the case name.
+    """
+    results = {}
+    for name, (function, operations) in cases.items():
+        if not operations:
+            continue
+        best = None
+        for _ in range(repeat):
+            start = perf_counter_ns()
+            function()
+            elapsed = perf_counter_ns() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = {"ns_per_op": best / operations, "operations": operations}
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare the results with a baseline.
+
+    Args:
+        results (dict): The results of run_cases().
+        baseline (dict): The results of a previous run, cases missing from either side are skipped.
+        threshold (float): The allowed slowdown, e.g. 0.25 for 25%.
+
+    Returns:
+        list: Tuples of the case name, the baseline and current time per operation and their ratio, for every
+        case slower than allowed.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        baseline_ns = baseline[name]["ns_per_op"]
+        ratio = result["ns_per_op"] / baseline_ns
+        if ratio > 1 + threshold:
+            regressions.append((name, baseline_ns, result["ns_per_op"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    """
+    Run the suite from the command line.
+
+    Returns:
+        int: The exit status, 1 if any case regressed beyond the threshold and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.suite",
+        description="Benchmark suite of the fee calculator hot path.",
+    )
+    parser.add_argument(
+        "--size", type=int, default=DEFAULT_SIZE, help="Number of generated requests."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated traffic.")
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per case, the best one is kept."
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown against the baseline, {DEFAULT_THRESHOLD} (i.e. {DEFAULT_THRESHOLD:.0%}) by default.",
+    )
+    args = parser.parse_args(argv)
+
+    payloads = generate_traffic(args.size, args.seed)
+    results = run_cases(build_cases(payloads), args.repeat)
+
+    for name, result in results.items():
+        print(f"{name:<36}{result['ns_per_op']:>12.0f} ns/op")
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "size": args.size,
+            "seed": args.seed,
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, baseline_ns, current_ns, ratio in regressions:
+            print(
+                f"REGRESSION {name}: {baseline_ns:.0f} -> {current_ns:.0f} ns/op ({ratio - 1:+.0%})",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
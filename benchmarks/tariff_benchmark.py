@@ -0,0 +1,87 @@
+"""
+Microbenchmark of the compiled Tariff against the per-call constant arithmetic it replaced.
+
+Run from the repository root:
+    python -m benchmarks.tariff_benchmark
+
+Both implementations price the same mix of orders, and the latency per quote is reported for every
+fee component and for the total delivery fee.
+"""
+from datetime import datetime, timedelta, timezone
+from random import Random
+from timeit import repeat
+from fee_calculator.tariff import DEFAULT_TARIFF
+from tests import reference_fees
+
+NUMBER_OF_ORDERS = 1000
+REPEAT = 7
+
+
+def generate_orders(size, seed=0):
+    """
+    Generate random orders covering every fee rule.
+
+    Returns:
+        list: Tuples of cart value, delivery distance, number of items and time.
+    """
+    random = Random(seed)
+    start = datetime(2024, 1, 22, tzinfo=timezone.utc)
+    return [
+        (
+            random.randint(1, 25000),
+            random.randint(1, 5000),
+            random.randint(1, 20),
+            start + timedelta(minutes=random.randrange(7 * 24 * 60)),
+        )
+        for _ in range(size)
+    ]
+
+
+def best_ns_per_quote(function, arguments):
+    """
+    Return the best time per quote, in nanoseconds, of calling the function on every argument tuple.
+    """
+    best = min(
+        repeat(lambda: [function(*args) for args in arguments], number=1, repeat=REPEAT)
+    )
+    return best / len(arguments) * 1e9
+
+
+def main():
+    orders = generate_orders(NUMBER_OF_ORDERS)
+    cart_values = [(order[0],) for order in orders]
+    delivery_distances = [(order[1],) for order in orders]
+    numbers_of_items = [(order[2],) for order in orders]
+    cases = [
+        (
+            "distance fee",
+            reference_fees.distance_fee,
+            DEFAULT_TARIFF.distance_fee,
+            delivery_distances,
+        ),
+        (
+            "small order surcharge",
+            reference_fees.small_order_surcharge,
+            DEFAULT_TARIFF.small_order_surcharge,
+            cart_values,
+        ),
+        (
+            "item surcharge",
+            reference_fees.item_surcharge,
+            DEFAULT_TARIFF.item_surcharge,
+            numbers_of_items,
+        ),
+        ("total fee", reference_fees.total_delivery_fee, DEFAULT_TARIFF.total_fee, orders),
+    ]
+
+    print(f"{'':<24}{'constants ns':>14}{'tariff ns':>12}{'speedup':>9}")
+    for name, reference, compiled, arguments in cases:
+        reference_ns = best_ns_per_quote(reference, arguments)
+        compiled_ns = best_ns_per_quote(compiled, arguments)
+        print(
+            f"{name:<24}{reference_ns:>14.1f}{compiled_ns:>12.1f}{reference_ns / compiled_ns:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Generator of realistic request traffic for the benchmarks.
+
+The payloads follow the mix seen in production: most orders are small carts delivered within a few
+kilometers, with Friday rush hours, bulk carts, free deliveries and malformed requests in fixed shares.
+"""
+from datetime import datetime, timedelta
+from random import Random
+
+# Shares of the special kinds of traffic, the rest being regular orders
+DEFAULT_MIX = {
+    "rush_hour": 0.20,
+    "bulk": 0.05,
+    "free_delivery": 0.05,
+    "invalid": 0.05,
+}
+# A Monday, so that day offsets map to weekdays
+START = datetime(2024, 1, 22)
+FRIDAY_OFFSET = 4
+INVALID_VALUES = {
+    "cart_value": ["790", 7.9, -1, 0, None],
+    "delivery_distance": ["2235", -1, 0, 22.35],
+    "number_of_items": ["4", 0, -4, True],
+    "time": ["2024-01-36T15:00:00Z", "yesterday", "", None],
+}
+
+
+def regular_time(random):
+    """
+    A time during opening hours on any day outside the Friday rush hours.
+    """
+    while True:
+        time = START + timedelta(
+            days=random.randrange(7), hours=random.randint(8, 22), minutes=random.randrange(60)
+        )
+        if not (time.weekday() == FRIDAY_OFFSET and 15 <= time.hour < 19):
+            return time
+
+
+def generate_payload(random, mix=DEFAULT_MIX):
+    """
+    Generate one request payload.
+
+    Args:
+        random (Random): The random generator.
+        mix (dict): The shares of rush hour, bulk, free delivery and invalid payloads.
+
+    Returns:
+        dict: The JSON payload of a POST / request.
+    """
+    payload = {
+        "cart_value": max(1, int(random.lognormvariate(7.4, 0.6))),
+        "delivery_distance": max(1, int(random.lognormvariate(7.2, 0.5))),
+        "number_of_items": random.choice((1, 1, 2, 2, 3, 3, 4, 5, 6, 8)),
+        "time": regular_time(random),
+    }
+
+    draw = random.random()
+    for kind, share in mix.items():
+        if draw >= share:
+            draw -= share
+            continue
+        if kind == "rush_hour":
+            payload["time"] = START + timedelta(
+                days=FRIDAY_OFFSET, hours=random.randint(15, 18), minutes=random.randrange(60)
+            )
+        elif kind == "bulk":
+            payload["number_of_items"] = random.randint(13, 40)
+        elif kind == "free_delivery":
+            payload["cart_value"] = random.randint(20000, 50000)
+        elif kind == "invalid":
+            field = random.choice(list(INVALID_VALUES))
+            if random.random() < 0.2:
+                del payload[field]
+            else:
+                payload[field] = random.choice(INVALID_VALUES[field])
+        break
+
+    if isinstance(payload.get("time"), datetime):
+        payload["time"] = payload["time"].isoformat() + "Z"
+    return payload
+
+
+def generate_traffic(size, seed=0, mix=DEFAULT_MIX):
+    """
+    Generate a list of request payloads.
+
+    Args:
+        size (int): Number of payloads.
+        seed (int): Seed of the random generator, the same seed always gives the same traffic.
+        mix (dict): The shares of rush hour, bulk, free delivery and invalid payloads.
+
+    Returns:
+        list: The JSON payloads.
+    """
+    random = Random(seed)
+    return [generate_payload(random, mix) for _ in range(size)]
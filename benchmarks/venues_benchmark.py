@@ -0,0 +1,93 @@
+"""
+Benchmark of the memory footprint and the lookup latency of the venue registry, by number of venues.
+
+Run from the repository root:
+    python -m benchmarks.venues_benchmark --venues 100000 --schedules 100
+
+The venues share a few schedules. The TariffRegistry is compared with a dict of the same shared Tariffs, and
+with a dict holding a Tariff of its own per venue, i.e. one pricing object per venue. The memory is the one
+allocated to build the mapping from the venue IDs, measured with tracemalloc, the shared schedules excluded.
+A Tariff per venue does not fit in memory at this scale, so its footprint is extrapolated from
+PER_VENUE_SAMPLE venues, and its lookups are those of the dict of shared tariffs. The lookups are made in
+random order, a tenth of them for unknown venues.
+"""
+import argparse
+import random
+import tracemalloc
+from timeit import repeat
+from fee_calculator.tariff import Tariff
+from fee_calculator.venues import TariffRegistry
+
+DEFAULT_VENUES = 100_000
+DEFAULT_SCHEDULES = 100
+PER_VENUE_SAMPLE = 1000
+REPEAT = 5
+
+
+def venue_id(index):
+    """
+    Return the ID of the index-th venue.
+    """
+    return f"venue-{index:08d}"
+
+
+def allocated(build):
+    """
+    Return the result of build() and the number of bytes it allocated and still holds.
+    """
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def ns_per_lookup(get, venue_ids):
+    """
+    Return the best time, in nanoseconds, of looking up one venue.
+    """
+    seconds = min(
+        repeat(lambda: [get(venue) for venue in venue_ids], number=1, repeat=REPEAT)
+    )
+    return seconds / len(venue_ids) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.venues_benchmark")
+    parser.add_argument("--venues", type=int, default=DEFAULT_VENUES, help="Number of venues.")
+    parser.add_argument("--schedules", type=int, default=DEFAULT_SCHEDULES, help="Number of schedules.")
+    args = parser.parse_args()
+
+    schedules = [Tariff(base_delivery_fee=1 + index / 100) for index in range(args.schedules)]
+    mappings = {
+        "registry": lambda: TariffRegistry(
+            (venue_id(index), schedules[index % args.schedules]) for index in range(args.venues)
+        ),
+        "dict of shared tariffs": lambda: {
+            venue_id(index): schedules[index % args.schedules] for index in range(args.venues)
+        },
+    }
+    lookups = [venue_id(random.randrange(args.venues * 10 // 9)) for _ in range(args.venues)]
+
+    print(f"{args.venues} venues, {args.schedules} schedules")
+    print(f"{'mapping':<24}{'MB':>8}{'bytes/venue':>13}{'ns/lookup':>11}")
+    for name, build in mappings.items():
+        mapping, size = allocated(build)
+        latency = ns_per_lookup(mapping.get, lookups)
+        print(f"{name:<24}{size / 1e6:>8.1f}{size / args.venues:>13.0f}{latency:>11.0f}")
+        del mapping
+
+    _, size = allocated(
+        lambda: {
+            venue_id(index): Tariff(base_delivery_fee=1 + (index % args.schedules) / 100)
+            for index in range(min(args.venues, PER_VENUE_SAMPLE))
+        }
+    )
+    per_venue = size / min(args.venues, PER_VENUE_SAMPLE)
+    print(
+        f"{'dict of venue tariffs':<24}{per_venue * args.venues / 1e6:>8.1f}{per_venue:>13.0f}{'-':>11}"
+    )
+
+
+if __name__ == "__main__":
+    main()
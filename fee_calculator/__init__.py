@@ -1 +1,13 @@
-from .app import app
\ No newline at end of file
+def __getattr__(name):
+    """
+    Import the Flask app on first use, so that importing a module of the package does not import Flask.
+
+    `flask --app fee_calculator run` still finds the app as an attribute of the package.
+    """
+    if name == "app":
+        from .app import app
+
+        # Replaces the submodule the import bound to the name
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
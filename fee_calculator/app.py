@@ -1,9 +1,22 @@
-from flask import Flask, request, jsonify
-from .Order import Order
+from flask import Flask, Response, g, request, jsonify
+from .batch import OrderBatch
+from .cache import QUOTE_CACHE
+from .capture import CAPTURE
+from .dedup import RESPONSE_CACHE
+from .fast_order import parse_order
+from .grid import FeeGrid
+from .inverse import InverseQuery
+from .errors import validation_error_details
+from .metrics import METRICS
+from .pricing import PRICING
+from .shadow import SHADOW
 from pydantic import ValidationError
 from http import HTTPStatus
+from time import perf_counter_ns
 
 app = Flask(__name__)
+# The responses of a request body that do not depend on anything but the body and the pricing
+CACHED_STATUS_CODES = (HTTPStatus.OK, HTTPStatus.BAD_REQUEST)
 
 
 @app.errorhandler(ValidationError)
@@ -17,9 +30,17 @@ def handle_value_error(error):
     Returns:
         Response: A JSON response containing details of the validation error with a 400 status code.
     """
-    error_details = {error["loc"][0]: error["msg"] for error in error.errors()}
+    error_details = validation_error_details(error)
     response = jsonify({"Validation Error": error_details})
     response.status_code = HTTPStatus.BAD_REQUEST
+    # The metrics are the ones of POST /, whose invalid orders are timed up to their validation
+    if request.endpoint == "index":
+        for field in error_details:
+            METRICS.count_validation_error(field)
+        stage_times = g.pop("stage_times", None)
+        if stage_times is not None:
+            start, parsed, validated = stage_times
+            METRICS.observe_stages(start, parsed, validated, validated, perf_counter_ns())
     return response
 
 
@@ -28,13 +49,220 @@ def index():
     """
     Route all the requests with '/' here. Accepts only POST requests, others will be met with a 405 response.
 
+    Orders with a venue_id are priced with the fee schedule of the venue, the others with the current pricing.
+    With the response cache enabled, a request body sent again within its time to live gets the response
+    encoded the first time, without being decoded, validated nor priced (see fee_calculator.dedup).
+
+    Returns:
+        Response: A JSON response containing the calculated delivery fee and the version of the pricing that
+        calculated it, with a 200 status code.
+    """
+    start = perf_counter_ns()
+    # Taken once, so the request is priced with this tariff even if the pricing is reloaded meanwhile
+    tariff = PRICING.tariff
+    if RESPONSE_CACHE.maxsize > 0 and request.is_json:
+        key = RESPONSE_CACHE.key(tariff.fingerprint, request.get_data())
+        cached = RESPONSE_CACHE.get(key)
+        METRICS.count_response_cache(cached is not None)
+        if cached is not None:
+            status, body = cached
+            return Response(body, status, mimetype="application/json")
+        # Stored by cache_response() once the response, or the validation error, is encoded
+        g.response_cache_key = key
+    data = request.json
+    parsed = perf_counter_ns()
+    try:
+        order = parse_order(data)
+    except ValidationError:
+        # Recorded by handle_value_error() with the time of encoding the error, and no pricing
+        g.stage_times = (start, parsed, perf_counter_ns())
+        raise
+    tariff = order.pricing_tariff(tariff)
+    validated = perf_counter_ns()
+    # The total of the same single pass as POST /quote, so the two never disagree
+    breakdown = order.calculate_fee_breakdown(tariff)
+    priced = perf_counter_ns()
+    response = jsonify({"delivery_fee": breakdown.total, "pricing_version": tariff.version})
+    METRICS.observe_stages(start, parsed, validated, priced, perf_counter_ns())
+    # The candidate schedule replaces the service pricing, so the orders of a venue are not compared with it
+    if SHADOW is not None and order.venue_id is None:
+        SHADOW.offer(order, breakdown)
+    return response
+
+
+@app.route("/quote", methods=["POST"])
+def quote():
+    """
+    Calculate the components of the delivery fee of an order. Accepts only POST requests.
+
+    The request body is the same as for POST /, and the total is the delivery fee POST / responds with. Orders
+    with a venue_id are priced with the fee schedule of the venue, the others with the current pricing.
+
     Returns:
-        Response: A JSON response containing the calculated delivery fee with a 200 status code.
+        Response: A JSON response containing the components of the delivery fee, the total and the version of
+        the pricing that calculated them, with a 200 status code.
     """
     data = request.json
-    order = Order(**data)
-    delivery_fee = order.calculate_total_delivery_fee()
-    return jsonify({"delivery_fee": delivery_fee})
+    order = parse_order(data)
+    tariff = order.pricing_tariff(PRICING.tariff)
+    breakdown = order.calculate_fee_breakdown(tariff)
+    return jsonify({**breakdown.to_dict(), "pricing_version": tariff.version})
+
+
+@app.after_request
+def count_request(response):
+    """
+    Count the POST / requests by outcome, including the 400 responses of handle_value_error.
+
+    Args:
+        response: The response of the request.
+
+    Returns:
+        Response: The same response.
+    """
+    if request.endpoint == "index":
+        METRICS.count_request(response.status_code)
+    return response
+
+
+@app.after_request
+def cache_response(response):
+    """
+    Add the POST / responses that missed the response cache to it, including the 400 responses of
+    handle_value_error.
+
+    Args:
+        response: The response of the request.
+
+    Returns:
+        Response: The same response.
+    """
+    key = g.pop("response_cache_key", None)
+    if key is not None and response.status_code in CACHED_STATUS_CODES and response.is_json:
+        RESPONSE_CACHE.put(key, response.status_code, response.get_data())
+    return response
+
+
+@app.after_request
+def capture_request(response):
+    """
+    Log the POST / requests and their responses, including the 400 responses of handle_value_error, when the
+    traffic capture is enabled (see fee_calculator.capture).
+
+    Args:
+        response: The response of the request.
+
+    Returns:
+        Response: The same response.
+    """
+    if CAPTURE is not None and request.endpoint == "index":
+        CAPTURE.record(request.content_type or "", request.get_data(), response.status_code, response.get_data())
+    return response
+
+
+@app.route("/batch", methods=["POST"])
+def batch():
+    """
+    Calculate the delivery fees of many orders in one request. Accepts only POST requests.
+
+    The request body holds one array per order field, and the i-th elements of all arrays make up the i-th order.
+
+    Returns:
+        Response: A JSON response containing the calculated delivery fees, in the order of the input, and the
+        version of the pricing that calculated them, with a 200 status code.
+    """
+    tariff = PRICING.tariff
+    data = request.json
+    order_batch = OrderBatch(**data)
+    delivery_fees = order_batch.calculate_total_delivery_fees(tariff)
+    return jsonify({"delivery_fees": delivery_fees.tolist(), "pricing_version": tariff.version})
+
+
+@app.route("/grid", methods=["POST"])
+def grid():
+    """
+    Calculate the delivery fees of a cart at a time for ranges of delivery distances and numbers of items.
+    Accepts only POST requests.
+
+    Returns:
+        Response: A JSON response containing the axes and the shape of the grid, the fees in the requested
+        encoding and the version of the pricing that calculated them, with a 200 status code.
+    """
+    tariff = PRICING.tariff
+    data = request.json
+    fee_grid = FeeGrid(**data)
+    fees = fee_grid.calculate_fees(tariff)
+    return jsonify(
+        {
+            "delivery_distance": fee_grid.delivery_distance.model_dump(),
+            "number_of_items": fee_grid.number_of_items.model_dump(),
+            "shape": list(fees.shape),
+            "encoding": fee_grid.encoding,
+            "fees": fee_grid.encode_fees(fees),
+            "pricing_version": tariff.version,
+        }
+    )
+
+
+@app.route("/solve", methods=["POST"])
+def solve():
+    """
+    Solve an inverse query: the furthest delivery distance, the largest number of items or the smallest cart
+    value for which the delivery fee is within a budget. Accepts only POST requests.
+
+    Returns:
+        Response: A JSON response containing the query, the value of its unknown (null when any value is within
+        the budget) and the version of the pricing that solved it, with a 200 status code.
+    """
+    tariff = PRICING.tariff
+    data = request.json
+    query = InverseQuery(**data)
+    value = query.calculate(tariff)
+    return jsonify(
+        {
+            **query.model_dump(exclude={"time", query.solve}),
+            query.solve: value,
+            "pricing_version": tariff.version,
+        }
+    )
+
+
+@app.route("/cache", methods=["GET"])
+def cache_stats():
+    """
+    Report the counters of the quote cache of this worker process.
+
+    Returns:
+        Response: A JSON response containing the hits, misses, evictions, invalidations and size of the cache.
+    """
+    return jsonify(QUOTE_CACHE.stats())
+
+
+@app.route("/shadow", methods=["GET"])
+def shadow_stats():
+    """
+    Report how the candidate fee schedule of shadow pricing would have changed the fees of this worker process.
+
+    Returns:
+        Response: A JSON response containing the statistics of ShadowPricer.stats(), with a 200 status code,
+        or a 404 response when shadow pricing is disabled.
+    """
+    if SHADOW is None:
+        response = jsonify({"error": "Shadow pricing is disabled"})
+        response.status_code = HTTPStatus.NOT_FOUND
+        return response
+    return jsonify(SHADOW.stats())
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Report the latency histograms and counters of POST / requests, summed over all the worker processes.
+
+    Returns:
+        Response: The metrics in the Prometheus text format, with a 200 status code.
+    """
+    return Response(METRICS.export(), mimetype="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
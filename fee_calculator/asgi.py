@@ -0,0 +1,18 @@
+"""
+ASGI entry point of the fee calculator, served by uvicorn in the asgi mode of fee_calculator.serve.
+
+The WSGI app runs in the thread pool of uvicorn's WSGI middleware. It is warmed up when this module is
+imported, i.e. when a worker process starts. The POST / requests are answered on the event loop by a
+CoalescingApp instead (see fee_calculator.coalesce): every order is priced as soon as it arrives, or, with
+COALESCE_WINDOW_MS set, with the orders that arrive within the window.
+"""
+from uvicorn.middleware.wsgi import WSGIMiddleware
+from . import config
+from .coalesce import CoalescingApp, OrderCoalescer
+from .serve import warm_up
+
+if config.COALESCE_WINDOW_MS > 0:
+    coalescer = OrderCoalescer(config.COALESCE_WINDOW_MS / 1000, config.COALESCE_MAX_BATCH)
+else:
+    coalescer = OrderCoalescer(max_batch=1)
+application = CoalescingApp(WSGIMiddleware(warm_up()), coalescer)
@@ -0,0 +1,291 @@
+from datetime import datetime, timezone
+from typing import Annotated
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, StrictInt, ValidationInfo, field_validator
+from .constants import *
+from .money import HALF_BASIS_POINTS, ROUND_HALF_EVEN
+from .pricing import PRICING
+from .rush import MINUTES_PER_DAY
+
+# 1970-01-01, the start of Unix time, was a Thursday
+EPOCH_WEEKDAY = 3
+
+
+def distance_fees(tariff, delivery_distance):
+    """
+    Calculate the distance-based delivery fees of an array of distances.
+
+    Args:
+        tariff (Tariff): The fee schedule.
+        delivery_distance (numpy.ndarray): Delivery distances in meters, as int64.
+
+    Returns:
+        numpy.ndarray: Distance-based delivery fees in cents.
+    """
+    excess_distance = np.maximum(delivery_distance - tariff.base_distance, 0)
+    # Integer ceil division of the excess distance by the interval length
+    extra_distance_intervals = -(-excess_distance // tariff.additional_distance_interval)
+    return tariff.base_delivery_fee + tariff.fee_per_additional_interval * extra_distance_intervals
+
+
+def item_surcharges(tariff, number_of_items):
+    """
+    Calculate the item surcharges of an array of item counts.
+
+    Args:
+        tariff (Tariff): The fee schedule.
+        number_of_items (numpy.ndarray): Numbers of items, as int64.
+
+    Returns:
+        numpy.ndarray: Surcharge amounts in cents.
+    """
+    # Subtracting 1 because no. of items including the threshold are considered as excess
+    excess_items = np.maximum(number_of_items - (tariff.surchargeable_items_threshold - 1), 0)
+    excess_item_surcharge = tariff.excess_charge_per_item * excess_items
+    return excess_item_surcharge + np.where(
+        number_of_items > tariff.bulk_items_threshold,
+        tariff.bulk_fee,
+        0,
+    )
+
+
+def rush_fees(tariff, fees, codes):
+    """
+    Apply the rush multipliers of the rush calendar codes to an array of fees.
+
+    Args:
+        tariff (Tariff): The fee schedule.
+        fees (numpy.ndarray): The delivery fees in cents.
+        codes: The rush calendar codes (see RushCalendar.code) of the fees, an array of the same shape or a
+            single code for all of them.
+
+    Returns:
+        numpy.ndarray: The delivery fees in cents, with the rush multiplier applied where applicable.
+    """
+    basis_points = np.asarray(tariff.rush_calendar.basis_points, dtype=np.int64)[codes]
+    # The same exact integer rounding as round_basis_points() in Tariff.rush_fee
+    scaled = fees * basis_points
+    rush = (scaled + HALF_BASIS_POINTS) // BASIS_POINTS
+    if tariff.rush_rounding == ROUND_HALF_EVEN:
+        rush -= (rush & 1) & (scaled % BASIS_POINTS == HALF_BASIS_POINTS)
+    return np.where(codes != 0, rush, fees)
+
+
+def timestamp_rush_codes(calendar, timestamps):
+    """
+    Look up the rush calendar codes (see RushCalendar.code) of an array of Unix timestamps.
+
+    Without time zone nor exception dates, the codes are indexed in the weekly tables of the calendar with array
+    arithmetic. Otherwise the calendar looks up every distinct minute of the timestamps once.
+
+    Args:
+        calendar (RushCalendar): The rush calendar.
+        timestamps (numpy.ndarray): Delivery times in seconds since the Unix epoch, UTC, as int64.
+
+    Returns:
+        numpy.ndarray: The codes, as uint8.
+    """
+    minutes = timestamps // 60
+    if calendar.zone is None and not calendar.exceptions:
+        week = np.frombuffer(
+            b"".join(table or bytes(MINUTES_PER_DAY) for table in calendar.days), dtype=np.uint8
+        )
+        days, minute_of_day = np.divmod(minutes, MINUTES_PER_DAY)
+        return week[(days + EPOCH_WEEKDAY) % 7 * MINUTES_PER_DAY + minute_of_day]
+    distinct_minutes, inverse = np.unique(minutes, return_inverse=True)
+    codes = np.fromiter(
+        (
+            calendar.code(datetime.fromtimestamp(minute * 60, timezone.utc))
+            for minute in distinct_minutes.tolist()
+        ),
+        dtype=np.uint8,
+        count=len(distinct_minutes),
+    )
+    return codes[inverse]
+
+
+def total_fees(tariff, cart_value, delivery_distance, number_of_items, codes):
+    """
+    Calculate the total delivery fees of orders given as arrays.
+
+    Args:
+        tariff (Tariff): The fee schedule.
+        cart_value (numpy.ndarray): Cart values in cents, as int64.
+        delivery_distance (numpy.ndarray): Delivery distances in meters, as int64.
+        number_of_items (numpy.ndarray): Numbers of items, as int64.
+        codes (numpy.ndarray): The rush calendar codes of the delivery times.
+
+    Returns:
+        numpy.ndarray: Total delivery fees in cents.
+    """
+    fees = distance_fees(tariff, delivery_distance)
+    fees += np.maximum(tariff.small_order_cart_value - cart_value, 0)
+    fees += item_surcharges(tariff, number_of_items)
+    fees = rush_fees(tariff, fees, codes)
+    # Cap the delivery fee
+    fees = np.minimum(fees, tariff.max_possible_delivery_fee)
+    # Free delivery for high cart value
+    return np.where(cart_value >= tariff.free_delivery_cart_value, 0, fees)
+
+
+class OrderBatch(BaseModel):
+    """
+    Represents a batch of orders, stored column-wise, for calculating delivery fees in bulk.
+
+    Every column is validated with the same rules as the corresponding field of `Order`, and all
+    columns must have the same length. Row `i` of the batch is the order made of the `i`-th element
+    of every column. The fees are priced with the given tariff, or else the current one of PRICING, like `Order`.
+    A batch is priced with a single fee schedule, so any other column, a venue_id among them, is rejected.
+
+    Attributes:
+        cart_value: Cart values of the orders in cents.
+        delivery_distance: Delivery distances of the orders in meters.
+        number_of_items: Number of items of the orders.
+        time: Delivery times of the orders. Valid datetime strings are automatically casted to datetime objects.
+
+    Methods:
+        calculate_distance_fees(tariff): Calculate the distance-based delivery fee of every order.
+        calculate_small_order_surcharges(tariff): Calculate the small order surcharge of every order.
+        calculate_item_surcharges(tariff): Calculate the item surcharge of every order.
+        calculate_friday_rush(fees, tariff): Apply the rush multipliers to the fees of the orders placed during rush hours.
+        calculate_rush_codes(tariff): Look up the rush calendar code of every order.
+        calculate_total_delivery_fees(tariff): Calculate the total delivery fee of every order.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    cart_value: list[Annotated[StrictInt, Field(ge=MIN_CART_VALUE, le=MAX_CART_VALUE)]]
+    delivery_distance: list[Annotated[StrictInt, Field(ge=MIN_DELIVERY_DISTANCE, le=MAX_DELIVERY_DISTANCE)]]
+    number_of_items: list[Annotated[StrictInt, Field(ge=MIN_ITEMS_COUNT, le=MAX_ITEMS_COUNT)]]
+    time: list[datetime]
+
+    @field_validator("delivery_distance", "number_of_items", "time")
+    @classmethod
+    def check_column_length(cls, column, info: ValidationInfo):
+        """
+        Check that the column has as many rows as the cart_value column.
+
+        Raises:
+            ValueError: If the lengths of the columns differ.
+        """
+        cart_value = info.data.get("cart_value")
+        if cart_value is not None and len(column) != len(cart_value):
+            raise ValueError("Column should have the same length as cart_value")
+        return column
+
+    def calculate_distance_fees(self, tariff=None):
+        """
+        Calculate the distance-based delivery fee of every order.
+
+        Args:
+            tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+        Returns:
+            numpy.ndarray: Distance-based delivery fees in cents.
+        """
+        if tariff is None:
+            tariff = PRICING.tariff
+        return distance_fees(tariff, np.asarray(self.delivery_distance, dtype=np.int64))
+
+    def calculate_small_order_surcharges(self, tariff=None):
+        """
+        Calculate the small order surcharge of every order.
+
+        Args:
+            tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+        Returns:
+            numpy.ndarray: Surcharge amounts in cents.
+        """
+        if tariff is None:
+            tariff = PRICING.tariff
+        cart_value = np.asarray(self.cart_value, dtype=np.int64)
+        return np.maximum(tariff.small_order_cart_value - cart_value, 0)
+
+    def calculate_item_surcharges(self, tariff=None):
+        """
+        Calculate the item surcharge of every order.
+
+        Args:
+            tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+        Returns:
+            numpy.ndarray: Surcharge amounts in cents.
+        """
+        if tariff is None:
+            tariff = PRICING.tariff
+        return item_surcharges(tariff, np.asarray(self.number_of_items, dtype=np.int64))
+
+    def calculate_friday_rush(self, fees, tariff=None):
+        """
+        Apply the rush multipliers to the fees of the orders placed during rush hours.
+
+        Args:
+            fees (numpy.ndarray): The delivery fees of the orders.
+            tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+        Returns:
+            numpy.ndarray: The delivery fees in cents, with the rush multiplier applied where applicable.
+        """
+        if tariff is None:
+            tariff = PRICING.tariff
+        return rush_fees(tariff, fees, self.calculate_rush_codes(tariff))
+
+    def calculate_rush_codes(self, tariff):
+        """
+        Look up the rush calendar code of the delivery time of every order.
+
+        Args:
+            tariff (Tariff): The fee schedule.
+
+        Returns:
+            numpy.ndarray: The codes, as uint8, 0 outside the rush hours.
+        """
+        calendar = tariff.rush_calendar
+        return np.fromiter(map(calendar.code, self.time), dtype=np.uint8, count=len(self.time))
+
+    def calculate_total_delivery_fees(self, tariff=None):
+        """
+        Calculate the total delivery fee of every order.
+
+        Args:
+            tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+        Returns:
+            numpy.ndarray: Total delivery fees in cents.
+        """
+        if tariff is None:
+            tariff = PRICING.tariff
+        return total_fees(
+            tariff,
+            np.asarray(self.cart_value, dtype=np.int64),
+            np.asarray(self.delivery_distance, dtype=np.int64),
+            np.asarray(self.number_of_items, dtype=np.int64),
+            self.calculate_rush_codes(tariff),
+        )
+
+
+def calculate_delivery_fees(cart_value, delivery_distance, number_of_items, time, tariff=None):
+    """
+    Calculate the delivery fees of many orders at once.
+
+    Args:
+        cart_value: Sequence of cart values in cents.
+        delivery_distance: Sequence of delivery distances in meters.
+        number_of_items: Sequence of item counts.
+        time: Sequence of delivery times, as datetime objects or datetime strings.
+        tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+    Returns:
+        numpy.ndarray: Total delivery fees in cents, one per order.
+
+    Raises:
+        ValidationError: If any of the values is invalid, or the sequences have different lengths.
+    """
+    batch = OrderBatch(
+        cart_value=cart_value,
+        delivery_distance=delivery_distance,
+        number_of_items=number_of_items,
+        time=time,
+    )
+    return batch.calculate_total_delivery_fees(tariff)
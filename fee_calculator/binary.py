@@ -0,0 +1,158 @@
+"""
+Compact binary quote protocol, for callers on the same host as the fee calculator.
+
+Instead of HTTP and JSON, the caller connects to a Unix domain socket (see fee_calculator.binary_server) and
+writes fixed-size request frames, each answered by a fixed-size response frame, in the same order. Any number
+of requests can be written before reading their responses (pipelining).
+
+Request frame (REQUEST, 20 bytes, little-endian):
+    int32 cart_value, int32 delivery_distance, int32 number_of_items, int64 time in seconds since the epoch (UTC)
+
+Response frame (RESPONSE, 6 bytes, little-endian):
+    uint16 status, int32 value
+    The status is 200 and the value the delivery fee in cents, or the status is 400 and the value has the bit of
+    every invalid field set (FIELD_BITS).
+
+The orders are validated with the rules of the Order model and priced with the current pricing, like POST /.
+Venue orders and the pricing version of the responses are not part of the protocol.
+
+This module only imports the standard library, so that the callers importing QuoteClient do not import the
+app and its dependencies.
+"""
+import socket
+import struct
+from datetime import datetime, timezone
+
+REQUEST = struct.Struct("<iiiq")
+RESPONSE = struct.Struct("<Hi")
+STATUS_OK = 200
+STATUS_INVALID = 400
+# Bit of every field in the value of a 400 response
+FIELD_BITS = {"cart_value": 1, "delivery_distance": 2, "number_of_items": 4, "time": 8}
+# Frames written before reading their responses, so that neither side blocks on a full socket buffer
+PIPELINE_DEPTH = 4096
+
+
+def invalid_fields(value):
+    """
+    Return the names of the fields of a 400 response value.
+
+    Args:
+        value (int): The value of the response, with the bit of every invalid field set.
+
+    Returns:
+        list: The names of the invalid fields, in the order of the request frame.
+    """
+    return [field for field, bit in FIELD_BITS.items() if value & bit]
+
+
+def timestamp(time):
+    """
+    Convert a delivery time to the seconds since the epoch of a request frame.
+
+    Args:
+        time (datetime or int): The delivery time, UTC when it has no time zone, or the seconds since the epoch.
+
+    Returns:
+        int: The seconds since the epoch, the fraction of a second being dropped.
+    """
+    if isinstance(time, datetime):
+        if time.tzinfo is None:
+            time = time.replace(tzinfo=timezone.utc)
+        return int(time.timestamp())
+    return time
+
+
+class QuoteClient:
+    """
+    Client of the binary quote protocol, holding one connection to the Unix domain socket of the server.
+
+    The client is not thread-safe: every thread should have its own.
+
+    Args:
+        path (str): The path of the Unix domain socket of the server.
+
+    Methods:
+        quote(cart_value, delivery_distance, number_of_items, time): Calculate the delivery fee of an order.
+        quote_many(orders): Calculate the delivery fees of many orders, pipelined.
+        close(): Close the connection.
+    """
+
+    def __init__(self, path):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def quote(self, cart_value, delivery_distance, number_of_items, time):
+        """
+        Calculate the delivery fee of an order.
+
+        Args:
+            cart_value (int): Total value of items in the shopping cart, in cents.
+            delivery_distance (int): Distance of the delivery in meters.
+            number_of_items (int): Number of items in the order.
+            time (datetime or int): The delivery time, UTC when it has no time zone, or the seconds since the epoch.
+
+        Returns:
+            int: The delivery fee in cents.
+
+        Raises:
+            ValueError: If the order is invalid, naming the invalid fields.
+        """
+        self._socket.sendall(REQUEST.pack(cart_value, delivery_distance, number_of_items, timestamp(time)))
+        status, value = RESPONSE.unpack(self._receive(RESPONSE.size))
+        if status != STATUS_OK:
+            raise ValueError(f"Invalid order fields: {', '.join(invalid_fields(value))}")
+        return value
+
+    def quote_many(self, orders):
+        """
+        Calculate the delivery fees of many orders, writing up to PIPELINE_DEPTH requests before reading their
+        responses.
+
+        Args:
+            orders (iterable): The (cart_value, delivery_distance, number_of_items, time) of every order.
+
+        Returns:
+            list: The delivery fee in cents of every order, None for the invalid orders.
+        """
+        orders = list(orders)
+        fees = []
+        for start in range(0, len(orders), PIPELINE_DEPTH):
+            chunk = orders[start : start + PIPELINE_DEPTH]
+            self._socket.sendall(
+                b"".join(
+                    REQUEST.pack(cart_value, delivery_distance, number_of_items, timestamp(time))
+                    for cart_value, delivery_distance, number_of_items, time in chunk
+                )
+            )
+            responses = self._receive(len(chunk) * RESPONSE.size)
+            fees.extend(
+                value if status == STATUS_OK else None for status, value in RESPONSE.iter_unpack(responses)
+            )
+        return fees
+
+    def _receive(self, size):
+        """
+        Read exactly size bytes of responses.
+        """
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            count = self._socket.recv_into(view[received:])
+            if count == 0:
+                raise ConnectionError("The quote server closed the connection")
+            received += count
+        return buffer
+
+    def close(self):
+        """
+        Close the connection.
+        """
+        self._socket.close()
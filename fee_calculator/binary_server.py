@@ -0,0 +1,133 @@
+"""
+Unix domain socket listener of the binary quote protocol (see fee_calculator.binary).
+
+Every connection is served by a thread, which reads as many request frames as are available, validates and
+prices them with a single read of the current tariff, and writes all their responses at once, so a pipelining
+caller pays for a couple of system calls per batch of orders rather than per order. The orders are validated
+with the rules of the Order model (strict ints within their bounds, a valid time), priced like POST / and
+offered to the shadow pricing. They are not counted in the metrics of /metrics, which are the ones of POST /.
+
+In the prefork mode of fee_calculator.serve, the socket is bound once, before forking, and every worker accepts
+connections on it from a thread; in the asgi mode, the socket is served by the process running uvicorn.
+"""
+import os
+import socket
+import threading
+from datetime import datetime, timezone
+from .binary import FIELD_BITS, REQUEST, RESPONSE, STATUS_INVALID, STATUS_OK
+from .constants import *
+from .fast_order import FastOrder, is_valid_int
+from .pricing import PRICING
+from . import shadow
+
+RECEIVE_SIZE = 64 * 1024
+BACKLOG = 128
+
+
+def answer(frames):
+    """
+    Validate and price the orders of request frames.
+
+    Args:
+        frames (bytes): Whole request frames.
+
+    Returns:
+        bytes: The response frame of every request, in the same order.
+    """
+    # Taken once for all the frames, so a pricing reload never mixes two schedules within them
+    tariff = PRICING.tariff
+    shadow_pricer = shadow.SHADOW
+    responses = []
+    for cart_value, delivery_distance, number_of_items, seconds in REQUEST.iter_unpack(frames):
+        invalid = 0
+        if not is_valid_int(cart_value, MIN_CART_VALUE, MAX_CART_VALUE):
+            invalid |= FIELD_BITS["cart_value"]
+        if not is_valid_int(delivery_distance, MIN_DELIVERY_DISTANCE, MAX_DELIVERY_DISTANCE):
+            invalid |= FIELD_BITS["delivery_distance"]
+        if not is_valid_int(number_of_items, MIN_ITEMS_COUNT, MAX_ITEMS_COUNT):
+            invalid |= FIELD_BITS["number_of_items"]
+        try:
+            time = datetime.fromtimestamp(seconds, timezone.utc)
+        except (OverflowError, OSError, ValueError):  # Out of the range of datetime
+            invalid |= FIELD_BITS["time"]
+        if invalid:
+            responses.append(RESPONSE.pack(STATUS_INVALID, invalid))
+            continue
+        order = FastOrder(cart_value, delivery_distance, number_of_items, time)
+        breakdown = order.calculate_fee_breakdown(tariff)
+        responses.append(RESPONSE.pack(STATUS_OK, breakdown.total))
+        if shadow_pricer is not None:
+            shadow_pricer.offer(order, breakdown)
+    return b"".join(responses)
+
+
+class QuoteServer:
+    """
+    Listener of the binary quote protocol on a Unix domain socket.
+
+    Args:
+        path (str): The path of the socket. A file left there by a previous run is replaced.
+
+    Methods:
+        start(): Accept connections from a daemon thread.
+        serve_forever(): Accept connections, serving every one from a thread.
+        close(): Stop listening and remove the socket file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(path):
+            os.remove(path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(path)
+        self._socket.listen(BACKLOG)
+
+    def start(self):
+        """
+        Accept connections from a daemon thread.
+
+        Returns:
+            threading.Thread: The started thread.
+        """
+        thread = threading.Thread(target=self.serve_forever, name="quote-server", daemon=True)
+        thread.start()
+        return thread
+
+    def serve_forever(self):
+        """
+        Accept connections, serving every one from a daemon thread, until the server is closed.
+        """
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:  # Closed
+                return
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection):
+        """
+        Answer the request frames of a connection until the caller closes it.
+        """
+        pending = b""
+        with connection:
+            try:
+                while data := connection.recv(RECEIVE_SIZE):
+                    if pending:
+                        data = pending + data
+                    # A frame split between two reads waits for the rest of it
+                    end = len(data) - len(data) % REQUEST.size
+                    if end:
+                        connection.sendall(answer(memoryview(data)[:end]))
+                    pending = data[end:]
+            except OSError:  # E.g. the caller reset the connection
+                return
+
+    def close(self):
+        """
+        Stop listening and remove the socket file. The open connections are served until their callers close them.
+        """
+        # Wakes up the thread blocked in accept()
+        self._socket.shutdown(socket.SHUT_RDWR)
+        self._socket.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
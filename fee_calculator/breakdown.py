@@ -0,0 +1,63 @@
+from operator import itemgetter
+
+
+class FeeBreakdown(tuple):
+    """
+    Represents the components of a delivery fee, as calculated by Tariff.breakdown() in a single pass.
+
+    The breakdown is an immutable tuple with named fields and empty __slots__, so it has no per-instance
+    __dict__ and is as cheap to build as a tuple: FeeBreakdown((distance_fee, ..., total)). All amounts are in
+    cents, and the components add up to the total:
+    distance_fee + small_order_surcharge + item_surcharge + bulk_fee + rush_uplift - cap_reduction == total.
+
+    Attributes:
+        distance_fee: The distance-based delivery fee.
+        small_order_surcharge: The surcharge for small orders.
+        item_surcharge: The surcharge for the items including and above the surchargeable items threshold.
+        bulk_fee: The bulk fee for the orders above the bulk items threshold.
+        rush_uplift: The amount added by the rush multiplier.
+        cap_reduction: The amount removed by capping the fee at the maximum possible delivery fee.
+        free_delivery: Whether the delivery is free because of the cart value, all amounts being 0.
+        total: The total delivery fee.
+
+    Methods:
+        to_dict(): Return the breakdown as a dict.
+    """
+
+    __slots__ = ()
+
+    FIELDS = (
+        "distance_fee",
+        "small_order_surcharge",
+        "item_surcharge",
+        "bulk_fee",
+        "rush_uplift",
+        "cap_reduction",
+        "free_delivery",
+        "total",
+    )
+
+    distance_fee = property(itemgetter(0))
+    small_order_surcharge = property(itemgetter(1))
+    item_surcharge = property(itemgetter(2))
+    bulk_fee = property(itemgetter(3))
+    rush_uplift = property(itemgetter(4))
+    cap_reduction = property(itemgetter(5))
+    free_delivery = property(itemgetter(6))
+    total = property(itemgetter(7))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self.FIELDS, self))
+        return f"FeeBreakdown({fields})"
+
+    def to_dict(self):
+        """
+        Return the breakdown as a dict, e.g. for a JSON response.
+
+        Returns:
+            dict: The components of the fee and the total, keyed by their names.
+        """
+        return dict(zip(self.FIELDS, self))
+
+
+FREE_DELIVERY = FeeBreakdown((0, 0, 0, 0, 0, 0, True, 0))
@@ -0,0 +1,270 @@
+"""
+Command-line bulk re-pricing of orders.
+
+Reads orders as NDJSON (one JSON object per line) or CSV (with a header row) from a file or stdin,
+validates and prices them in chunks, and writes every valid order back out with its delivery_fee.
+Invalid rows are written to a separate reject stream, in the same format as the 400 responses of the app,
+together with their line number. The input is processed as a generator pipeline, so memory use only
+depends on the chunk size and not on the size of the input.
+
+Usage:
+    python -m fee_calculator.bulk orders.ndjson -o priced.ndjson --rejects rejects.ndjson
+    cat orders.csv | python -m fee_calculator.bulk - --format csv > priced.csv
+    python -m fee_calculator.bulk orders.ndjson --pricing pricing-2024-02.json -o repriced.ndjson
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+from itertools import islice
+import numpy as np
+from .columnar import price_columns, record_columns, validate_columns
+from .pricing import PRICING, load_tariff
+
+FORMATS = ("ndjson", "csv")
+DEFAULT_CHUNK_SIZE = 10000
+INTEGER_FIELDS = ("cart_value", "delivery_distance", "number_of_items")
+INTEGER_PATTERN = re.compile(r"-?\d+")
+
+
+def read_ndjson(stream):
+    """
+    Read orders from NDJSON lines. Blank lines are skipped.
+
+    Args:
+        stream: A text stream with one JSON object per line.
+
+    Yields:
+        tuple: The line number, and the decoded JSON value (None if the line is not valid JSON).
+    """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, None
+
+
+def read_csv(reader):
+    """
+    Read orders from CSV rows.
+
+    CSV values are strings, so values of the integer fields that look like integers are converted to int,
+    and empty values are treated as missing. Any other value is left as is, for the validation to reject.
+
+    Args:
+        reader (csv.DictReader): A reader over a CSV stream with a header row naming the fields.
+
+    Yields:
+        tuple: The line number, and the order as a dict.
+    """
+    for row in reader:
+        # Values without a header (key None) are dropped, like any other unknown field
+        record = {
+            field: value
+            for field, value in row.items()
+            if field is not None and value not in ("", None)
+        }
+        for field in INTEGER_FIELDS:
+            value = record.get(field)
+            if value is not None and INTEGER_PATTERN.fullmatch(value):
+                record[field] = int(value)
+        yield reader.line_num, record
+
+
+def chunked(iterable, size):
+    """
+    Split an iterable into lists of at most `size` elements.
+
+    Yields:
+        list: The next chunk of the iterable.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def validate_records(records):
+    """
+    Validate orders column by column, or one at a time should the columns raise.
+
+    validate_columns() reports every invalid row without raising. Should a row still raise an unexpected error,
+    the rows are validated one at a time, so that only that row is rejected and the others are priced.
+
+    Args:
+        records (list): The orders, as dicts.
+
+    Returns:
+        tuple: The columns of the orders, the validity mask, the times and the error details of the invalid
+        rows, as returned by validate_columns().
+    """
+    columns = record_columns(records)
+    try:
+        return (columns, *validate_columns(columns))
+    except Exception:
+        pass
+    times, errors = [], {}
+    for row, record in enumerate(records):
+        try:
+            _, (time,), record_errors = validate_columns(record_columns([record]))
+        except Exception as error:
+            time, record_errors = None, {0: {"order": f"Order could not be validated: {error}"}}
+        times.append(time)
+        if record_errors:
+            errors[row] = record_errors[0]
+    valid = np.ones(len(records), dtype=bool)
+    valid[list(errors)] = False
+    return columns, valid, times, errors
+
+
+def price_chunk(chunk, tariff=None):
+    """
+    Validate and price a chunk of orders.
+
+    The rows are validated column by column, with the rules and error messages of a request to the app but
+    without raising for every invalid row (see fee_calculator.columnar), and a row raising an unexpected error
+    is rejected like an invalid one (see validate_records()). The valid rows are then priced column-wise, once
+    per fee schedule (see fee_calculator.columnar.price_columns()): like in a request to the app, the rows with
+    a venue_id are priced with the fee schedule of their venue, the others with the given tariff.
+
+    Args:
+        chunk (list): Tuples of the line number and the order record.
+        tariff (Tariff): The fee schedule of the rows without a venue, the current one of PRICING by default.
+
+    Returns:
+        tuple: The list of (record, delivery_fee) tuples of the valid rows, and the list of rejects.
+    """
+    records = [record for _, record in chunk if isinstance(record, dict)]
+    columns, valid, times, errors = validate_records(records)
+
+    valid_records, rejects = [], []
+    row = 0
+    for line_number, record in chunk:
+        if not isinstance(record, dict):
+            rejects.append(
+                {
+                    "line": line_number,
+                    "Validation Error": {"order": "Input should be a valid JSON object"},
+                }
+            )
+            continue
+        if row in errors:
+            rejects.append({"line": line_number, "Validation Error": errors[row]})
+        else:
+            valid_records.append(record)
+        row += 1
+
+    if tariff is None:
+        tariff = PRICING.tariff
+    delivery_fees, _ = price_columns(columns, valid, times, tariff)
+    return list(zip(valid_records, delivery_fees.tolist())), rejects
+
+
+def reprice(records, chunk_size=DEFAULT_CHUNK_SIZE, tariff=None):
+    """
+    Price a stream of orders chunk by chunk.
+
+    Args:
+        records: Iterable of (line number, record) tuples, as produced by read_ndjson() or read_csv().
+        chunk_size (int): Number of orders validated and priced together.
+        tariff (Tariff): The fee schedule of the whole stream, the current one of PRICING by default.
+
+    Yields:
+        tuple: The priced (record, delivery_fee) tuples and the rejects of every chunk.
+    """
+    if tariff is None:
+        tariff = PRICING.tariff
+    for chunk in chunked(records, chunk_size):
+        yield price_chunk(chunk, tariff)
+
+
+def main(argv=None):
+    """
+    Run the bulk re-pricing from the command line.
+
+    Returns:
+        int: The exit status, 1 if any row was rejected and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m fee_calculator.bulk",
+        description="Re-price NDJSON or CSV orders in bulk.",
+    )
+    parser.add_argument("input", help="Input file, or '-' to read from stdin.")
+    parser.add_argument("-o", "--output", default="-", help="Output file, stdout by default.")
+    parser.add_argument(
+        "--rejects", default=None, help="Reject file (NDJSON), stderr by default."
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=None,
+        help="Input and output format, inferred from the input file extension by default.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Number of orders priced together, {DEFAULT_CHUNK_SIZE} by default.",
+    )
+    parser.add_argument(
+        "--pricing",
+        default=None,
+        help="JSON pricing file to price with, the pricing of the service by default.",
+    )
+    args = parser.parse_args(argv)
+
+    tariff = PRICING.tariff
+    if args.pricing is not None:
+        try:
+            tariff = load_tariff(args.pricing)
+        except (OSError, ValueError) as error:
+            parser.error(f"invalid pricing file {args.pricing}: {error}")
+
+    input_format = args.format
+    if input_format is None:
+        input_format = "csv" if args.input.lower().endswith(".csv") else "ndjson"
+
+    input_stream = sys.stdin if args.input == "-" else open(args.input, newline="")
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    reject_stream = sys.stderr if args.rejects is None else open(args.rejects, "w")
+
+    rejected = 0
+    try:
+        if input_format == "csv":
+            reader = csv.DictReader(input_stream)
+            fieldnames = [
+                field for field in (reader.fieldnames or []) if field != "delivery_fee"
+            ]
+            writer = csv.DictWriter(
+                output_stream, fieldnames=[*fieldnames, "delivery_fee"]
+            )
+            writer.writeheader()
+            records = read_csv(reader)
+        else:
+            records = read_ndjson(input_stream)
+
+        for priced, rejects in reprice(records, args.chunk_size, tariff):
+            if input_format == "csv":
+                writer.writerows(
+                    {**record, "delivery_fee": delivery_fee}
+                    for record, delivery_fee in priced
+                )
+            else:
+                output_stream.writelines(
+                    json.dumps({**record, "delivery_fee": delivery_fee}) + "\n"
+                    for record, delivery_fee in priced
+                )
+            reject_stream.writelines(json.dumps(reject) + "\n" for reject in rejects)
+            rejected += len(rejects)
+    finally:
+        for stream in (input_stream, output_stream, reject_stream):
+            if stream not in (sys.stdin, sys.stdout, sys.stderr):
+                stream.close()
+
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
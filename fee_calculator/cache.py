@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+from . import config
+
+
+class QuoteCache:
+    """
+    Bounded LRU memoization of fee breakdowns, keyed on pricing-equivalence classes.
+
+    The key is the normalized tuple of Tariff.pricing_key(), not the raw order, so near-identical orders
+    share an entry. The entries are only valid for the tariff that priced them: when an order is priced
+    with a different tariff, the cache is cleared first.
+
+    Args:
+        maxsize (int): The maximum number of entries, 0 disables the cache.
+
+    Attributes:
+        hits: Number of breakdowns found in the cache.
+        misses: Number of breakdowns calculated and added to the cache.
+        evictions: Number of least recently used entries removed to make room.
+        invalidations: Number of times the cache was cleared because the tariff changed.
+
+    Methods:
+        breakdown(tariff, cart_value, delivery_distance, number_of_items, time): Calculate the fee breakdown, through the cache.
+        total_fee(tariff, cart_value, delivery_distance, number_of_items, time): Calculate the total delivery fee, through the cache.
+        clear(): Remove all entries.
+        stats(): Return the counters and the size of the cache.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._fees = OrderedDict()
+        self._tariff = None
+        self._lock = threading.Lock()
+
+    def breakdown(self, tariff, cart_value, delivery_distance, number_of_items, time):
+        """
+        Calculate the fee breakdown, through the cache.
+
+        Args:
+            tariff (Tariff): The tariff pricing the order.
+            cart_value (int): Total value of items in the shopping cart in cents.
+            delivery_distance (int): Distance of the delivery in meters.
+            number_of_items (int): Number of items in the order.
+            time (datetime): Delivery time.
+
+        Returns:
+            FeeBreakdown: The components of the delivery fee and the total, in cents.
+        """
+        if self.maxsize <= 0:
+            return tariff.breakdown(cart_value, delivery_distance, number_of_items, time)
+
+        key = tariff.pricing_key(cart_value, delivery_distance, number_of_items, time)
+        with self._lock:
+            if tariff is not self._tariff:
+                if self._fees:
+                    self._fees.clear()
+                    self.invalidations += 1
+                self._tariff = tariff
+            breakdown = self._fees.get(key)
+            if breakdown is not None:
+                self._fees.move_to_end(key)
+                self.hits += 1
+                return breakdown
+            self.misses += 1
+
+        breakdown = tariff.breakdown(cart_value, delivery_distance, number_of_items, time)
+
+        with self._lock:
+            # The tariff may have changed while the breakdown was calculated
+            if tariff is self._tariff:
+                self._fees[key] = breakdown
+                if len(self._fees) > self.maxsize:
+                    self._fees.popitem(last=False)
+                    self.evictions += 1
+        return breakdown
+
+    def total_fee(self, tariff, cart_value, delivery_distance, number_of_items, time):
+        """
+        Calculate the total delivery fee, through the cache.
+
+        Args:
+            tariff (Tariff): The tariff pricing the order.
+            cart_value (int): Total value of items in the shopping cart in cents.
+            delivery_distance (int): Distance of the delivery in meters.
+            number_of_items (int): Number of items in the order.
+            time (datetime): Delivery time.
+
+        Returns:
+            int: Total delivery fee in cents.
+        """
+        return self.breakdown(tariff, cart_value, delivery_distance, number_of_items, time).total
+
+    def clear(self):
+        """
+        Remove all entries. The counters are kept.
+        """
+        with self._lock:
+            self._fees.clear()
+
+    def stats(self):
+        """
+        Return the counters and the size of the cache.
+
+        Returns:
+            dict: The hits, misses, evictions and invalidations counters, the current size and the maximum size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self._fees),
+            "maxsize": self.maxsize,
+        }
+
+
+QUOTE_CACHE = QuoteCache(config.QUOTE_CACHE_SIZE)
@@ -0,0 +1,181 @@
+"""
+Capture of the POST / traffic to a compact, rotating on-disk log, for replaying it (see benchmarks.replay).
+
+Every worker process appends to its own log in the capture directory (capture_<pid>.log), so the workers never
+share a file. A record is a fixed header followed by the raw bytes of the request and the response:
+
+    float64 time (seconds since the epoch), uint16 status code, uint8 length of the content type,
+    uint32 length of the request body, uint32 length of the response body,
+    then the content type, the request body and the response body.
+
+The records go through the buffer of the file, so capturing a request costs a couple of microseconds rather than
+a system call. When a log exceeds max_bytes, it is renamed to capture_<pid>.log.1 (the previous .1 to .2, and so
+on up to backups) and a new log is started, so the capture never takes more than about (backups + 1) * max_bytes
+per worker.
+"""
+import atexit
+import glob
+import heapq
+import os
+import struct
+import threading
+import time
+from . import config
+
+RECORD_HEADER = struct.Struct("<dHBII")
+FILE_PATTERN = "capture_*.log*"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_BACKUPS = 4
+
+
+class TrafficCapture:
+    """
+    Appends the requests and responses of a worker process to its rotating log.
+
+    Args:
+        directory (str): The directory of the logs, created if needed.
+        max_bytes (int): The size above which a log is rotated.
+        backups (int): The number of rotated logs kept per process.
+
+    Attributes:
+        records: Number of records written by this process.
+
+    Methods:
+        record(content_type, body, status, response): Append a request and its response to the log.
+        flush(): Write the buffered records to the log.
+        close(): Write the buffered records and close the log.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, backups=DEFAULT_BACKUPS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = None
+        self._open()
+        # Forked workers must not write to the log of their parent, nor inherit its buffered records
+        os.register_at_fork(before=self.flush, after_in_child=self._reopen)
+        atexit.register(self.close)
+
+    def _open(self):
+        """
+        Start the log of this process.
+        """
+        self.records = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"capture_{os.getpid()}.log")
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+
+    def _reopen(self):
+        """
+        Close the log inherited from the parent process, flushed before forking, and start the log of this process.
+        """
+        if self._file.closed:
+            return
+        self._file.close()
+        self._open()
+
+    def record(self, content_type, body, status, response):
+        """
+        Append a request and its response to the log.
+
+        Args:
+            content_type (str): The content type of the request, truncated to 255 bytes.
+            body (bytes): The raw request body.
+            status (int): The status code of the response.
+            response (bytes): The response body.
+        """
+        content_type = content_type.encode("latin-1", "replace")[:255]
+        header = RECORD_HEADER.pack(time.time(), status, len(content_type), len(body), len(response))
+        entry = b"".join((header, content_type, body, response))
+        with self._lock:
+            self._file.write(entry)
+            self.records += 1
+            self._size += len(entry)
+            if self._size > self.max_bytes:
+                self._rotate()
+
+    def _rotate(self):
+        """
+        Rename the log to .1, shifting the older logs and dropping the oldest one, and start a new log.
+        """
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "ab")
+        self._size = 0
+
+    def flush(self):
+        """
+        Write the buffered records to the log.
+        """
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self):
+        """
+        Write the buffered records and close the log. Called at exit.
+        """
+        with self._lock:
+            self._file.close()
+        atexit.unregister(self.close)
+
+
+def read_log(path):
+    """
+    Read the records of a log.
+
+    Args:
+        path (str): The path of the log.
+
+    Yields:
+        tuple: The time, the content type, the request body, the status code and the response body of every
+        record, in the order they were written. A record cut short by a crash ends the log.
+    """
+    with open(path, "rb") as file:
+        while header := file.read(RECORD_HEADER.size):
+            if len(header) < RECORD_HEADER.size:
+                return
+            timestamp, status, content_type_length, body_length, response_length = RECORD_HEADER.unpack(header)
+            data = file.read(content_type_length + body_length + response_length)
+            if len(data) < content_type_length + body_length + response_length:
+                return
+            content_type = data[:content_type_length].decode("latin-1")
+            body = data[content_type_length : content_type_length + body_length]
+            yield timestamp, content_type, body, status, data[content_type_length + body_length :]
+
+
+def read_capture(directory):
+    """
+    Read the records of all the logs of a capture directory, rotated ones included.
+
+    Args:
+        directory (str): The capture directory.
+
+    Returns:
+        iterator: The records, as yielded by read_log(), of all the logs merged in time order.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, FILE_PATTERN)))
+    return heapq.merge(*(read_log(path) for path in paths), key=lambda record: record[0])
+
+
+def load_capture():
+    """
+    Build the traffic capture of the settings.
+
+    Returns:
+        TrafficCapture: The capture, None when no capture directory is set.
+    """
+    if config.CAPTURE_DIR is None:
+        return None
+    return TrafficCapture(config.CAPTURE_DIR, config.CAPTURE_MAX_BYTES, config.CAPTURE_BACKUPS)
+
+
+CAPTURE = load_capture()
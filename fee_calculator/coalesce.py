@@ -0,0 +1,354 @@
+"""
+Coalescing of concurrent POST / requests into batches, for the ASGI serving mode.
+
+Through the WSGI adapter, every POST / request is handed to a thread of the pool of uvicorn and goes through
+Flask's routing, request and response objects, which costs far more than validating and pricing the order.
+CoalescingApp answers POST / on the event loop instead: the orders of the requests that arrive within a
+window are collected by an OrderCoalescer, then validated and priced together column by column (see
+fee_calculator.columnar), with a single read of the current tariff, and every caller gets its own response,
+the same as the one of the app. The other requests
+are passed on to the app unchanged.
+
+A batch is priced when it holds max_batch orders, or window seconds after its first order arrived, whichever
+comes first, so no request waits more than the window before its order is priced. With a max_batch of 1, every
+order is priced as soon as it arrives, without a window: this is how the asgi mode answers POST / by default,
+as the window costs the requests more wait than batching saves them unless many clients share it.
+
+The coalesced requests go through the same hooks as in the app: the request metrics and stage latencies (the
+wait for the batch excluded), the response cache and the traffic capture.
+"""
+import asyncio
+import json
+from time import perf_counter_ns
+from .capture import CAPTURE
+from .columnar import price_columns, record_columns, validate_columns
+from .dedup import RESPONSE_CACHE
+from .fast_order import FastOrder
+from .metrics import METRICS
+from .pricing import PRICING
+from . import shadow
+
+DEFAULT_WINDOW = 0.001
+DEFAULT_MAX_BATCH = 64
+# The smallest batch priced column by column, below which pricing the orders one at a time is cheaper
+COLUMNAR_MIN_BATCH = 48
+JSON_HEADERS = [(b"content-type", b"application/json")]
+
+
+def order_error(data):
+    """
+    Validate request data the fast validation rejected with the pydantic Order.
+
+    Args:
+        data (dict): The decoded JSON of the request.
+
+    Returns:
+        tuple: The order and None, or None and the details of the validation error.
+    """
+    from pydantic import ValidationError
+    from .Order import Order
+    from .errors import validation_error_details
+
+    try:
+        return Order(**data), None
+    except ValidationError as error:
+        return None, validation_error_details(error)
+
+
+def price_order(data, default_tariff):
+    """
+    Validate and price a single order, like POST / does.
+
+    Args:
+        data (dict): The decoded JSON object of the request.
+        default_tariff (Tariff): The fee schedule of the order without a venue.
+
+    Returns:
+        tuple: The status code, the JSON payload of the response and the validation and pricing times in
+        nanoseconds.
+    """
+    start = perf_counter_ns()
+    order = FastOrder.validate(data)
+    if order is None:
+        order, errors = order_error(data)
+        if order is None:
+            for field in errors:
+                METRICS.count_validation_error(field)
+            return 400, {"Validation Error": errors}, perf_counter_ns() - start, 0
+    tariff = order.pricing_tariff(default_tariff)
+    validated = perf_counter_ns()
+    breakdown = order.calculate_fee_breakdown(tariff)
+    payload = {"delivery_fee": breakdown.total, "pricing_version": tariff.version}
+    priced = perf_counter_ns()
+    if shadow.SHADOW is not None and order.venue_id is None:
+        shadow.SHADOW.offer(order, breakdown)
+    return 200, payload, validated - start, priced - validated
+
+
+def price_batch(batch, default_tariff):
+    """
+    Validate and price the orders of a batch column by column, like POST / does one order.
+
+    The orders are validated with validate_columns() and priced with one array calculation per fee schedule, so
+    the cost of a batch grows far slower than its number of orders, from a fixed cost higher than the one of
+    pricing a few orders one at a time. The validation and pricing times of the batch are shared evenly by its
+    orders.
+
+    Args:
+        batch (list): The decoded JSON objects of the requests.
+        default_tariff (Tariff): The fee schedule of the orders without a venue.
+
+    Returns:
+        list: For every request, in the same order, the status code, the JSON payload of the response and the
+        validation and pricing times in nanoseconds.
+    """
+    start = perf_counter_ns()
+    columns = record_columns(batch)
+    valid, times, errors = validate_columns(columns)
+    validated = perf_counter_ns()
+    fees, tariffs = price_columns(columns, valid, times, default_tariff)
+    fees = fees.tolist()
+    priced = perf_counter_ns()
+    validation = (validated - start) // len(batch)
+    pricing = (priced - validated) // len(batch)
+
+    shadow_pricer = shadow.SHADOW
+    responses = []
+    priced_rows = 0
+    for row in range(len(batch)):
+        if row in errors:
+            responses.append((400, {"Validation Error": errors[row]}, validation, 0))
+            continue
+        tariff = tariffs[priced_rows]
+        responses.append(
+            (200, {"delivery_fee": fees[priced_rows], "pricing_version": tariff.version}, validation, pricing)
+        )
+        priced_rows += 1
+        if shadow_pricer is not None and tariff is default_tariff:
+            shadow_pricer.offer_values(
+                tariff,
+                columns["cart_value"][row],
+                columns["delivery_distance"][row],
+                columns["number_of_items"][row],
+                times[row],
+            )
+    for row_errors in errors.values():
+        for field in row_errors:
+            METRICS.count_validation_error(field)
+    return responses
+
+
+def price_orders(batch):
+    """
+    Validate and price the orders of a batch, like POST / does one order.
+
+    A batch of at least COLUMNAR_MIN_BATCH orders is priced column by column with price_batch(), a smaller one
+    order by order with price_order(), whichever costs less per order. An order raising an unexpected error only
+    fails its own request, like a request of the app would: should a batch raise one, its orders are priced
+    again one at a time.
+
+    Args:
+        batch (list): The decoded JSON objects of the requests.
+
+    Returns:
+        list: For every request, in the same order, the status code, the JSON payload of the response and the
+        validation and pricing times in nanoseconds, or the exception its order raised.
+    """
+    # Taken once for the whole batch, so a pricing reload never mixes two schedules within it
+    default_tariff = PRICING.tariff
+    responses = None
+    if len(batch) >= COLUMNAR_MIN_BATCH:
+        try:
+            responses = price_batch(batch, default_tariff)
+        except Exception:
+            # Priced again order by order, so that only the order raising the error fails its request
+            responses = None
+    if responses is None:
+        responses = []
+        for data in batch:
+            try:
+                responses.append(price_order(data, default_tariff))
+            except Exception as error:
+                responses.append(error)
+    for response in responses:
+        METRICS.count_request(500 if isinstance(response, Exception) else response[0])
+    return responses
+
+
+class OrderCoalescer:
+    """
+    Collects the orders of concurrent requests on an event loop, and prices them in batches.
+
+    Args:
+        window (float): The longest time, in seconds, an order waits for other orders before its batch is priced.
+        max_batch (int): The number of orders that makes a batch priced without waiting.
+
+    Attributes:
+        batches: Number of batches priced.
+        orders: Number of orders priced.
+
+    Methods:
+        submit(data): Price an order with the next batch.
+        flush(): Price the pending orders.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.orders = 0
+        self._pending = []
+        self._futures = []
+        self._timer = None
+
+    def submit(self, data):
+        """
+        Add an order to the pending batch.
+
+        Args:
+            data (dict): The decoded JSON object of the request.
+
+        Returns:
+            asyncio.Future: The status code, the JSON payload of the response and the validation and pricing
+            times, as returned by price_orders(), once the batch is priced.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(data)
+        self._futures.append(future)
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        """
+        Price the pending orders, and resolve the futures of their requests.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, futures = self._pending, self._futures
+        if not batch:
+            return
+        self._pending, self._futures = [], []
+        self.batches += 1
+        self.orders += len(batch)
+        try:
+            responses = price_orders(batch)
+        except Exception as error:
+            # Every request of the batch fails like the request of an unexpected error in the app
+            responses = [error] * len(batch)
+        for future, response in zip(futures, responses):
+            if future.done():  # The request may have been cancelled meanwhile
+                continue
+            if isinstance(response, Exception):
+                future.set_exception(response)
+            else:
+                future.set_result(response)
+
+
+def content_type(headers):
+    """
+    Return the content type of a request, an empty bytes string without one.
+    """
+    for name, value in headers:
+        if name == b"content-type":
+            return value
+    return b""
+
+
+def is_json(headers):
+    """
+    Check that the content type of a request is JSON, like Flask's request.is_json.
+    """
+    mimetype = content_type(headers).split(b";")[0].strip().lower()
+    return mimetype == b"application/json" or (
+        mimetype.startswith(b"application/") and mimetype.endswith(b"+json")
+    )
+
+
+class CoalescingApp:
+    """
+    ASGI app answering POST / with an OrderCoalescer, and passing every other request on to an ASGI app.
+
+    The requests whose body is not a JSON object are passed on as well, with their body, so the app answers
+    them as before.
+
+    Args:
+        app: The ASGI app of the other requests, e.g. the Flask app through uvicorn's WSGI adapter.
+        coalescer (OrderCoalescer): The coalescer of the POST / orders.
+    """
+
+    def __init__(self, app, coalescer):
+        self.app = app
+        self.coalescer = coalescer
+
+    async def __call__(self, scope, receive, send):
+        if not (
+            scope["type"] == "http"
+            and scope["method"] == "POST"
+            and scope["path"] == "/"
+            and is_json(scope["headers"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        start = perf_counter_ns()
+        cache_key = None
+        if RESPONSE_CACHE.maxsize > 0:
+            cache_key = RESPONSE_CACHE.key(PRICING.tariff.fingerprint, body)
+            cached = RESPONSE_CACHE.get(cache_key)
+            if cached is not None:
+                METRICS.count_response_cache(True)
+                METRICS.count_request(cached[0])
+                await self.respond(scope, body, send, *cached)
+                return
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None
+        if type(data) is not dict:
+            # The app looks the body up in the response cache and counts the lookup itself
+            replayed = False
+
+            async def replay():
+                nonlocal replayed
+                if replayed:
+                    return await receive()
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+
+            await self.app(scope, replay, send)
+            return
+
+        if cache_key is not None:
+            METRICS.count_response_cache(False)
+        parsed = perf_counter_ns()
+        status, payload, validation, pricing = await self.coalescer.submit(data)
+        encoding = perf_counter_ns()
+        response = json.dumps(payload).encode()
+        serialized = perf_counter_ns()
+        # The stages of the request alone, without the wait for the batch
+        validated = parsed + validation
+        priced = validated + pricing
+        METRICS.observe_stages(start, parsed, validated, priced, priced + serialized - encoding)
+        if cache_key is not None:
+            RESPONSE_CACHE.put(cache_key, status, response)
+        await self.respond(scope, body, send, status, response)
+
+    async def respond(self, scope, body, send, status, response):
+        """
+        Send a JSON response to a POST / request, and capture the request when the traffic capture is enabled.
+        """
+        await send({"type": "http.response.start", "status": status, "headers": JSON_HEADERS})
+        await send({"type": "http.response.body", "body": response})
+        if CAPTURE is not None:
+            CAPTURE.record(content_type(scope["headers"]).decode("latin-1"), body, status, response)
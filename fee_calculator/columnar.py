@@ -0,0 +1,196 @@
+"""
+Exception-free validation and pricing of orders a column at a time, for bulk inputs and coalesced requests.
+
+Validating every row with the pydantic Order raises and catches a ValidationError for every invalid row, which
+dominates the run time of an input with a share of invalid rows. validate_columns() checks whole columns
+against the rules of Order instead (strict ints within the bounds of constants, a parseable time), and returns a validity mask and the error details of the invalid rows, with
+the messages of the 400 responses of the app, without raising.
+
+Only the values that pydantic alone can judge go through Order, one row at a time: time strings other than the
+common ISO 8601 shapes of fast_order, time numbers and dates, which pydantic may accept. The venue IDs are
+checked against VENUES column-wise too.
+
+price_columns() then prices the valid rows with the array calculation of fee_calculator.batch, once per fee
+schedule.
+"""
+from datetime import datetime
+from itertools import compress
+import numpy as np
+from pydantic import ValidationError
+from .Order import Order
+from .batch import total_fees
+from .constants import *
+from .errors import validation_error_details
+from .fast_order import parse_time
+from .venues import VENUES
+
+FIELDS = ("cart_value", "delivery_distance", "number_of_items", "time", "venue_id")
+INTEGER_MINIMUMS = {
+    "cart_value": MIN_CART_VALUE,
+    "delivery_distance": MIN_DELIVERY_DISTANCE,
+    "number_of_items": MIN_ITEMS_COUNT,
+}
+INTEGER_MAXIMUMS = {
+    "cart_value": MAX_CART_VALUE,
+    "delivery_distance": MAX_DELIVERY_DISTANCE,
+    "number_of_items": MAX_ITEMS_COUNT,
+}
+# The value of the rows without a field
+MISSING = object()
+# The messages of pydantic for the errors decided here
+FIELD_REQUIRED = "Field required"
+INVALID_INTEGER = "Input should be a valid integer"
+BELOW_MINIMUM = "Input should be greater than or equal to {}"
+ABOVE_MAXIMUM = "Input should be less than or equal to {}"
+INVALID_DATETIME = "Input should be a valid datetime"
+INVALID_STRING = "Input should be a valid string"
+UNKNOWN_VENUE = "Value error, Unknown venue"
+# The time values pydantic rejects whatever their value
+INVALID_TIME_TYPES = (type(None), bool, list, dict)
+
+
+def record_columns(records):
+    """
+    Split orders into columns.
+
+    Args:
+        records (list): The orders, as dicts. Keys other than the order fields are ignored.
+
+    Returns:
+        dict: The column of every order field, with MISSING for the rows without the field.
+    """
+    return {field: [record.get(field, MISSING) for record in records] for field in FIELDS}
+
+
+def validate_columns(columns):
+    """
+    Validate orders column by column with the rules of Order, without raising for the invalid rows.
+
+    Args:
+        columns (dict): The column of every order field, as returned by record_columns(). A field without a
+            column is missing from every row.
+
+    Returns:
+        tuple: The validity mask (numpy bool array), the time of every row (a datetime for the valid rows, None
+        for the others), and the error details of every invalid row by row index, {field: message} in the
+        format of the 400 responses.
+    """
+    size = len(next(iter(columns.values()), ()))
+    errors = {}
+    for field, minimum in INTEGER_MINIMUMS.items():
+        maximum = INTEGER_MAXIMUMS[field]
+        column = columns.get(field) or [MISSING] * size
+        invalid = np.fromiter(
+            (type(value) is not int or not minimum <= value <= maximum for value in column), dtype=bool, count=size
+        )
+        for row in np.flatnonzero(invalid).tolist():
+            value = column[row]
+            if value is MISSING:
+                message = FIELD_REQUIRED
+            elif type(value) is not int:
+                message = INVALID_INTEGER
+            elif value < minimum:
+                message = BELOW_MINIMUM.format(minimum)
+            else:
+                message = ABOVE_MAXIMUM.format(maximum)
+            errors.setdefault(row, {})[field] = message
+
+    times = [None] * size
+    # Rows validated by Order, with a time only pydantic can judge
+    undecided = []
+    for row, value in enumerate(columns.get("time") or [MISSING] * size):
+        if type(value) is datetime:
+            times[row] = value
+        elif type(value) is str and (time := parse_time(value)) is not None:
+            times[row] = time
+        elif value is MISSING:
+            errors.setdefault(row, {})["time"] = FIELD_REQUIRED
+        elif type(value) in INVALID_TIME_TYPES:
+            errors.setdefault(row, {})["time"] = INVALID_DATETIME
+        else:
+            undecided.append(row)
+    for row, venue_id in enumerate(columns.get("venue_id") or ()):
+        if venue_id is MISSING or venue_id is None:
+            continue
+        if type(venue_id) is not str:
+            errors.setdefault(row, {})["venue_id"] = INVALID_STRING
+        elif VENUES.get(venue_id) is None:
+            errors.setdefault(row, {})["venue_id"] = UNKNOWN_VENUE
+
+    for row in undecided:
+        record = {field: column[row] for field, column in columns.items() if column[row] is not MISSING}
+        try:
+            times[row] = Order(**record).time
+            errors.pop(row, None)
+        except ValidationError as error:
+            times[row] = None
+            errors[row] = validation_error_details(error)
+        except (ValueError, TypeError):
+            # Raised by pydantic itself for some times, e.g. "year 0 is out of range" for 0000-01-01T00:00:00Z
+            times[row] = None
+            errors.setdefault(row, {})["time"] = INVALID_DATETIME
+
+    valid = np.ones(size, dtype=bool)
+    valid[list(errors)] = False
+    for row in errors:
+        times[row] = None
+    return valid, times, errors
+
+
+def valid_rows(column, valid):
+    """
+    Return the values of the valid rows of a column.
+
+    Args:
+        column (list): The values of every row.
+        valid: The validity mask of the rows.
+
+    Returns:
+        list: The values of the rows of the mask.
+    """
+    return list(compress(column, valid))
+
+
+def price_columns(columns, valid, times, tariff):
+    """
+    Price the valid rows of validated columns with one array calculation per fee schedule.
+
+    Like in a request to the app, the rows with a venue_id are priced with the fee schedule of their venue, the
+    others with the given tariff.
+
+    Args:
+        columns (dict): The columns of the orders, as returned by record_columns().
+        valid: The validity mask of the rows, as returned by validate_columns().
+        times (list): The parsed times of the rows, as returned by validate_columns().
+        tariff (Tariff): The fee schedule of the rows without a venue.
+
+    Returns:
+        tuple: The total delivery fees of the valid rows in cents, as a numpy int64 array, and the list of the
+        fee schedule of every valid row.
+    """
+    valid_columns = {field: valid_rows(columns[field], valid) for field in INTEGER_MINIMUMS}
+    valid_times = valid_rows(times, valid)
+    tariffs = [
+        tariff if venue_id is MISSING or venue_id is None else VENUES.get(venue_id)
+        for venue_id in valid_rows(columns["venue_id"], valid)
+    ]
+    rows_by_tariff = {}
+    for row, row_tariff in enumerate(tariffs):
+        rows_by_tariff.setdefault(row_tariff, []).append(row)
+
+    fees = np.zeros(len(tariffs), dtype=np.int64)
+    for row_tariff, rows in rows_by_tariff.items():
+        if len(rows) == len(tariffs):
+            group_columns, group_times = valid_columns, valid_times
+        else:
+            group_columns = {field: [column[row] for row in rows] for field, column in valid_columns.items()}
+            group_times = [valid_times[row] for row in rows]
+        calendar = row_tariff.rush_calendar
+        fees[rows] = total_fees(
+            row_tariff,
+            np.asarray(group_columns["cart_value"], dtype=np.int64),
+            np.asarray(group_columns["delivery_distance"], dtype=np.int64),
+            np.asarray(group_columns["number_of_items"], dtype=np.int64),
+            np.fromiter(map(calendar.code, group_times), dtype=np.uint8, count=len(rows)),
+        )
+    return fees, tariffs
@@ -0,0 +1,123 @@
+"""
+This file contains the settings of the fee calculator server. Every setting can be overridden with the
+environment variable of the same name, prefixed with FEE_CALCULATOR_ (e.g. FEE_CALCULATOR_WORKERS=8).
+
+Server settings:
+  HOST: The interface the server binds to.
+  PORT: The port the server listens on.
+  WORKERS: The number of worker processes, one per CPU by default.
+  KEEPALIVE: The number of seconds an idle keep-alive connection is kept open.
+  BACKLOG: The maximum number of pending connections.
+
+Coalescing settings, for the asgi serving mode:
+  COALESCE_WINDOW_MS: The longest time, in milliseconds, a POST / order waits for concurrent ones to be priced with
+    them (see fee_calculator.coalesce). 0 (the default) prices every order as soon as it arrives.
+  COALESCE_MAX_BATCH: The number of orders priced together without waiting for the window to end.
+
+Binary protocol settings:
+  QUOTE_SOCKET: The path of a Unix domain socket on which the workers also answer the binary quote protocol of
+    the callers of the same host (see fee_calculator.binary). The protocol is disabled when it is not set.
+
+Quote cache settings:
+  QUOTE_CACHE_SIZE: The maximum number of fees memoized per worker process, 0 (the default) disables the cache.
+
+Response cache settings:
+  RESPONSE_CACHE_SIZE: The maximum number of POST / responses cached by the hash of their request body, to answer
+    the retries of a request (see fee_calculator.dedup). 0 (the default) disables the cache.
+  RESPONSE_CACHE_TTL: The number of seconds a cached response is valid.
+  RESPONSE_CACHE_DIR: The directory of the file through which the worker processes share their cached responses.
+    Every worker caches its own responses, in memory, when it is not set.
+
+Pricing settings:
+  PRICING_FILE: The JSON pricing file (see fee_calculator.pricing), the pricing constants are used when it is not set.
+  PRICING_RELOAD_INTERVAL: The number of seconds between two checks of the pricing file for changes, 0 disables
+    the reloading.
+
+Shadow pricing settings:
+  SHADOW_PRICING_FILE: The JSON pricing file of a candidate fee schedule, evaluated against a sample of the live
+    orders (see fee_calculator.shadow). Shadow pricing is disabled when it is not set.
+  SHADOW_SAMPLE_RATE: The fraction of the POST / orders evaluated with the candidate schedule.
+  SHADOW_QUEUE_SIZE: The maximum number of orders waiting to be evaluated, per worker process; the orders
+    sampled while the queue is full are dropped.
+
+Venue settings:
+  VENUES_FILE: The JSON venues file of the per-venue fee schedules (see fee_calculator.venues), no venue is known
+    when it is not set.
+
+Pricing grid settings:
+  MAX_GRID_CELLS: The maximum number of fees of a pricing grid (see fee_calculator.grid).
+
+Capture settings:
+  CAPTURE_DIR: The directory where every worker process logs the POST / requests and their responses, for
+    replaying them (see fee_calculator.capture). The capture is disabled when it is not set.
+  CAPTURE_MAX_BYTES: The size above which the log of a worker is rotated.
+  CAPTURE_BACKUPS: The number of rotated logs kept per worker.
+
+Metrics settings:
+  METRICS_DIR: The directory where every worker process keeps its metrics, so that /metrics reports the totals
+    of all the workers. When it is not set, fee_calculator.serve uses a temporary directory with several
+    workers, and the metrics are kept in memory with a single process.
+"""
+import os
+
+
+def setting(name, default, cast=str):
+    """
+    Read a setting from the environment.
+
+    Args:
+        name (str): The name of the setting, without the FEE_CALCULATOR_ prefix.
+        default: The value used when the environment variable is not set.
+        cast: The function converting the environment variable to the type of the setting.
+
+    Returns:
+        The value of the setting.
+    """
+    value = os.environ.get(f"FEE_CALCULATOR_{name}")
+    return default if value is None else cast(value)
+
+
+# Server settings
+HOST = setting("HOST", "0.0.0.0")
+PORT = setting("PORT", 5000, int)
+WORKERS = setting("WORKERS", os.cpu_count() or 1, int)
+KEEPALIVE = setting("KEEPALIVE", 5, int)
+BACKLOG = setting("BACKLOG", 2048, int)
+
+# Coalescing settings
+COALESCE_WINDOW_MS = setting("COALESCE_WINDOW_MS", 0.0, float)
+COALESCE_MAX_BATCH = setting("COALESCE_MAX_BATCH", 64, int)
+
+# Binary protocol settings
+QUOTE_SOCKET = setting("QUOTE_SOCKET", None)
+
+# Quote cache settings
+QUOTE_CACHE_SIZE = setting("QUOTE_CACHE_SIZE", 0, int)
+
+# Response cache settings
+RESPONSE_CACHE_SIZE = setting("RESPONSE_CACHE_SIZE", 0, int)
+RESPONSE_CACHE_TTL = setting("RESPONSE_CACHE_TTL", 5.0, float)
+RESPONSE_CACHE_DIR = setting("RESPONSE_CACHE_DIR", None)
+
+# Pricing settings
+PRICING_FILE = setting("PRICING_FILE", None)
+PRICING_RELOAD_INTERVAL = setting("PRICING_RELOAD_INTERVAL", 1.0, float)
+
+# Shadow pricing settings
+SHADOW_PRICING_FILE = setting("SHADOW_PRICING_FILE", None)
+SHADOW_SAMPLE_RATE = setting("SHADOW_SAMPLE_RATE", 0.1, float)
+SHADOW_QUEUE_SIZE = setting("SHADOW_QUEUE_SIZE", 10000, int)
+
+# Venue settings
+VENUES_FILE = setting("VENUES_FILE", None)
+
+# Pricing grid settings
+MAX_GRID_CELLS = setting("MAX_GRID_CELLS", 1_000_000, int)
+
+# Capture settings
+CAPTURE_DIR = setting("CAPTURE_DIR", None)
+CAPTURE_MAX_BYTES = setting("CAPTURE_MAX_BYTES", 64 * 1024 * 1024, int)
+CAPTURE_BACKUPS = setting("CAPTURE_BACKUPS", 4, int)
+
+# Metrics settings
+METRICS_DIR = setting("METRICS_DIR", None)
@@ -5,6 +5,8 @@ Constants for field validation:
   MIN_CART_VALUE: The minimum cart value below which an order cannot be placed.
   MIN_DELIVERY_DISTANCE: The minimum delivery distance in meters.
   MIN_ITEMS_COUNT: The minimum number of items in an order.
+  MAX_CART_VALUE, MAX_DELIVERY_DISTANCE, MAX_ITEMS_COUNT: The maximum values of the fields, so that the fees of
+    many orders calculated with int64 arrays cannot overflow.
 
 Constants for fee calculations:
   BASE_DELIVERY_FEE: The base delivery fee in Euros.
@@ -12,6 +14,7 @@ Constants for fee calculations:
   FEE_PER_ADDITIONAL_INTERVAL: The fee in Euros for every ADDITIONAL_DISTANCE_INTERVAL interval.
   ADDITIONAL_DISTANCE_INTERVAL: The interval (in meters) after BASE_DISTANCE_METERS, for which FEE_PER_ADDITIONAL_INTERVAL is charged throughout the interval.
   CENTS_PER_EUR: The number of cents per Euro.
+  BASIS_POINTS: The number of basis points per unit of a multiplier, e.g. 12000 for a multiplier of 1.2.
   SMALL_ORDER_CART_VALUE: The cart value in Euros above below which small order surcharge is applied.
   SURCHARGEABLE_ITEMS_THRESHOLD: The items count threshold, including and above which a surcharge of EXCESS_CHARGE_PER_ITEM is applicable per item.
   EXCESS_CHARGE_PER_ITEM: The surcharge per item in Euros when the number of items exceeds MIN_SURCHARGEABLE_ITEMS.
@@ -21,6 +24,7 @@ Constants for fee calculations:
   RUSH_HOUR_START: The start hour (24-hour format) for rush hour.
   RUSH_HOUR_END: The end hour (24-hour format) for rush hour.
   RUSH_FEE_MULTIPLIER: The multiplier to be applied to the base fee during rush hours.
+  RUSH_ROUNDING: The rounding mode of the half cents of the fee during rush hours, "half_up" or "half_even".
   FREE_DELIVERY_CART_VALUE: The cart value in Euros above which delivery is free.
   MAX_POSSIBLE_DELIVERY_FEE: The maximum possible delivery fee in Euros.
 
@@ -30,6 +34,9 @@ These constants are used in the calculation of delivery fees, taking into accoun
 MIN_CART_VALUE = 1
 MIN_DELIVERY_DISTANCE = 1
 MIN_ITEMS_COUNT = 1
+MAX_CART_VALUE = 2**31 - 1
+MAX_DELIVERY_DISTANCE = 2**31 - 1
+MAX_ITEMS_COUNT = 2**31 - 1
 
 # Fee calculation constants
 BASE_DELIVERY_FEE = 2
@@ -37,6 +44,7 @@ BASE_DISTANCE = 1000
 FEE_PER_ADDITIONAL_INTERVAL = 1
 ADDITIONAL_DISTANCE_INTERVAL = 500
 CENTS_PER_EUR = 100
+BASIS_POINTS = 10000
 SMALL_ORDER_CART_VALUE = 10
 SURCHARGEABLE_ITEMS_THRESHOLD = 5
 EXCESS_CHARGE_PER_ITEM = 50
@@ -46,5 +54,6 @@ FRIDAY = 5
 RUSH_HOUR_START = 15
 RUSH_HOUR_END = 19
 RUSH_FEE_MULTIPLIER = 1.2
+RUSH_ROUNDING = "half_up"
 FREE_DELIVERY_CART_VALUE = 200
 MAX_POSSIBLE_DELIVERY_FEE = 15
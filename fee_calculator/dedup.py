@@ -0,0 +1,239 @@
+"""
+Short-lived cache of the encoded POST / responses, keyed by a hash of the raw request body.
+
+Clients retrying a request send the same bytes again within seconds. The response of such a retry is looked up
+by a hash of the body and of the fingerprint of the current tariff, and returned as the bytes encoded the first
+time, without decoding the JSON, validating the order nor pricing it. The fingerprint is a hash of the rules of
+the tariff and not only its version, so a pricing reload that changes the fees but keeps the version misses.
+The 400 responses of the validation errors are cached as well. Entries expire after a few seconds (ttl) and the number of entries is bounded.
+
+Without a directory, every worker process keeps its own entries in memory, evicting the least recently used
+ones. With one, the workers share their entries through a memory-mapped file of the directory
+(response_cache.db), made of a fixed number of fixed-size slots: an entry goes to the slot of its hash,
+replacing the entry there. A checksum of every slot detects the entries read while another worker was writing
+them, which are treated as misses, so the workers never take a lock.
+"""
+import hashlib
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from mmap import mmap
+from time import monotonic
+from . import config
+
+DEFAULT_TTL = 5.0
+FILE_NAME = "response_cache.db"
+# Slot of the shared file: the hash of the key, the expiry time, the status code, the length of the body and
+# the checksum of all of them, then the body
+SLOT_HEADER = struct.Struct("<16sdHHI")
+SLOT_SIZE = 512
+MAX_SHARED_BODY = SLOT_SIZE - SLOT_HEADER.size
+# Everything but the checksum, which is computed over it
+CHECKED_HEADER = struct.Struct("<16sdHH")
+
+
+class ResponseCache:
+    """
+    Bounded cache of encoded responses with a time to live, per process or shared by the worker processes.
+
+    Args:
+        maxsize (int): The maximum number of entries, the number of slots of the shared file. 0 disables the
+            cache.
+        ttl (float): The number of seconds an entry is valid.
+        directory (str): Directory of the file shared by the worker processes, None to keep the entries in the
+            memory of every process.
+
+    Attributes:
+        hits: Number of responses found in the cache.
+        misses: Number of lookups without a valid entry.
+        evictions: Number of valid entries removed to make room.
+
+    Methods:
+        key(version, body): Calculate the key of a request body.
+        get(key): Return the cached response of a key.
+        put(key, status, body): Cache the response of a key.
+        clear(): Remove all entries.
+        reset(): Start the entries and the counters of this process afresh.
+        stats(): Return the counters of the cache.
+    """
+
+    def __init__(self, maxsize, ttl=DEFAULT_TTL, directory=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.directory = directory
+        self._open()
+        # Forked workers must not share the entries nor the lock of their parent, but map the same shared file
+        os.register_at_fork(after_in_child=self._open)
+
+    def _open(self):
+        """
+        Create the empty entries of this process, or map the shared file.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._slots = None
+        if self.directory is None or self.maxsize <= 0:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        size = self.maxsize * SLOT_SIZE
+        descriptor = os.open(os.path.join(self.directory, FILE_NAME), os.O_RDWR | os.O_CREAT)
+        try:
+            # Every worker opens the file; the first one sizes it, zeroed
+            if os.fstat(descriptor).st_size < size:
+                os.ftruncate(descriptor, size)
+            self._slots = mmap(descriptor, size)
+        finally:
+            os.close(descriptor)
+
+    @staticmethod
+    def key(fingerprint, body):
+        """
+        Calculate the key of a request body.
+
+        Args:
+            fingerprint (bytes): The fingerprint of the tariff the body would be priced with.
+            body (bytes): The raw request body.
+
+        Returns:
+            bytes: The 16-byte hash of the fingerprint and the body.
+        """
+        digest = hashlib.blake2b(fingerprint, digest_size=16)
+        digest.update(body)
+        return digest.digest()
+
+    def get(self, key):
+        """
+        Return the cached response of a key.
+
+        Args:
+            key (bytes): The key of the request body.
+
+        Returns:
+            tuple: The status code and the encoded body of the response, None if there is no valid entry.
+        """
+        if self._slots is not None:
+            return self._get_shared(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, status, body = entry
+                if expires > monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return status, body
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def _get_shared(self, key):
+        """
+        Return the cached response of a key from its slot of the shared file.
+        """
+        offset = self._slot_offset(key)
+        # A single copy of the slot, which the checksum validates as a whole
+        slot = self._slots[offset : offset + SLOT_SIZE]
+        slot_key, expires, status, length, checksum = SLOT_HEADER.unpack_from(slot)
+        if slot_key == key and expires > monotonic() and length <= MAX_SHARED_BODY:
+            body = slot[SLOT_HEADER.size : SLOT_HEADER.size + length]
+            if zlib.crc32(body, zlib.crc32(slot[: CHECKED_HEADER.size])) == checksum:
+                self.hits += 1
+                return status, body
+        self.misses += 1
+        return None
+
+    def put(self, key, status, body):
+        """
+        Cache the response of a key. Responses too large for a slot of the shared file are not cached.
+
+        Args:
+            key (bytes): The key of the request body.
+            status (int): The status code of the response.
+            body (bytes): The encoded body of the response.
+        """
+        if self.maxsize <= 0:
+            return
+        expires = monotonic() + self.ttl
+        if self._slots is not None:
+            self._put_shared(key, expires, status, body)
+            return
+        with self._lock:
+            self._entries[key] = (expires, status, body)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                _, (oldest_expires, _, _) = self._entries.popitem(last=False)
+                if oldest_expires > monotonic():
+                    self.evictions += 1
+
+    def _put_shared(self, key, expires, status, body):
+        """
+        Write an entry to the slot of its key in the shared file, replacing the entry there.
+        """
+        if len(body) > MAX_SHARED_BODY:
+            return
+        offset = self._slot_offset(key)
+        previous_key, previous_expires = struct.unpack_from("<16sd", self._slots, offset)
+        if previous_key != key and previous_expires > monotonic():
+            self.evictions += 1
+        header = CHECKED_HEADER.pack(key, expires, status, len(body))
+        checksum = zlib.crc32(body, zlib.crc32(header))
+        entry = header + struct.pack("<I", checksum) + body
+        self._slots[offset : offset + len(entry)] = entry
+
+    def _slot_offset(self, key):
+        """
+        Return the offset of the slot of a key in the shared file.
+        """
+        return int.from_bytes(key[:8], "little") % self.maxsize * SLOT_SIZE
+
+    def clear(self):
+        """
+        Remove all entries. The counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            if self._slots is not None:
+                self._slots[:] = bytes(len(self._slots))
+
+    def reset(self):
+        """
+        Start the entries and the counters of this process afresh, mapping the shared file again, e.g. after
+        clear_directory() removed the file this process had mapped.
+        """
+        self._open()
+
+    def stats(self):
+        """
+        Return the counters of the cache.
+
+        Returns:
+            dict: The hits, misses and evictions counters of this process, the size of the entries of this process
+            (None when they are shared), the maximum size and the time to live.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": None if self._slots is not None else len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
+
+
+def clear_directory(directory):
+    """
+    Remove the shared file left in a directory by a previous run. Called once at server startup, before
+    RESPONSE_CACHE.reset() maps a new file.
+    """
+    path = os.path.join(directory, FILE_NAME)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+RESPONSE_CACHE = ResponseCache(
+    config.RESPONSE_CACHE_SIZE, config.RESPONSE_CACHE_TTL, config.RESPONSE_CACHE_DIR
+)
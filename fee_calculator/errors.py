@@ -0,0 +1,11 @@
+def validation_error_details(error):
+    """
+    Build the details of a ValidationError, as returned in the 400 responses of the app.
+
+    Args:
+        error: The ValidationError object containing details about the validation error.
+
+    Returns:
+        dict: The error message of every invalid field, keyed by the field name.
+    """
+    return {error["loc"][0]: error["msg"] for error in error.errors()}
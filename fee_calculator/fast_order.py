@@ -0,0 +1,154 @@
+import re
+from datetime import datetime
+from .constants import *
+from .fees import OrderFeesMixin
+from .venues import VENUES
+
+# The common ISO 8601 shapes, which datetime.fromisoformat() parses to the same value as pydantic.
+# Any other string is left to pydantic to accept or reject.
+ISO_DATETIME_PATTERN = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2}[T ][0-9]{2}:[0-9]{2}"
+    r"(:[0-9]{2}(\.[0-9]{1,6})?)?"
+    r"(Z|[+-][0-9]{2}:[0-5][0-9])?"
+)
+
+
+def parse_time(value):
+    """
+    Parse a delivery time without pydantic.
+
+    Args:
+        value: The time value of the request.
+
+    Returns:
+        datetime: The parsed time, or None if the value is not in one of the shapes handled here.
+    """
+    if isinstance(value, datetime):
+        return value
+    if type(value) is not str or not ISO_DATETIME_PATTERN.fullmatch(value):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:  # E.g. day or hour out of range
+        return None
+
+
+def is_valid_int(value, minimum, maximum):
+    """
+    Check a value like StrictInt with Field(ge=minimum, le=maximum): an int, but not a bool, between the minimum
+    and the maximum.
+    """
+    return type(value) is int and minimum <= value <= maximum
+
+
+class FastOrder(OrderFeesMixin):
+    """
+    Lightweight order representation, validated by hand instead of by pydantic.
+
+    It accepts a subset of what `Order` accepts, with the same rules: the integer fields are strict ints within
+    their bounds, and the time is a datetime or an ISO 8601 string. Whatever FastOrder.validate()
+    does not accept is handed to `Order`, which either accepts it or raises the usual ValidationError.
+
+    Attributes:
+        cart_value: Total value of items in the shopping cart.
+        delivery_distance: Distance of the delivery in meters.
+        number_of_items: Number of items in the order.
+        time: Delivery time as a datetime object.
+        venue_id: The venue of the order, None when it has none.
+
+    Methods:
+        validate(data): Build a FastOrder from the request data, if it is valid.
+        The fee calculation methods come from OrderFeesMixin.
+    """
+
+    __slots__ = ("cart_value", "delivery_distance", "number_of_items", "time", "venue_id")
+
+    def __init__(self, cart_value, delivery_distance, number_of_items, time, venue_id=None):
+        self.cart_value = cart_value
+        self.delivery_distance = delivery_distance
+        self.number_of_items = number_of_items
+        self.time = time
+        self.venue_id = venue_id
+
+    def __repr__(self):
+        return (
+            f"FastOrder(cart_value={self.cart_value!r}, delivery_distance={self.delivery_distance!r}, "
+            f"number_of_items={self.number_of_items!r}, time={self.time!r}, venue_id={self.venue_id!r})"
+        )
+
+    @classmethod
+    def validate(cls, data):
+        """
+        Build a FastOrder from the request data, if it is valid.
+
+        Args:
+            data: The decoded JSON of the request.
+
+        Returns:
+            FastOrder: The order, or None if the data is invalid or not handled by the fast path.
+        """
+        if type(data) is not dict:
+            return None
+
+        cart_value = data.get("cart_value")
+        delivery_distance = data.get("delivery_distance")
+        number_of_items = data.get("number_of_items")
+        if not (
+            is_valid_int(cart_value, MIN_CART_VALUE, MAX_CART_VALUE)
+            and is_valid_int(delivery_distance, MIN_DELIVERY_DISTANCE, MAX_DELIVERY_DISTANCE)
+            and is_valid_int(number_of_items, MIN_ITEMS_COUNT, MAX_ITEMS_COUNT)
+        ):
+            return None
+
+        time = parse_time(data.get("time"))
+        if time is None:
+            return None
+
+        venue_id = data.get("venue_id")
+        if venue_id is not None and (type(venue_id) is not str or venue_id not in VENUES):
+            return None
+
+        return cls(cart_value, delivery_distance, number_of_items, time, venue_id)
+
+
+def parse_order(data):
+    """
+    Validate the request data, through the fast path when possible.
+
+    The pydantic `Order` is only imported and run when the fast validation fails, so invalid data raises
+    exactly the same ValidationError as before.
+
+    Args:
+        data: The decoded JSON of the request.
+
+    Returns:
+        FastOrder or Order: The validated order.
+
+    Raises:
+        ValidationError: If any field is missing or invalid.
+    """
+    order = FastOrder.validate(data)
+    if order is None:
+        # Imported on first use, so that the fast path alone does not import pydantic
+        from .Order import Order
+
+        order = Order(**data)
+    return order
+
+
+def quote(data, tariff=None):
+    """
+    Validate an order like a request to the app, and calculate its fee breakdown.
+
+    Args:
+        data (dict): The order, with the fields of a POST /quote request.
+        tariff (Tariff): The fee schedule, the one of the venue of the order or else the current one of
+            PRICING by default.
+
+    Returns:
+        FeeBreakdown: The components of the delivery fee and the total, in cents.
+
+    Raises:
+        ValidationError: If the order is invalid.
+    """
+    return parse_order(data).calculate_fee_breakdown(tariff)
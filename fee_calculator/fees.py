@@ -0,0 +1,135 @@
+from .cache import QUOTE_CACHE
+from .pricing import PRICING
+from .venues import VENUES
+
+
+class OrderFeesMixin:
+    """
+    Fee calculation methods shared by the order representations.
+
+    The class using the mixin provides the cart_value, delivery_distance, number_of_items, time and venue_id
+    attributes. The fees are priced with the given tariff, or else the tariff of the venue in VENUES, or else
+    the current one of PRICING; a request takes its tariff once with pricing_tariff() and passes it to every
+    calculation, so a pricing reload never changes its fees halfway.
+    The total delivery fee is the total of the fee breakdown, which is memoized in QUOTE_CACHE for the orders
+    without a venue. The cache holds the fees of a single tariff, so venue orders are priced without it.
+
+    Methods:
+        pricing_tariff(default): Return the tariff pricing the order.
+        calculate_distance_fee(tariff): Calculate the distance-based delivery fee.
+        calculate_small_order_surcharge(tariff): Calculate surcharge for small orders.
+        calculate_item_surcharge(tariff): Calculate surcharge for large item quantities.
+        calculate_friday_rush(fee, tariff): Calculate delivery fee during rush hours on Fridays.
+        calculate_fee_breakdown(tariff): Calculate the components of the delivery fee and the total.
+        calculate_total_delivery_fee(tariff): Calculate the total delivery fee.
+    """
+
+    __slots__ = ()
+
+    def pricing_tariff(self, default=None):
+        """
+        Return the tariff pricing the order: the one of its venue, if it has one, or else the default.
+
+        Args:
+            default (Tariff): The fee schedule of the orders without a venue, the current one of PRICING by
+                default.
+
+        Returns:
+            Tariff: The fee schedule of the order.
+        """
+        if self.venue_id is not None:
+            return VENUES.get(self.venue_id)
+        return PRICING.tariff if default is None else default
+
+    def calculate_distance_fee(self, tariff=None):
+        """
+        Calculate the distance-based delivery fee.
+
+        Args:
+            tariff (Tariff): The fee schedule, the one of pricing_tariff() by default.
+
+        Returns:
+            int: Distance-based delivery fee in cents.
+        """
+        if tariff is None:
+            tariff = self.pricing_tariff()
+        return tariff.distance_fee(self.delivery_distance)
+
+    def calculate_small_order_surcharge(self, tariff=None):
+        """
+        Calculate surcharge for small orders.
+
+        Args:
+            tariff (Tariff): The fee schedule, the one of pricing_tariff() by default.
+
+        Returns:
+            int: Surcharge amount in cents.
+        """
+        if tariff is None:
+            tariff = self.pricing_tariff()
+        return tariff.small_order_surcharge(self.cart_value)
+
+    def calculate_item_surcharge(self, tariff=None):
+        """
+        Calculate surcharge for large item quantities.
+
+        Args:
+            tariff (Tariff): The fee schedule, the one of pricing_tariff() by default.
+
+        Returns:
+            int: Surcharge amount in cents.
+        """
+        if tariff is None:
+            tariff = self.pricing_tariff()
+        return tariff.item_surcharge(self.number_of_items)
+
+    def calculate_friday_rush(self, fee, tariff=None):
+        """
+        Calculate delivery fee during rush hours on Fridays.
+
+        Args:
+            fee (int): The delivery fee.
+            tariff (Tariff): The fee schedule, the one of pricing_tariff() by default.
+
+        Returns:
+            int: The delivery fee during rush hours in cents.
+        """
+        if tariff is None:
+            tariff = self.pricing_tariff()
+        return tariff.rush_fee(fee, self.time)
+
+    def calculate_fee_breakdown(self, tariff=None):
+        """
+        Calculate the components of the delivery fee and the total, in a single pass.
+
+        Args:
+            tariff (Tariff): The fee schedule, the one of pricing_tariff() by default.
+
+        Returns:
+            FeeBreakdown: The components of the delivery fee and the total, in cents.
+        """
+        if tariff is None:
+            tariff = self.pricing_tariff()
+        if self.venue_id is not None:
+            return tariff.breakdown(
+                self.cart_value, self.delivery_distance, self.number_of_items, self.time
+            )
+        return QUOTE_CACHE.breakdown(
+            tariff,
+            self.cart_value,
+            self.delivery_distance,
+            self.number_of_items,
+            self.time,
+        )
+
+    def calculate_total_delivery_fee(self, tariff=None):
+        """
+        Calculate the total delivery fee, as the total of calculate_fee_breakdown().
+
+        Args:
+            tariff (Tariff): The fee schedule, the one of pricing_tariff() by default.
+
+        Returns:
+            int: Total delivery fee in cents.
+        """
+        return self.calculate_fee_breakdown(tariff).total
@@ -0,0 +1,256 @@
+"""
+Pricing grids: the delivery fees of a cart at a time, for ranges of delivery distances and numbers of items.
+
+The whole grid is calculated in one vectorized evaluation of the fee rules: the distance fees and the item
+surcharges are calculated once per axis value, and added up as an outer sum. The cart value and the time being
+fixed, the small order surcharge, the rush multiplier and free delivery apply to the whole grid.
+
+The fees can be encoded in three ways:
+  dense: A list of rows, one per delivery distance, of the fees at every number of items.
+  rle: Run-length encoded rows, as [row_count, [[fee, column_count], ...]] pairs. The distance fee only changes
+    every additional distance interval, and the item surcharge is constant below the surchargeable items
+    threshold, so grids collapse to a few runs.
+  typed: The fees as little-endian int32 ("<i4"), in row-major order, encoded in base64.
+"""
+import base64
+from datetime import datetime
+from typing import Literal
+import numpy as np
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    StrictInt,
+    ValidationInfo,
+    field_validator,
+    model_validator,
+)
+from . import config
+from .batch import distance_fees, item_surcharges, rush_fees
+from .constants import *
+from .pricing import PRICING
+
+ENCODINGS = ("dense", "rle", "typed")
+TYPED_DTYPE = "<i4"
+AXIS_MINIMUMS = {"delivery_distance": MIN_DELIVERY_DISTANCE, "number_of_items": MIN_ITEMS_COUNT}
+AXIS_MAXIMUMS = {"delivery_distance": MAX_DELIVERY_DISTANCE, "number_of_items": MAX_ITEMS_COUNT}
+
+
+class GridAxis(BaseModel):
+    """
+    Represents the values of an axis of a pricing grid, like range(start, stop, step).
+
+    A range object is accepted in place of the fields.
+
+    Attributes:
+        start: The first value.
+        stop: The end of the axis, excluded.
+        step: The difference between two consecutive values.
+
+    Methods:
+        values(): Return the values of the axis.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    start: StrictInt
+    stop: StrictInt
+    step: StrictInt = Field(1, gt=0)
+
+    @model_validator(mode="before")
+    @classmethod
+    def from_range(cls, data):
+        """
+        Convert a range object to the fields of the axis.
+        """
+        if isinstance(data, range):
+            return {"start": data.start, "stop": data.stop, "step": data.step}
+        return data
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        """
+        Check that the axis has at least one value.
+
+        Raises:
+            ValueError: If stop is not after start.
+        """
+        if self.stop <= self.start:
+            raise ValueError("stop should be greater than start")
+        return self
+
+    def __len__(self):
+        return len(range(self.start, self.stop, self.step))
+
+    def values(self):
+        """
+        Return the values of the axis.
+
+        Returns:
+            numpy.ndarray: The values, as int64.
+        """
+        return np.arange(self.start, self.stop, self.step, dtype=np.int64)
+
+
+class FeeGrid(BaseModel):
+    """
+    Represents a pricing grid, the delivery fees of a cart at a time by delivery distance and number of items.
+
+    Attributes:
+        cart_value: Total value of items in the shopping cart in cents.
+        delivery_distance: The delivery distances in meters, one row of the grid each.
+        number_of_items: The numbers of items, one column of the grid each.
+        time: Delivery time. Valid datetime strings are automatically casted to datetime objects.
+        encoding: The encoding of the fees in the responses, one of ENCODINGS.
+
+    Methods:
+        calculate_fees(tariff): Calculate the delivery fees of the grid.
+        encode_fees(fees): Encode the fees of the grid.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    cart_value: StrictInt = Field(ge=MIN_CART_VALUE, le=MAX_CART_VALUE)
+    delivery_distance: GridAxis
+    number_of_items: GridAxis
+    time: datetime
+    encoding: Literal[ENCODINGS] = "dense"
+
+    @field_validator("delivery_distance", "number_of_items")
+    @classmethod
+    def check_axis(cls, axis, info: ValidationInfo):
+        """
+        Check that the values of the axis are valid values of its field, and that the grid is not too large.
+
+        Raises:
+            ValueError: If the axis starts below the minimum of its field, ends above its maximum, or the grid has
+                more than config.MAX_GRID_CELLS fees.
+        """
+        minimum = AXIS_MINIMUMS[info.field_name]
+        if axis.start < minimum:
+            raise ValueError(f"Axis should start at {minimum} or more")
+        maximum = AXIS_MAXIMUMS[info.field_name]
+        if axis.start + (len(axis) - 1) * axis.step > maximum:
+            raise ValueError(f"Axis should end at {maximum} or less")
+        delivery_distance = info.data.get("delivery_distance")
+        if delivery_distance is not None and len(delivery_distance) * len(axis) > config.MAX_GRID_CELLS:
+            raise ValueError(f"Grid should have at most {config.MAX_GRID_CELLS} fees")
+        return axis
+
+    def calculate_fees(self, tariff=None):
+        """
+        Calculate the delivery fees of the grid.
+
+        Args:
+            tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+        Returns:
+            numpy.ndarray: Total delivery fees in cents, with one row per delivery distance and one column per
+            number of items.
+        """
+        if tariff is None:
+            tariff = PRICING.tariff
+        shape = (len(self.delivery_distance), len(self.number_of_items))
+
+        # Free delivery for high cart value
+        if self.cart_value >= tariff.free_delivery_cart_value:
+            return np.zeros(shape, dtype=np.int64)
+
+        small_order_surcharge = max(tariff.small_order_cart_value - self.cart_value, 0)
+        rows = distance_fees(tariff, self.delivery_distance.values())
+        columns = item_surcharges(tariff, self.number_of_items.values()) + small_order_surcharge
+        fees = np.add.outer(rows, columns)
+
+        code = tariff.rush_calendar.code(self.time)
+        if code:
+            fees = rush_fees(tariff, fees, code)
+
+        # Cap the delivery fee
+        return np.minimum(fees, tariff.max_possible_delivery_fee)
+
+    def encode_fees(self, fees):
+        """
+        Encode the fees of the grid, with the encoding of the grid.
+
+        Args:
+            fees (numpy.ndarray): The fees, as returned by calculate_fees().
+
+        Returns:
+            The encoded fees, ready to be serialized as JSON.
+        """
+        if self.encoding == "rle":
+            return encode_rle(fees)
+        if self.encoding == "typed":
+            return base64.b64encode(fees.astype(TYPED_DTYPE).tobytes()).decode("ascii")
+        return fees.tolist()
+
+
+def run_starts(changes, size):
+    """
+    Return the starts and lengths of the runs, given where consecutive values differ.
+    """
+    starts = np.flatnonzero(np.concatenate(([True], changes)))
+    return starts, np.diff(np.append(starts, size))
+
+
+def encode_rle(fees):
+    """
+    Run-length encode a grid of fees, first by identical consecutive rows, then within every row.
+
+    Args:
+        fees (numpy.ndarray): The fees, with one row per delivery distance.
+
+    Returns:
+        list: [row_count, [[fee, column_count], ...]] pairs, in the order of the rows.
+    """
+    row_starts, row_counts = run_starts(np.any(fees[1:] != fees[:-1], axis=1), len(fees))
+    runs = []
+    for row_start, row_count in zip(row_starts.tolist(), row_counts.tolist()):
+        row = fees[row_start]
+        starts, counts = run_starts(row[1:] != row[:-1], len(row))
+        runs.append([row_count, [list(pair) for pair in zip(row[starts].tolist(), counts.tolist())]])
+    return runs
+
+
+def decode_rle(runs):
+    """
+    Decode a run-length encoded grid of fees.
+
+    Args:
+        runs (list): The runs, as returned by encode_rle().
+
+    Returns:
+        numpy.ndarray: The fees.
+    """
+    rows = []
+    for row_count, values in runs:
+        row = np.repeat([fee for fee, _ in values], [count for _, count in values])
+        rows.extend([row] * row_count)
+    return np.array(rows, dtype=np.int64)
+
+
+def calculate_fee_grid(cart_value, delivery_distance, number_of_items, time, tariff=None):
+    """
+    Calculate the delivery fees of a cart at a time, for ranges of delivery distances and numbers of items.
+
+    Args:
+        cart_value (int): Total value of items in the shopping cart in cents.
+        delivery_distance: The delivery distances in meters, as a range or a dict with start, stop and step.
+        number_of_items: The numbers of items, as a range or a dict with start, stop and step.
+        time: Delivery time, as a datetime object or a datetime string.
+        tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+    Returns:
+        numpy.ndarray: Total delivery fees in cents, with one row per delivery distance and one column per
+        number of items.
+
+    Raises:
+        ValidationError: If any of the values is invalid, or the grid is too large.
+    """
+    grid = FeeGrid(
+        cart_value=cart_value,
+        delivery_distance=delivery_distance,
+        number_of_items=number_of_items,
+        time=time,
+    )
+    return grid.calculate_fees(tariff)
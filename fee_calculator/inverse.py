@@ -0,0 +1,243 @@
+"""
+Inverse queries of the fee function, solved in closed form.
+
+The total delivery fee is piecewise linear in each of its inputs: the distance fee is a step function of the
+distance intervals, the small order surcharge is linear below the small order cart value, the item surcharge
+is linear above the surchargeable items threshold with a step at the bulk items threshold, the rush multiplier
+scales the fee, the cap bounds it and the free delivery cart value zeroes it. The fee never decreases with the
+distance or the number of items, and never increases with the cart value, so the inverse queries are solved
+by inverting every piece instead of scanning the inputs:
+
+  max_delivery_distance: The furthest delivery distance at which the fee stays within a budget.
+  max_number_of_items: The largest number of items for which the fee stays within a budget.
+  min_cart_value: The smallest cart value that brings the fee within a budget.
+
+The maximum queries return None when the fee stays within the budget whatever the value (free delivery, a
+cap within the budget, or a fee that stops growing), and 0 when no valid value does.
+"""
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, StrictInt, ValidationInfo, field_validator
+from .constants import *
+from .money import HALF_BASIS_POINTS, ROUND_HALF_UP, round_basis_points
+from .pricing import PRICING
+
+UNKNOWNS = ("delivery_distance", "number_of_items", "cart_value")
+
+
+def max_base_fee(budget, basis_points, rounding=ROUND_HALF_UP):
+    """
+    Find the largest fee that is still within the budget once the rush multiplier is applied.
+
+    Args:
+        budget (int): The maximum fee in cents.
+        basis_points (int): The rush multiplier in basis points, None outside the rush hours.
+        rounding (str): The rush rounding of the tariff, ROUND_HALF_UP or ROUND_HALF_EVEN.
+
+    Returns:
+        int: The largest fee x, in cents, with round_basis_points(x * basis_points) <= budget, None if every
+        fee is.
+    """
+    if basis_points is None:
+        return budget
+    if basis_points <= 0:
+        return None
+    # Rounded half up, x * basis_points is within the budget up to half a cent beyond it, excluded
+    fee = ((budget + 1) * BASIS_POINTS - HALF_BASIS_POINTS - 1) // basis_points
+    # Rounded half even, a fee landing on the half cent beyond an even budget is rounded down into it
+    while round_basis_points((fee + 1) * basis_points, rounding) <= budget:
+        fee += 1
+    return fee
+
+
+def fee_allowance(tariff, budget, cart_value, time):
+    """
+    Find the largest fee, before the rush multiplier and the cap, that keeps the total fee within the budget.
+
+    Returns:
+        int: The largest fee in cents, None if the total fee is within the budget whatever the fee.
+    """
+    if cart_value is not None and cart_value >= tariff.free_delivery_cart_value:
+        return None
+    if tariff.max_possible_delivery_fee <= budget:
+        return None
+    code = tariff.rush_calendar.code(time)
+    basis_points = tariff.rush_calendar.basis_points[code] if code else None
+    return max_base_fee(budget, basis_points, tariff.rush_rounding)
+
+
+def max_delivery_distance(budget, cart_value, number_of_items, time, tariff=None):
+    """
+    Find the furthest delivery distance at which the total delivery fee is within the budget.
+
+    Args:
+        budget (int): The maximum delivery fee in cents.
+        cart_value (int): Total value of items in the shopping cart in cents.
+        number_of_items (int): Number of items in the order.
+        time (datetime): Delivery time.
+        tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+    Returns:
+        int: The distance in meters, None if the fee is within the budget at any distance, 0 if it is at none.
+    """
+    if tariff is None:
+        tariff = PRICING.tariff
+    allowance = fee_allowance(tariff, budget, cart_value, time)
+    if allowance is None:
+        return None
+    distance_allowance = (
+        allowance
+        - tariff.small_order_surcharge(cart_value)
+        - tariff.item_surcharge(number_of_items)
+        - tariff.base_delivery_fee
+    )
+    if distance_allowance < 0:
+        return 0
+    if tariff.fee_per_additional_interval == 0:
+        return None
+    intervals = distance_allowance // tariff.fee_per_additional_interval
+    distance = tariff.base_distance + intervals * tariff.additional_distance_interval
+    return distance if distance >= MIN_DELIVERY_DISTANCE else 0
+
+
+def max_number_of_items(budget, cart_value, delivery_distance, time, tariff=None):
+    """
+    Find the largest number of items for which the total delivery fee is within the budget.
+
+    Args:
+        budget (int): The maximum delivery fee in cents.
+        cart_value (int): Total value of items in the shopping cart in cents.
+        delivery_distance (int): Distance of the delivery in meters.
+        time (datetime): Delivery time.
+        tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+    Returns:
+        int: The number of items, None if the fee is within the budget for any number, 0 if it is for none.
+    """
+    if tariff is None:
+        tariff = PRICING.tariff
+    allowance = fee_allowance(tariff, budget, cart_value, time)
+    if allowance is None:
+        return None
+    item_allowance = (
+        allowance
+        - tariff.small_order_surcharge(cart_value)
+        - tariff.distance_fee(delivery_distance)
+    )
+    if item_allowance < tariff.item_surcharge(MIN_ITEMS_COUNT):
+        return 0
+
+    # Items below the threshold are free, every item from it costs excess_charge_per_item
+    free_items = tariff.surchargeable_items_threshold - 1
+    per_item = tariff.excess_charge_per_item
+    # Above the bulk items threshold, the bulk fee comes on top
+    if item_allowance >= tariff.bulk_fee:
+        if per_item == 0:
+            return None
+        items = free_items + (item_allowance - tariff.bulk_fee) // per_item
+        if items > tariff.bulk_items_threshold:
+            return items
+    if per_item == 0:
+        return tariff.bulk_items_threshold
+    return min(free_items + item_allowance // per_item, tariff.bulk_items_threshold)
+
+
+def min_cart_value(budget, delivery_distance, number_of_items, time, tariff=None):
+    """
+    Find the smallest cart value for which the total delivery fee is within the budget.
+
+    The delivery being free from the free delivery cart value, there always is one.
+
+    Args:
+        budget (int): The maximum delivery fee in cents.
+        delivery_distance (int): Distance of the delivery in meters.
+        number_of_items (int): Number of items in the order.
+        time (datetime): Delivery time.
+        tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+    Returns:
+        int: The cart value in cents.
+    """
+    if tariff is None:
+        tariff = PRICING.tariff
+    allowance = fee_allowance(tariff, budget, None, time)
+    if allowance is None:
+        return MIN_CART_VALUE
+    surcharge_allowance = (
+        allowance - tariff.distance_fee(delivery_distance) - tariff.item_surcharge(number_of_items)
+    )
+    if surcharge_allowance < 0:
+        # Only free delivery is within the budget
+        return max(tariff.free_delivery_cart_value, MIN_CART_VALUE)
+    cart_value = tariff.small_order_cart_value - surcharge_allowance
+    return max(min(cart_value, tariff.free_delivery_cart_value), MIN_CART_VALUE)
+
+
+SOLVERS = {
+    "delivery_distance": max_delivery_distance,
+    "number_of_items": max_number_of_items,
+    "cart_value": min_cart_value,
+}
+
+
+class InverseQuery(BaseModel):
+    """
+    Represents an inverse query: the order value that keeps the delivery fee within a budget, the other values
+    of the order being fixed.
+
+    Attributes:
+        solve: The unknown of the query, one of UNKNOWNS. The delivery distance and the number of items are
+            maximized, the cart value is minimized.
+        max_fee: The budget, the maximum delivery fee in cents.
+        cart_value: Total value of items in the shopping cart, required unless it is the unknown.
+        delivery_distance: Distance of the delivery in meters, required unless it is the unknown.
+        number_of_items: Number of items in the order, required unless it is the unknown.
+        time: Delivery time. Valid datetime strings are automatically casted to datetime objects.
+
+    Methods:
+        calculate(tariff): Solve the query.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    solve: Literal[UNKNOWNS]
+    max_fee: StrictInt = Field(ge=0)
+    cart_value: Optional[StrictInt] = Field(None, ge=MIN_CART_VALUE, le=MAX_CART_VALUE, validate_default=True)
+    delivery_distance: Optional[StrictInt] = Field(
+        None, ge=MIN_DELIVERY_DISTANCE, le=MAX_DELIVERY_DISTANCE, validate_default=True
+    )
+    number_of_items: Optional[StrictInt] = Field(
+        None, ge=MIN_ITEMS_COUNT, le=MAX_ITEMS_COUNT, validate_default=True
+    )
+    time: datetime
+
+    @field_validator("cart_value", "delivery_distance", "number_of_items")
+    @classmethod
+    def check_known(cls, value, info: ValidationInfo):
+        """
+        Check that the value is given, unless it is the unknown of the query.
+
+        Raises:
+            ValueError: If the value is missing, or given for the unknown.
+        """
+        solve = info.data.get("solve")
+        if solve == info.field_name:
+            if value is not None:
+                raise ValueError("Field should not be given when solving for it")
+        elif value is None and solve is not None:
+            raise ValueError("Field required")
+        return value
+
+    def calculate(self, tariff=None):
+        """
+        Solve the query.
+
+        Args:
+            tariff (Tariff): The fee schedule, the current one of PRICING by default.
+
+        Returns:
+            int: The value of the unknown. For the maximized ones, None if any value keeps the fee within the
+            budget and 0 if no valid value does.
+        """
+        known = {name: getattr(self, name) for name in UNKNOWNS if name != self.solve}
+        return SOLVERS[self.solve](self.max_fee, time=self.time, tariff=tariff, **known)
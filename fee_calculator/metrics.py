@@ -0,0 +1,240 @@
+"""
+Low-overhead metrics of the POST / hot path, exported in the Prometheus text format.
+
+Every metric value lives at a fixed index of a flat array of doubles, so recording a request only takes a few
+array updates. Without a metrics directory the array is in the process memory. With one, every process
+memory-maps its own file in the directory (metrics_<pid>.db), and the export sums the files of all the
+processes, so the /metrics of any worker reports the totals of all the workers. fee_calculator.serve uses a
+temporary directory when it starts several workers without one.
+
+The updates of a process take a lock, as the threads of a worker (the thread pool of the asgi mode, the
+coalescing event loop) record requests concurrently and += on the array is not atomic.
+"""
+import glob
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from mmap import mmap
+from . import config
+
+STAGES = ("parse", "validate", "price", "serialize")
+# Upper bounds of the latency buckets in nanoseconds, the last bucket (+Inf) is implicit
+BUCKET_BOUNDS_NS = (
+    1_000,
+    2_500,
+    5_000,
+    10_000,
+    25_000,
+    50_000,
+    100_000,
+    250_000,
+    500_000,
+    1_000_000,
+    2_500_000,
+    5_000_000,
+    10_000_000,
+)
+OUTCOMES = ("200", "400", "other")
+FIELDS = ("cart_value", "delivery_distance", "number_of_items", "time", "other")
+RESPONSE_CACHE_RESULTS = ("hit", "miss")
+
+# Layout of the array: one histogram per stage (buckets then sum, the count being the sum of the buckets),
+# then the outcome, field and response cache counters
+SUM_INDEX = len(BUCKET_BOUNDS_NS) + 1
+HISTOGRAM_SIZE = SUM_INDEX + 1
+VALIDATE_OFFSET = HISTOGRAM_SIZE
+PRICE_OFFSET = 2 * HISTOGRAM_SIZE
+SERIALIZE_OFFSET = 3 * HISTOGRAM_SIZE
+OUTCOMES_OFFSET = len(STAGES) * HISTOGRAM_SIZE
+FIELDS_OFFSET = OUTCOMES_OFFSET + len(OUTCOMES)
+RESPONSE_CACHE_OFFSET = FIELDS_OFFSET + len(FIELDS)
+SIZE = RESPONSE_CACHE_OFFSET + len(RESPONSE_CACHE_RESULTS)
+OUTCOME_INDEXES = {int(outcome): OUTCOMES_OFFSET + index for index, outcome in enumerate(OUTCOMES[:-1])}
+OTHER_OUTCOME_INDEX = OUTCOMES_OFFSET + len(OUTCOMES) - 1
+FIELD_INDEXES = {field: FIELDS_OFFSET + index for index, field in enumerate(FIELDS[:-1])}
+OTHER_FIELD_INDEX = FIELDS_OFFSET + len(FIELDS) - 1
+FILE_PATTERN = "metrics_*.db"
+
+
+class Metrics:
+    """
+    Per-stage latency histograms, request outcomes, validation errors and response cache lookups of POST /
+    requests.
+
+    Args:
+        directory (str): Directory of the per-process metric files, None to keep the metrics in memory.
+
+    Methods:
+        observe_stages(start, parsed, validated, priced, serialized): Record the latency of every stage.
+        count_request(status_code): Count a request by outcome.
+        count_validation_error(field): Count a validation error by field.
+        count_response_cache(hit): Count a lookup of the response cache by result.
+        reset(): Zero the metrics of this process, in a new file.
+        values(): Return the values of all the processes, summed.
+        export(): Return the metrics in the Prometheus text format.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._open()
+        # Forked workers must not share the array of their parent
+        os.register_at_fork(after_in_child=self._open)
+
+    def _open(self):
+        """
+        Allocate the array of this process, zeroed.
+        """
+        # Not inherited from the parent, where another thread may hold it
+        self._lock = threading.Lock()
+        if self.directory is None:
+            self._values = memoryview(bytearray(SIZE * 8)).cast("d")
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"metrics_{os.getpid()}.db")
+        with open(path, "w+b") as file:
+            file.truncate(SIZE * 8)
+            self._values = memoryview(mmap(file.fileno(), SIZE * 8)).cast("d")
+
+    def reset(self):
+        """
+        Zero the metrics of this process, in a new file: after a warm-up, or after clear_directory() removed the
+        file of this process.
+        """
+        self._open()
+
+    def observe_stages(self, start, parsed, validated, priced, serialized):
+        """
+        Record the latency of every stage of a request.
+
+        Args:
+            start (int): perf_counter_ns() when the request handling started.
+            parsed (int): perf_counter_ns() after decoding the JSON body.
+            validated (int): perf_counter_ns() after validating the order.
+            priced (int): perf_counter_ns() after calculating the fee.
+            serialized (int): perf_counter_ns() after encoding the response.
+        """
+        # Unrolled over the stages, as this runs on every request
+        values = self._values
+        with self._lock:
+            duration = parsed - start
+            values[bisect_left(BUCKET_BOUNDS_NS, duration)] += 1
+            values[SUM_INDEX] += duration
+            duration = validated - parsed
+            values[VALIDATE_OFFSET + bisect_left(BUCKET_BOUNDS_NS, duration)] += 1
+            values[VALIDATE_OFFSET + SUM_INDEX] += duration
+            duration = priced - validated
+            values[PRICE_OFFSET + bisect_left(BUCKET_BOUNDS_NS, duration)] += 1
+            values[PRICE_OFFSET + SUM_INDEX] += duration
+            duration = serialized - priced
+            values[SERIALIZE_OFFSET + bisect_left(BUCKET_BOUNDS_NS, duration)] += 1
+            values[SERIALIZE_OFFSET + SUM_INDEX] += duration
+
+    def count_request(self, status_code):
+        """
+        Count a request by outcome: 200, 400 or other.
+        """
+        with self._lock:
+            self._values[OUTCOME_INDEXES.get(status_code, OTHER_OUTCOME_INDEX)] += 1
+
+    def count_validation_error(self, field):
+        """
+        Count a validation error by field, fields other than the order fields being counted as other.
+        """
+        with self._lock:
+            self._values[FIELD_INDEXES.get(field, OTHER_FIELD_INDEX)] += 1
+
+    def count_response_cache(self, hit):
+        """
+        Count a lookup of the response cache (see fee_calculator.dedup) as a hit or a miss.
+        """
+        with self._lock:
+            self._values[RESPONSE_CACHE_OFFSET + (not hit)] += 1
+
+    def values(self):
+        """
+        Return the values of all the processes, summed.
+
+        Returns:
+            list: The values, in the layout of the array.
+        """
+        if self.directory is None:
+            return self._values.tolist()
+
+        totals = [0.0] * SIZE
+        for path in glob.glob(os.path.join(self.directory, FILE_PATTERN)):
+            process_values = array("d")
+            with open(path, "rb") as file:
+                process_values.frombytes(file.read(SIZE * 8))
+            for index, value in enumerate(process_values):
+                totals[index] += value
+        return totals
+
+    def export(self):
+        """
+        Return the metrics in the Prometheus text format.
+
+        Returns:
+            str: The exposition of the stage latency histograms and the request, validation error and response
+            cache counters.
+        """
+        values = self.values()
+        lines = [
+            "# HELP fee_calculator_stage_duration_seconds Latency of every stage of POST / requests.",
+            "# TYPE fee_calculator_stage_duration_seconds histogram",
+        ]
+        for stage_index, stage in enumerate(STAGES):
+            offset = stage_index * HISTOGRAM_SIZE
+            cumulative = 0
+            for bucket_index, bound in enumerate((*BUCKET_BOUNDS_NS, None)):
+                cumulative += values[offset + bucket_index]
+                le = "+Inf" if bound is None else repr(bound / 1e9)
+                lines.append(
+                    f'fee_calculator_stage_duration_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative:.0f}'
+                )
+            lines.append(
+                f'fee_calculator_stage_duration_seconds_sum{{stage="{stage}"}} {values[offset + SUM_INDEX] / 1e9!r}'
+            )
+            lines.append(
+                f'fee_calculator_stage_duration_seconds_count{{stage="{stage}"}} {cumulative:.0f}'
+            )
+
+        lines += [
+            "# HELP fee_calculator_requests_total POST / requests by outcome.",
+            "# TYPE fee_calculator_requests_total counter",
+        ]
+        for index, outcome in enumerate(OUTCOMES):
+            lines.append(
+                f'fee_calculator_requests_total{{outcome="{outcome}"}} {values[OUTCOMES_OFFSET + index]:.0f}'
+            )
+
+        lines += [
+            "# HELP fee_calculator_validation_errors_total Validation errors by field.",
+            "# TYPE fee_calculator_validation_errors_total counter",
+        ]
+        for index, field in enumerate(FIELDS):
+            lines.append(
+                f'fee_calculator_validation_errors_total{{field="{field}"}} {values[FIELDS_OFFSET + index]:.0f}'
+            )
+
+        lines += [
+            "# HELP fee_calculator_response_cache_total Lookups of the POST / response cache by result.",
+            "# TYPE fee_calculator_response_cache_total counter",
+        ]
+        for index, result in enumerate(RESPONSE_CACHE_RESULTS):
+            lines.append(
+                f'fee_calculator_response_cache_total{{result="{result}"}} {values[RESPONSE_CACHE_OFFSET + index]:.0f}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+def clear_directory(directory):
+    """
+    Remove the metric files left in a directory by previous runs. Called once at server startup, before
+    METRICS.reset() starts the file of the server process again.
+    """
+    for path in glob.glob(os.path.join(directory, FILE_PATTERN)):
+        os.remove(path)
+
+
+METRICS = Metrics(config.METRICS_DIR)
@@ -0,0 +1,61 @@
+"""
+Exact integer arithmetic of the fees: amounts in integer cents, multipliers in integer basis points.
+
+The Euro amounts and the multipliers of the settings are converted once, when a tariff is built, from their
+decimal representation, so 1.2 is exactly 120 cents or 12000 basis points, whatever its float error. Applying
+a multiplier to a fee then only takes integer arithmetic, and the half cents are rounded with an explicit
+rounding mode:
+
+  ROUND_HALF_UP: Half cents are rounded up, the usual rounding of prices.
+  ROUND_HALF_EVEN: Half cents are rounded to the even cent, like Python's round() of an exact product.
+"""
+from decimal import Decimal, ROUND_HALF_UP as DECIMAL_HALF_UP
+from .constants import *
+
+ROUND_HALF_UP = "half_up"
+ROUND_HALF_EVEN = "half_even"
+ROUNDING_MODES = (ROUND_HALF_UP, ROUND_HALF_EVEN)
+HALF_BASIS_POINTS = BASIS_POINTS // 2
+
+
+def to_cents(euros):
+    """
+    Convert an amount in Euros to integer cents.
+
+    Args:
+        euros (int | float): The amount in Euros.
+
+    Returns:
+        int: The amount in cents, a fraction of a cent being rounded half up.
+    """
+    return int((Decimal(str(euros)) * CENTS_PER_EUR).quantize(1, DECIMAL_HALF_UP))
+
+
+def to_basis_points(multiplier):
+    """
+    Convert a multiplier to integer basis points.
+
+    Args:
+        multiplier (int | float): The multiplier, e.g. 1.2.
+
+    Returns:
+        int: The multiplier in basis points, e.g. 12000, a fraction of a basis point being rounded half up.
+    """
+    return int((Decimal(str(multiplier)) * BASIS_POINTS).quantize(1, DECIMAL_HALF_UP))
+
+
+def round_basis_points(scaled, rounding=ROUND_HALF_UP):
+    """
+    Round an amount in cents multiplied by basis points to whole cents.
+
+    Args:
+        scaled (int): The non-negative product of an amount in cents and a multiplier in basis points.
+        rounding (str): The rounding mode of the half cents, ROUND_HALF_UP or ROUND_HALF_EVEN.
+
+    Returns:
+        int: The amount in whole cents.
+    """
+    rounded = (scaled + HALF_BASIS_POINTS) // BASIS_POINTS
+    if rounding == ROUND_HALF_EVEN and rounded & 1 and scaled % BASIS_POINTS == HALF_BASIS_POINTS:
+        rounded -= 1
+    return rounded
@@ -0,0 +1,190 @@
+"""
+Versioned pricing files, hot-reloaded while the service runs.
+
+A pricing file is a JSON object with a version and any of the fee schedule settings of Tariff, in the same
+units as fee_calculator.constants; the settings it leaves out keep the value of the constant. For example:
+
+    {"version": "2024-02-01", "base_delivery_fee": 2.5, "rush_fee_multiplier": 1.3}
+
+Instead of the single weekly window of the rush_* settings, the rush hours can be given as a calendar
+(see fee_calculator.rush), with a time zone, weekly windows and exception dates:
+
+    {
+        "version": "2024-12",
+        "rush": {
+            "timezone": "Europe/Helsinki",
+            "windows": [
+                {"days": [1, 2, 3, 4, 5], "start": "11:00", "end": "13:00", "multiplier": 1.1},
+                {"days": [5], "start": "15:00", "end": "19:00", "multiplier": 1.2}
+            ],
+            "exceptions": {"2024-12-24": [{"start": "10:00", "end": "14:00", "multiplier": 1.5}], "2024-12-25": []}
+        }
+    }
+
+The file is validated and compiled into a new Tariff, which then replaces the current one with a single
+reference assignment. Requests read PRICING.tariff once, without any lock, and keep pricing with that
+tariff until they finish, so a reload never mixes two schedules within a request. An invalid file is
+logged and ignored, and the current schedule stays in place.
+
+The pydantic models of the file are defined in fee_calculator.pricing_schema, which is only imported when a
+file is loaded, and are available from this module as well.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from . import config
+from .tariff import DEFAULT_TARIFF
+
+logger = logging.getLogger(__name__)
+
+# The pricing file models, imported from fee_calculator.pricing_schema on first use by __getattr__()
+SCHEMA_NAMES = (
+    "Clock",
+    "RUSH_SETTINGS",
+    "RushHoursConfig",
+    "RushWindowConfig",
+    "RushCalendarConfig",
+    "PricingConfig",
+)
+
+
+def __getattr__(name):
+    """
+    Import the pricing file models lazily, so that importing this module does not import pydantic.
+    """
+    if name in SCHEMA_NAMES:
+        from . import pricing_schema
+
+        return getattr(pricing_schema, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def load_tariff(path):
+    """
+    Read, validate and compile a pricing file.
+
+    Args:
+        path (str): Path of the JSON pricing file.
+
+    Returns:
+        Tariff: The compiled fee schedule.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not valid JSON (json.JSONDecodeError) or not a valid pricing (ValidationError).
+    """
+    from .pricing_schema import PricingConfig
+
+    with open(path) as file:
+        data = json.load(file)
+    if not isinstance(data, dict):
+        raise ValueError("Pricing file should contain a JSON object")
+    return PricingConfig(**data).compile()
+
+
+def file_stamp(path):
+    """
+    Identify the current content of a file by its inode, size and modification time, None if it is missing.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class Pricing:
+    """
+    Holder of the current fee schedule, reloaded from a pricing file when the file changes.
+
+    Args:
+        path (str): Path of the pricing file, None to price with DEFAULT_TARIFF.
+        interval (float): Seconds between two checks of the pricing file by watch().
+
+    Attributes:
+        tariff: The current Tariff. Readers take this reference once per request and need no lock.
+
+    Methods:
+        swap(tariff): Replace the current tariff.
+        reload(): Reload the pricing file if it changed.
+        watch(): Check the pricing file for changes in a background thread.
+    """
+
+    def __init__(self, path=None, interval=1.0):
+        self.path = path
+        self.interval = interval
+        self._stamp = None
+        self._watching = False
+        # Only the writers are serialized, the readers never take this lock
+        self._lock = threading.Lock()
+        self.tariff = DEFAULT_TARIFF if path is None else load_tariff(path)
+        if path is not None:
+            self._stamp = file_stamp(path)
+
+    def swap(self, tariff):
+        """
+        Replace the current tariff. Requests that already took the previous one keep pricing with it.
+
+        Args:
+            tariff (Tariff): The new fee schedule.
+        """
+        # A single reference assignment, so readers see either the previous or the new tariff
+        self.tariff = tariff
+
+    def reload(self):
+        """
+        Reload the pricing file if it changed since the last load. An invalid file is logged and ignored.
+
+        Returns:
+            bool: True if a new tariff replaced the current one.
+        """
+        if self.path is None:
+            return False
+        with self._lock:
+            stamp = file_stamp(self.path)
+            if stamp is None or stamp == self._stamp:
+                return False
+            # Remembered before loading, so an invalid file is reported once and not at every check
+            self._stamp = stamp
+            try:
+                tariff = load_tariff(self.path)
+            except (OSError, ValueError) as error:
+                logger.error("Ignoring invalid pricing file %s: %s", self.path, error)
+                return False
+            self.swap(tariff)
+        logger.info("Pricing %s loaded from %s", tariff.version, self.path)
+        return True
+
+    def watch(self):
+        """
+        Check the pricing file for changes every interval seconds, in a daemon thread of every process.
+        """
+        if self._watching:
+            return
+        self._watching = True
+        self._start_watcher()
+        # Threads do not survive a fork, so every forked worker starts its own watcher
+        os.register_at_fork(after_in_child=self._start_watcher)
+
+    def _start_watcher(self):
+        """
+        Start the watcher thread, with a new lock in case the fork happened while it was held.
+        """
+        self._lock = threading.Lock()
+        thread = threading.Thread(target=self._watch_loop, name="pricing-watcher", daemon=True)
+        thread.start()
+
+    def _watch_loop(self):
+        """
+        Reload the pricing file every interval seconds, for the lifetime of the process.
+        """
+        while True:
+            time.sleep(self.interval)
+            self.reload()
+
+
+PRICING = Pricing(config.PRICING_FILE, config.PRICING_RELOAD_INTERVAL)
+if config.PRICING_FILE is not None and config.PRICING_RELOAD_INTERVAL > 0:
+    PRICING.watch()
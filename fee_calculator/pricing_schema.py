@@ -0,0 +1,180 @@
+"""
+The schema of the pricing files, validated with pydantic and compiled into a Tariff.
+
+It is kept apart from fee_calculator.pricing, so that pricing with the default tariff does not import pydantic
+(see fee_calculator.serverless); the models are only imported when a pricing file is loaded.
+"""
+from datetime import date
+from typing import Annotated, Literal, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from pydantic import BaseModel, ConfigDict, Field, StrictStr, field_validator, model_validator
+from .constants import *
+from .rush import RushCalendar, parse_clock
+from .tariff import Tariff
+
+# A time of day from 00:00 to 24:00
+Clock = Annotated[str, Field(pattern=r"^(([01][0-9]|2[0-3]):[0-5][0-9]|24:00)$")]
+RUSH_SETTINGS = ("rush_day", "rush_hour_start", "rush_hour_end", "rush_fee_multiplier")
+
+
+class RushHoursConfig(BaseModel):
+    """
+    Represents rush hours within a day.
+
+    Attributes:
+        start: The start time of day, in the HH:MM format.
+        end: The end time of day, excluded, in the HH:MM format.
+        multiplier: The multiplier applied to the fee during the rush hours.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    start: Clock
+    end: Clock
+    multiplier: float = Field(gt=0)
+
+
+class RushWindowConfig(RushHoursConfig):
+    """
+    Represents weekly rush hours. They wrap around midnight into the next day when the end is before the start.
+
+    Attributes:
+        days: The ISO weekdays of the rush hours.
+    """
+
+    days: list[Annotated[int, Field(ge=1, le=7)]] = Field(min_length=1)
+
+
+class RushCalendarConfig(BaseModel):
+    """
+    Represents the rush hours of a market.
+
+    Attributes:
+        timezone: The IANA time zone of the rush hours, the time of day of the delivery times is used as is when
+            it is not set.
+        windows: The weekly rush hours, a later window overriding an earlier one where they overlap.
+        exceptions: The rush hours of exception dates, replacing the weekly ones on that date.
+
+    Methods:
+        compile(): Compile the calendar into a RushCalendar.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    timezone: Optional[StrictStr] = None
+    windows: list[RushWindowConfig] = []
+    exceptions: dict[date, list[RushHoursConfig]] = {}
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, timezone):
+        """
+        Check that the time zone is known.
+
+        Raises:
+            ValueError: If there is no such time zone.
+        """
+        if timezone is not None:
+            try:
+                ZoneInfo(timezone)
+            except (ZoneInfoNotFoundError, ValueError):
+                raise ValueError(f"Unknown time zone {timezone}")
+        return timezone
+
+    @field_validator("exceptions")
+    @classmethod
+    def check_exceptions(cls, exceptions):
+        """
+        Check that the rush hours of exception dates end within the date.
+
+        Raises:
+            ValueError: If rush hours of an exception date end before they start.
+        """
+        for hours in exceptions.values():
+            for window in hours:
+                if parse_clock(window.end) < parse_clock(window.start):
+                    raise ValueError("Rush hours of exception dates should not end before they start")
+        return exceptions
+
+    def compile(self):
+        """
+        Compile the calendar into a RushCalendar.
+
+        Returns:
+            RushCalendar: The compiled calendar.
+        """
+        return RushCalendar(
+            [
+                (window.days, parse_clock(window.start), parse_clock(window.end), window.multiplier)
+                for window in self.windows
+            ],
+            {
+                exception_date: [
+                    (parse_clock(window.start), parse_clock(window.end), window.multiplier)
+                    for window in hours
+                ]
+                for exception_date, hours in self.exceptions.items()
+            },
+            self.timezone,
+        )
+
+
+class PricingConfig(BaseModel):
+    """
+    Represents the content of a pricing file.
+
+    Attributes:
+        version: The version of the fee schedule, reported with the fees it prices.
+        rush: The rush calendar, replacing the single weekly window of the rush_* settings.
+        The other attributes are the fee schedule settings of Tariff, defaulting to the pricing constants.
+
+    Methods:
+        compile(): Compile the pricing into a Tariff.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    version: StrictStr = Field(min_length=1)
+    base_delivery_fee: float = Field(BASE_DELIVERY_FEE, ge=0)
+    base_distance: int = Field(BASE_DISTANCE, ge=0)
+    fee_per_additional_interval: float = Field(FEE_PER_ADDITIONAL_INTERVAL, ge=0)
+    additional_distance_interval: int = Field(ADDITIONAL_DISTANCE_INTERVAL, gt=0)
+    small_order_cart_value: float = Field(SMALL_ORDER_CART_VALUE, ge=0)
+    surchargeable_items_threshold: int = Field(SURCHARGEABLE_ITEMS_THRESHOLD, ge=1)
+    excess_charge_per_item: int = Field(EXCESS_CHARGE_PER_ITEM, ge=0)
+    bulk_items_threshold: int = Field(BULK_ITEMS_THRESHOLD, ge=0)
+    bulk_fee: float = Field(BULK_FEE, ge=0)
+    rush_day: int = Field(FRIDAY, ge=1, le=7)
+    rush_hour_start: int = Field(RUSH_HOUR_START, ge=0, le=24)
+    rush_hour_end: int = Field(RUSH_HOUR_END, ge=0, le=24)
+    rush_fee_multiplier: float = Field(RUSH_FEE_MULTIPLIER, ge=0)
+    rush_rounding: Literal["half_up", "half_even"] = RUSH_ROUNDING
+    free_delivery_cart_value: float = Field(FREE_DELIVERY_CART_VALUE, ge=0)
+    max_possible_delivery_fee: float = Field(MAX_POSSIBLE_DELIVERY_FEE, ge=0)
+    rush: Optional[RushCalendarConfig] = None
+
+    @model_validator(mode="after")
+    def check_rush_hours(self):
+        """
+        Check that the rush hours do not end before they start, and are not given both ways.
+
+        Raises:
+            ValueError: If rush_hour_end is before rush_hour_start, or rush is given with any rush_* setting.
+        """
+        if self.rush_hour_end < self.rush_hour_start:
+            raise ValueError("rush_hour_end should not be before rush_hour_start")
+        if self.rush is not None and self.model_fields_set.intersection(RUSH_SETTINGS):
+            raise ValueError(f"rush should not be combined with {', '.join(RUSH_SETTINGS)}")
+        return self
+
+    def compile(self):
+        """
+        Compile the pricing into a Tariff.
+
+        Returns:
+            Tariff: The compiled fee schedule.
+        """
+        settings = self.model_dump(exclude={"rush"})
+        if self.rush is not None:
+            settings["rush_calendar"] = self.rush.compile()
+        return Tariff(**settings)
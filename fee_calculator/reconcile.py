@@ -0,0 +1,295 @@
+"""
+Command-line reconciliation: re-pricing of memory-mapped columnar order files across a process pool.
+
+The orders are stored column-wise in a directory, one .npy file per field (see write_columns()):
+
+  cart_value.npy, delivery_distance.npy, number_of_items.npy: Integer columns.
+  time.npy: The delivery times, as datetime64 (taken as UTC) or integer seconds since the Unix epoch.
+
+The columns are memory-mapped, never read as a whole. The rows are split into shards of consecutive rows, and
+every worker process maps the same files, so the operating system shares the pages between them without any
+copy. A worker prices its shards with the vectorized fee rules and writes the fees to its rows of the output
+column, itself a memory-mapped .npy file of int64. Every row only depends on its own values and is written at
+its own offset, so the output is the same whatever the number of workers and the order the shards finish in.
+
+Rows with a value outside the bounds of its field, or a time that is NaT or outside the range of datetime, get the
+fee INVALID_FEE, and are counted as rejected.
+
+Usage:
+    python -m fee_calculator.reconcile orders/ -o fees.npy --workers 8
+    python -m fee_calculator.reconcile orders/ -o fees.npy --pricing pricing-2024-02.json
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import numpy as np
+from .batch import timestamp_rush_codes, total_fees
+from .constants import *
+from .pricing import PRICING, load_tariff
+
+COLUMNS = ("cart_value", "delivery_distance", "number_of_items", "time")
+COLUMN_MINIMUMS = {
+    "cart_value": MIN_CART_VALUE,
+    "delivery_distance": MIN_DELIVERY_DISTANCE,
+    "number_of_items": MIN_ITEMS_COUNT,
+}
+COLUMN_MAXIMUMS = {
+    "cart_value": MAX_CART_VALUE,
+    "delivery_distance": MAX_DELIVERY_DISTANCE,
+    "number_of_items": MAX_ITEMS_COUNT,
+}
+# The delivery times in seconds since the Unix epoch, a day within the range of datetime so that the time of day in
+# any time zone is a datetime too. NaT, converted to the smallest int64, is below it.
+TIME_MINIMUM = int(np.datetime64("0001-01-02T00:00:00", "s").astype(np.int64))
+TIME_MAXIMUM = int(np.datetime64("9999-12-30T23:59:59", "s").astype(np.int64))
+DEFAULT_SHARD_SIZE = 1_000_000
+INVALID_FEE = -1
+
+
+def write_columns(directory, cart_value, delivery_distance, number_of_items, time):
+    """
+    Write orders as columnar files.
+
+    Args:
+        directory (str): The directory of the column files, created if needed.
+        cart_value: Sequence of cart values in cents.
+        delivery_distance: Sequence of delivery distances in meters.
+        number_of_items: Sequence of item counts.
+        time: Sequence of delivery times, as datetime64 values or ISO 8601 strings without time zone, in UTC.
+    """
+    os.makedirs(directory, exist_ok=True)
+    columns = {
+        "cart_value": np.asarray(cart_value, dtype=np.int64),
+        "delivery_distance": np.asarray(delivery_distance, dtype=np.int64),
+        "number_of_items": np.asarray(number_of_items, dtype=np.int64),
+        "time": np.asarray(time, dtype="datetime64[s]"),
+    }
+    for name, column in columns.items():
+        np.save(os.path.join(directory, f"{name}.npy"), column)
+
+
+def open_columns(directory):
+    """
+    Memory-map the column files of a directory, read-only.
+
+    Args:
+        directory (str): The directory of the column files.
+
+    Returns:
+        dict: The memory-mapped columns, keyed by the field name.
+
+    Raises:
+        OSError: If a column file cannot be read.
+        ValueError: If a column is not a valid .npy file, is not one-dimensional, has the wrong type, or the
+            columns have different lengths.
+    """
+    columns = {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in COLUMNS
+    }
+    for name, column in columns.items():
+        if column.ndim != 1:
+            raise ValueError(f"Column {name} should be one-dimensional")
+        if len(column) != len(columns["cart_value"]):
+            raise ValueError(f"Column {name} should have the same length as cart_value")
+        kind = column.dtype.kind
+        if kind not in "iu" and not (name == "time" and kind == "M"):
+            raise ValueError(f"Column {name} should hold integers")
+    return columns
+
+
+def timestamps(time):
+    """
+    Convert a slice of the time column to seconds since the Unix epoch.
+    """
+    if time.dtype.kind == "M":
+        return time.astype("datetime64[s]").astype(np.int64)
+    return time.astype(np.int64)
+
+
+class ShardPricer:
+    """
+    Prices shards of the rows of a column directory into an output column, both memory-mapped.
+
+    Args:
+        directory (str): The directory of the column files.
+        output (str): The output .npy file, created by reconcile() with one int64 per row.
+        tariff (Tariff): The fee schedule.
+
+    Methods:
+        price(shard): Price a shard of rows and write their fees.
+    """
+
+    def __init__(self, directory, output, tariff):
+        self.columns = open_columns(directory)
+        self.fees = np.load(output, mmap_mode="r+")
+        self.tariff = tariff
+
+    def price(self, shard):
+        """
+        Price a shard of rows and write their fees to the output column.
+
+        Args:
+            shard (tuple): The first row and the end row, excluded, of the shard.
+
+        Returns:
+            tuple: The number of rows, of rejected rows and the sum of the fees of the other rows.
+        """
+        start, stop = shard
+        valid = np.ones(stop - start, dtype=bool)
+        values = {}
+        for name, minimum in COLUMN_MINIMUMS.items():
+            column = self.columns[name][start:stop]
+            maximum = COLUMN_MAXIMUMS[name]
+            valid &= (column >= minimum) & (column <= maximum)
+            # The rejected rows are priced within the bounds too, so that their fees cannot overflow
+            values[name] = np.clip(column, minimum, maximum).astype(np.int64)
+        seconds = timestamps(self.columns["time"][start:stop])
+        valid &= (seconds >= TIME_MINIMUM) & (seconds <= TIME_MAXIMUM)
+        # Only the valid times are looked up, the calendar could not convert the others to a datetime
+        codes = np.zeros(stop - start, dtype=np.uint8)
+        codes[valid] = timestamp_rush_codes(self.tariff.rush_calendar, seconds[valid])
+        fees = total_fees(self.tariff, codes=codes, **values)
+        fees[~valid] = INVALID_FEE
+
+        self.fees[start:stop] = fees
+        self.fees.flush()
+        return stop - start, int(stop - start - np.count_nonzero(valid)), int(fees[valid].sum())
+
+
+# The pricer of a worker process, opened once by init_worker()
+_pricer = None
+
+
+def init_worker(directory, output, tariff):
+    """
+    Map the columns and the output column in a worker process.
+    """
+    global _pricer
+    _pricer = ShardPricer(directory, output, tariff)
+
+
+def price_shard(shard):
+    """
+    Price a shard with the pricer of the worker process.
+    """
+    return _pricer.price(shard)
+
+
+def reconcile(
+    directory, output, tariff=None, workers=None, shard_size=DEFAULT_SHARD_SIZE, progress=None
+):
+    """
+    Price every row of a column directory into an output column, across a pool of worker processes.
+
+    Args:
+        directory (str): The directory of the column files.
+        output (str): The output .npy file, overwritten if it exists.
+        tariff (Tariff): The fee schedule, the current one of PRICING by default.
+        workers (int): The number of worker processes, one per CPU by default. With 1, the rows are priced
+            in the calling process.
+        shard_size (int): The number of rows priced together.
+        progress: A function called with the number of rows priced so far and the number of rows, after every
+            shard.
+
+    Returns:
+        dict: The number of rows, of rejected rows and the sum of the fees of the other rows, in cents.
+
+    Raises:
+        OSError: If a column file cannot be read.
+        ValueError: If the columns are invalid, see open_columns().
+    """
+    if tariff is None:
+        tariff = PRICING.tariff
+    if workers is None:
+        workers = os.cpu_count() or 1
+    rows = len(open_columns(directory)["cart_value"])
+    # Created with its final size before the workers map it
+    np.lib.format.open_memmap(output, mode="w+", dtype=np.int64, shape=(rows,)).flush()
+
+    shards = [(start, min(start + shard_size, rows)) for start in range(0, rows, shard_size)]
+    summary = {"rows": 0, "rejected": 0, "total_fees": 0}
+
+    def collect(results):
+        for shard_rows, rejected, fees in results:
+            summary["rows"] += shard_rows
+            summary["rejected"] += rejected
+            summary["total_fees"] += fees
+            if progress is not None:
+                progress(summary["rows"], rows)
+
+    if workers == 1:
+        pricer = ShardPricer(directory, output, tariff)
+        collect(map(pricer.price, shards))
+    else:
+        with multiprocessing.Pool(
+            workers, initializer=init_worker, initargs=(directory, output, tariff)
+        ) as pool:
+            collect(pool.imap_unordered(price_shard, shards))
+    return summary
+
+
+def main(argv=None):
+    """
+    Run the reconciliation from the command line.
+
+    Returns:
+        int: The exit status, 1 if any row was rejected and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m fee_calculator.reconcile",
+        description="Re-price memory-mapped columnar order files across a process pool.",
+    )
+    parser.add_argument("input", help="Directory of the column files.")
+    parser.add_argument("-o", "--output", required=True, help="Output .npy file of the fees.")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Number of worker processes, one per CPU by default."
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help=f"Number of rows priced together, {DEFAULT_SHARD_SIZE} by default.",
+    )
+    parser.add_argument(
+        "--pricing",
+        default=None,
+        help="JSON pricing file to price with, the pricing of the service by default.",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Do not report the progress.")
+    args = parser.parse_args(argv)
+
+    tariff = PRICING.tariff
+    if args.pricing is not None:
+        try:
+            tariff = load_tariff(args.pricing)
+        except (OSError, ValueError) as error:
+            parser.error(f"invalid pricing file {args.pricing}: {error}")
+
+    try:
+        open_columns(args.input)
+    except (OSError, ValueError) as error:
+        parser.error(f"invalid columns in {args.input}: {error}")
+
+    def report(priced, rows):
+        print(f"Priced {priced}/{rows} rows ({priced / rows:.0%})", file=sys.stderr)
+
+    summary = reconcile(
+        args.input,
+        args.output,
+        tariff,
+        args.workers,
+        args.shard_size,
+        None if args.quiet else report,
+    )
+
+    print(
+        f"{summary['rows']} rows, {summary['rejected']} rejected, "
+        f"total fees {summary['total_fees']} cents, pricing {tariff.version}",
+        file=sys.stderr,
+    )
+    return 1 if summary["rejected"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Rush-hour calendars, compiled into minute-of-week lookup tables.
+
+A calendar is made of weekly windows (ISO weekdays, a start and end time of day and a multiplier) and of
+exception dates, such as holidays, whose own windows replace the weekly ones for that date. All the rules are
+compiled once into a minute-of-week lookup: for every day of the week, a table holding the index of the
+multiplier that applies at every minute of the day (None for days without rush hours), and one such table
+per exception date. Looking up a delivery time then costs the same whatever the number of windows: a time
+zone conversion, at most one dictionary lookup and two indexings.
+"""
+from datetime import timezone
+from zoneinfo import ZoneInfo
+from .constants import *
+from .money import to_basis_points
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+# The tables hold one byte per minute, index 0 standing for no rush
+MAX_MULTIPLIERS = 255
+
+
+def parse_clock(value):
+    """
+    Convert a time of day to minutes since midnight.
+
+    Args:
+        value (str): The time of day in the HH:MM format, from 00:00 to 24:00.
+
+    Returns:
+        int: The number of minutes since midnight.
+    """
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def day_table(minutes):
+    """
+    Freeze the multiplier indexes of the minutes of a day, None if there is no rush hour in the day.
+    """
+    if not any(minutes):
+        return None
+    return bytes(minutes)
+
+
+class RushCalendar:
+    """
+    Represents the rush hours of a market, compiled into minute-of-week lookup tables.
+
+    Windows are applied in the given order, so a later window overrides an earlier one where they overlap.
+    A weekly window ending before it starts wraps around midnight into the next day.
+
+    Args:
+        windows: Tuples of the ISO weekdays, the start and end minutes of the day and the multiplier of every
+            weekly window. The end minute is excluded.
+        exceptions (dict): Tuples of the start and end minutes and the multiplier of the windows of every
+            exception date, keyed by the date. A date without windows has no rush hours.
+        tz (str): The IANA time zone of the market, e.g. "Europe/Helsinki". Delivery times are converted to it,
+            naive times being taken as UTC. When None, the time of day of the delivery time is used as is.
+
+    Attributes:
+        days: The multiplier index of every minute of every day of the week, from Monday, None for days without
+            rush hours.
+        multipliers: The distinct multipliers, index 0 (no rush) being 1, so windows with a multiplier of 1
+            are the same as no window.
+        basis_points: The distinct multipliers in integer basis points, at the same indexes, which the fees
+            are calculated with.
+
+    Methods:
+        weekly(day, start_hour, end_hour, multiplier): Build the calendar of a single weekly window.
+        code(time): Return the index of the multiplier applying at a time.
+        multiplier(time): Return the multiplier applying at a time.
+    """
+
+    __slots__ = ("multipliers", "basis_points", "days", "exceptions", "zone")
+
+    def __init__(self, windows, exceptions=None, tz=None):
+        self.zone = None if tz is None else ZoneInfo(tz)
+        self.multipliers = (1,)
+        self.basis_points = (BASIS_POINTS,)
+        week = bytearray(MINUTES_PER_WEEK)
+        for days, start, end, multiplier in windows:
+            code = self._code_of(multiplier)
+            for day in days:
+                first = (day - 1) * MINUTES_PER_DAY + start
+                last = (day - 1 if start <= end else day) * MINUTES_PER_DAY + end
+                if last > MINUTES_PER_WEEK:
+                    # Sunday windows wrapping around midnight end on Monday
+                    week[first:] = bytes([code]) * (MINUTES_PER_WEEK - first)
+                    first, last = 0, last - MINUTES_PER_WEEK
+                week[first:last] = bytes([code]) * (last - first)
+        # Indexed by date.weekday(), i.e. from Monday (0) to Sunday (6)
+        self.days = tuple(
+            day_table(week[first : first + MINUTES_PER_DAY])
+            for first in range(0, MINUTES_PER_WEEK, MINUTES_PER_DAY)
+        )
+
+        self.exceptions = {}
+        for date, date_windows in (exceptions or {}).items():
+            table = bytearray(MINUTES_PER_DAY)
+            for start, end, multiplier in date_windows:
+                if end < start:
+                    raise ValueError("Windows of exception dates should not end before they start")
+                table[start:end] = bytes([self._code_of(multiplier)]) * (end - start)
+            self.exceptions[date] = day_table(table)
+
+    @classmethod
+    def weekly(cls, day, start_hour, end_hour, multiplier):
+        """
+        Build the calendar of a single weekly window, in the time of day of the delivery times.
+
+        Args:
+            day (int): The ISO weekday of the window.
+            start_hour (int): The start hour (24-hour format) of the window.
+            end_hour (int): The end hour (24-hour format) of the window, excluded.
+            multiplier (float): The multiplier applied to the fee during the window.
+
+        Returns:
+            RushCalendar: The calendar.
+        """
+        return cls([((day,), start_hour * 60, end_hour * 60, multiplier)])
+
+    def _code_of(self, multiplier):
+        """
+        Return the index of a multiplier, adding it to the distinct multipliers if needed.
+
+        Multipliers are the same when they are in basis points, e.g. 1.2 and 1.20001.
+        """
+        basis_points = to_basis_points(multiplier)
+        if basis_points not in self.basis_points:
+            if len(self.basis_points) > MAX_MULTIPLIERS:
+                raise ValueError(f"A calendar should have at most {MAX_MULTIPLIERS} distinct multipliers")
+            self.basis_points += (basis_points,)
+            self.multipliers += (basis_points / BASIS_POINTS,)
+        return self.basis_points.index(basis_points)
+
+    def code(self, time):
+        """
+        Return the index of the multiplier applying at a time.
+
+        Args:
+            time (datetime): Delivery time.
+
+        Returns:
+            int: The index in multipliers, 0 outside the rush hours.
+        """
+        if self.zone is not None:
+            if time.tzinfo is None:
+                time = time.replace(tzinfo=timezone.utc)
+            time = time.astimezone(self.zone)
+        table = self.days[time.weekday()]
+        if self.exceptions:
+            table = self.exceptions.get(time.date(), table)
+        if table is None:
+            return 0
+        return table[time.hour * 60 + time.minute]
+
+    def multiplier(self, time):
+        """
+        Return the multiplier applying at a time.
+
+        Args:
+            time (datetime): Delivery time.
+
+        Returns:
+            float: The multiplier, None outside the rush hours.
+        """
+        code = self.code(time)
+        if code:
+            return self.multipliers[code]
+        return None
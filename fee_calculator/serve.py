@@ -0,0 +1,186 @@
+"""
+Production entry point of the fee calculator, replacing the single-process `flask run` development server.
+
+Two modes are supported:
+  prefork: gunicorn pre-forks WORKERS synchronous worker processes serving the WSGI app.
+  asgi: uvicorn runs WORKERS worker processes serving the app through its ASGI adapter (fee_calculator.asgi).
+
+The app is imported and warmed up before the workers start serving, so the first requests of a worker do
+not pay for the imports and the construction of the validators. With QUOTE_SOCKET set, the binary quote
+protocol is served on that Unix domain socket as well (see fee_calculator.binary_server). With several workers
+and no METRICS_DIR, the workers keep their metrics in a temporary directory, so that /metrics reports the totals
+of all the workers (see fee_calculator.metrics).
+
+Usage:
+    python -m fee_calculator.serve --mode prefork --workers 4 --keepalive 5 --backlog 2048
+"""
+import argparse
+import atexit
+import os
+import shutil
+import tempfile
+from . import config
+from .dedup import RESPONSE_CACHE, clear_directory as clear_response_cache
+from .metrics import METRICS, clear_directory
+
+MODES = ("prefork", "asgi")
+
+WARM_UP_PAYLOADS = (
+    {
+        "cart_value": 790,
+        "delivery_distance": 2235,
+        "number_of_items": 4,
+        "time": "2024-01-15T13:00:00Z",
+    },
+    {"cart_value": "790", "delivery_distance": -1, "number_of_items": 4, "time": 1},
+)
+
+
+def warm_up():
+    """
+    Import the app and build everything the first requests would otherwise build lazily.
+
+    A valid and an invalid payload are sent through the app, which exercises the fast validation path, the
+    pydantic Order schema and the error handler, as well as Flask's routing and JSON provider. The metrics of
+    the process are reset afterwards, so they only count the served requests.
+
+    Returns:
+        Flask: The warmed up app.
+    """
+    from .app import app
+
+    with app.test_client() as client:
+        for payload in WARM_UP_PAYLOADS:
+            client.post("/", json=payload)
+    METRICS.reset()
+    return app
+
+
+def run_prefork(host, port, workers, keepalive, backlog, quote_server=None):
+    """
+    Serve the app with gunicorn pre-forked workers. The app is loaded and warmed up once, before forking.
+
+    Every worker also accepts the connections of the binary quote protocol on the socket of the quote server,
+    bound before forking, from a thread started once the worker is forked.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class FeeCalculatorApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{host}:{port}",
+                "workers": workers,
+                "keepalive": keepalive,
+                "backlog": backlog,
+                "preload_app": True,
+            }
+            if quote_server is not None:
+                options["post_fork"] = lambda server, worker: quote_server.start()
+            for name, value in options.items():
+                self.cfg.set(name, value)
+
+        def load(self):
+            return warm_up()
+
+    FeeCalculatorApplication().run()
+
+
+def run_asgi(host, port, workers, keepalive, backlog, quote_server=None):
+    """
+    Serve the app with uvicorn worker processes. Every worker warms up when importing fee_calculator.asgi.
+
+    The binary quote protocol is served by this process, on the socket of the quote server.
+    """
+    import uvicorn
+
+    if quote_server is not None:
+        quote_server.start()
+
+    uvicorn.run(
+        "fee_calculator.asgi:application",
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_keep_alive=keepalive,
+        backlog=backlog,
+        access_log=False,
+    )
+
+
+def metrics_directory(workers):
+    """
+    Return the directory of the metrics of the workers: METRICS_DIR, or with several workers and without it, a new
+    temporary directory, removed when this process exits.
+
+    The temporary directory is set in the environment too, for the uvicorn workers, which read the config afresh.
+
+    Args:
+        workers (int): The number of worker processes.
+
+    Returns:
+        str: The directory, None to keep the metrics in memory.
+    """
+    if config.METRICS_DIR is not None or workers < 2:
+        return config.METRICS_DIR
+    directory = tempfile.mkdtemp(prefix="fee_calculator_metrics_")
+    pid = os.getpid()
+    # Only by this process, the forked workers inherit the handler
+    atexit.register(lambda: os.getpid() == pid and shutil.rmtree(directory, ignore_errors=True))
+    os.environ["FEE_CALCULATOR_METRICS_DIR"] = directory
+    return directory
+
+
+def main(argv=None):
+    """
+    Run the server from the command line. The defaults of the options come from fee_calculator.config.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m fee_calculator.serve",
+        description="Serve the fee calculator with multiple worker processes.",
+    )
+    parser.add_argument("--mode", choices=MODES, default="prefork", help="Serving mode.")
+    parser.add_argument("--host", default=config.HOST, help="Interface to bind to.")
+    parser.add_argument("--port", type=int, default=config.PORT, help="Port to listen on.")
+    parser.add_argument(
+        "--workers", type=int, default=config.WORKERS, help="Number of worker processes."
+    )
+    parser.add_argument(
+        "--keepalive",
+        type=int,
+        default=config.KEEPALIVE,
+        help="Seconds an idle keep-alive connection is kept open.",
+    )
+    parser.add_argument(
+        "--backlog",
+        type=int,
+        default=config.BACKLOG,
+        help="Maximum number of pending connections.",
+    )
+    args = parser.parse_args(argv)
+
+    config.METRICS_DIR = metrics_directory(args.workers)
+    if config.METRICS_DIR is not None:
+        # The files of previous runs would otherwise be summed with the ones of the new workers
+        clear_directory(config.METRICS_DIR)
+        # The file of this process, mapped when importing the metrics, is removed too, and this process serves
+        # the requests itself in the asgi mode with a single worker
+        METRICS.directory = config.METRICS_DIR
+        METRICS.reset()
+    if config.RESPONSE_CACHE_DIR is not None:
+        # The workers map the file afresh, without the responses of the previous run
+        clear_response_cache(config.RESPONSE_CACHE_DIR)
+        # Like the metrics, this process mapped the removed file when importing the cache
+        RESPONSE_CACHE.reset()
+
+    quote_server = None
+    if config.QUOTE_SOCKET is not None:
+        from .binary_server import QuoteServer
+
+        quote_server = QuoteServer(config.QUOTE_SOCKET)
+
+    run = run_prefork if args.mode == "prefork" else run_asgi
+    run(args.host, args.port, args.workers, args.keepalive, args.backlog, quote_server)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Serverless entry point of the fee calculator, for scale-to-zero function platforms.
+
+The handler answers the HTTP events of API Gateway style platforms (AWS Lambda proxy integrations, payload
+format 1.0 or 2.0) for POST / and POST /quote, with the same responses as the Flask app. It is built for a
+short cold start: importing this module imports neither Flask, pydantic nor numpy, and valid orders are
+validated by FastOrder, a validator that needs no schema to be built. The pydantic Order is only imported
+when an order fails the fast validation, to report the same validation errors as the app.
+
+Configure the function with the handler fee_calculator.serverless.handler. A pricing file is supported as in
+the app, but FEE_CALCULATOR_PRICING_RELOAD_INTERVAL should be 0: a frozen function has no use for the watcher
+thread, and loading the file imports pydantic.
+"""
+import base64
+import json
+from .fast_order import FastOrder
+from .pricing import PRICING
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+ROUTES = ("/", "/quote")
+
+
+def response(status_code, payload):
+    """
+    Build the response of an event.
+
+    Args:
+        status_code (int): The HTTP status code.
+        payload: The JSON body.
+
+    Returns:
+        dict: The response, in the API Gateway proxy format.
+    """
+    return {"statusCode": status_code, "headers": JSON_HEADERS, "body": json.dumps(payload)}
+
+
+def validate_order(data):
+    """
+    Validate the request data with the pydantic Order, imported on first use.
+
+    Args:
+        data (dict): The decoded JSON of the request, rejected by FastOrder.validate().
+
+    Returns:
+        tuple: The order and None, or None and the details of the validation error.
+    """
+    from pydantic import ValidationError
+    from .Order import Order
+    from .errors import validation_error_details
+
+    try:
+        return Order(**data), None
+    except ValidationError as error:
+        return None, validation_error_details(error)
+
+
+def handler(event, context=None):
+    """
+    Answer a POST / or POST /quote event.
+
+    Args:
+        event (dict): The HTTP event, with the path in rawPath (or path), the method in
+            requestContext.http.method (or httpMethod) and the JSON order in body, base64 encoded if
+            isBase64Encoded is true.
+        context: The context of the invocation, unused.
+
+    Returns:
+        dict: The response, with the delivery fee (POST /) or the fee breakdown (POST /quote) and the version
+        of the pricing that calculated it, with a 200 status code. Invalid orders get the validation errors
+        of the app with a 400 status code.
+    """
+    path = event.get("rawPath") or event.get("path") or "/"
+    method = event.get("httpMethod") or event.get("requestContext", {}).get("http", {}).get("method")
+    if path not in ROUTES:
+        return response(404, {"error": f"No route for {path}"})
+    if method not in (None, "POST"):
+        return response(405, {"error": f"Method {method} not allowed"})
+
+    body = event.get("body") or ""
+    if event.get("isBase64Encoded"):
+        body = base64.b64decode(body)
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return response(400, {"error": "Request body should be valid JSON"})
+    if not isinstance(data, dict):
+        return response(400, {"error": "Request body should be a JSON object"})
+
+    # Taken once, like the app, so a pricing reload never mixes two schedules within a request
+    tariff = PRICING.tariff
+    order = FastOrder.validate(data)
+    if order is None:
+        order, errors = validate_order(data)
+        if order is None:
+            return response(400, {"Validation Error": errors})
+    tariff = order.pricing_tariff(tariff)
+
+    breakdown = order.calculate_fee_breakdown(tariff)
+    if path == "/":
+        return response(200, {"delivery_fee": breakdown.total, "pricing_version": tariff.version})
+    return response(200, {**breakdown.to_dict(), "pricing_version": tariff.version})
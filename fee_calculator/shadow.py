@@ -0,0 +1,245 @@
+"""
+Shadow pricing: a candidate fee schedule evaluated against live traffic, off the request path.
+
+A sampled fraction of the orders priced by POST / is queued, with their live fee breakdown, to a background
+thread, which re-prices them with the candidate tariff and aggregates the differences: the share of orders
+whose fee would change, the distribution of the fee deltas, and the components of the breakdown (distance fee,
+surcharges, rush uplift, cap, free delivery) that changed with them. The request only pays for the sampling and
+a non-blocking put: the queue is bounded, and an order that does not fit is dropped and counted.
+
+The statistics are kept per process, like the quote cache, and reported by GET /shadow.
+"""
+import math
+import os
+import queue
+import threading
+from collections import Counter
+from random import random
+from . import config
+from .breakdown import FeeBreakdown
+from .pricing import load_tariff
+
+DEFAULT_QUEUE_SIZE = 10000
+PERCENTILES = (0.5, 0.9, 0.99)
+# The components of the breakdown a change of the total is attributed to
+RULES = FeeBreakdown.FIELDS[:-1]
+
+
+def counter_percentile(counts, fraction):
+    """
+    Return the nearest-rank percentile of values counted in a Counter.
+
+    Args:
+        counts (Counter): The number of occurrences of every value.
+        fraction (float): The percentile, between 0 and 1.
+
+    Returns:
+        The smallest value with at least the fraction of all the values at or below it, None if there are none.
+    """
+    rank = max(math.ceil(fraction * sum(counts.values())), 1)
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if seen >= rank:
+            return value
+    return None
+
+
+class ShadowPricer:
+    """
+    Re-prices a sample of the live orders with a candidate tariff in a background thread.
+
+    Args:
+        candidate (Tariff): The candidate fee schedule.
+        sample_rate (float): The fraction of the offered orders that are evaluated, between 0 and 1.
+        queue_size (int): The maximum number of orders waiting for the background thread.
+
+    Attributes:
+        sampled: Number of orders sampled, queued or dropped.
+        dropped: Number of sampled orders dropped because the queue was full.
+
+    Methods:
+        offer(order, live): Queue a sample of a live order and its breakdown.
+        offer_values(tariff, cart_value, delivery_distance, number_of_items, time): Queue a sample of a live order.
+        evaluate(cart_value, delivery_distance, number_of_items, time, live): Compare a live breakdown with the candidate one.
+        start(): Start the background thread, in this process and every forked one.
+        join(): Wait until every queued order is evaluated.
+        stats(): Return the aggregated differences.
+    """
+
+    def __init__(self, candidate, sample_rate=1.0, queue_size=DEFAULT_QUEUE_SIZE):
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self.queue_size = queue_size
+        self._started = False
+        self._reset()
+
+    def _reset(self):
+        """
+        Create an empty queue, lock and statistics.
+        """
+        self.sampled = 0
+        self.dropped = 0
+        self._evaluated = 0
+        self._changed = 0
+        self._delta_sum = 0
+        self._deltas = Counter()
+        self._rules = Counter()
+        self._queue = queue.Queue(self.queue_size)
+        # Only between the background thread and stats(), the request path never takes it
+        self._lock = threading.Lock()
+
+    def offer(self, order, live):
+        """
+        Queue a sample of a live order and its breakdown for the background thread, without ever blocking.
+
+        Args:
+            order: The validated order, an Order or a FastOrder.
+            live (FeeBreakdown): The breakdown the order was priced with.
+        """
+        if random() >= self.sample_rate:
+            return
+        self._put((order.cart_value, order.delivery_distance, order.number_of_items, order.time, live))
+
+    def offer_values(self, tariff, cart_value, delivery_distance, number_of_items, time):
+        """
+        Queue a sample of a live order priced without a breakdown, e.g. column-wise, without ever blocking.
+
+        The live breakdown is only calculated for a sampled order.
+
+        Args:
+            tariff (Tariff): The fee schedule the order was priced with.
+            cart_value (int): Total value of items in the shopping cart in cents.
+            delivery_distance (int): Distance of the delivery in meters.
+            number_of_items (int): Number of items in the order.
+            time (datetime): Delivery time.
+        """
+        if random() >= self.sample_rate:
+            return
+        live = tariff.breakdown(cart_value, delivery_distance, number_of_items, time)
+        self._put((cart_value, delivery_distance, number_of_items, time, live))
+
+    def _put(self, sample):
+        """
+        Queue a sampled order, or count it as dropped when the queue is full.
+        """
+        self.sampled += 1
+        try:
+            self._queue.put_nowait(sample)
+        except queue.Full:
+            self.dropped += 1
+
+    def evaluate(self, cart_value, delivery_distance, number_of_items, time, live):
+        """
+        Price an order with the candidate tariff, and add its difference with the live breakdown to the
+        statistics.
+
+        Args:
+            cart_value (int): Total value of items in the shopping cart in cents.
+            delivery_distance (int): Distance of the delivery in meters.
+            number_of_items (int): Number of items in the order.
+            time (datetime): Delivery time.
+            live (FeeBreakdown): The breakdown the order was priced with.
+        """
+        candidate = self.candidate.breakdown(cart_value, delivery_distance, number_of_items, time)
+        delta = candidate.total - live.total
+        with self._lock:
+            self._evaluated += 1
+            self._delta_sum += delta
+            self._deltas[delta] += 1
+            if delta:
+                self._changed += 1
+                for rule, live_value, candidate_value in zip(RULES, live, candidate):
+                    if live_value != candidate_value:
+                        self._rules[rule] += 1
+
+    def start(self):
+        """
+        Start the background thread, in this process and in every process forked from it.
+        """
+        if self._started:
+            return
+        self._started = True
+        self._start_worker()
+        # Threads do not survive a fork, and the queue and its locks are not shared, so every forked worker
+        # starts afresh
+        os.register_at_fork(after_in_child=self._restart_worker)
+
+    def _restart_worker(self):
+        """
+        Start the background thread of a forked process, with statistics of its own.
+        """
+        self._reset()
+        self._start_worker()
+
+    def _start_worker(self):
+        thread = threading.Thread(target=self._work, name="shadow-pricer", daemon=True)
+        thread.start()
+
+    def _work(self):
+        """
+        Evaluate the queued orders, for the lifetime of the process.
+        """
+        while True:
+            order = self._queue.get()
+            self.evaluate(*order)
+            self._queue.task_done()
+
+    def join(self):
+        """
+        Wait until every queued order is evaluated. The background thread has to be started.
+        """
+        self._queue.join()
+
+    def stats(self):
+        """
+        Return the aggregated differences between the candidate and the live fees.
+
+        Returns:
+            dict: The candidate version and the sample rate; the numbers of sampled, dropped, queued, evaluated
+            and changed orders; the share of changed orders; the mean and percentiles of the fee deltas in
+            cents (candidate minus live); and the number of changed orders by changed component.
+        """
+        with self._lock:
+            evaluated = self._evaluated
+            changed = self._changed
+            delta_sum = self._delta_sum
+            deltas = self._deltas.copy()
+            rules = dict(self._rules)
+        return {
+            "candidate_version": self.candidate.version,
+            "sample_rate": self.sample_rate,
+            "sampled": self.sampled,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "evaluated": evaluated,
+            "changed": changed,
+            "changed_share": changed / evaluated if evaluated else 0.0,
+            "mean_delta": delta_sum / evaluated if evaluated else 0.0,
+            "delta_percentiles": {
+                f"p{round(fraction * 100)}": counter_percentile(deltas, fraction)
+                for fraction in PERCENTILES
+            },
+            "min_delta": min(deltas, default=None),
+            "max_delta": max(deltas, default=None),
+            "rules": rules,
+        }
+
+
+def load_shadow():
+    """
+    Build the shadow pricer of the settings, and start it.
+
+    Returns:
+        ShadowPricer: The started pricer, None when no candidate pricing file is set.
+    """
+    if config.SHADOW_PRICING_FILE is None:
+        return None
+    pricer = ShadowPricer(
+        load_tariff(config.SHADOW_PRICING_FILE), config.SHADOW_SAMPLE_RATE, config.SHADOW_QUEUE_SIZE
+    )
+    pricer.start()
+    return pricer
+
+
+SHADOW = load_shadow()
@@ -0,0 +1,427 @@
+import hashlib
+from .breakdown import FREE_DELIVERY, FeeBreakdown
+from .constants import *
+from .money import HALF_BASIS_POINTS, ROUND_HALF_EVEN, ROUNDING_MODES, round_basis_points, to_cents
+from .rush import RushCalendar
+
+DEFAULT_MAX_TABLE_ITEMS = 100
+DEFAULT_MAX_TABLE_INTERVALS = 100
+DEFAULT_VERSION = "default"
+
+
+class Tariff:
+    """
+    Represents a fee schedule, compiled once from the pricing constants or a pricing file.
+
+    All amounts are converted to integer cents and the rush multipliers to integer basis points when the tariff
+    is built (see fee_calculator.money), and the item surcharge and the distance fee are precomputed into lookup
+    tables, so pricing an order only takes comparisons, table lookups and integer arithmetic. Values beyond the
+    tables are computed with the same rules.
+
+    A tariff is never modified once built: a pricing change builds a new tariff, which replaces the current
+    one (see fee_calculator.pricing), so a request holding a tariff is priced consistently throughout. Its
+    fingerprint, a hash of its rules and version, keys the cached responses (see fee_calculator.dedup).
+
+    Args:
+        base_delivery_fee: The base delivery fee in Euros.
+        base_distance: The distance in meters covered by the base delivery fee.
+        fee_per_additional_interval: The fee in Euros for every started additional distance interval.
+        additional_distance_interval: The length in meters of an additional distance interval.
+        small_order_cart_value: The cart value in Euros below which the small order surcharge is applied.
+        surchargeable_items_threshold: The items count including and above which every item is surcharged.
+        excess_charge_per_item: The surcharge per item in cents.
+        bulk_items_threshold: The items count above which the bulk fee is applied.
+        bulk_fee: The bulk fee in Euros.
+        rush_day: The ISO weekday of the rush hours.
+        rush_hour_start: The start hour (24-hour format) of the rush hours.
+        rush_hour_end: The end hour (24-hour format) of the rush hours.
+        rush_fee_multiplier: The multiplier applied to the fee during rush hours.
+        rush_calendar: The RushCalendar of the rush hours, replacing the single weekly window of the four
+            settings above when given.
+        rush_rounding: The rounding mode of the half cents of the fee during rush hours, "half_up" or
+            "half_even".
+        free_delivery_cart_value: The cart value in Euros from which the delivery is free.
+        max_possible_delivery_fee: The maximum possible delivery fee in Euros.
+        version: The version of the fee schedule, reported with the fees it priced.
+        max_table_items: The largest number of items with a precomputed item surcharge.
+        max_table_intervals: The largest distance interval index with a precomputed distance fee.
+
+    Methods:
+        distance_interval(delivery_distance): Calculate the index of the distance interval.
+        distance_fee(delivery_distance): Calculate the distance-based delivery fee.
+        small_order_surcharge(cart_value): Calculate surcharge for small orders.
+        item_surcharge(number_of_items): Calculate surcharge for large item quantities.
+        is_rush(time): Check whether the time is in the rush hours.
+        rush_fee(fee, time): Apply the rush multiplier of the time to the fee.
+        breakdown(cart_value, delivery_distance, number_of_items, time): Calculate the components of the delivery fee.
+        total_fee(cart_value, delivery_distance, number_of_items, time): Calculate the total delivery fee.
+        pricing_key(cart_value, delivery_distance, number_of_items, time): Calculate the pricing-equivalence class.
+    """
+
+    __slots__ = (
+        "base_delivery_fee",
+        "base_distance",
+        "fee_per_additional_interval",
+        "additional_distance_interval",
+        "small_order_cart_value",
+        "surchargeable_items_threshold",
+        "excess_charge_per_item",
+        "bulk_items_threshold",
+        "bulk_fee",
+        "rush_day",
+        "rush_hour_start",
+        "rush_hour_end",
+        "rush_fee_multiplier",
+        "rush_calendar",
+        "rush_days",
+        "rush_rounding",
+        "free_delivery_cart_value",
+        "max_possible_delivery_fee",
+        "version",
+        "fingerprint",
+        "distance_fees",
+        "item_surcharges",
+        "item_surcharge_parts",
+    )
+
+    def __init__(
+        self,
+        base_delivery_fee=BASE_DELIVERY_FEE,
+        base_distance=BASE_DISTANCE,
+        fee_per_additional_interval=FEE_PER_ADDITIONAL_INTERVAL,
+        additional_distance_interval=ADDITIONAL_DISTANCE_INTERVAL,
+        small_order_cart_value=SMALL_ORDER_CART_VALUE,
+        surchargeable_items_threshold=SURCHARGEABLE_ITEMS_THRESHOLD,
+        excess_charge_per_item=EXCESS_CHARGE_PER_ITEM,
+        bulk_items_threshold=BULK_ITEMS_THRESHOLD,
+        bulk_fee=BULK_FEE,
+        rush_day=FRIDAY,
+        rush_hour_start=RUSH_HOUR_START,
+        rush_hour_end=RUSH_HOUR_END,
+        rush_fee_multiplier=RUSH_FEE_MULTIPLIER,
+        rush_calendar=None,
+        rush_rounding=RUSH_ROUNDING,
+        free_delivery_cart_value=FREE_DELIVERY_CART_VALUE,
+        max_possible_delivery_fee=MAX_POSSIBLE_DELIVERY_FEE,
+        version=DEFAULT_VERSION,
+        max_table_items=DEFAULT_MAX_TABLE_ITEMS,
+        max_table_intervals=DEFAULT_MAX_TABLE_INTERVALS,
+    ):
+        # Euro amounts are compiled to integer cents
+        self.base_delivery_fee = to_cents(base_delivery_fee)
+        self.base_distance = base_distance
+        self.fee_per_additional_interval = to_cents(fee_per_additional_interval)
+        self.additional_distance_interval = additional_distance_interval
+        self.small_order_cart_value = to_cents(small_order_cart_value)
+        self.surchargeable_items_threshold = surchargeable_items_threshold
+        self.excess_charge_per_item = excess_charge_per_item
+        self.bulk_items_threshold = bulk_items_threshold
+        self.bulk_fee = to_cents(bulk_fee)
+        self.rush_day = rush_day
+        self.rush_hour_start = rush_hour_start
+        self.rush_hour_end = rush_hour_end
+        self.rush_fee_multiplier = rush_fee_multiplier
+        if rush_calendar is None:
+            rush_calendar = RushCalendar.weekly(
+                rush_day, rush_hour_start, rush_hour_end, rush_fee_multiplier
+            )
+        self.rush_calendar = rush_calendar
+        if rush_rounding not in ROUNDING_MODES:
+            raise ValueError(f"rush_rounding should be one of {', '.join(ROUNDING_MODES)}")
+        self.rush_rounding = rush_rounding
+        # The day tables, when they are all there is to the calendar, for breakdown() to index directly
+        if rush_calendar.zone is None and not rush_calendar.exceptions:
+            self.rush_days = rush_calendar.days
+        else:
+            self.rush_days = None
+        self.free_delivery_cart_value = to_cents(free_delivery_cart_value)
+        self.max_possible_delivery_fee = to_cents(max_possible_delivery_fee)
+        self.version = version
+
+        # Index i holds the distance fee of the i-th additional interval, 0 being the base distance
+        self.distance_fees = tuple(
+            self.base_delivery_fee + self.fee_per_additional_interval * interval
+            for interval in range(max_table_intervals + 1)
+        )
+        # Index i holds the per-item surcharge and the bulk fee of i items, and their sum
+        self.item_surcharge_parts = tuple(
+            self._compute_item_surcharge_parts(number_of_items)
+            for number_of_items in range(max_table_items + 1)
+        )
+        self.item_surcharges = tuple(sum(parts) for parts in self.item_surcharge_parts)
+        self.fingerprint = self._compute_fingerprint()
+
+    def _compute_fingerprint(self):
+        """
+        Hash everything the responses priced with the tariff depend on: the compiled rules and the version.
+
+        Two tariffs with the same fingerprint price every order the same, whatever their version strings, so the
+        fingerprint, unlike the version, tells apart the fee schedules of pricing files that forgot to change it.
+
+        Returns:
+            bytes: The 16-byte hash.
+        """
+        calendar = self.rush_calendar
+        rules = (
+            self.base_delivery_fee,
+            self.base_distance,
+            self.fee_per_additional_interval,
+            self.additional_distance_interval,
+            self.small_order_cart_value,
+            self.surchargeable_items_threshold,
+            self.excess_charge_per_item,
+            self.bulk_items_threshold,
+            self.bulk_fee,
+            self.rush_rounding,
+            self.free_delivery_cart_value,
+            self.max_possible_delivery_fee,
+            self.version,
+            calendar.basis_points,
+            calendar.days,
+            sorted(calendar.exceptions.items()),
+            None if calendar.zone is None else calendar.zone.key,
+        )
+        return hashlib.blake2b(repr(rules).encode(), digest_size=16).digest()
+
+    def _compute_item_surcharge_parts(self, number_of_items):
+        """
+        Compute the per-item surcharge and the bulk fee without the lookup table.
+        """
+        excess_item_surcharge = 0
+        bulk_fee = 0
+
+        if number_of_items >= self.surchargeable_items_threshold:
+            # Subtracting 1 because no. of items including the threshold are considered as excess
+            excess_items = number_of_items - (self.surchargeable_items_threshold - 1)
+            excess_item_surcharge = self.excess_charge_per_item * excess_items
+
+        if number_of_items > self.bulk_items_threshold:
+            bulk_fee = self.bulk_fee
+
+        return excess_item_surcharge, bulk_fee
+
+    def _compute_item_surcharge(self, number_of_items):
+        """
+        Compute the item surcharge without the lookup table.
+        """
+        return sum(self._compute_item_surcharge_parts(number_of_items))
+
+    def distance_interval(self, delivery_distance):
+        """
+        Calculate the index of the distance interval.
+
+        Args:
+            delivery_distance (int): Distance of the delivery in meters.
+
+        Returns:
+            int: 0 within the base distance, otherwise the number of started additional distance intervals.
+        """
+        if delivery_distance <= self.base_distance:
+            return 0
+        # Integer ceil division of the excess distance by the interval length
+        return (
+            delivery_distance - self.base_distance - 1
+        ) // self.additional_distance_interval + 1
+
+    def distance_fee(self, delivery_distance):
+        """
+        Calculate the distance-based delivery fee.
+
+        Args:
+            delivery_distance (int): Distance of the delivery in meters.
+
+        Returns:
+            int: Distance-based delivery fee in cents.
+        """
+        if delivery_distance <= self.base_distance:
+            return self.base_delivery_fee
+
+        # Same as distance_interval(), inlined because this is on the hot path of every quote
+        interval = (
+            delivery_distance - self.base_distance - 1
+        ) // self.additional_distance_interval + 1
+        try:
+            return self.distance_fees[interval]
+        except IndexError:
+            return self.base_delivery_fee + self.fee_per_additional_interval * interval
+
+    def small_order_surcharge(self, cart_value):
+        """
+        Calculate surcharge for small orders.
+
+        Args:
+            cart_value (int): Total value of items in the shopping cart in cents.
+
+        Returns:
+            int: Surcharge amount in cents.
+        """
+        if cart_value < self.small_order_cart_value:
+            return self.small_order_cart_value - cart_value
+        return 0
+
+    def item_surcharge(self, number_of_items):
+        """
+        Calculate surcharge for large item quantities.
+
+        Args:
+            number_of_items (int): Number of items in the order.
+
+        Returns:
+            int: Surcharge amount in cents.
+        """
+        try:
+            return self.item_surcharges[number_of_items]
+        except IndexError:
+            return self._compute_item_surcharge(number_of_items)
+
+    def is_rush(self, time):
+        """
+        Check whether the time is in the rush hours.
+
+        Args:
+            time (datetime): Delivery time.
+
+        Returns:
+            bool: True if the time is in the rush hours.
+        """
+        return self.rush_calendar.code(time) != 0
+
+    def rush_fee(self, fee, time):
+        """
+        Apply the rush multiplier of the time to the fee.
+
+        Args:
+            fee (int): The delivery fee in cents.
+            time (datetime): Delivery time.
+
+        Returns:
+            int: The delivery fee in cents, rounded to a whole cent with the rush rounding during rush hours.
+        """
+        code = self.rush_calendar.code(time)
+        if code:
+            return round_basis_points(fee * self.rush_calendar.basis_points[code], self.rush_rounding)
+        return fee
+
+    def breakdown(self, cart_value, delivery_distance, number_of_items, time):
+        """
+        Calculate the components of the delivery fee, and the total, in a single pass.
+
+        Args:
+            cart_value (int): Total value of items in the shopping cart in cents.
+            delivery_distance (int): Distance of the delivery in meters.
+            number_of_items (int): Number of items in the order.
+            time (datetime): Delivery time.
+
+        Returns:
+            FeeBreakdown: The components of the delivery fee and the total, in cents.
+        """
+        # Free delivery for high cart value
+        if cart_value >= self.free_delivery_cart_value:
+            return FREE_DELIVERY
+
+        # The components are inlined, with the same rules as their methods, because this is the hot path
+        excess_distance = delivery_distance - self.base_distance
+        if excess_distance <= 0:
+            distance_fee = self.base_delivery_fee
+        else:
+            interval = (excess_distance - 1) // self.additional_distance_interval + 1
+            try:
+                distance_fee = self.distance_fees[interval]
+            except IndexError:
+                distance_fee = self.base_delivery_fee + self.fee_per_additional_interval * interval
+
+        small_order_surcharge = self.small_order_cart_value - cart_value
+        if small_order_surcharge < 0:
+            small_order_surcharge = 0
+
+        try:
+            item_surcharge, bulk_fee = self.item_surcharge_parts[number_of_items]
+        except IndexError:
+            item_surcharge, bulk_fee = self._compute_item_surcharge_parts(number_of_items)
+
+        fee = distance_fee + small_order_surcharge + item_surcharge + bulk_fee
+        # Same as rush_calendar.code(), without the call when the calendar is only the day tables
+        rush_days = self.rush_days
+        if rush_days is None:
+            code = self.rush_calendar.code(time)
+        else:
+            table = rush_days[time.weekday()]
+            code = 0 if table is None else table[time.hour * 60 + time.minute]
+        if code:
+            # Same as round_basis_points(), inlined: an exact integer product, rounded half up, and down again
+            # when the half-even rounding went up to an odd cent
+            scaled = fee * self.rush_calendar.basis_points[code]
+            rush_fee = (scaled + HALF_BASIS_POINTS) // BASIS_POINTS
+            if rush_fee & 1 and scaled % BASIS_POINTS == HALF_BASIS_POINTS:
+                if self.rush_rounding == ROUND_HALF_EVEN:
+                    rush_fee -= 1
+            rush_uplift = rush_fee - fee
+            fee = rush_fee
+        else:
+            rush_uplift = 0
+
+        # Cap the delivery fee
+        cap_reduction = fee - self.max_possible_delivery_fee
+        if cap_reduction > 0:
+            fee -= cap_reduction
+        else:
+            cap_reduction = 0
+
+        return FeeBreakdown(
+            (
+                distance_fee,
+                small_order_surcharge,
+                item_surcharge,
+                bulk_fee,
+                rush_uplift,
+                cap_reduction,
+                False,
+                fee,
+            )
+        )
+
+    def total_fee(self, cart_value, delivery_distance, number_of_items, time):
+        """
+        Calculate the total delivery fee, as the total of breakdown().
+
+        Args:
+            cart_value (int): Total value of items in the shopping cart in cents.
+            delivery_distance (int): Distance of the delivery in meters.
+            number_of_items (int): Number of items in the order.
+            time (datetime): Delivery time.
+
+        Returns:
+            int: Total delivery fee in cents.
+        """
+        return self.breakdown(cart_value, delivery_distance, number_of_items, time).total
+
+    def pricing_key(self, cart_value, delivery_distance, number_of_items, time):
+        """
+        Calculate the pricing-equivalence class of an order.
+
+        Orders with the same key have the same total delivery fee: the fee only depends on whether the
+        delivery is free, the small order shortfall, the distance interval, the number of surchargeable
+        items, whether the bulk fee applies and the rush multiplier of the time. The bulk fee is part of the key
+        on its own, as the bulk items threshold may be below the surchargeable items threshold.
+
+        Args:
+            cart_value (int): Total value of items in the shopping cart in cents.
+            delivery_distance (int): Distance of the delivery in meters.
+            number_of_items (int): Number of items in the order.
+            time (datetime): Delivery time.
+
+        Returns:
+            tuple: The pricing-equivalence class, () for free deliveries.
+        """
+        if cart_value >= self.free_delivery_cart_value:
+            return ()
+        return (
+            self.small_order_surcharge(cart_value),
+            self.distance_interval(delivery_distance),
+            max(number_of_items - (self.surchargeable_items_threshold - 1), 0),
+            number_of_items > self.bulk_items_threshold,
+            self.rush_calendar.code(time),
+        )
+
+
+DEFAULT_TARIFF = Tariff()
@@ -0,0 +1,205 @@
+"""
+Per-venue fee schedules, looked up by the venue_id of an order.
+
+A venues file is a JSON object with a version, named fee schedules and the schedule of every venue (or city,
+any ID will do):
+
+    {
+        "version": "2024-02",
+        "schedules": {
+            "helsinki": {"base_delivery_fee": 2.5, "rush": {"timezone": "Europe/Helsinki", "windows": []}},
+            "espoo": {"base_delivery_fee": 1.9}
+        },
+        "venues": {"venue-1": "helsinki", "venue-2": "helsinki", "venue-3": "espoo"}
+    }
+
+A schedule holds the settings of a pricing file (see fee_calculator.pricing) except the version, which is the
+one of the file followed by the name of the schedule, e.g. "2024-02/helsinki". Every schedule is compiled
+into a single Tariff, shared by all of its venues.
+
+The registry is built for hundreds of thousands of venues: instead of a dict holding a key object and a
+reference per venue, the venue IDs are joined into one string and indexed by an open-addressing hash
+table of arrays, so a venue costs a few dozen bytes and a lookup is a hash and, on average, one probe.
+"""
+import json
+from array import array
+from . import config
+
+MIN_CAPACITY = 8
+EMPTY_SLOT = -1
+
+
+class TariffRegistry:
+    """
+    Immutable mapping of venue IDs to the Tariff of their fee schedule.
+
+    Args:
+        venues: Iterable of (venue_id, tariff) pairs. Venues with the same Tariff object share it.
+        version (str): The version of the venues file, None when the registry is built in code.
+
+    Attributes:
+        version: The version of the venues file.
+        schedules: The distinct Tariffs of the venues.
+
+    Methods:
+        get(venue_id): Return the Tariff of a venue.
+
+    Raises:
+        ValueError: If a venue ID is given twice.
+    """
+
+    __slots__ = (
+        "version",
+        "schedules",
+        "_keys",
+        "_offsets",
+        "_hashes",
+        "_schedule_indexes",
+        "_slots",
+        "_mask",
+    )
+
+    def __init__(self, venues, version=None):
+        self.version = version
+        schedule_indexes = {}
+        keys = []
+        hashes = array("q")
+        indexes = []
+        for venue_id, tariff in venues:
+            keys.append(venue_id)
+            hashes.append(hash(venue_id))
+            index, _ = schedule_indexes.setdefault(id(tariff), (len(schedule_indexes), tariff))
+            indexes.append(index)
+        self.schedules = tuple(tariff for _, tariff in schedule_indexes.values())
+        self._schedule_indexes = array("H" if len(self.schedules) <= 0xFFFF else "I", indexes)
+        self._hashes = hashes
+
+        # Entry i is the ID from offset i to offset i + 1 of the joined IDs
+        self._keys = "".join(keys)
+        self._offsets = array("Q", [0])
+        for key in keys:
+            self._offsets.append(self._offsets[-1] + len(key))
+
+        # At most half of the slots are used, which keeps the probe sequences short
+        capacity = MIN_CAPACITY
+        while capacity < 2 * len(keys):
+            capacity *= 2
+        self._mask = capacity - 1
+        self._slots = array("i", [EMPTY_SLOT]) * capacity
+        for entry, key in enumerate(keys):
+            slot = self._find(key)
+            if self._slots[slot] != EMPTY_SLOT:
+                raise ValueError(f"Duplicate venue {key}")
+            self._slots[slot] = entry
+
+    def _find(self, venue_id):
+        """
+        Probe the hash table for a venue ID.
+
+        Returns:
+            int: The slot of the venue, or the empty slot ending the probe sequence if it is not registered.
+        """
+        key_hash = hash(venue_id)
+        mask = self._mask
+        slot = key_hash & mask
+        slots = self._slots
+        while True:
+            entry = slots[slot]
+            if entry == EMPTY_SLOT:
+                return slot
+            if (
+                self._hashes[entry] == key_hash
+                and self._keys[self._offsets[entry] : self._offsets[entry + 1]] == venue_id
+            ):
+                return slot
+            slot = (slot + 1) & mask
+
+    def get(self, venue_id):
+        """
+        Return the Tariff of a venue.
+
+        Args:
+            venue_id (str): The ID of the venue.
+
+        Returns:
+            Tariff: The fee schedule of the venue, None if it is not registered.
+        """
+        # _find() inlined, this is on the path of every venue order
+        key_hash = hash(venue_id)
+        mask = self._mask
+        slot = key_hash & mask
+        slots = self._slots
+        while True:
+            entry = slots[slot]
+            if entry == EMPTY_SLOT:
+                return None
+            if (
+                self._hashes[entry] == key_hash
+                and self._keys[self._offsets[entry] : self._offsets[entry + 1]] == venue_id
+            ):
+                return self.schedules[self._schedule_indexes[entry]]
+            slot = (slot + 1) & mask
+
+    def __contains__(self, venue_id):
+        return self.get(venue_id) is not None
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __iter__(self):
+        """
+        Iterate over the venue IDs, in the order they were registered.
+        """
+        offsets = self._offsets
+        for entry in range(len(self)):
+            yield self._keys[offsets[entry] : offsets[entry + 1]]
+
+
+def load_registry(path):
+    """
+    Read, validate and compile a venues file.
+
+    Args:
+        path (str): Path of the JSON venues file.
+
+    Returns:
+        TariffRegistry: The venues and their fee schedules.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not valid JSON (json.JSONDecodeError), a schedule is not a valid pricing
+            (ValidationError), or a venue refers to an unknown schedule.
+    """
+    from .pricing_schema import PricingConfig
+
+    with open(path) as file:
+        data = json.load(file)
+    if not isinstance(data, dict) or set(data) != {"version", "schedules", "venues"}:
+        raise ValueError(
+            "Venues file should contain a JSON object with version, schedules and venues"
+        )
+    version, schedules, venues = data["version"], data["schedules"], data["venues"]
+    if not isinstance(version, str) or not version:
+        raise ValueError("The version should be a non-empty string")
+    if not isinstance(schedules, dict) or not isinstance(venues, dict):
+        raise ValueError("The schedules and the venues should be JSON objects")
+
+    tariffs = {}
+    for name, settings in schedules.items():
+        if not isinstance(settings, dict) or "version" in settings:
+            raise ValueError(
+                f"Schedule {name} should be a JSON object of pricing settings without a version"
+            )
+        tariffs[name] = PricingConfig(version=f"{version}/{name}", **settings).compile()
+
+    def venue_tariffs():
+        for venue_id, name in venues.items():
+            tariff = tariffs.get(name) if isinstance(name, str) else None
+            if tariff is None:
+                raise ValueError(f"Venue {venue_id} has an unknown schedule {name!r}")
+            yield venue_id, tariff
+
+    return TariffRegistry(venue_tariffs(), version)
+
+
+VENUES = TariffRegistry(()) if config.VENUES_FILE is None else load_registry(config.VENUES_FILE)
@@ -8,6 +8,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from fee_calculator.app import app
+from fee_calculator.metrics import FIELD_INDEXES, METRICS, SUM_INDEX, VALIDATE_OFFSET
 
 
 class TestItemMethods(unittest.TestCase):
@@ -20,6 +21,11 @@ class TestItemMethods(unittest.TestCase):
         test_invalid_input: Tests the API endpoint with invalid input data.
         test_missing_input: Tests the API endpoint with missing fields in input data.
         test_missing_invalid_input: Tests the API endpoint with missing fields and invalid input data.
+        test_out_of_bounds_input: Tests the API endpoint with values above the maximum of their field.
+        test_batch_valid_input: Tests the batch API endpoint with valid input data.
+        test_batch_invalid_input: Tests the batch API endpoint with invalid input data.
+        test_cache_stats: Tests the quote cache counters endpoint.
+        test_metrics: Tests the Prometheus metrics endpoint.
     """
 
     def setUp(self):
@@ -100,6 +106,135 @@ class TestItemMethods(unittest.TestCase):
         )
         self.assertEqual(response.status_code, 400)
 
+    def test_out_of_bounds_input(self):
+        """
+        Test case for verifying the API's response to values too large to price.
+
+        This method sends POST requests with every field at its maximum, and
+        with 2**31 and 2**63 in one field at a time, and checks for a successful
+        response at the maximum and an error response (status code 400) naming
+        the field otherwise.
+        """
+        order = {
+            "cart_value": 790,
+            "delivery_distance": 2235,
+            "number_of_items": 4,
+            "time": "2024-01-15T13:00:00Z",
+        }
+        for field in ("cart_value", "delivery_distance", "number_of_items"):
+            response = self.app.post("/", json={**order, field: 2**31 - 1})
+            self.assertEqual(response.status_code, 200, field)
+            for value in (2**31, 2**63):
+                response = self.app.post("/", json={**order, field: value})
+                self.assertEqual(response.status_code, 400, (field, value))
+                self.assertEqual(list(json.loads(response.data)["Validation Error"]), [field])
+
+    def test_batch_valid_input(self):
+        """
+        Test case for verifying the batch API's response to valid input.
+
+        This method sends a POST request with the columns of two orders and
+        checks for a successful response (status code 200) and
+        one delivery fee per order, in the order of the input.
+        """
+        response = self.app.post(
+            "/batch",
+            json={
+                "cart_value": [790, 20000],
+                "delivery_distance": [2235, 1000],
+                "number_of_items": [4, 3],
+                "time": ["2024-01-15T13:00:00Z", "2024-01-26T15:00:00Z"],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        response_data = json.loads(response.data)
+        self.assertEqual(response_data["delivery_fees"], [710, 0])
+
+    def test_batch_invalid_input(self):
+        """
+        Test case for verifying the batch API's response to invalid input.
+
+        This method sends POST requests with an invalid value, with columns
+        of different lengths and with values too large to price, and checks for an error response (status code 400).
+        """
+        response = self.app.post(
+            "/batch",
+            json={
+                "cart_value": [790, "790"],
+                "delivery_distance": [2235, 2235],
+                "number_of_items": [4, 4],
+                "time": ["2024-01-15T13:00:00Z", "2024-01-15T13:00:00Z"],
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("cart_value", json.loads(response.data)["Validation Error"])
+
+        response = self.app.post(
+            "/batch",
+            json={
+                "cart_value": [790, 790],
+                "delivery_distance": [2235],
+                "number_of_items": [4, 4],
+                "time": ["2024-01-15T13:00:00Z", "2024-01-15T13:00:00Z"],
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.app.post(
+            "/batch",
+            json={
+                "cart_value": [790, 2**63],
+                "delivery_distance": [2235, 2**62],
+                "number_of_items": [4, 4],
+                "time": ["2024-01-15T13:00:00Z", "2024-01-15T13:00:00Z"],
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            set(json.loads(response.data)["Validation Error"]), {"cart_value", "delivery_distance"}
+        )
+
+    def test_cache_stats(self):
+        """
+        Test case for verifying that the quote cache counters are reported.
+
+        This method sends a GET request to '/cache' and checks for a successful
+        response (status code 200) with all the counters.
+        """
+        response = self.app.get("/cache")
+        self.assertEqual(response.status_code, 200)
+        response_data = json.loads(response.data)
+        for counter in ("hits", "misses", "evictions", "invalidations", "size", "maxsize"):
+            self.assertIn(counter, response_data)
+
+    def test_metrics(self):
+        """
+        Test case for verifying that POST / requests are reported by the metrics endpoint.
+
+        This method sends a valid and an invalid POST request, then a GET request to '/metrics'
+        and checks for a successful response (status code 200) in the Prometheus text format.
+        """
+        self.app.post("/", json={"cart_value": 790, "delivery_distance": 2235, "number_of_items": 4,
+                                 "time": "2024-01-15T13:00:00Z"})
+        self.app.post("/", json={"cart_value": 790})
+        response = self.app.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        text = response.get_data(as_text=True)
+        self.assertIn('fee_calculator_stage_duration_seconds_count{stage="price"}', text)
+        self.assertIn('fee_calculator_requests_total{outcome="400"}', text)
+        self.assertIn('fee_calculator_validation_errors_total{field="time"}', text)
+
+        # The 400 responses of POST / are timed, and only their validation errors are counted
+        before = METRICS.values()
+        self.app.post("/", json={"cart_value": 790})
+        self.app.post("/batch", json={"cart_value": [790]})
+        self.app.post("/quote", json={"cart_value": 790})
+        after = METRICS.values()
+        validations = slice(VALIDATE_OFFSET, VALIDATE_OFFSET + SUM_INDEX)
+        self.assertEqual(sum(after[validations]) - sum(before[validations]), 1)
+        self.assertEqual(after[FIELD_INDEXES["time"]] - before[FIELD_INDEXES["time"]], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
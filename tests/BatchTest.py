@@ -0,0 +1,165 @@
+import unittest
+import itertools
+import sys
+import os
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pydantic import ValidationError
+from fee_calculator.Order import Order
+from fee_calculator.batch import OrderBatch, calculate_delivery_fees
+from fee_calculator.constants import MAX_CART_VALUE, MAX_DELIVERY_DISTANCE, MAX_ITEMS_COUNT
+
+
+class TestOrderBatchMethods(unittest.TestCase):
+    """
+    Test suite for the vectorized fee calculation of an OrderBatch.
+
+    The batch results are compared against the scalar Order methods over a grid of boundary values.
+
+    Methods:
+        setUp: Builds the boundary grid and the corresponding batch.
+        test_components_match_order: Tests every fee component against the Order methods.
+        test_total_matches_order: Tests the total delivery fee against the Order method.
+        test_calculate_delivery_fees: Tests the library function against the Order method.
+        test_invalid_values: Tests that invalid values are rejected like in Order.
+        test_mismatched_lengths: Tests that columns of different lengths are rejected.
+        test_maximum_values: Tests the fees at the maximum values, and that larger values are rejected.
+    """
+
+    def setUp(self):
+        """
+        Build the boundary grid of orders, and the batch made of the same orders.
+        """
+        cart_values = [1, 499, 500, 999, 1000, 1001, 19999, 20000, 20001]
+        delivery_distances = [1, 999, 1000, 1001, 1499, 1500, 1501, 2000, 3001, 10000]
+        numbers_of_items = [1, 4, 5, 12, 13, 14, 50]
+        times = [
+            "2024-01-15T13:00:00Z",
+            "2024-01-26T14:59:59Z",
+            "2024-01-26T15:00:00Z",
+            "2024-01-26T18:59:59Z",
+            "2024-01-26T19:00:00Z",
+        ]
+        rows = list(
+            itertools.product(cart_values, delivery_distances, numbers_of_items, times)
+        )
+        self.orders = [
+            Order(
+                cart_value=cart_value,
+                delivery_distance=delivery_distance,
+                number_of_items=number_of_items,
+                time=time,
+            )
+            for cart_value, delivery_distance, number_of_items, time in rows
+        ]
+        self.columns = {
+            "cart_value": [row[0] for row in rows],
+            "delivery_distance": [row[1] for row in rows],
+            "number_of_items": [row[2] for row in rows],
+            "time": [row[3] for row in rows],
+        }
+        self.batch = OrderBatch(**self.columns)
+
+    def test_components_match_order(self):
+        """
+        Test that every fee component of the batch equals the one of the scalar Order.
+        """
+        self.assertEqual(
+            self.batch.calculate_distance_fees().tolist(),
+            [order.calculate_distance_fee() for order in self.orders],
+        )
+        self.assertEqual(
+            self.batch.calculate_small_order_surcharges().tolist(),
+            [order.calculate_small_order_surcharge() for order in self.orders],
+        )
+        self.assertEqual(
+            self.batch.calculate_item_surcharges().tolist(),
+            [order.calculate_item_surcharge() for order in self.orders],
+        )
+        fees = self.batch.calculate_distance_fees()
+        self.assertEqual(
+            self.batch.calculate_friday_rush(fees).tolist(),
+            [
+                order.calculate_friday_rush(fee)
+                for order, fee in zip(self.orders, fees.tolist())
+            ],
+        )
+
+    def test_total_matches_order(self):
+        """
+        Test that the total delivery fee of the batch equals the one of the scalar Order.
+        """
+        self.assertEqual(
+            self.batch.calculate_total_delivery_fees().tolist(),
+            [order.calculate_total_delivery_fee() for order in self.orders],
+        )
+
+    def test_calculate_delivery_fees(self):
+        """
+        Test that the library function returns the same fees as the scalar Order.
+        """
+        self.assertEqual(
+            calculate_delivery_fees(**self.columns).tolist(),
+            [order.calculate_total_delivery_fee() for order in self.orders],
+        )
+
+    def test_invalid_values(self):
+        """
+        Test that the invalid values rejected by Order are rejected by OrderBatch too.
+        """
+        with self.assertRaises(ValidationError):
+            OrderBatch(
+                cart_value=[1500, "1500"],
+                delivery_distance=[1000, 1000],
+                number_of_items=[3, 3],
+                time=["2024-01-15T13:00:00Z", "2024-01-15T13:00:00Z"],
+            )
+
+        with self.assertRaises(ValidationError):
+            OrderBatch(
+                cart_value=[1500, 1500],
+                delivery_distance=[1000, 0],
+                number_of_items=[3, 3],
+                time=["2024-01-15T13:00:00Z", "2024-01-36T13:00:00Z"],
+            )
+
+    def test_mismatched_lengths(self):
+        """
+        Test that columns with a different number of rows are rejected.
+        """
+        with self.assertRaises(ValidationError) as context:
+            OrderBatch(
+                cart_value=[1500, 1500],
+                delivery_distance=[1000],
+                number_of_items=[3, 3],
+                time=["2024-01-15T13:00:00Z", "2024-01-15T13:00:00Z"],
+            )
+        self.assertEqual(context.exception.errors()[0]["loc"], ("delivery_distance",))
+
+
+    def test_maximum_values(self):
+        """
+        Test that the fees at the maximum values equal the ones of the scalar Order, and that larger values,
+        whose fees would overflow int64, are rejected.
+        """
+        columns = {
+            "cart_value": [1, 1, MAX_CART_VALUE],
+            "delivery_distance": [MAX_DELIVERY_DISTANCE, 1, MAX_DELIVERY_DISTANCE],
+            "number_of_items": [1, MAX_ITEMS_COUNT, MAX_ITEMS_COUNT],
+            "time": ["2024-01-26T16:00:00Z"] * 3,
+        }
+        orders = [Order(**dict(zip(columns, row))) for row in zip(*columns.values())]
+        self.assertEqual(
+            OrderBatch(**columns).calculate_total_delivery_fees().tolist(),
+            [order.calculate_total_delivery_fee() for order in orders],
+        )
+        for field, value in (("cart_value", 2**63), ("delivery_distance", 2**62), ("number_of_items", 2**60)):
+            with self.assertRaises(ValidationError):
+                OrderBatch(**{**columns, field: [value] * 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.suite import compare, is_valid
+from benchmarks.traffic import generate_traffic
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """
+    Test suite for the traffic generator and the regression check of the benchmark suite.
+
+    Methods:
+        test_traffic_is_deterministic: Tests that the same seed generates the same traffic.
+        test_traffic_mix: Tests that the generated traffic contains every kind of request.
+        test_compare: Tests that only cases slower than the threshold are reported.
+    """
+
+    def test_traffic_is_deterministic(self):
+        """
+        Test that the same seed generates the same traffic, and another seed different traffic.
+        """
+        self.assertEqual(generate_traffic(100, seed=1), generate_traffic(100, seed=1))
+        self.assertNotEqual(generate_traffic(100, seed=1), generate_traffic(100, seed=2))
+
+    def test_traffic_mix(self):
+        """
+        Test that the traffic contains rush hour, bulk, free delivery and invalid requests.
+        """
+        payloads = generate_traffic(1000)
+        valid = [payload for payload in payloads if is_valid(payload)]
+        self.assertTrue(0 < len(payloads) - len(valid) < 100)
+        self.assertTrue(any(payload["number_of_items"] > 12 for payload in valid))
+        self.assertTrue(any(payload["cart_value"] >= 20000 for payload in valid))
+        self.assertTrue(any(payload["time"].startswith("2024-01-26T1") for payload in valid))
+
+    def test_compare(self):
+        """
+        Test that cases slower than the threshold are reported, and other or new cases are not.
+        """
+        baseline = {"fast": {"ns_per_op": 100}, "slow": {"ns_per_op": 100}}
+        results = {
+            "fast": {"ns_per_op": 120},
+            "slow": {"ns_per_op": 130},
+            "new": {"ns_per_op": 1000},
+        }
+        self.assertEqual(compare(results, baseline, 0.25), [("slow", 100, 130, 1.3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import tempfile
+import socket
+import json
+import sys
+import os
+from datetime import datetime, timezone
+from random import Random
+from unittest import mock
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fee_calculator import binary
+from fee_calculator.app import app
+from fee_calculator.binary import REQUEST, RESPONSE, QuoteClient, invalid_fields
+from fee_calculator.binary_server import QuoteServer, answer
+
+FRIDAY_RUSH = datetime(2024, 1, 26, 16, tzinfo=timezone.utc)
+MONDAY = datetime(2024, 1, 22, 13, tzinfo=timezone.utc)
+
+
+class TestBinaryProtocol(unittest.TestCase):
+    """
+    Test suite for the binary quote protocol over a Unix domain socket.
+
+    Methods:
+        test_answer: Tests that the responses of the request frames agree with POST / on random orders.
+        test_invalid_fields: Tests the fields of the 400 responses.
+        test_client: Tests the client against a server, with and without pipelining.
+        test_split_frames: Tests that the frames split across reads are answered.
+    """
+
+    def setUp(self):
+        """
+        Set up method to start a server on a socket of a temporary directory.
+        """
+        self.client = app.test_client()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "quote.sock")
+        self.server = QuoteServer(self.path)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.close()
+        self.directory.cleanup()
+
+    def test_answer(self):
+        """
+        Test that the fee or validation error of every request frame is the one of POST / for the same order.
+        """
+        random = Random(0)
+        orders = [
+            (
+                random.randint(-5, 25000),
+                random.randint(-5, 5000),
+                random.randint(-1, 20),
+                random.choice((FRIDAY_RUSH, MONDAY)).replace(minute=random.randrange(60)),
+            )
+            for _ in range(300)
+        ]
+        frames = b"".join(
+            REQUEST.pack(cart_value, distance, items, int(time.timestamp()))
+            for cart_value, distance, items, time in orders
+        )
+        responses = list(RESPONSE.iter_unpack(answer(frames)))
+        self.assertEqual(len(responses), len(orders))
+        for (cart_value, distance, items, time), (status, value) in zip(orders, responses):
+            payload = {
+                "cart_value": cart_value,
+                "delivery_distance": distance,
+                "number_of_items": items,
+                "time": time.isoformat(),
+            }
+            response = self.client.post("/", json=payload)
+            self.assertEqual(status, response.status_code, payload)
+            if status == 200:
+                self.assertEqual(value, response.json["delivery_fee"], payload)
+            else:
+                self.assertEqual(invalid_fields(value), list(response.json["Validation Error"]), payload)
+
+    def test_invalid_fields(self):
+        """
+        Test that every invalid field has its bit set, including a time out of the range of datetime.
+        """
+        status, value = RESPONSE.unpack(answer(REQUEST.pack(0, 1, -2, 2**62)))
+        self.assertEqual(status, 400)
+        self.assertEqual(invalid_fields(value), ["cart_value", "number_of_items", "time"])
+        self.assertEqual(answer(b""), b"")
+
+    def test_client(self):
+        """
+        Test a single quote, pipelined quotes over several chunks and an invalid order through the client.
+        """
+        with QuoteClient(self.path) as client:
+            self.assertEqual(client.quote(790, 2235, 4, datetime(2024, 1, 15, 13)), 710)
+            self.assertEqual(client.quote(790, 2235, 4, FRIDAY_RUSH), 852)
+            self.assertEqual(client.quote(790, 2235, 4, int(MONDAY.timestamp())), 710)
+            with self.assertRaisesRegex(ValueError, "delivery_distance"):
+                client.quote(790, 0, 4, MONDAY)
+            orders = [(790, 2235, 4, MONDAY), (790, 2235, 0, MONDAY), (790, 2235, 4, FRIDAY_RUSH)] * 7
+            with mock.patch.object(binary, "PIPELINE_DEPTH", 4):
+                self.assertEqual(client.quote_many(orders), [710, None, 852] * 7)
+            self.assertEqual(client.quote_many([]), [])
+
+    def test_split_frames(self):
+        """
+        Test that frames written a few bytes at a time are answered once complete.
+        """
+        frames = REQUEST.pack(790, 2235, 4, int(MONDAY.timestamp())) * 2
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(self.path)
+            connection.sendall(frames[:7])
+            connection.sendall(frames[7:29])
+            self.assertEqual(RESPONSE.unpack(connection.recv(RESPONSE.size)), (200, 710))
+            connection.sendall(frames[29:])
+            self.assertEqual(RESPONSE.unpack(connection.recv(RESPONSE.size)), (200, 710))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+import itertools
+import json
+import sys
+import os
+from datetime import datetime
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pydantic import ValidationError
+from fee_calculator.app import app
+from fee_calculator.breakdown import FeeBreakdown
+from fee_calculator.fast_order import quote
+from fee_calculator.tariff import DEFAULT_TARIFF, Tariff
+from tests import reference_fees
+from tests.TariffTest import CART_VALUES, DELIVERY_DISTANCES, NUMBERS_OF_ITEMS, TIMES
+
+
+def component_sum(breakdown):
+    """
+    Add up the components of a breakdown.
+    """
+    return (
+        breakdown.distance_fee
+        + breakdown.small_order_surcharge
+        + breakdown.item_surcharge
+        + breakdown.bulk_fee
+        + breakdown.rush_uplift
+        - breakdown.cap_reduction
+    )
+
+
+class TestFeeBreakdown(unittest.TestCase):
+    """
+    Test suite for the single-pass fee breakdown and the POST /quote endpoint.
+
+    Methods:
+        setUp: Prepares the test client for the application.
+        test_breakdown_grid: Tests the breakdown over the full boundary grid of tests/TariffTest.py.
+        test_components: Tests the components of a few typical orders.
+        test_table_bounds: Tests the breakdown of item counts and distances beyond the lookup tables.
+        test_immutable: Tests that a breakdown cannot be modified.
+        test_quote: Tests the library call.
+        test_quote_endpoint: Tests that POST /quote reports the breakdown whose total POST / responds with.
+        test_quote_invalid_input: Tests POST /quote with invalid input data.
+    """
+
+    def setUp(self):
+        """
+        Set up method to initialize a test client for the Flask application.
+        """
+        self.app = app.test_client()
+
+    def test_breakdown_grid(self):
+        """
+        Test that the components add up to the total, which equals the reference fee and total_fee().
+        """
+        for row in itertools.product(CART_VALUES, DELIVERY_DISTANCES, NUMBERS_OF_ITEMS, TIMES):
+            breakdown = DEFAULT_TARIFF.breakdown(*row)
+            self.assertEqual(breakdown.total, reference_fees.total_delivery_fee(*row))
+            self.assertEqual(breakdown.total, DEFAULT_TARIFF.total_fee(*row))
+            if breakdown.free_delivery:
+                self.assertEqual(breakdown, (0, 0, 0, 0, 0, 0, True, 0))
+            else:
+                self.assertEqual(component_sum(breakdown), breakdown.total)
+
+    def test_components(self):
+        """
+        Test the components of a plain order, a rush hour order, a capped order and a free delivery.
+        """
+        friday = datetime.fromisoformat("2024-01-26T16:00:00Z")
+        monday = datetime.fromisoformat("2024-01-22T16:00:00Z")
+        self.assertEqual(
+            DEFAULT_TARIFF.breakdown(790, 2235, 4, monday).to_dict(),
+            {
+                "distance_fee": 500,
+                "small_order_surcharge": 210,
+                "item_surcharge": 0,
+                "bulk_fee": 0,
+                "rush_uplift": 0,
+                "cap_reduction": 0,
+                "free_delivery": False,
+                "total": 710,
+            },
+        )
+        rush = DEFAULT_TARIFF.breakdown(790, 2235, 5, friday)
+        self.assertEqual(rush.item_surcharge, 50)
+        self.assertEqual(rush.rush_uplift, 152)
+        self.assertEqual(rush.total, 912)
+
+        capped = DEFAULT_TARIFF.breakdown(100, 10000, 20, friday)
+        self.assertEqual(capped.bulk_fee, 120)
+        self.assertEqual(capped.total, 1500)
+        self.assertGreater(capped.cap_reduction, 0)
+
+        free = DEFAULT_TARIFF.breakdown(20000, 10000, 20, friday)
+        self.assertTrue(free.free_delivery)
+        self.assertEqual(free.total, 0)
+
+    def test_table_bounds(self):
+        """
+        Test that a tariff without lookup tables breaks the fees down like the default one.
+        """
+        tariff = Tariff(max_table_items=0, max_table_intervals=0)
+        for row in itertools.product(CART_VALUES, DELIVERY_DISTANCES, NUMBERS_OF_ITEMS, TIMES[:4]):
+            self.assertEqual(tariff.breakdown(*row), DEFAULT_TARIFF.breakdown(*row))
+
+    def test_immutable(self):
+        """
+        Test that the fields of a breakdown cannot be assigned and that it has no instance dictionary.
+        """
+        breakdown = DEFAULT_TARIFF.breakdown(790, 2235, 4, TIMES[0])
+        self.assertIsInstance(breakdown, FeeBreakdown)
+        with self.assertRaises(AttributeError):
+            breakdown.total = 0
+        with self.assertRaises(AttributeError):
+            breakdown.discount = 0
+        with self.assertRaises(TypeError):
+            breakdown[7] = 0
+        self.assertFalse(hasattr(breakdown, "__dict__"))
+        self.assertTrue(repr(breakdown).startswith("FeeBreakdown(distance_fee=500, "))
+
+    def test_quote(self):
+        """
+        Test that quote() validates the order like the app and returns its breakdown.
+        """
+        order = {
+            "cart_value": 790,
+            "delivery_distance": 2235,
+            "number_of_items": 4,
+            "time": "2024-01-15T13:00:00Z",
+        }
+        self.assertEqual(quote(order), DEFAULT_TARIFF.breakdown(790, 2235, 4, TIMES[0]))
+        self.assertEqual(quote(order, Tariff(base_delivery_fee=3)).distance_fee, 600)
+        with self.assertRaises(ValidationError):
+            quote({**order, "cart_value": -1})
+
+    def test_quote_endpoint(self):
+        """
+        Test that POST /quote reports the components and the total that POST / responds with.
+        """
+        for cart_value, number_of_items, time in itertools.product(
+            [100, 790, 20000], [1, 4, 13], ["2024-01-15T13:00:00Z", "2024-01-26T16:00:00Z"]
+        ):
+            order = {
+                "cart_value": cart_value,
+                "delivery_distance": 2235,
+                "number_of_items": number_of_items,
+                "time": time,
+            }
+            response = self.app.post("/quote", json=order)
+            self.assertEqual(response.status_code, 200)
+            quoted = json.loads(response.data)
+            self.assertEqual(set(quoted), set(FeeBreakdown.FIELDS) | {"pricing_version"})
+            self.assertEqual(quoted["pricing_version"], "default")
+            total = json.loads(self.app.post("/", json=order).data)["delivery_fee"]
+            self.assertEqual(quoted["total"], total)
+
+    def test_quote_invalid_input(self):
+        """
+        Test that POST /quote responds with the validation errors of POST / and a 400 status code.
+        """
+        order = {"cart_value": -1, "delivery_distance": 2235, "time": "2024-01-15T13:00:00Z"}
+        response = self.app.post("/quote", json=order)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, self.app.post("/", json=order).data)
+
+
+if __name__ == "__main__":
+    unittest.main()
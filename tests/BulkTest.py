@@ -0,0 +1,176 @@
+import unittest
+import io
+import itertools
+import json
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fee_calculator.bulk import main, price_chunk, read_ndjson, reprice
+
+VALID_ORDER = {
+    "cart_value": 790,
+    "delivery_distance": 2235,
+    "number_of_items": 4,
+    "time": "2024-01-15T13:00:00Z",
+}
+
+
+class TestBulkRepricing(unittest.TestCase):
+    """
+    Test suite for the bulk re-pricing command-line tool.
+
+    Methods:
+        test_reprice_is_lazy: Tests that the input is consumed one chunk at a time.
+        test_ndjson: Tests re-pricing NDJSON input, with valid and invalid rows.
+        test_csv: Tests re-pricing CSV input, with valid and invalid rows.
+        test_pricing_file: Tests re-pricing with a given pricing file.
+        test_unexpected_errors: Tests that rows raising unexpected errors are rejected and the run goes on.
+    """
+
+    def test_reprice_is_lazy(self):
+        """
+        Test that pricing the first chunk of an endless input only reads that chunk.
+        """
+        records = ((line, VALID_ORDER) for line in itertools.count(1))
+        priced, rejects = next(reprice(records, chunk_size=3))
+        self.assertEqual([fee for _, fee in priced], [710, 710, 710])
+        self.assertEqual(rejects, [])
+        self.assertEqual(next(records)[0], 4)
+
+    def test_ndjson(self):
+        """
+        Test that valid NDJSON rows are priced and invalid ones are rejected with their line number.
+        """
+        lines = [
+            json.dumps(VALID_ORDER),
+            json.dumps({**VALID_ORDER, "cart_value": "790", "number_of_items": 0}),
+            "",
+            "not json",
+            json.dumps({**VALID_ORDER, "cart_value": 20000}),
+        ]
+        records = read_ndjson(io.StringIO("\n".join(lines)))
+        priced, rejects = next(reprice(records))
+        self.assertEqual([fee for _, fee in priced], [710, 0])
+        self.assertEqual(
+            rejects,
+            [
+                {
+                    "line": 2,
+                    "Validation Error": {
+                        "cart_value": "Input should be a valid integer",
+                        "number_of_items": "Input should be greater than or equal to 1",
+                    },
+                },
+                {
+                    "line": 4,
+                    "Validation Error": {"order": "Input should be a valid JSON object"},
+                },
+            ],
+        )
+
+    def test_csv(self):
+        """
+        Test that valid CSV rows are written out with their fee and invalid ones to the reject file.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "orders.csv")
+            output_path = os.path.join(directory, "priced.csv")
+            rejects_path = os.path.join(directory, "rejects.ndjson")
+            with open(input_path, "w") as file:
+                file.write(
+                    "cart_value,delivery_distance,number_of_items,time\n"
+                    "790,2235,4,2024-01-15T13:00:00Z\n"
+                    "790,,4,2024-01-15T13:00:00Z\n"
+                    "7.9,2235,4,2024-01-15T13:00:00Z\n"
+                )
+
+            status = main([input_path, "-o", output_path, "--rejects", rejects_path])
+
+            self.assertEqual(status, 1)
+            with open(output_path) as file:
+                self.assertEqual(
+                    file.read().splitlines(),
+                    [
+                        "cart_value,delivery_distance,number_of_items,time,delivery_fee",
+                        "790,2235,4,2024-01-15T13:00:00Z,710",
+                    ],
+                )
+            with open(rejects_path) as file:
+                rejects = [json.loads(line) for line in file]
+            self.assertEqual(
+                rejects,
+                [
+                    {"line": 3, "Validation Error": {"delivery_distance": "Field required"}},
+                    {
+                        "line": 4,
+                        "Validation Error": {
+                            "cart_value": "Input should be a valid integer"
+                        },
+                    },
+                ],
+            )
+
+    def test_pricing_file(self):
+        """
+        Test that the orders are priced with the pricing file given with --pricing.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "orders.ndjson")
+            output_path = os.path.join(directory, "priced.ndjson")
+            pricing_path = os.path.join(directory, "pricing.json")
+            with open(input_path, "w") as file:
+                file.write(json.dumps(VALID_ORDER) + "\n")
+            with open(pricing_path, "w") as file:
+                json.dump({"version": "2024-02-01", "base_delivery_fee": 3}, file)
+
+            status = main([input_path, "-o", output_path, "--pricing", pricing_path])
+
+            self.assertEqual(status, 0)
+            with open(output_path) as file:
+                self.assertEqual(json.loads(file.read())["delivery_fee"], 810)
+
+
+    def test_unexpected_errors(self):
+        """
+        Test that a time pydantic fails with a bare ValueError, and a row raising any other error, are written to
+        the rejects while the other rows are priced.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "orders.csv")
+            output_path = os.path.join(directory, "priced.csv")
+            rejects_path = os.path.join(directory, "rejects.ndjson")
+            with open(input_path, "w") as file:
+                file.write(
+                    "cart_value,delivery_distance,number_of_items,time\n"
+                    "790,2235,4,0000-01-01T00:00:00Z\n"
+                    "790,2235,4,2024-01-15T13:00:00Z\n"
+                )
+
+            status = main([input_path, "-o", output_path, "--rejects", rejects_path])
+
+            self.assertEqual(status, 1)
+            with open(output_path) as file:
+                self.assertEqual(file.read().splitlines()[1:], ["790,2235,4,2024-01-15T13:00:00Z,710"])
+            with open(rejects_path) as file:
+                rejects = [json.loads(line) for line in file]
+            self.assertEqual(
+                rejects, [{"line": 2, "Validation Error": {"time": "Input should be a valid datetime"}}]
+            )
+
+        # Only the row validated by Order raises
+        with mock.patch("fee_calculator.columnar.Order", side_effect=RuntimeError("unexpected")):
+            priced, rejects = price_chunk([(1, VALID_ORDER), (2, {**VALID_ORDER, "time": 1705323600})])
+        self.assertEqual([fee for _, fee in priced], [710])
+        self.assertEqual(
+            rejects, [{"line": 2, "Validation Error": {"order": "Order could not be validated: unexpected"}}]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
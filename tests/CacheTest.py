@@ -0,0 +1,98 @@
+import unittest
+import itertools
+import sys
+import os
+from datetime import datetime
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fee_calculator.cache import QuoteCache
+from fee_calculator.tariff import DEFAULT_TARIFF, Tariff
+
+MONDAY = datetime.fromisoformat("2024-01-15T13:00:00Z")
+FRIDAY_RUSH = datetime.fromisoformat("2024-01-26T15:00:00Z")
+
+
+class TestQuoteCache(unittest.TestCase):
+    """
+    Test suite for the LRU memoization of total delivery fees.
+
+    Methods:
+        test_same_fees: Tests that cached fees equal the fees of the tariff over a boundary grid.
+        test_equivalent_orders: Tests that orders in the same pricing-equivalence class share an entry.
+        test_lru_eviction: Tests that the least recently used entry is evicted.
+        test_invalidation: Tests that the cache is cleared when the tariff changes.
+        test_disabled: Tests that a cache of size 0 stores nothing.
+    """
+
+    def test_same_fees(self):
+        """
+        Test that the fees returned through the cache equal the ones of the tariff, on the first and second call,
+        including with a bulk items threshold below the surchargeable items threshold.
+        """
+        for tariff in (DEFAULT_TARIFF, Tariff(surchargeable_items_threshold=10, bulk_items_threshold=3)):
+            cache = QuoteCache(64)
+            grid = itertools.product(
+                [1, 500, 999, 1000, 19999, 20000],
+                [1, 1000, 1001, 1500, 1501, 3001],
+                [1, 3, 4, 5, 9, 10, 12, 13],
+                [MONDAY, FRIDAY_RUSH],
+            )
+            for row in grid:
+                expected = tariff.total_fee(*row)
+                self.assertEqual(cache.total_fee(tariff, *row), expected, row)
+                self.assertEqual(cache.total_fee(tariff, *row), expected, row)
+
+    def test_equivalent_orders(self):
+        """
+        Test that orders differing only within their distance interval and below the item threshold hit the same entry.
+        """
+        cache = QuoteCache(8)
+        cache.total_fee(DEFAULT_TARIFF, 790, 1501, 1, MONDAY)
+        cache.total_fee(DEFAULT_TARIFF, 790, 2000, 4, MONDAY)
+        cache.total_fee(DEFAULT_TARIFF, 20000, 1000, 4, MONDAY)
+        cache.total_fee(DEFAULT_TARIFF, 30000, 5000, 20, FRIDAY_RUSH)
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used entry is evicted when the cache is full.
+        """
+        cache = QuoteCache(2)
+        cache.total_fee(DEFAULT_TARIFF, 100, 1000, 1, MONDAY)
+        cache.total_fee(DEFAULT_TARIFF, 200, 1000, 1, MONDAY)
+        cache.total_fee(DEFAULT_TARIFF, 100, 1000, 1, MONDAY)
+        cache.total_fee(DEFAULT_TARIFF, 300, 1000, 1, MONDAY)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+        cache.total_fee(DEFAULT_TARIFF, 100, 1000, 1, MONDAY)
+        self.assertEqual(cache.stats()["hits"], 2)
+        cache.total_fee(DEFAULT_TARIFF, 200, 1000, 1, MONDAY)
+        self.assertEqual(cache.stats()["misses"], 4)
+
+    def test_invalidation(self):
+        """
+        Test that a fee cached for one tariff is not returned for another one.
+        """
+        cache = QuoteCache(8)
+        cheaper_tariff = Tariff(base_delivery_fee=1)
+        self.assertEqual(cache.total_fee(DEFAULT_TARIFF, 1000, 1000, 1, MONDAY), 200)
+        self.assertEqual(cache.total_fee(cheaper_tariff, 1000, 1000, 1, MONDAY), 100)
+        self.assertEqual(cache.stats()["invalidations"], 1)
+        self.assertEqual(cache.stats()["size"], 1)
+
+    def test_disabled(self):
+        """
+        Test that a cache of size 0 prices every order with the tariff and stores nothing.
+        """
+        cache = QuoteCache(0)
+        self.assertEqual(cache.total_fee(DEFAULT_TARIFF, 1000, 1000, 1, MONDAY), 200)
+        self.assertEqual(cache.stats()["size"], 0)
+        self.assertEqual(cache.stats()["misses"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+import tempfile
+import threading
+import json
+import sys
+import os
+from unittest import mock
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from werkzeug.serving import make_server
+from benchmarks.replay import replay
+from benchmarks.traffic import generate_traffic
+from fee_calculator.app import app
+from fee_calculator.capture import RECORD_HEADER, TrafficCapture, read_capture, read_log
+
+ORDER = {
+    "cart_value": 790,
+    "delivery_distance": 2235,
+    "number_of_items": 4,
+    "time": "2024-01-15T13:00:00Z",
+}
+
+
+class TestTrafficCapture(unittest.TestCase):
+    """
+    Test suite for the capture of the POST / traffic and its replay.
+
+    Methods:
+        test_app: Tests that the POST / requests and their responses are captured, and no other request.
+        test_rotation: Tests that the logs are rotated and the oldest ones dropped.
+        test_fork: Tests that a forked process closes the log of its parent and writes its own.
+        test_read_capture: Tests the merge of the logs in time order, and a record cut short.
+        test_replay: Tests the replay of a capture against a server, with and without mismatches.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.captures = []
+
+    def tearDown(self):
+        for capture in self.captures:
+            capture.close()
+        self.directory.cleanup()
+
+    def capture(self, bodies, content_type="application/json"):
+        """
+        Send the bodies to the app with the traffic capture enabled.
+
+        Returns:
+            TrafficCapture: The capture, flushed.
+        """
+        capture = TrafficCapture(self.directory.name)
+        self.captures.append(capture)
+        client = app.test_client()
+        with mock.patch("fee_calculator.app.CAPTURE", capture):
+            for body in bodies:
+                client.post("/", data=body, content_type=content_type)
+            client.post("/quote", json=ORDER)
+            client.get("/")
+        capture.flush()
+        return capture
+
+    def test_app(self):
+        """
+        Test that the body, content type, status and response of every POST / request are captured.
+        """
+        capture = self.capture([json.dumps(ORDER), json.dumps({**ORDER, "cart_value": 0})])
+        self.capture(["not json"], "text/plain")
+        self.assertEqual(capture.records, 2)
+        records = list(read_capture(self.directory.name))
+        self.assertEqual([record[1:4] for record in records], [
+            ("application/json", json.dumps(ORDER).encode(), 200),
+            ("application/json", json.dumps({**ORDER, "cart_value": 0}).encode(), 400),
+            ("text/plain", b"not json", 415),
+        ])
+        self.assertEqual(json.loads(records[0][4])["delivery_fee"], 710)
+        self.assertIn("cart_value", json.loads(records[1][4])["Validation Error"])
+        self.assertEqual(records, sorted(records, key=lambda record: record[0]))
+
+    def test_rotation(self):
+        """
+        Test that a log larger than max_bytes is rotated, keeping the given number of backups.
+        """
+        capture = TrafficCapture(self.directory.name, max_bytes=100, backups=2)
+        self.captures.append(capture)
+        for index in range(5):
+            capture.record("application/json", b"x" * 80, 200, str(index).encode())
+        capture.flush()
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            [os.path.basename(capture.path) + suffix for suffix in ("", ".1", ".2")],
+        )
+        # Every record exceeds max_bytes, so the last two rotated ones are kept and the new log is empty
+        self.assertEqual([record[4] for record in read_capture(self.directory.name)], [b"3", b"4"])
+        self.assertEqual(os.path.getsize(capture.path), 0)
+
+    def test_fork(self):
+        """
+        Test that a forked process closes the inherited log and appends to its own, and that the records buffered
+        before forking are written once, by the parent.
+        """
+        capture = TrafficCapture(self.directory.name)
+        self.captures.append(capture)
+        capture.record("application/json", b"{}", 200, b"parent")
+        inherited = capture._file
+        pid = os.fork()
+        if pid == 0:
+            # The child exits without the test runner, with its status telling the checks that failed
+            status = int(not inherited.closed) + 2 * int(capture.path == inherited.name)
+            capture.record("application/json", b"{}", 200, b"child")
+            capture.close()
+            os._exit(status)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        self.assertFalse(inherited.closed)
+        capture.close()
+        self.assertEqual(sorted(record[4] for record in read_capture(self.directory.name)), [b"child", b"parent"])
+
+    def test_read_capture(self):
+        """
+        Test that the logs of several processes are merged in time order, and a torn record ends its log.
+        """
+        paths = [os.path.join(self.directory.name, f"capture_{pid}.log") for pid in (1, 2)]
+        for path, times in zip(paths, ((1.0, 3.0), (2.0, 4.0))):
+            with open(path, "wb") as file:
+                for timestamp in times:
+                    file.write(RECORD_HEADER.pack(timestamp, 200, 0, 2, 2) + b"{}{}")
+        with open(paths[1], "ab") as file:
+            file.write(RECORD_HEADER.pack(5.0, 200, 0, 2, 2) + b"{}")
+        self.assertEqual([record[0] for record in read_capture(self.directory.name)], [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(len(list(read_log(paths[1]))), 2)
+
+    def test_replay(self):
+        """
+        Test that a capture of generated traffic replays without mismatches, and that a changed response is
+        reported.
+        """
+        bodies = [json.dumps(payload) for payload in generate_traffic(200, seed=5)]
+        self.capture(bodies)
+        records = list(read_capture(self.directory.name))
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/"
+            result = replay(records, url, concurrency=4, speed=0)
+            self.assertEqual((result["requests"], result["errors"], result["mismatches"]), (200, 0, 0))
+            self.assertGreater(result["p99_ms"], 0)
+
+            records[7] = (*records[7][:4], b'{"delivery_fee": 1, "pricing_version": "default"}')
+            result = replay(records[:10], url, concurrency=2, speed=100)
+            self.assertEqual(result["mismatches"], 1)
+            self.assertEqual(result["first_mismatches"][0]["index"], 7)
+        finally:
+            server.shutdown()
+            thread.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
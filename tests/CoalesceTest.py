@@ -0,0 +1,180 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+import tempfile
+from time import perf_counter
+from unittest import mock
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from uvicorn.middleware.wsgi import WSGIMiddleware
+from benchmarks.asgi_client import asgi_request
+from benchmarks.traffic import generate_traffic
+from fee_calculator.app import app
+from fee_calculator.capture import TrafficCapture, read_capture
+from fee_calculator.coalesce import COLUMNAR_MIN_BATCH, CoalescingApp, OrderCoalescer
+from fee_calculator.dedup import ResponseCache
+from fee_calculator.metrics import METRICS, OUTCOME_INDEXES, PRICE_OFFSET, RESPONSE_CACHE_OFFSET, SUM_INDEX
+
+ORDER = {
+    "cart_value": 790,
+    "delivery_distance": 2235,
+    "number_of_items": 4,
+    "time": "2024-01-15T13:00:00Z",
+}
+
+
+class TestCoalesce(unittest.TestCase):
+    """
+    Test suite for the coalescing of concurrent POST / requests.
+
+    Methods:
+        setUp: Prepares the test client of the Flask app.
+        test_responses: Tests that every coalesced request gets the response of the app.
+        test_batches: Tests that a batch is priced when full, or when the window ends.
+        test_passthrough: Tests that the other requests and the bodies that are not JSON objects reach the app.
+        test_failing_order: Tests that an order raising an unexpected error only fails its own request.
+        test_hooks: Tests the request metrics, the response cache and the traffic capture of coalesced requests.
+    """
+
+    def setUp(self):
+        """
+        Set up method to initialize a test client for the Flask application.
+        """
+        self.client = app.test_client()
+
+    def test_responses(self):
+        """
+        Test that the concurrent requests of generated traffic get the status and the body POST / responds with.
+        """
+        payloads = generate_traffic(300)
+        # Batches priced order by order, and column by column
+        for max_batch in (16, COLUMNAR_MIN_BATCH):
+            coalescer = OrderCoalescer(window=0.002, max_batch=max_batch)
+            coalescing_app = CoalescingApp(WSGIMiddleware(app), coalescer)
+
+            async def send_all():
+                return await asyncio.gather(
+                    *(
+                        asgi_request(coalescing_app, "POST", "/", json.dumps(payload).encode())
+                        for payload in payloads
+                    )
+                )
+
+            for payload, (status, body) in zip(payloads, asyncio.run(send_all())):
+                expected = self.client.post("/", json=payload)
+                self.assertEqual(status, expected.status_code, payload)
+                self.assertEqual(json.loads(body), json.loads(expected.data))
+            self.assertEqual(coalescer.orders, len(payloads))
+            self.assertLess(coalescer.batches, len(payloads) / 8)
+
+    def test_batches(self):
+        """
+        Test that full batches are priced without waiting, and a lone order after the window.
+        """
+        coalescer = OrderCoalescer(window=0.05, max_batch=4)
+
+        async def submit(count):
+            start = perf_counter()
+            responses = await asyncio.gather(*(coalescer.submit(ORDER) for _ in range(count)))
+            return responses, perf_counter() - start
+
+        responses, seconds = asyncio.run(submit(8))
+        self.assertEqual(
+            [response[:2] for response in responses],
+            [(200, {"delivery_fee": 710, "pricing_version": "default"})] * 8,
+        )
+        self.assertEqual(coalescer.batches, 2)
+        self.assertLess(seconds, 0.05)
+
+        responses, seconds = asyncio.run(submit(1))
+        self.assertEqual(coalescer.batches, 3)
+        self.assertGreaterEqual(seconds, 0.05)
+        self.assertLess(seconds, 0.5)
+
+        self.assertEqual(
+            [response[:2] for response in responses], [(200, {"delivery_fee": 710, "pricing_version": "default"})]
+        )
+
+        status, body = asyncio.run(
+            asgi_request(CoalescingApp(None, coalescer), "POST", "/", b'{"time": "Friday"}')
+        )
+        self.assertEqual(status, 400)
+        self.assertIn("cart_value", json.loads(body)["Validation Error"])
+        self.assertEqual(coalescer.orders, 10)
+
+    def test_passthrough(self):
+        """
+        Test that other routes, other content types and invalid JSON bodies are answered by the app.
+        """
+        coalescer = OrderCoalescer()
+        coalescing_app = CoalescingApp(WSGIMiddleware(app), coalescer)
+        for method, path, body, content_type in (
+            ("GET", "/cache", b"", b"application/json"),
+            ("POST", "/", json.dumps(ORDER).encode(), b"text/plain"),
+            ("POST", "/", b"{", b"application/json"),
+            ("POST", "/", b"[1, 2]", b"application/json"),
+        ):
+            status, _ = asyncio.run(asgi_request(coalescing_app, method, path, body, content_type))
+            expected = self.client.open(path, method=method, data=body, content_type=content_type.decode())
+            self.assertEqual(status, expected.status_code, (method, path, body))
+        self.assertEqual(coalescer.orders, 0)
+
+    def test_failing_order(self):
+        """
+        Test that an order raising an unexpected error fails its own request, and not its whole batch.
+        """
+        orders = (ORDER, {**ORDER, "time": 1705323600}, ORDER)
+
+        async def submit_all(coalescer):
+            return await asyncio.gather(*(coalescer.submit(data) for data in orders), return_exceptions=True)
+
+        # Only the order whose time is validated by Order raises, priced order by order, and column by column
+        for min_batch in (4, 3):
+            coalescer = OrderCoalescer(window=0.05, max_batch=3)
+            with mock.patch("fee_calculator.coalesce.COLUMNAR_MIN_BATCH", min_batch), mock.patch(
+                "fee_calculator.columnar.Order", side_effect=RuntimeError("unexpected")
+            ), mock.patch("fee_calculator.coalesce.order_error", side_effect=RuntimeError("unexpected")):
+                responses = asyncio.run(submit_all(coalescer))
+            self.assertEqual(coalescer.batches, 1)
+            self.assertIsInstance(responses[1], RuntimeError)
+            self.assertEqual(
+                [responses[0][:2], responses[2][:2]],
+                [(200, {"delivery_fee": 710, "pricing_version": "default"})] * 2,
+            )
+
+    def test_hooks(self):
+        """
+        Test that coalesced requests are counted and timed, answered from the response cache when sent again, and
+        captured with their responses.
+        """
+        body = json.dumps(ORDER).encode()
+        with tempfile.TemporaryDirectory() as directory:
+            capture = TrafficCapture(directory)
+            cache = ResponseCache(16)
+            with mock.patch("fee_calculator.coalesce.RESPONSE_CACHE", cache), mock.patch(
+                "fee_calculator.coalesce.CAPTURE", capture
+            ):
+                before = METRICS.values()
+                coalescing_app = CoalescingApp(None, OrderCoalescer(window=0.001))
+                responses = [asyncio.run(asgi_request(coalescing_app, "POST", "/", body)) for _ in range(2)]
+                after = METRICS.values()
+            capture.close()
+            records = list(read_capture(directory))
+        self.assertEqual(responses[0], responses[1])
+        self.assertEqual(json.loads(responses[0][1])["delivery_fee"], 710)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(coalescing_app.coalescer.orders, 1)
+        self.assertEqual([record[1:] for record in records], [("application/json", body, *responses[0])] * 2)
+        self.assertEqual(after[OUTCOME_INDEXES[200]] - before[OUTCOME_INDEXES[200]], 2)
+        self.assertEqual(after[RESPONSE_CACHE_OFFSET] - before[RESPONSE_CACHE_OFFSET], 1)
+        self.assertEqual(after[RESPONSE_CACHE_OFFSET + 1] - before[RESPONSE_CACHE_OFFSET + 1], 1)
+        self.assertGreater(after[PRICE_OFFSET + SUM_INDEX], before[PRICE_OFFSET + SUM_INDEX])
+
+
+if __name__ == "__main__":
+    unittest.main()
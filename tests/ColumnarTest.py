@@ -0,0 +1,162 @@
+import unittest
+import sys
+import os
+from datetime import date, datetime
+from unittest import mock
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pydantic import ValidationError
+from benchmarks.traffic import DEFAULT_MIX, generate_traffic
+from fee_calculator import columnar
+from fee_calculator.Order import Order
+from fee_calculator.columnar import record_columns, valid_rows, validate_columns
+from fee_calculator.errors import validation_error_details
+from fee_calculator.tariff import DEFAULT_TARIFF
+from fee_calculator.venues import TariffRegistry
+
+ORDER = {
+    "cart_value": 790,
+    "delivery_distance": 2235,
+    "number_of_items": 4,
+    "time": "2024-01-15T13:00:00Z",
+}
+RECORDS = [
+    ORDER,
+    {**ORDER, "cart_value": 2**31 - 1, "time": datetime(2024, 1, 26, 16)},
+    {},
+    {"cart_value": None, "delivery_distance": True, "number_of_items": 7.0, "time": None},
+    {**ORDER, "cart_value": "790", "delivery_distance": 0, "number_of_items": 2**63},
+    {**ORDER, "time": False},
+    {**ORDER, "time": [2024]},
+    {**ORDER, "extra": "ignored"},
+    # Only pydantic can judge these
+    {**ORDER, "time": 1705323600},
+    {**ORDER, "time": date(2024, 1, 15)},
+    {**ORDER, "time": "2024-01-36T15:00:00Z"},
+    {**ORDER, "number_of_items": 0, "time": "yesterday"},
+    {**ORDER, "venue_id": "unknown"},
+    {**ORDER, "cart_value": 0, "venue_id": 7},
+    {**ORDER, "venue_id": None},
+    {**ORDER, "venue_id": "venue-1"},
+    {**ORDER, "time": "yesterday", "venue_id": ["venue-1"]},
+]
+# The venues of the records, registered for every test
+REGISTRY = TariffRegistry([("venue-1", DEFAULT_TARIFF)])
+
+
+def order_results(records):
+    """
+    Validate every record with Order.
+
+    Returns:
+        list: The time of every valid record, or the error details of every invalid one.
+    """
+    results = []
+    for record in records:
+        try:
+            results.append(Order(**record).time)
+        except ValidationError as error:
+            results.append(validation_error_details(error))
+    return results
+
+
+def column_results(records):
+    """
+    Validate the records with validate_columns().
+
+    Returns:
+        list: The time of every valid record, or the error details of every invalid one.
+    """
+    valid, times, errors = validate_columns(record_columns(records))
+    for row, is_valid in enumerate(valid.tolist()):
+        assert is_valid == (row not in errors) == (times[row] is not None)
+    return [times[row] if row not in errors else errors[row] for row in range(len(records))]
+
+
+class TestColumnarValidation(unittest.TestCase):
+    """
+    Test suite for the column-wise validation of bulk orders.
+
+    Methods:
+        setUp: Registers the venues of the records.
+        test_edge_cases: Tests that the validity, times and error details are the ones of Order on edge cases.
+        test_traffic: Tests the same on generated traffic with a large share of invalid rows.
+        test_no_exceptions: Tests that only the rows only pydantic can judge go through Order.
+        test_valid_rows: Tests the selection of the valid rows of a column.
+        test_order_value_error: Tests that a time Order raises a bare ValueError for is a time error of its row.
+    """
+
+    def setUp(self):
+        """
+        Register the venues of the records for Order and the column-wise validation, undone after each test.
+        """
+        for module in ("Order", "columnar"):
+            patch = mock.patch(f"fee_calculator.{module}.VENUES", REGISTRY)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_edge_cases(self):
+        """
+        Test that every edge case gets the time or the error details of the Order of the same record.
+        """
+        self.assertEqual(column_results(RECORDS), order_results(RECORDS))
+
+    def test_traffic(self):
+        """
+        Test that generated traffic with 50% invalid rows gets the times and error details of Order.
+        """
+        records = generate_traffic(5000, seed=3, mix={**DEFAULT_MIX, "invalid": 0.5})
+        self.assertEqual(column_results(records), order_results(records))
+
+    def test_no_exceptions(self):
+        """
+        Test that the rows with invalid integers, times of the types pydantic always rejects or venue IDs are not
+        validated by Order, and the empty columns.
+        """
+        with mock.patch.object(columnar, "Order", wraps=Order) as order:
+            valid, _, errors = validate_columns(record_columns(RECORDS[:8]))
+            self.assertEqual(order.call_count, 0)
+            self.assertEqual(valid.tolist(), [True, True] + [False] * 5 + [True])
+            self.assertEqual(errors[4]["delivery_distance"], "Input should be greater than or equal to 1")
+            validate_columns(record_columns(RECORDS))
+            self.assertEqual(order.call_count, 5)
+        valid, times, errors = validate_columns(record_columns([]))
+        self.assertEqual((valid.tolist(), times, errors), ([], [], {}))
+
+    def test_valid_rows(self):
+        """
+        Test that the values of the valid rows are selected in order.
+        """
+        valid, _, _ = validate_columns(record_columns(RECORDS[:5]))
+        self.assertEqual(valid_rows(["a", "b", "c", "d", "e"], valid), ["a", "b"])
+
+
+    def test_order_value_error(self):
+        """
+        Test that a time pydantic fails with a ValueError rather than a ValidationError is rejected as an invalid
+        time of its row, with the errors of its other fields, and the other rows are validated as usual.
+        """
+        year_zero = "0000-01-01T00:00:00Z"
+        records = [{**ORDER, "time": year_zero}, {**ORDER, "cart_value": 0, "time": year_zero}, ORDER]
+        with self.assertRaises(ValueError):
+            Order(**records[0])
+        valid, times, errors = validate_columns(record_columns(records))
+        self.assertEqual(valid.tolist(), [False, False, True])
+        self.assertEqual(times[:2], [None, None])
+        self.assertEqual(
+            errors,
+            {
+                0: {"time": "Input should be a valid datetime"},
+                1: {
+                    "cart_value": "Input should be greater than or equal to 1",
+                    "time": "Input should be a valid datetime",
+                },
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
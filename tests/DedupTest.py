@@ -0,0 +1,200 @@
+import unittest
+import tempfile
+import json
+import sys
+import os
+from unittest import mock
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fee_calculator import fast_order
+from fee_calculator.app import app
+from fee_calculator.dedup import FILE_NAME, MAX_SHARED_BODY, SLOT_SIZE, ResponseCache, clear_directory
+from fee_calculator.metrics import Metrics
+from fee_calculator.pricing import PRICING
+from fee_calculator.tariff import DEFAULT_TARIFF, Tariff
+from tests.MetricsTest import parse_export
+
+ORDER = {
+    "cart_value": 790,
+    "delivery_distance": 2235,
+    "number_of_items": 4,
+    "time": "2024-01-15T13:00:00Z",
+}
+
+
+class TestResponseCache(unittest.TestCase):
+    """
+    Test suite for the cache of the POST / responses keyed by the hash of the request body.
+
+    Methods:
+        test_app: Tests that a repeated body gets the cached bytes without being priced, and the hit rate metrics.
+        test_validation_errors: Tests that the 400 responses of validation errors are cached.
+        test_key: Tests that the key depends on the body and the pricing version.
+        test_reload: Tests that a reloaded tariff with other fees misses, even with the same version.
+        test_ttl: Tests that the entries expire.
+        test_lru_eviction: Tests that the least recently used entry of a process is evicted.
+        test_shared: Tests the entries shared by the processes mapping the same file.
+    """
+
+    def setUp(self):
+        """
+        Set up method to initialize a test client for the Flask application.
+        """
+        self.client = app.test_client()
+
+    def post(self, cache, metrics, bodies, content_type="application/json"):
+        """
+        Send the bodies to POST / with the response cache, counting the orders that are validated.
+
+        Returns:
+            tuple: The responses, and the number of validated orders.
+        """
+        with mock.patch("fee_calculator.app.RESPONSE_CACHE", cache), mock.patch(
+            "fee_calculator.app.METRICS", metrics
+        ), mock.patch("fee_calculator.app.parse_order", wraps=fast_order.parse_order) as parse_order:
+            responses = [self.client.post("/", data=body, content_type=content_type) for body in bodies]
+        return responses, parse_order.call_count
+
+    def test_app(self):
+        """
+        Test that a byte-identical body is answered with the same bytes, validated and priced only once.
+        """
+        metrics = Metrics()
+        body = json.dumps(ORDER)
+        other = json.dumps({**ORDER, "cart_value": 791})
+        responses, validated = self.post(ResponseCache(16), metrics, [body, body, other, body])
+        self.assertEqual(validated, 2)
+        self.assertEqual([response.status_code for response in responses], [200] * 4)
+        self.assertEqual(responses[1].data, responses[0].data)
+        self.assertEqual(responses[1].content_type, responses[0].content_type)
+        self.assertEqual(json.loads(responses[3].data)["delivery_fee"], 710)
+        samples = parse_export(metrics.export())
+        self.assertEqual(samples['fee_calculator_response_cache_total{result="hit"}'], 2)
+        self.assertEqual(samples['fee_calculator_response_cache_total{result="miss"}'], 2)
+        self.assertEqual(samples['fee_calculator_requests_total{outcome="200"}'], 4)
+
+        # Disabled, or not a JSON request: never looked up
+        metrics = Metrics()
+        _, validated = self.post(ResponseCache(0), metrics, [body, body])
+        self.assertEqual(validated, 2)
+        responses, _ = self.post(ResponseCache(16), metrics, [body, body], "text/plain")
+        self.assertEqual([response.status_code for response in responses], [415, 415])
+        self.assertEqual(parse_export(metrics.export())['fee_calculator_response_cache_total{result="miss"}'], 0)
+
+    def test_validation_errors(self):
+        """
+        Test that the 400 response of a validation error is cached, and the error counted once.
+        """
+        metrics = Metrics()
+        body = json.dumps({**ORDER, "cart_value": 0})
+        responses, validated = self.post(ResponseCache(16), metrics, [body, body])
+        self.assertEqual(validated, 1)
+        self.assertEqual([response.status_code for response in responses], [400, 400])
+        self.assertEqual(responses[1].data, responses[0].data)
+        self.assertIn("cart_value", json.loads(responses[1].data)["Validation Error"])
+        samples = parse_export(metrics.export())
+        self.assertEqual(samples['fee_calculator_requests_total{outcome="400"}'], 2)
+        self.assertEqual(samples['fee_calculator_validation_errors_total{field="cart_value"}'], 1)
+
+    def test_key(self):
+        """
+        Test that the key differs by a single byte of the body, or by the fingerprint of the tariff.
+        """
+        cache = ResponseCache(16)
+        cache.put(ResponseCache.key(DEFAULT_TARIFF.fingerprint, b'{"a": 1}'), 200, b"one")
+        self.assertEqual(cache.get(ResponseCache.key(DEFAULT_TARIFF.fingerprint, b'{"a": 1}')), (200, b"one"))
+        self.assertIsNone(cache.get(ResponseCache.key(DEFAULT_TARIFF.fingerprint, b'{"a": 1} ')))
+        self.assertIsNone(cache.get(ResponseCache.key(Tariff(version="2024-02-01").fingerprint, b'{"a": 1}')))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_reload(self):
+        """
+        Test that a body sent again after a reload of the pricing is priced with the new tariff when its fees
+        differ, even if the pricing file kept the version, and answered from the cache when they are the same.
+        """
+        cache = ResponseCache(16)
+        body = json.dumps(ORDER)
+        responses = []
+        for tariff in (Tariff(), Tariff(base_delivery_fee=3), Tariff(base_delivery_fee=3)):
+            with mock.patch.object(PRICING, "tariff", tariff):
+                responses += self.post(cache, Metrics(), [body])[0]
+        self.assertEqual([json.loads(response.data) for response in responses], [
+            {"delivery_fee": 710, "pricing_version": "default"},
+            {"delivery_fee": 810, "pricing_version": "default"},
+            {"delivery_fee": 810, "pricing_version": "default"},
+        ])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_ttl(self):
+        """
+        Test that an entry is valid for the time to live, and missed after it.
+        """
+        with tempfile.TemporaryDirectory() as shared_directory:
+            for directory in (None, shared_directory):
+                with mock.patch("fee_calculator.dedup.monotonic", return_value=100.0) as monotonic:
+                    cache = ResponseCache(16, ttl=5, directory=directory)
+                    key = ResponseCache.key(DEFAULT_TARIFF.fingerprint, b"{}")
+                    cache.put(key, 200, b"{}")
+                    monotonic.return_value = 104.9
+                    self.assertEqual(cache.get(key), (200, b"{}"))
+                    monotonic.return_value = 105.0
+                    self.assertIsNone(cache.get(key))
+
+    def test_lru_eviction(self):
+        """
+        Test that the entries of a process are bounded, and the least recently used one is evicted.
+        """
+        cache = ResponseCache(2)
+        keys = [ResponseCache.key(DEFAULT_TARIFF.fingerprint, bytes([index])) for index in range(3)]
+        cache.put(keys[0], 200, b"0")
+        cache.put(keys[1], 200, b"1")
+        cache.get(keys[0])
+        cache.put(keys[2], 200, b"2")
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get(keys[0]), (200, b"0"))
+        self.assertEqual(cache.stats()["size"], 2)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_shared(self):
+        """
+        Test that the processes mapping the same file share their entries, which replace the entry of their
+        slot, that a torn slot or a body too large for a slot is missed, and that reset() maps the file again.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            worker, other_worker = ResponseCache(4, directory=directory), ResponseCache(4, directory=directory)
+            self.assertEqual(os.path.getsize(os.path.join(directory, FILE_NAME)), 4 * SLOT_SIZE)
+            keys = [ResponseCache.key(DEFAULT_TARIFF.fingerprint, str(index).encode()) for index in range(16)]
+            worker.put(keys[0], 400, b'{"Validation Error": {}}')
+            self.assertEqual(other_worker.get(keys[0]), (400, b'{"Validation Error": {}}'))
+
+            # Another key of the same slot replaces the entry
+            colliding = next(key for key in keys[1:] if worker._slot_offset(key) == worker._slot_offset(keys[0]))
+            other_worker.put(colliding, 200, b"{}")
+            self.assertIsNone(worker.get(keys[0]))
+            self.assertEqual(worker.get(colliding), (200, b"{}"))
+            self.assertEqual(other_worker.evictions, 1)
+
+            # A body byte changed by a concurrent write fails the checksum
+            offset = worker._slot_offset(colliding)
+            worker._slots[offset + SLOT_SIZE - MAX_SHARED_BODY] = ord("[")
+            self.assertIsNone(other_worker.get(colliding))
+
+            worker.put(keys[0], 200, b"x" * (MAX_SHARED_BODY + 1))
+            self.assertIsNone(other_worker.get(keys[0]))
+            other_worker.clear()
+            self.assertEqual(worker._slots[:], bytes(4 * SLOT_SIZE))
+
+            # A worker started again after the file was removed shares a new file with the other workers
+            clear_directory(directory)
+            worker.reset()
+            other_worker.reset()
+            worker.put(keys[0], 200, b"{}")
+            self.assertEqual(other_worker.get(keys[0]), (200, b"{}"))
+            self.assertEqual(os.listdir(directory), [FILE_NAME])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import itertools
+import sys
+import os
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pydantic import ValidationError
+from fee_calculator.Order import Order
+from fee_calculator.fast_order import FastOrder, parse_order
+
+INT_VALUES = [1, 2, 1500, 0, -1, True, 1.0, 1.5, "1500", None, [1]]
+TIME_VALUES = [
+    "2024-01-15T13:00:00Z",
+    "2024-01-26T15:00:00",
+    "2024-01-26 18:59:59.123456+02:00",
+    "2024-01-26T18:59",
+    "2024-01-26T18:59Z",
+    "2024-01-26T18:59:59.1234567Z",
+    "2024-01-26T18:59:59-23:59",
+    "2024-01-26t15:00:00z",
+    "2024-01-26T15",
+    "2024-01-26",
+    "2024-01-36T15:00:00",
+    "2024-02-30T15:00:00",
+    "2024-01-26T24:00:00",
+    "2024-01-26T15:00:00+24:00",
+    "2024-01-26T15:00:00+05:60",
+    "2024-01-26T15:00:00-05:99",
+    "0000-01-01T00:00:00",
+    "1706281200",
+    1706281200,
+    "",
+    None,
+]
+FIELDS = ("cart_value", "delivery_distance", "number_of_items", "time")
+
+
+class TestFastOrder(unittest.TestCase):
+    """
+    Differential test suite for the fast validation path against the pydantic Order.
+
+    Methods:
+        test_int_fields: Tests every integer field with valid and invalid values.
+        test_time_field: Tests the time field with valid and invalid values.
+        test_missing_fields: Tests payloads with missing fields and payloads that are not objects.
+    """
+
+    def assertSameValidation(self, data):
+        """
+        Assert that parse_order() returns the same order, or raises the same errors, as Order.
+
+        Pydantic raises a plain ValueError for some dates (e.g. year 0), which must be kept as is too.
+        """
+        try:
+            expected = Order(**data)
+        except ValueError as error:
+            self.assertIsNone(FastOrder.validate(data), data)
+            with self.assertRaises(type(error)) as context:
+                parse_order(data)
+            if isinstance(error, ValidationError):
+                self.assertEqual(context.exception.errors(), error.errors())
+            return
+
+        order = parse_order(data)
+        for field in FIELDS:
+            self.assertEqual(getattr(order, field), getattr(expected, field), data)
+        self.assertEqual(order.time.utcoffset(), expected.time.utcoffset(), data)
+        self.assertEqual(
+            order.calculate_total_delivery_fee(),
+            expected.calculate_total_delivery_fee(),
+            data,
+        )
+
+    def test_int_fields(self):
+        """
+        Test that every integer field is validated like in Order.
+        """
+        for field, value in itertools.product(FIELDS[:3], INT_VALUES):
+            data = {
+                "cart_value": 790,
+                "delivery_distance": 2235,
+                "number_of_items": 4,
+                "time": "2024-01-15T13:00:00Z",
+            }
+            data[field] = value
+            self.assertSameValidation(data)
+
+    def test_time_field(self):
+        """
+        Test that the time field is validated and parsed like in Order.
+        """
+        for value in TIME_VALUES:
+            self.assertSameValidation(
+                {
+                    "cart_value": 790,
+                    "delivery_distance": 2235,
+                    "number_of_items": 4,
+                    "time": value,
+                }
+            )
+
+    def test_missing_fields(self):
+        """
+        Test that payloads with missing fields are rejected like in Order.
+        """
+        for size in range(len(FIELDS)):
+            for fields in itertools.combinations(FIELDS, size):
+                data = {
+                    "cart_value": 0,
+                    "delivery_distance": 2235,
+                    "number_of_items": 4,
+                    "time": "2024-01-15T13:00:00Z",
+                }
+                self.assertSameValidation({field: data[field] for field in fields})
+
+        self.assertIsNone(FastOrder.validate([790, 2235, 4, "2024-01-15T13:00:00Z"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+import base64
+import itertools
+import json
+import sys
+import os
+from datetime import datetime
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from pydantic import ValidationError
+from fee_calculator.app import app
+from fee_calculator.grid import calculate_fee_grid, decode_rle, encode_rle
+from fee_calculator.rush import RushCalendar
+from fee_calculator.tariff import DEFAULT_TARIFF, Tariff
+from tests.TariffTest import CART_VALUES, TIMES
+
+DISTANCES = range(1, 5002, 125)
+ITEMS = range(1, 30)
+REQUEST = {
+    "cart_value": 790,
+    "delivery_distance": {"start": 500, "stop": 3001, "step": 250},
+    "number_of_items": {"start": 1, "stop": 15},
+    "time": "2024-01-26T16:00:00Z",
+}
+
+
+def cell_fees(tariff, cart_value, delivery_distance, number_of_items, time):
+    """
+    Calculate the fees of a grid one cell at a time with Tariff.total_fee().
+    """
+    return [
+        [tariff.total_fee(cart_value, distance, items, time) for items in number_of_items]
+        for distance in delivery_distance
+    ]
+
+
+class TestFeeGrid(unittest.TestCase):
+    """
+    Test suite for the pricing grids and the POST /grid endpoint.
+
+    Methods:
+        setUp: Prepares the test client for the application.
+        test_grid: Tests the grid against Tariff.total_fee() at every cell, for the boundary cart values and times.
+        test_custom_tariff: Tests the grid of a tariff with a rush calendar and without lookup tables.
+        test_rle: Tests the run-length encoding of grids.
+        test_grid_endpoint: Tests POST /grid in every encoding.
+        test_invalid_grid: Tests that empty, too large and out of range grids are rejected.
+    """
+
+    def setUp(self):
+        """
+        Set up method to initialize a test client for the Flask application.
+        """
+        self.app = app.test_client()
+
+    def test_grid(self):
+        """
+        Test that every cell of the grid equals the total fee of its order.
+        """
+        for cart_value, time in itertools.product(CART_VALUES, TIMES):
+            fees = calculate_fee_grid(cart_value, DISTANCES, ITEMS, time, DEFAULT_TARIFF)
+            self.assertEqual(fees.shape, (len(DISTANCES), len(ITEMS)))
+            self.assertEqual(
+                fees.tolist(), cell_fees(DEFAULT_TARIFF, cart_value, DISTANCES, ITEMS, time)
+            )
+
+    def test_custom_tariff(self):
+        """
+        Test that a tariff with several rush multipliers and without lookup tables prices the grid cell by cell.
+        """
+        tariff = Tariff(
+            base_delivery_fee=2.5,
+            max_table_items=0,
+            max_table_intervals=0,
+            rush_calendar=RushCalendar(
+                [((5,), 15 * 60, 19 * 60, 1.15), ((1,), 0, 24 * 60, 1.35)], tz="Europe/Helsinki"
+            ),
+        )
+        for time in TIMES + [datetime(2024, 1, 22, 12)]:
+            fees = calculate_fee_grid(790, DISTANCES, ITEMS, time, tariff)
+            self.assertEqual(fees.tolist(), cell_fees(tariff, 790, DISTANCES, ITEMS, time))
+
+    def test_rle(self):
+        """
+        Test that run-length encoded grids decode to the same fees, and that the runs follow the fee rules.
+        """
+        fees = calculate_fee_grid(790, range(1, 3001), range(1, 5), TIMES[0])
+        runs = encode_rle(fees)
+        # One run of rows per distance fee, and a single fee per row below the surchargeable items threshold
+        self.assertEqual([row_count for row_count, _ in runs], [1000, 500, 500, 500, 500])
+        self.assertEqual(runs[0], [1000, [[410, 4]]])
+        np.testing.assert_array_equal(decode_rle(runs), fees)
+
+        for cart_value, time in itertools.product(CART_VALUES, TIMES):
+            fees = calculate_fee_grid(cart_value, DISTANCES, ITEMS, time)
+            np.testing.assert_array_equal(decode_rle(encode_rle(fees)), fees)
+
+    def test_grid_endpoint(self):
+        """
+        Test that POST /grid returns the same fees in every encoding, and the fees of POST / at every cell.
+        """
+        responses = {}
+        for encoding in ("dense", "rle", "typed"):
+            response = self.app.post("/grid", json={**REQUEST, "encoding": encoding})
+            self.assertEqual(response.status_code, 200)
+            responses[encoding] = json.loads(response.data)
+            self.assertEqual(responses[encoding]["shape"], [11, 14])
+            self.assertEqual(responses[encoding]["pricing_version"], "default")
+            self.assertEqual(responses[encoding]["delivery_distance"], REQUEST["delivery_distance"])
+            self.assertEqual(responses[encoding]["number_of_items"], {**REQUEST["number_of_items"], "step": 1})
+
+        dense = responses["dense"]["fees"]
+        self.assertEqual(decode_rle(responses["rle"]["fees"]).tolist(), dense)
+        typed = np.frombuffer(base64.b64decode(responses["typed"]["fees"]), dtype="<i4")
+        self.assertEqual(typed.reshape(11, 14).tolist(), dense)
+
+        for row, distance in enumerate(range(500, 3001, 250)):
+            for column, items in enumerate(range(1, 15)):
+                if (row + column) % 7:
+                    continue
+                order = {**REQUEST, "delivery_distance": distance, "number_of_items": items}
+                response = self.app.post("/", json=order)
+                self.assertEqual(json.loads(response.data)["delivery_fee"], dense[row][column])
+
+    def test_invalid_grid(self):
+        """
+        Test that empty axes, axes out of the bounds of their field, unknown encodings and grids larger
+        than config.MAX_GRID_CELLS are rejected with a 400 status code.
+        """
+        invalid_requests = [
+            ({"number_of_items": {"start": 5, "stop": 5}}, "number_of_items"),
+            ({"number_of_items": {"start": 1, "stop": 5, "step": 0}}, "number_of_items"),
+            ({"delivery_distance": {"start": 0, "stop": 5}}, "delivery_distance"),
+            ({"delivery_distance": {"start": 2**31 - 2, "stop": 2**62, "step": 2**61}}, "delivery_distance"),
+            ({"delivery_distance": {"start": 1, "stop": 10_000_000}}, "number_of_items"),
+            ({"encoding": "csv"}, "encoding"),
+            ({"cart_value": 0}, "cart_value"),
+            ({"cart_value": 2**63}, "cart_value"),
+        ]
+        for change, field in invalid_requests:
+            response = self.app.post("/grid", json={**REQUEST, **change})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(field, json.loads(response.data)["Validation Error"])
+
+        with self.assertRaises(ValidationError):
+            calculate_fee_grid(790, range(10, 1), ITEMS, TIMES[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+import unittest
+import itertools
+import json
+import sys
+import os
+from datetime import datetime
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fee_calculator.app import app
+from fee_calculator.inverse import (
+    max_base_fee,
+    max_delivery_distance,
+    max_number_of_items,
+    min_cart_value,
+)
+from fee_calculator.money import ROUNDING_MODES, round_basis_points
+from fee_calculator.rush import RushCalendar
+from fee_calculator.tariff import DEFAULT_TARIFF, Tariff
+
+MONDAY = datetime.fromisoformat("2024-01-22T16:00:00Z")
+FRIDAY_RUSH = datetime.fromisoformat("2024-01-26T16:00:00Z")
+BUDGETS = [0, 199, 200, 409, 410, 500, 611, 760, 912, 1000, 1200, 1499, 1500, 5000]
+# Large enough for the fee to reach the budgets or the cap, so brute force finds every bounded answer
+SCAN_DISTANCES = range(1, 8001)
+SCAN_ITEMS = range(1, 61)
+SCAN_CART_VALUES = range(1, 20101)
+TARIFFS = [
+    DEFAULT_TARIFF,
+    # Rush hours all Monday, a multiplier below 1, an item surcharge from the first item and bulk from 2 items,
+    # half cents rounded to even
+    Tariff(
+        surchargeable_items_threshold=1,
+        bulk_items_threshold=1,
+        small_order_cart_value=12.5,
+        rush_calendar=RushCalendar([((1,), 0, 24 * 60, 0.85), ((5,), 15 * 60, 19 * 60, 1.35)]),
+        rush_rounding="half_even",
+    ),
+    # The bulk fee from 4 items, before the item surcharge from 10 items
+    Tariff(surchargeable_items_threshold=10, bulk_items_threshold=3),
+    # No per-item surcharge and no distance intervals, so the fee stops growing
+    Tariff(excess_charge_per_item=0, fee_per_additional_interval=0, max_possible_delivery_fee=50),
+]
+
+
+def brute_max(fees, values, budget):
+    """
+    Find the largest value whose fee is within the budget by scanning, None if the last one is within it.
+    """
+    within = [value for value, fee in zip(values, fees) if fee <= budget]
+    if within and within[-1] == values[-1]:
+        return None
+    return max(within, default=0)
+
+
+def brute_min(fees, values, budget):
+    """
+    Find the smallest value whose fee is within the budget by scanning.
+    """
+    return next(value for value, fee in zip(values, fees) if fee <= budget)
+
+
+class TestInverse(unittest.TestCase):
+    """
+    Test suite for the closed-form inverse queries and the POST /solve endpoint, cross-checked against brute force.
+
+    Methods:
+        setUp: Prepares the test client for the application.
+        test_max_base_fee: Tests the inverse of the rounded rush multiplier.
+        test_max_delivery_distance: Tests the furthest distance within a budget against a scan of the distances.
+        test_max_number_of_items: Tests the largest number of items within a budget against a scan of the counts.
+        test_min_cart_value: Tests the smallest cart value within a budget against a scan of the cart values.
+        test_solve_endpoint: Tests POST /solve.
+        test_solve_invalid_input: Tests POST /solve with invalid input data.
+    """
+
+    def setUp(self):
+        """
+        Set up method to initialize a test client for the Flask application.
+        """
+        self.app = app.test_client()
+
+    def test_max_base_fee(self):
+        """
+        Test that the largest fee within the budget after the rush multiplier matches a scan of the fees.
+        """
+        for basis_points, rounding in itertools.product(
+            [None, 8500, 11000, 12000, 13500, 15000, 25000], ROUNDING_MODES
+        ):
+            fees = range(0, 1000)
+            rushed = [
+                fee if basis_points is None else round_basis_points(fee * basis_points, rounding)
+                for fee in fees
+            ]
+            for budget in range(0, 400):
+                self.assertEqual(max_base_fee(budget, basis_points, rounding), brute_max(rushed, fees, budget))
+
+    def test_max_delivery_distance(self):
+        """
+        Test that the furthest distance within the budget is the one found by scanning the distances.
+        """
+        for tariff, cart_value, number_of_items, time in itertools.product(
+            TARIFFS, [1, 790, 1000, 20000], [1, 5, 13, 40], [MONDAY, FRIDAY_RUSH]
+        ):
+            fees = [
+                tariff.total_fee(cart_value, distance, number_of_items, time)
+                for distance in SCAN_DISTANCES
+            ]
+            for budget in BUDGETS:
+                self.assertEqual(
+                    max_delivery_distance(budget, cart_value, number_of_items, time, tariff),
+                    brute_max(fees, SCAN_DISTANCES, budget),
+                    (cart_value, number_of_items, time, budget),
+                )
+
+    def test_max_number_of_items(self):
+        """
+        Test that the largest number of items within the budget is the one found by scanning the counts.
+        """
+        for tariff, cart_value, delivery_distance, time in itertools.product(
+            TARIFFS, [1, 790, 999, 1000, 20000], [1, 1000, 1001, 2235, 4000], [MONDAY, FRIDAY_RUSH]
+        ):
+            fees = [tariff.total_fee(cart_value, delivery_distance, items, time) for items in SCAN_ITEMS]
+            for budget in BUDGETS:
+                self.assertEqual(
+                    max_number_of_items(budget, cart_value, delivery_distance, time, tariff),
+                    brute_max(fees, SCAN_ITEMS, budget),
+                    (cart_value, delivery_distance, time, budget),
+                )
+
+    def test_min_cart_value(self):
+        """
+        Test that the smallest cart value within the budget is the one found by scanning the cart values.
+        """
+        for tariff, delivery_distance, number_of_items, time in itertools.product(
+            TARIFFS, [1, 2235, 4000], [1, 5, 13], [MONDAY, FRIDAY_RUSH]
+        ):
+            fees = [
+                tariff.total_fee(cart_value, delivery_distance, number_of_items, time)
+                for cart_value in SCAN_CART_VALUES
+            ]
+            for budget in BUDGETS:
+                self.assertEqual(
+                    min_cart_value(budget, delivery_distance, number_of_items, time, tariff),
+                    brute_min(fees, SCAN_CART_VALUES, budget),
+                    (delivery_distance, number_of_items, time, budget),
+                )
+
+    def test_solve_endpoint(self):
+        """
+        Test that POST /solve returns the value of the unknown, within the budget according to POST /.
+        """
+        order = {
+            "cart_value": 790,
+            "delivery_distance": 2235,
+            "number_of_items": 4,
+            "time": "2024-01-26T16:00:00Z",
+        }
+        for unknown, expected in [("delivery_distance", 3000), ("number_of_items", 6), ("cart_value", 833)]:
+            query = {**order, "solve": unknown, "max_fee": 1000 if unknown != "cart_value" else 800}
+            del query[unknown]
+            response = self.app.post("/solve", json=query)
+            self.assertEqual(response.status_code, 200)
+            response_data = json.loads(response.data)
+            self.assertEqual(response_data[unknown], expected)
+            self.assertEqual(response_data["pricing_version"], "default")
+            fee = json.loads(self.app.post("/", json={**order, unknown: expected}).data)["delivery_fee"]
+            self.assertLessEqual(fee, query["max_fee"])
+
+        # Free delivery is within any budget
+        query = {**order, "cart_value": 20000, "solve": "delivery_distance", "max_fee": 0}
+        del query["delivery_distance"]
+        self.assertIsNone(json.loads(self.app.post("/solve", json=query).data)["delivery_distance"])
+
+    def test_solve_invalid_input(self):
+        """
+        Test that unknown or missing values, values given for the unknown and negative budgets are rejected.
+        """
+        query = {
+            "solve": "cart_value",
+            "max_fee": 800,
+            "delivery_distance": 2235,
+            "time": "2024-01-26T16:00:00Z",
+        }
+        invalid_queries = [
+            ({"solve": "time"}, "solve"),
+            ({"max_fee": -1}, "max_fee"),
+            ({"cart_value": 100}, "cart_value"),
+            ({}, "number_of_items"),
+            ({"number_of_items": 0}, "number_of_items"),
+        ]
+        for change, field in invalid_queries:
+            response = self.app.post("/solve", json={**query, **change})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(field, json.loads(response.data)["Validation Error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import tempfile
+import threading
+import sys
+import os
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fee_calculator.metrics import Metrics, clear_directory
+
+STAGE_LINE = 'fee_calculator_stage_duration_seconds_{}{{stage="{}"{}}}'
+
+
+def parse_export(text):
+    """
+    Parse a Prometheus text exposition into a dict of the sample values keyed by the metric and labels.
+    """
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    Test suite for the per-stage latency histograms and the request counters.
+
+    Methods:
+        test_observe_stages: Tests that the stage latencies land in the right buckets, sums and counts.
+        test_counters: Tests the request outcome and validation error counters.
+        test_threads: Tests that no update is lost when threads record requests concurrently.
+        test_processes_summed: Tests that the files of all the processes in the directory are summed.
+    """
+
+    def test_observe_stages(self):
+        """
+        Test that every stage latency is counted in its bucket, cumulatively, and added to the sum of its stage.
+        """
+        metrics = Metrics()
+        # parse 800 ns, validate 3 us, price 1 us, serialize 20 ms
+        metrics.observe_stages(0, 800, 3_800, 4_800, 20_004_800)
+        metrics.observe_stages(0, 800, 3_800, 4_800, 20_004_800)
+        samples = parse_export(metrics.export())
+
+        self.assertEqual(samples[STAGE_LINE.format("bucket", "parse", ',le="1e-06"')], 2)
+        self.assertEqual(samples[STAGE_LINE.format("bucket", "validate", ',le="2.5e-06"')], 0)
+        self.assertEqual(samples[STAGE_LINE.format("bucket", "validate", ',le="5e-06"')], 2)
+        self.assertEqual(samples[STAGE_LINE.format("bucket", "price", ',le="1e-06"')], 2)
+        self.assertEqual(samples[STAGE_LINE.format("bucket", "serialize", ',le="0.01"')], 0)
+        self.assertEqual(samples[STAGE_LINE.format("bucket", "serialize", ',le="+Inf"')], 2)
+        for stage in ("parse", "validate", "price", "serialize"):
+            self.assertEqual(samples[STAGE_LINE.format("count", stage, "")], 2)
+        self.assertAlmostEqual(samples[STAGE_LINE.format("sum", "validate", "")], 6e-06)
+        self.assertAlmostEqual(samples[STAGE_LINE.format("sum", "serialize", "")], 0.04)
+
+    def test_counters(self):
+        """
+        Test that requests are counted by outcome and validation errors by field, unknown ones as other.
+        """
+        metrics = Metrics()
+        for status_code in (200, 200, 400, 415, 500):
+            metrics.count_request(status_code)
+        for field in ("cart_value", "time", "time", "order"):
+            metrics.count_validation_error(field)
+        samples = parse_export(metrics.export())
+
+        self.assertEqual(samples['fee_calculator_requests_total{outcome="200"}'], 2)
+        self.assertEqual(samples['fee_calculator_requests_total{outcome="400"}'], 1)
+        self.assertEqual(samples['fee_calculator_requests_total{outcome="other"}'], 2)
+        self.assertEqual(samples['fee_calculator_validation_errors_total{field="cart_value"}'], 1)
+        self.assertEqual(samples['fee_calculator_validation_errors_total{field="delivery_distance"}'], 0)
+        self.assertEqual(samples['fee_calculator_validation_errors_total{field="time"}'], 2)
+        self.assertEqual(samples['fee_calculator_validation_errors_total{field="other"}'], 1)
+
+    def test_threads(self):
+        """
+        Test that the requests recorded by concurrent threads are all counted.
+        """
+        metrics = Metrics()
+
+        def record():
+            for _ in range(20000):
+                metrics.count_request(200)
+                metrics.observe_stages(0, 1, 2, 3, 4)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        samples = parse_export(metrics.export())
+        self.assertEqual(samples['fee_calculator_requests_total{outcome="200"}'], 8 * 20000)
+        self.assertEqual(samples[STAGE_LINE.format("count", "price", "")], 8 * 20000)
+        self.assertEqual(samples[STAGE_LINE.format("sum", "price", "")], 8 * 20000 / 1e9)
+
+    def test_processes_summed(self):
+        """
+        Test that the export of a process includes the metrics of the other processes sharing the directory,
+        and that clearing the directory removes the files of previous runs, the one of this process being started
+        again, zeroed, by reset().
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            metrics = Metrics(directory)
+            metrics.count_request(200)
+            # A second worker, as seen from this process: a file of another pid in the same directory
+            with open(os.path.join(directory, f"metrics_{os.getpid()}.db"), "rb") as file:
+                data = file.read()
+            with open(os.path.join(directory, "metrics_0.db"), "wb") as file:
+                file.write(data)
+            metrics.count_request(200)
+
+            samples = parse_export(metrics.export())
+            self.assertEqual(samples['fee_calculator_requests_total{outcome="200"}'], 3)
+
+            clear_directory(directory)
+            self.assertEqual(os.listdir(directory), [])
+            metrics.reset()
+            metrics.count_request(200)
+            self.assertEqual(os.listdir(directory), [f"metrics_{os.getpid()}.db"])
+            samples = parse_export(metrics.export())
+            self.assertEqual(samples['fee_calculator_requests_total{outcome="200"}'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
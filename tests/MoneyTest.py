@@ -0,0 +1,178 @@
+"""
+Equivalence of the integer fee arithmetic with the float arithmetic it replaced, on randomly drawn inputs.
+
+The fees differ from round(fee * multiplier) and round(euros * CENTS_PER_EUR) only on purpose, on these inputs:
+  1. Rush fees landing exactly on a half cent are rounded half up, e.g. 3 cents x 1.5 = 4.5 is 5 cents, where
+     round() rounded half to even, to 4. With the "half_even" rush rounding, they round like round() of the
+     exact product.
+  2. Rush fees landing on a half cent the float product misses, which round() rounded by the float error:
+     55 cents x 1.1 = 60.5 is 60.50000000000001 as a float, so round() gave 61, where half even is 60, and
+     45 cents x 0.7 = 31.5 is 31.499999999999996, so round() gave 31, where both rounding modes give 32.
+  3. Euro amounts of the settings with a fraction of a cent are rounded half up from their decimal value, e.g.
+     1.005 EUR is 101 cents, where the float product 100.49999999999999 gave 100.
+  4. Multipliers with a fraction of a basis point are rounded half up to a basis point, e.g. 1.23456 is 12346.
+
+No fee of the default multiplier, 1.2, lands on a half cent, so the default fees are unchanged.
+"""
+import unittest
+import random
+import sys
+import os
+from datetime import datetime, timedelta
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from fee_calculator.batch import rush_fees
+from fee_calculator.constants import *
+from fee_calculator.money import ROUND_HALF_EVEN, ROUND_HALF_UP, round_basis_points, to_basis_points, to_cents
+from fee_calculator.rush import RushCalendar
+from fee_calculator.tariff import DEFAULT_TARIFF, Tariff
+from tests import reference_fees
+
+SEED = 20240126
+SAMPLES = 50000
+MONDAY = datetime.fromisoformat("2024-01-22T00:00:00Z")
+# Multipliers with half cents (odd fees times 1.5, 1.1, ...), drawn as often as any other multiplier
+COMMON_BASIS_POINTS = [11000, 12000, 12500, 13000, 13500, 15000, 25000]
+# Fee in cents, multiplier, round(fee * multiplier), half up and half even
+DIFFERENCES = [
+    (3, 1.5, 4, 5, 4),
+    (55, 1.1, 61, 61, 60),
+    (45, 0.7, 31, 32, 32),
+    (35, 1.1, 38, 39, 38),
+    (1, 0.5, 0, 1, 0),
+    (2, 1.25, 2, 3, 2),
+    (7, 1.5, 10, 11, 10),
+]
+
+
+class TestMoney(unittest.TestCase):
+    """
+    Property-based equivalence suite of the integer cents and basis points against the float arithmetic.
+
+    Methods:
+        setUp: Seeds the random generator, so every run draws the same inputs.
+        test_default_fees: Tests that the default fees are the ones of the original float fee rules.
+        test_default_multiplier: Tests that the default multiplier never lands on a half cent.
+        test_rush_rounding: Tests that the rush fees differ from the float ones only on half cents.
+        test_differences: Tests the documented differences.
+        test_conversions: Tests the conversions of Euro amounts and multipliers.
+        test_batch_rush_fees: Tests that the vectorized rush fees round like the scalar ones.
+    """
+
+    def setUp(self):
+        """
+        Set up method to seed the random generator.
+        """
+        self.random = random.Random(SEED)
+
+    def test_default_fees(self):
+        """
+        Test that the total fee of random orders, at any minute of the week, is the one of the reference rules.
+        """
+        for _ in range(SAMPLES):
+            cart_value = self.random.randint(1, 25000)
+            delivery_distance = self.random.randint(1, 10000)
+            number_of_items = self.random.randint(1, 50)
+            time = MONDAY + timedelta(minutes=self.random.randrange(7 * 24 * 60))
+            self.assertEqual(
+                DEFAULT_TARIFF.total_fee(cart_value, delivery_distance, number_of_items, time),
+                reference_fees.total_delivery_fee(cart_value, delivery_distance, number_of_items, time),
+                (cart_value, delivery_distance, number_of_items, time),
+            )
+
+    def test_default_multiplier(self):
+        """
+        Test every fee up to ten times the maximum fee with the default multiplier, in both rounding modes.
+        """
+        basis_points = to_basis_points(RUSH_FEE_MULTIPLIER)
+        for fee in range(MAX_POSSIBLE_DELIVERY_FEE * CENTS_PER_EUR * 10):
+            expected = round(fee * RUSH_FEE_MULTIPLIER)
+            self.assertEqual(round_basis_points(fee * basis_points, ROUND_HALF_UP), expected, fee)
+            self.assertEqual(round_basis_points(fee * basis_points, ROUND_HALF_EVEN), expected, fee)
+
+    def test_rush_rounding(self):
+        """
+        Test that random fees and multipliers are rounded like round() except on exact half cents, which are
+        rounded up, or to even.
+        """
+        half_cents = 0
+        for _ in range(SAMPLES):
+            fee = self.random.randint(0, 100000)
+            if self.random.random() < 0.5:
+                basis_points = self.random.choice(COMMON_BASIS_POINTS)
+            else:
+                basis_points = self.random.randint(1, 50000)
+            scaled = fee * basis_points
+            half_up = round_basis_points(scaled, ROUND_HALF_UP)
+            half_even = round_basis_points(scaled, ROUND_HALF_EVEN)
+            if scaled % BASIS_POINTS == BASIS_POINTS // 2:
+                half_cents += 1
+                self.assertEqual(half_up, scaled // BASIS_POINTS + 1)
+                self.assertEqual(half_even % 2, 0)
+                self.assertIn(round(fee * (basis_points / BASIS_POINTS)), (half_up, half_even))
+            else:
+                self.assertEqual(half_up, round(fee * (basis_points / BASIS_POINTS)), (fee, basis_points))
+                self.assertEqual(half_even, half_up)
+        # The inputs that differ were drawn
+        self.assertGreater(half_cents, SAMPLES // 20)
+
+    def test_differences(self):
+        """
+        Test the documented differences with round(), in both rounding modes and through a Tariff.
+        """
+        friday_rush = datetime.fromisoformat("2024-01-26T16:00:00Z")
+        for fee, multiplier, float_fee, half_up, half_even in DIFFERENCES:
+            self.assertEqual(round(fee * multiplier), float_fee)
+            for rounding, expected in ((ROUND_HALF_UP, half_up), (ROUND_HALF_EVEN, half_even)):
+                tariff = Tariff(rush_fee_multiplier=multiplier, rush_rounding=rounding)
+                self.assertEqual(tariff.rush_fee(fee, friday_rush), expected, (fee, multiplier, rounding))
+
+    def test_conversions(self):
+        """
+        Test that whole cents and basis points convert exactly, and fractions are rounded half up.
+        """
+        for _ in range(SAMPLES):
+            cents = self.random.randint(0, 10**7)
+            self.assertEqual(to_cents(cents / CENTS_PER_EUR), cents)
+            basis_points = self.random.randint(0, 10**6)
+            self.assertEqual(to_basis_points(basis_points / BASIS_POINTS), basis_points)
+        self.assertEqual(to_cents(BULK_FEE), 120)
+        self.assertEqual(to_cents(1 + 14 / 100), 114)
+        self.assertEqual(to_cents(1.005), 101)
+        self.assertEqual(to_cents(1.004), 100)
+        self.assertEqual(to_basis_points(1.23456), 12346)
+        self.assertEqual(to_basis_points(2), 20000)
+        self.assertEqual(RushCalendar.weekly(FRIDAY, 15, 19, 1.20001).multipliers, (1, 1.2))
+        with self.assertRaises(ValueError):
+            Tariff(rush_rounding="down")
+
+    def test_batch_rush_fees(self):
+        """
+        Test that the rush fees of random arrays of fees and codes are the scalar ones, in both rounding modes.
+        """
+        # One window of every multiplier, on its own day
+        calendar = RushCalendar(
+            [
+                ((day,), 15 * 60, 19 * 60, basis_points / BASIS_POINTS)
+                for day, basis_points in enumerate(COMMON_BASIS_POINTS, start=1)
+            ]
+        )
+        fees = np.array([self.random.randint(0, 100000) for _ in range(SAMPLES)], dtype=np.int64)
+        codes = np.array(
+            [self.random.randrange(len(calendar.basis_points)) for _ in range(SAMPLES)], dtype=np.uint8
+        )
+        for rounding in (ROUND_HALF_UP, ROUND_HALF_EVEN):
+            tariff = Tariff(rush_calendar=calendar, rush_rounding=rounding)
+            expected = [
+                round_basis_points(fee * calendar.basis_points[code], rounding) if code else fee
+                for fee, code in zip(fees.tolist(), codes.tolist())
+            ]
+            self.assertEqual(rush_fees(tariff, fees, codes).tolist(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+import json
+import sys
+import os
+import tempfile
+import time
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pydantic import ValidationError
+from fee_calculator.Order import Order
+from fee_calculator.app import app
+from fee_calculator.pricing import PRICING, Pricing, load_tariff
+from fee_calculator.tariff import DEFAULT_TARIFF
+
+ORDER = {
+    "cart_value": 790,
+    "delivery_distance": 2235,
+    "number_of_items": 4,
+    "time": "2024-01-15T13:00:00Z",
+}
+
+
+def write_pricing(path, pricing):
+    """
+    Write a pricing file the way a deployment would: to a temporary file renamed over the previous one.
+    """
+    with open(path + ".tmp", "w") as file:
+        json.dump(pricing, file)
+    os.replace(path + ".tmp", path)
+
+
+class TestPricing(unittest.TestCase):
+    """
+    Test suite for the versioned pricing files and their reloading.
+
+    Methods:
+        setUp: Creates a temporary directory for the pricing files.
+        test_load_tariff: Tests that a pricing file is compiled, with defaults for the settings it leaves out.
+        test_invalid_pricing: Tests that invalid pricing files are rejected.
+        test_reload: Tests that a changed pricing file replaces the tariff, and an invalid one is ignored.
+        test_in_flight_order: Tests that an order keeps the tariff it started with across a reload.
+        test_watch: Tests that the watcher thread picks up a changed pricing file.
+        test_response_version: Tests that the responses report the version of the pricing.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary directory for the pricing files, removed after each test.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "pricing.json")
+
+    def test_load_tariff(self):
+        """
+        Test that the settings of the file are compiled to cents and the others keep the default values.
+        """
+        write_pricing(self.path, {"version": "2024-02-01", "base_delivery_fee": 2.5})
+        tariff = load_tariff(self.path)
+        self.assertEqual(tariff.version, "2024-02-01")
+        self.assertEqual(tariff.base_delivery_fee, 250)
+        self.assertEqual(tariff.rush_fee_multiplier, DEFAULT_TARIFF.rush_fee_multiplier)
+        self.assertEqual(tariff.item_surcharges, DEFAULT_TARIFF.item_surcharges)
+
+    def test_invalid_pricing(self):
+        """
+        Test that a missing version, unknown settings, invalid values and inverted rush hours are rejected.
+        """
+        for pricing in (
+            {"base_delivery_fee": 2},
+            {"version": "v2", "base_delivery_fe": 2},
+            {"version": "v2", "additional_distance_interval": 0},
+            {"version": "v2", "rush_day": 8},
+            {"version": "v2", "rush_hour_start": 19, "rush_hour_end": 15},
+        ):
+            write_pricing(self.path, pricing)
+            with self.assertRaises(ValidationError):
+                load_tariff(self.path)
+
+        write_pricing(self.path, ["version", "v2"])
+        with self.assertRaises(ValueError):
+            load_tariff(self.path)
+
+    def test_reload(self):
+        """
+        Test that reload() only swaps the tariff when the file changed, and keeps it when the file is invalid.
+        """
+        write_pricing(self.path, {"version": "v1"})
+        pricing = Pricing(self.path)
+        first = pricing.tariff
+        self.assertEqual(first.version, "v1")
+        self.assertFalse(pricing.reload())
+
+        with self.assertLogs("fee_calculator.pricing", "ERROR"):
+            write_pricing(self.path, {"version": "v3", "base_delivery_fee": -3})
+            self.assertFalse(pricing.reload())
+        self.assertIs(pricing.tariff, first)
+
+        write_pricing(self.path, {"version": "v4", "base_delivery_fee": 3})
+        self.assertTrue(pricing.reload())
+        self.assertEqual(pricing.tariff.version, "v4")
+        self.assertEqual(pricing.tariff.base_delivery_fee, 300)
+
+    def test_in_flight_order(self):
+        """
+        Test that an order priced with the tariff taken before a reload is priced consistently with it.
+        """
+        write_pricing(self.path, {"version": "v1"})
+        pricing = Pricing(self.path)
+        order = Order(**ORDER)
+        tariff = pricing.tariff
+
+        write_pricing(self.path, {"version": "v2", "base_delivery_fee": 3})
+        self.assertTrue(pricing.reload())
+
+        self.assertEqual(order.calculate_total_delivery_fee(tariff), 710)
+        self.assertEqual(order.calculate_total_delivery_fee(pricing.tariff), 810)
+
+    def test_watch(self):
+        """
+        Test that the watcher thread reloads a changed pricing file.
+        """
+        write_pricing(self.path, {"version": "v1"})
+        pricing = Pricing(self.path, interval=0.01)
+        pricing.watch()
+        write_pricing(self.path, {"version": "v2", "max_possible_delivery_fee": 20})
+
+        deadline = time.monotonic() + 5
+        while pricing.tariff.version != "v2" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(pricing.tariff.version, "v2")
+
+    def test_response_version(self):
+        """
+        Test that POST / and POST /batch report the version of the current pricing.
+        """
+        write_pricing(self.path, {"version": "2024-02-01", "base_delivery_fee": 3})
+        PRICING.swap(load_tariff(self.path))
+        self.addCleanup(PRICING.swap, DEFAULT_TARIFF)
+
+        client = app.test_client()
+        response_data = json.loads(client.post("/", json=ORDER).data)
+        self.assertEqual(response_data, {"delivery_fee": 810, "pricing_version": "2024-02-01"})
+
+        batch = {field: [value] for field, value in ORDER.items()}
+        response_data = json.loads(client.post("/batch", json=batch).data)
+        self.assertEqual(response_data, {"delivery_fees": [810], "pricing_version": "2024-02-01"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+import unittest
+import contextlib
+import io
+import json
+import sys
+import os
+import tempfile
+from datetime import datetime, timezone
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from fee_calculator.constants import MAX_ITEMS_COUNT
+from fee_calculator.reconcile import INVALID_FEE, main, reconcile, write_columns
+from fee_calculator.rush import RushCalendar
+from fee_calculator.tariff import DEFAULT_TARIFF, Tariff
+
+NUMBER_OF_ORDERS = 5000
+
+
+def generate_columns(size, seed=0):
+    """
+    Generate random order columns, a few rows having values below the minimum or above the maximum of their field.
+    """
+    random = np.random.default_rng(seed)
+    columns = {
+        "cart_value": random.integers(0, 25000, size),
+        "delivery_distance": random.integers(0, 6000, size),
+        "number_of_items": random.integers(0, 30, size),
+        "time": np.datetime64("2024-01-01T00:00:00")
+        + random.integers(0, 60 * 24 * 60 * 60, size).astype("timedelta64[s]"),
+    }
+    columns["delivery_distance"][::997] = 2**62
+    columns["number_of_items"][::1009] = 2**60
+    return columns
+
+
+def expected_fees(tariff, columns):
+    """
+    Price the rows one at a time with Tariff.total_fee().
+    """
+    fees = []
+    for cart_value, delivery_distance, number_of_items, time in zip(*columns.values()):
+        values = (cart_value, delivery_distance, number_of_items)
+        if min(values) < 1 or max(values) > MAX_ITEMS_COUNT:
+            fees.append(INVALID_FEE)
+            continue
+        time = time.astype(datetime).replace(tzinfo=timezone.utc)
+        fees.append(
+            tariff.total_fee(int(cart_value), int(delivery_distance), int(number_of_items), time)
+        )
+    return fees
+
+
+class TestReconcile(unittest.TestCase):
+    """
+    Test suite for the reconciliation of memory-mapped columnar order files.
+
+    Methods:
+        setUp: Writes random order columns to a temporary directory.
+        test_fees: Tests the fees of every row against Tariff.total_fee().
+        test_deterministic: Tests that the output does not depend on the number of workers nor the shard size.
+        test_rush_calendar: Tests a rush calendar with a time zone and exception dates.
+        test_integer_time: Tests a time column of seconds since the Unix epoch.
+        test_invalid_time: Tests that NaT and times out of the range of datetime are rejected.
+        test_command_line: Tests the command-line tool, its progress reporting and its exit status.
+    """
+
+    def setUp(self):
+        """
+        Write random order columns to a temporary directory, removed after the test.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.input = os.path.join(self.directory, "orders")
+        self.columns = generate_columns(NUMBER_OF_ORDERS)
+        write_columns(self.input, **self.columns)
+
+    def test_fees(self):
+        """
+        Test that every row gets its Tariff.total_fee(), and INVALID_FEE when a value is out of its bounds.
+        """
+        output = os.path.join(self.directory, "fees.npy")
+        summary = reconcile(self.input, output, DEFAULT_TARIFF, workers=1, shard_size=999)
+        fees = expected_fees(DEFAULT_TARIFF, self.columns)
+        self.assertEqual(np.load(output).tolist(), fees)
+        self.assertEqual(
+            summary,
+            {
+                "rows": NUMBER_OF_ORDERS,
+                "rejected": fees.count(INVALID_FEE),
+                "total_fees": sum(fee for fee in fees if fee != INVALID_FEE),
+            },
+        )
+        self.assertGreater(summary["rejected"], 0)
+
+    def test_deterministic(self):
+        """
+        Test that the output file and the summary are the same with 1 and 3 workers, and any shard size.
+        """
+        outputs, summaries = [], []
+        for workers, shard_size in ((1, 10000), (3, 333), (2, 77)):
+            output = os.path.join(self.directory, f"fees-{workers}.npy")
+            summaries.append(reconcile(self.input, output, DEFAULT_TARIFF, workers, shard_size))
+            with open(output, "rb") as file:
+                outputs.append(file.read())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[0], outputs[2])
+        self.assertEqual(summaries[0], summaries[1])
+        self.assertEqual(summaries[0], summaries[2])
+
+    def test_rush_calendar(self):
+        """
+        Test that a calendar with a time zone and exception dates prices the rows like Tariff.total_fee().
+        """
+        tariff = Tariff(
+            rush_calendar=RushCalendar(
+                [((1, 2, 3, 4, 5), 11 * 60, 13 * 60, 1.1), ((5,), 15 * 60, 19 * 60, 1.25)],
+                {datetime(2024, 1, 26).date(): [(0, 24 * 60, 1.5)]},
+                "Europe/Helsinki",
+            )
+        )
+        output = os.path.join(self.directory, "fees.npy")
+        reconcile(self.input, output, tariff, workers=2, shard_size=1000)
+        self.assertEqual(np.load(output).tolist(), expected_fees(tariff, self.columns))
+
+    def test_integer_time(self):
+        """
+        Test that a time column of seconds since the Unix epoch prices like a datetime64 one.
+        """
+        np.save(
+            os.path.join(self.input, "time.npy"),
+            self.columns["time"].astype("datetime64[s]").astype(np.int64),
+        )
+        output = os.path.join(self.directory, "fees.npy")
+        reconcile(self.input, output, DEFAULT_TARIFF, workers=1)
+        self.assertEqual(np.load(output).tolist(), expected_fees(DEFAULT_TARIFF, self.columns))
+
+    def test_invalid_time(self):
+        """
+        Test that NaT and times outside the range of datetime get INVALID_FEE, with the default calendar and one with
+        a time zone and exception dates, and that the other rows are priced.
+        """
+        time = self.columns["time"].astype("datetime64[s]")
+        time[1] = np.datetime64("NaT")
+        time[2] = np.datetime64("0001-01-01T00:00:00")
+        seconds = time.astype(np.int64)
+        seconds[3] = 2**62
+        zone_tariff = Tariff(rush_calendar=RushCalendar([((5,), 15 * 60, 19 * 60, 1.25)], {}, "Europe/Helsinki"))
+        for tariff in (DEFAULT_TARIFF, zone_tariff):
+            for name, column in (("datetime64", time), ("seconds", seconds)):
+                np.save(os.path.join(self.input, "time.npy"), column)
+                output = os.path.join(self.directory, "fees.npy")
+                summary = reconcile(self.input, output, tariff, workers=1)
+                fees = np.load(output).tolist()
+                invalid_rows = (1, 2, 3) if name == "seconds" else (1, 2)
+                self.assertEqual([fees[row] for row in invalid_rows], [INVALID_FEE] * len(invalid_rows), name)
+                self.assertEqual(fees[4:], expected_fees(tariff, self.columns)[4:], name)
+                self.assertGreaterEqual(summary["rejected"], len(invalid_rows))
+
+    def test_command_line(self):
+        """
+        Test that the command reports its progress and summary, exits with 1 if rows were rejected, prices with
+        a given pricing file and rejects invalid columns.
+        """
+        output = os.path.join(self.directory, "fees.npy")
+        pricing = os.path.join(self.directory, "pricing.json")
+        with open(pricing, "w") as file:
+            json.dump({"version": "2024-02", "base_delivery_fee": 3}, file)
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            status = main(
+                [self.input, "-o", output, "--workers", "2", "--shard-size", "2000"]
+                + ["--pricing", pricing]
+            )
+        self.assertEqual(status, 1)
+        lines = stderr.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[2], f"Priced {NUMBER_OF_ORDERS}/{NUMBER_OF_ORDERS} rows (100%)")
+        self.assertTrue(lines[3].endswith("pricing 2024-02"))
+
+        valid_input = os.path.join(self.directory, "valid")
+        write_columns(valid_input, [790], [2235], [4], ["2024-01-15T13:00:00"])
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(main([valid_input, "-o", output, "--quiet"]), 0)
+        self.assertEqual(np.load(output).tolist(), [710])
+
+        np.save(os.path.join(valid_input, "number_of_items.npy"), np.array([4, 5]))
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main([valid_input, "-o", output])
+
+
+if __name__ == "__main__":
+    unittest.main()
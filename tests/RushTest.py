@@ -0,0 +1,183 @@
+import unittest
+import json
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pydantic import ValidationError
+from fee_calculator.batch import OrderBatch
+from fee_calculator.pricing import load_tariff
+from fee_calculator.rush import RushCalendar
+from fee_calculator.tariff import DEFAULT_TARIFF
+from tests import reference_fees
+
+# A Monday
+MONDAY = datetime.fromisoformat("2024-01-22T00:00:00Z")
+CALENDAR = {
+    "version": "2024-12",
+    "rush": {
+        "timezone": "Europe/Helsinki",
+        "windows": [
+            {"days": [1, 2, 3, 4, 5], "start": "11:00", "end": "13:00", "multiplier": 1.1},
+            {"days": [5], "start": "12:00", "end": "19:00", "multiplier": 1.2},
+            {"days": [7], "start": "23:00", "end": "01:00", "multiplier": 1.3},
+        ],
+        "exceptions": {
+            "2024-12-24": [{"start": "10:00", "end": "14:00", "multiplier": 1.5}],
+            "2024-12-25": [],
+        },
+    },
+}
+
+
+class TestRushCalendar(unittest.TestCase):
+    """
+    Test suite for the compiled rush calendars.
+
+    Methods:
+        test_default_calendar: Tests that the default calendar matches the reference rush rule at every minute.
+        test_overlapping_windows: Tests that a later window overrides an earlier one.
+        test_wrapping_windows: Tests windows wrapping around midnight, including from Sunday to Monday.
+        test_exceptions: Tests that exception dates replace the weekly windows.
+        test_timezone: Tests the conversion of delivery times to the time zone of the calendar.
+        test_pricing_file: Tests a calendar from a pricing file, priced by Tariff and OrderBatch.
+        test_invalid_calendar: Tests that invalid calendars are rejected.
+    """
+
+    def test_default_calendar(self):
+        """
+        Test that the default tariff applies the rush multiplier like the reference at every minute of a week.
+        """
+        for minute in range(7 * 24 * 60):
+            time = MONDAY + timedelta(minutes=minute)
+            self.assertEqual(
+                DEFAULT_TARIFF.rush_fee(1005, time), reference_fees.friday_rush(1005, time)
+            )
+
+    def test_overlapping_windows(self):
+        """
+        Test that where windows overlap, the one given last applies.
+        """
+        calendar = RushCalendar([((1,), 600, 720, 1.1), ((1,), 660, 780, 1.5)])
+        self.assertIsNone(calendar.multiplier(MONDAY + timedelta(minutes=599)))
+        self.assertEqual(calendar.multiplier(MONDAY + timedelta(minutes=600)), 1.1)
+        self.assertEqual(calendar.multiplier(MONDAY + timedelta(minutes=660)), 1.5)
+        self.assertEqual(calendar.multiplier(MONDAY + timedelta(minutes=779)), 1.5)
+        self.assertIsNone(calendar.multiplier(MONDAY + timedelta(minutes=780)))
+        self.assertEqual(calendar.multipliers, (1, 1.1, 1.5))
+
+    def test_wrapping_windows(self):
+        """
+        Test that windows ending before they start continue on the next day, from Sunday to Monday too.
+        """
+        calendar = RushCalendar([((1, 7), 23 * 60, 60, 1.3)])
+        sunday = MONDAY + timedelta(days=6)
+        self.assertIsNone(calendar.multiplier(sunday + timedelta(hours=22, minutes=59)))
+        self.assertEqual(calendar.multiplier(sunday + timedelta(hours=23)), 1.3)
+        self.assertEqual(calendar.multiplier(MONDAY + timedelta(minutes=59)), 1.3)
+        self.assertIsNone(calendar.multiplier(MONDAY + timedelta(hours=1)))
+        self.assertEqual(calendar.multiplier(MONDAY + timedelta(days=1, minutes=30)), 1.3)
+        self.assertIsNone(calendar.multiplier(MONDAY + timedelta(days=2, minutes=30)))
+
+    def test_exceptions(self):
+        """
+        Test that the windows of an exception date replace the weekly ones, and that no windows means no rush.
+        """
+        calendar = RushCalendar(
+            [((1, 2), 600, 720, 1.1)],
+            {MONDAY.date(): [(0, 60, 1.5)], (MONDAY + timedelta(days=1)).date(): []},
+        )
+        self.assertEqual(calendar.multiplier(MONDAY + timedelta(minutes=30)), 1.5)
+        self.assertIsNone(calendar.multiplier(MONDAY + timedelta(minutes=600)))
+        self.assertIsNone(calendar.multiplier(MONDAY + timedelta(days=1, minutes=600)))
+        self.assertEqual(calendar.multiplier(MONDAY + timedelta(days=7, minutes=600)), 1.1)
+
+    def test_timezone(self):
+        """
+        Test that delivery times are converted to the time zone of the calendar, naive times being UTC.
+        """
+        calendar = RushCalendar([((5,), 15 * 60, 19 * 60, 1.2)], tz="Europe/Helsinki")
+        # UTC+2 in winter and UTC+3 in summer
+        self.assertEqual(calendar.multiplier(datetime.fromisoformat("2024-01-26T13:00:00Z")), 1.2)
+        self.assertIsNone(calendar.multiplier(datetime.fromisoformat("2024-01-26T17:00:00Z")))
+        self.assertEqual(calendar.multiplier(datetime.fromisoformat("2024-07-26T12:00:00Z")), 1.2)
+        self.assertIsNone(calendar.multiplier(datetime.fromisoformat("2024-07-26T16:00:00Z")))
+        self.assertEqual(calendar.multiplier(datetime.fromisoformat("2024-01-26T18:30:00+05:00")), 1.2)
+        self.assertEqual(calendar.multiplier(datetime(2024, 1, 26, 13)), 1.2)
+
+        # Without a time zone, the time of day is used as given
+        calendar = RushCalendar([((5,), 15 * 60, 19 * 60, 1.2)])
+        self.assertEqual(calendar.multiplier(datetime.fromisoformat("2024-01-26T15:00:00+05:00")), 1.2)
+
+    def test_pricing_file(self):
+        """
+        Test that a calendar from a pricing file prices the same with Tariff and OrderBatch.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pricing.json")
+            with open(path, "w") as file:
+                json.dump(CALENDAR, file)
+            tariff = load_tariff(path)
+
+        times = [
+            datetime.fromisoformat(time)
+            for time in (
+                "2024-12-16T09:30:00Z",  # Monday 11:30 in Helsinki
+                "2024-12-20T10:30:00Z",  # Friday 12:30
+                "2024-12-20T17:00:00Z",  # Friday 19:00
+                "2024-12-22T21:30:00Z",  # Sunday 23:30
+                "2024-12-22T22:30:00Z",  # Monday 00:30
+                "2024-12-24T09:00:00Z",  # Christmas Eve 11:00
+                "2024-12-25T09:30:00Z",  # Christmas Day 11:30
+            )
+        ]
+        self.assertEqual(
+            [tariff.rush_fee(1000, time) for time in times], [1100, 1200, 1000, 1300, 1300, 1500, 1000]
+        )
+        batch = OrderBatch(
+            cart_value=[790] * len(times),
+            delivery_distance=[2235] * len(times),
+            number_of_items=[4] * len(times),
+            time=times,
+        )
+        self.assertEqual(
+            batch.calculate_total_delivery_fees(tariff).tolist(),
+            [tariff.total_fee(790, 2235, 4, time) for time in times],
+        )
+        self.assertNotEqual(
+            tariff.pricing_key(790, 2235, 4, times[0]), tariff.pricing_key(790, 2235, 4, times[1])
+        )
+
+    def test_invalid_calendar(self):
+        """
+        Test that unknown time zones, invalid times of day, inverted exception windows and calendars combined
+        with the rush_* settings are rejected.
+        """
+        invalid_rush = [
+            {"timezone": "Europe/Atlantis"},
+            {"windows": [{"days": [1], "start": "25:00", "end": "26:00", "multiplier": 1.2}]},
+            {"windows": [{"days": [8], "start": "10:00", "end": "11:00", "multiplier": 1.2}]},
+            {"exceptions": {"2024-12-24": [{"start": "14:00", "end": "10:00", "multiplier": 1.5}]}},
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pricing.json")
+            for pricing in [{"version": "v2", "rush": rush} for rush in invalid_rush] + [
+                {"version": "v2", "rush_day": 4, "rush": {}}
+            ]:
+                with open(path, "w") as file:
+                    json.dump(pricing, file)
+                with self.assertRaises(ValidationError):
+                    load_tariff(path)
+
+            with open(path, "w") as file:
+                json.dump({"version": "v2", "rush": {}}, file)
+            self.assertIsNone(load_tariff(path).rush_calendar.multiplier(datetime(2024, 1, 26, 16)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import json
+import sys
+import os
+import shutil
+from unittest import mock
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fee_calculator import config
+from fee_calculator.metrics import METRICS, SIZE
+from fee_calculator.serve import metrics_directory, warm_up
+
+
+class TestServe(unittest.TestCase):
+    """
+    Test suite for the production entry point and its settings.
+
+    Methods:
+        test_setting: Tests reading settings from the environment.
+        test_warm_up: Tests that the warmed up app serves requests, and that the warm-up is not in the metrics.
+        test_metrics_directory: Tests that several workers get a temporary metrics directory by default.
+    """
+
+    def test_setting(self):
+        """
+        Test that a setting is read from its prefixed environment variable, or falls back to its default.
+        """
+        with mock.patch.dict(os.environ, {"FEE_CALCULATOR_WORKERS": "8"}):
+            self.assertEqual(config.setting("WORKERS", 1, int), 8)
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertEqual(config.setting("WORKERS", 1, int), 1)
+
+    def test_warm_up(self):
+        """
+        Test that the app returned by warm_up() answers requests, and that the warm-up requests are not counted.
+        """
+        app = warm_up()
+        self.assertEqual(METRICS.values(), [0] * SIZE)
+        response = app.test_client().post(
+            "/",
+            json={
+                "cart_value": 790,
+                "delivery_distance": 2235,
+                "number_of_items": 4,
+                "time": "2024-01-15T13:00:00Z",
+            },
+        )
+        self.assertEqual(
+            json.loads(response.data), {"delivery_fee": 710, "pricing_version": "default"}
+        )
+
+    def test_metrics_directory(self):
+        """
+        Test that several workers without METRICS_DIR get a temporary directory, also set in the environment, and
+        that METRICS_DIR, or a single worker, are left as they are.
+        """
+        with mock.patch.object(config, "METRICS_DIR", None), mock.patch.dict(os.environ):
+            self.assertIsNone(metrics_directory(1))
+            directory = metrics_directory(2)
+            self.addCleanup(shutil.rmtree, directory, True)
+            self.assertTrue(os.path.isdir(directory))
+            self.assertEqual(os.environ["FEE_CALCULATOR_METRICS_DIR"], directory)
+        with mock.patch.object(config, "METRICS_DIR", "metrics"):
+            self.assertEqual(metrics_directory(4), "metrics")
+
+
+if __name__ == "__main__":
+    unittest.main()
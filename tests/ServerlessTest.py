@@ -0,0 +1,122 @@
+import unittest
+import base64
+import json
+import subprocess
+import sys
+import os
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from fee_calculator.app import app
+from fee_calculator.serverless import handler
+
+ORDER = {
+    "cart_value": 790,
+    "delivery_distance": 2235,
+    "number_of_items": 4,
+    "time": "2024-01-26T16:00:00Z",
+}
+PAYLOADS = [
+    ORDER,
+    {**ORDER, "number_of_items": 13, "time": "2024-01-15T13:00:00.5+02:00"},
+    {**ORDER, "cart_value": "790"},
+    {**ORDER, "time": "Friday"},
+    {"delivery_distance": -1},
+]
+HEAVY_MODULES = ("flask", "pydantic", "numpy")
+
+
+def imported_modules(script):
+    """
+    Run the script in a fresh interpreter, and return the heavy modules it imported.
+    """
+    script += f"\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return [module for module in result.stdout.strip().split(",") if module]
+
+
+class TestServerless(unittest.TestCase):
+    """
+    Test suite for the serverless entry point and the lazy imports it relies on.
+
+    Methods:
+        setUp: Prepares the test client for the application.
+        test_responses: Tests that the handler answers like the app, in both event formats.
+        test_invalid_events: Tests unknown routes, methods and bodies that are not JSON objects.
+        test_minimal_imports: Tests that the handler imports neither Flask, pydantic nor numpy for a valid order.
+        test_lazy_app: Tests that the package still exposes the Flask app, imported on first use.
+    """
+
+    def setUp(self):
+        """
+        Set up method to initialize a test client for the Flask application.
+        """
+        self.app = app.test_client()
+
+    def test_responses(self):
+        """
+        Test that the status and the body of every response are those of the app, for POST / and POST /quote.
+        """
+        for path in ("/", "/quote"):
+            for payload in PAYLOADS:
+                expected = self.app.post(path, json=payload)
+                body = json.dumps(payload)
+                events = [
+                    {"rawPath": path, "requestContext": {"http": {"method": "POST"}}, "body": body},
+                    {"path": path, "httpMethod": "POST", "body": body},
+                    {
+                        "rawPath": path,
+                        "body": base64.b64encode(body.encode()).decode(),
+                        "isBase64Encoded": True,
+                    },
+                ]
+                for event in events:
+                    response = handler(event)
+                    self.assertEqual(response["statusCode"], expected.status_code, (path, payload))
+                    self.assertEqual(response["headers"]["Content-Type"], "application/json")
+                    self.assertEqual(json.loads(response["body"]), json.loads(expected.data))
+
+    def test_invalid_events(self):
+        """
+        Test that unknown routes get 404, other methods 405 and bodies that are not JSON objects 400.
+        """
+        body = json.dumps(ORDER)
+        self.assertEqual(handler({"rawPath": "/batch", "body": body})["statusCode"], 404)
+        self.assertEqual(handler({"path": "/", "httpMethod": "GET"})["statusCode"], 405)
+        for invalid_body in ("{", "[1, 2]", None):
+            self.assertEqual(handler({"rawPath": "/", "body": invalid_body})["statusCode"], 400)
+
+    def test_minimal_imports(self):
+        """
+        Test that answering a valid order imports neither Flask, pydantic nor numpy, and an invalid one only
+        imports pydantic.
+        """
+        script = (
+            "from fee_calculator.serverless import handler\n"
+            f"assert handler({{'rawPath': '/', 'body': {json.dumps(ORDER)!r}}})['statusCode'] == 200"
+        )
+        self.assertEqual(imported_modules(script), [])
+        script += "\nassert handler({'rawPath': '/', 'body': '{}'})['statusCode'] == 400"
+        self.assertEqual(imported_modules(script), ["pydantic"])
+
+    def test_lazy_app(self):
+        """
+        Test that importing the package does not import Flask, and its app attribute is the Flask app.
+        """
+        script = (
+            "import fee_calculator\n"
+            "import sys\n"
+            "assert 'flask' not in sys.modules\n"
+            "from flask import Flask\n"
+            "assert isinstance(fee_calculator.app, Flask)"
+        )
+        self.assertEqual(imported_modules(script), ["flask", "pydantic", "numpy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import json
+import sys
+import os
+from collections import Counter
+from datetime import datetime
+from unittest import mock
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fee_calculator.app import app
+from fee_calculator.shadow import ShadowPricer, counter_percentile
+from fee_calculator.tariff import DEFAULT_TARIFF, Tariff
+
+MONDAY = datetime.fromisoformat("2024-01-15T13:00:00Z")
+FRIDAY_RUSH = datetime.fromisoformat("2024-01-26T16:00:00Z")
+# One euro more per started 500 m, the rush multiplier and the cap unchanged
+CANDIDATE = Tariff(fee_per_additional_interval=2, version="candidate")
+
+
+class Order:
+    """
+    The order fields ShadowPricer.offer() reads.
+    """
+
+    def __init__(self, cart_value, delivery_distance, number_of_items, time):
+        self.cart_value = cart_value
+        self.delivery_distance = delivery_distance
+        self.number_of_items = number_of_items
+        self.time = time
+
+
+def offer(pricer, *orders):
+    """
+    Offer the orders with their breakdown by DEFAULT_TARIFF.
+    """
+    for order in orders:
+        live = DEFAULT_TARIFF.breakdown(
+            order.cart_value, order.delivery_distance, order.number_of_items, order.time
+        )
+        pricer.offer(order, live)
+
+
+class TestShadow(unittest.TestCase):
+    """
+    Test suite for the shadow pricing of a candidate fee schedule.
+
+    Methods:
+        test_percentile: Tests the nearest-rank percentiles of counted values.
+        test_statistics: Tests the changed share, the deltas and the changed rules.
+        test_sampling: Tests that only the sampled fraction of the orders is evaluated.
+        test_overflow: Tests that the orders beyond the queue size are dropped, not waited for.
+        test_app: Tests that POST / feeds the shadow pricer and GET /shadow reports it.
+    """
+
+    def test_percentile(self):
+        """
+        Test the nearest-rank percentiles, and None without values.
+        """
+        counts = Counter({-50: 1, 0: 6, 100: 2, 300: 1})
+        self.assertEqual(counter_percentile(counts, 0.1), -50)
+        self.assertEqual(counter_percentile(counts, 0.5), 0)
+        self.assertEqual(counter_percentile(counts, 0.8), 100)
+        self.assertEqual(counter_percentile(counts, 0.99), 300)
+        self.assertIsNone(counter_percentile(Counter(), 0.5))
+
+    def test_statistics(self):
+        """
+        Test that the deltas are the candidate minus the live fees, and changes are attributed to the components.
+        """
+        pricer = ShadowPricer(CANDIDATE)
+        pricer.start()
+        offer(
+            pricer,
+            # Within the base distance: unchanged
+            Order(1000, 1000, 1, MONDAY),
+            # Two additional intervals: 2 x 100 cents more
+            Order(1000, 2000, 1, MONDAY),
+            # Two additional intervals at rush hours: 200 cents more before the 1.2 multiplier
+            Order(1000, 2000, 1, FRIDAY_RUSH),
+            # Capped before and after
+            Order(100, 10000, 20, MONDAY),
+            # Free delivery
+            Order(20000, 5000, 1, MONDAY),
+        )
+        pricer.join()
+        stats = pricer.stats()
+        self.assertEqual(stats["candidate_version"], "candidate")
+        self.assertEqual((stats["sampled"], stats["dropped"], stats["queued"]), (5, 0, 0))
+        self.assertEqual(stats["evaluated"], 5)
+        self.assertEqual(stats["changed"], 2)
+        self.assertEqual(stats["changed_share"], 0.4)
+        self.assertEqual(stats["mean_delta"], 88)
+        self.assertEqual(stats["delta_percentiles"], {"p50": 0, "p90": 240, "p99": 240})
+        self.assertEqual((stats["min_delta"], stats["max_delta"]), (0, 240))
+        self.assertEqual(stats["rules"], {"distance_fee": 2, "rush_uplift": 1})
+
+    def test_sampling(self):
+        """
+        Test that a sample rate of 0 evaluates nothing, and 0.5 about half of the orders.
+        """
+        orders = [Order(1000, 2000, 1, MONDAY)] * 2000
+        for sample_rate, low, high in ((0, 0, 0), (0.5, 800, 1200), (1, 2000, 2000)):
+            pricer = ShadowPricer(CANDIDATE, sample_rate)
+            pricer.start()
+            offer(pricer, *orders)
+            pricer.join()
+            self.assertGreaterEqual(pricer.stats()["evaluated"], low)
+            self.assertLessEqual(pricer.stats()["evaluated"], high)
+
+    def test_overflow(self):
+        """
+        Test that a full queue drops the sampled orders without blocking, and they are never evaluated.
+        """
+        pricer = ShadowPricer(CANDIDATE, queue_size=3)
+        offer(pricer, *[Order(1000, 2000, 1, MONDAY)] * 10)
+        self.assertEqual((pricer.sampled, pricer.dropped), (10, 7))
+        self.assertEqual(pricer.stats()["queued"], 3)
+        pricer.start()
+        pricer.join()
+        self.assertEqual(pricer.stats()["evaluated"], 3)
+
+    def test_app(self):
+        """
+        Test that the valid POST / orders are evaluated, and GET /shadow reports them, or 404 when disabled.
+        """
+        client = app.test_client()
+        self.assertEqual(client.get("/shadow").status_code, 404)
+
+        pricer = ShadowPricer(CANDIDATE)
+        pricer.start()
+        order = {
+            "cart_value": 790,
+            "delivery_distance": 2235,
+            "number_of_items": 4,
+            "time": "2024-01-15T13:00:00Z",
+        }
+        with mock.patch("fee_calculator.app.SHADOW", pricer):
+            for payload in (order, {**order, "delivery_distance": 900}, {**order, "time": "Friday"}):
+                delivery_fee = json.loads(client.post("/", json=payload).data).get("delivery_fee")
+            pricer.join()
+            stats = json.loads(client.get("/shadow").data)
+        self.assertIsNone(delivery_fee)
+        self.assertEqual(stats["evaluated"], 2)
+        self.assertEqual(stats["changed"], 1)
+        self.assertEqual(stats["max_delta"], 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
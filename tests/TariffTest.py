@@ -0,0 +1,107 @@
+import unittest
+import itertools
+import sys
+import os
+from datetime import datetime
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fee_calculator.tariff import DEFAULT_TARIFF, Tariff
+from tests import reference_fees
+
+# Boundary values of tests/OrderTest.py, extended around every threshold
+CART_VALUES = [1, 499, 500, 990, 991, 999, 1000, 1001, 1500, 2000, 19999, 20000, 20001]
+DELIVERY_DISTANCES = [1, 999, 1000, 1001, 1499, 1500, 1501, 2000, 2001, 2235, 3001, 1_000_000]
+NUMBERS_OF_ITEMS = [1, 3, 4, 5, 8, 10, 12, 13, 14, 99, 100, 101, 1000]
+TIMES = [
+    datetime.fromisoformat(time)
+    for time in (
+        "2024-01-15T13:00:00Z",
+        "2024-01-26T13:00:00Z",
+        "2024-01-26T14:59:59Z",
+        "2024-01-26T15:00:00Z",
+        "2024-01-26T18:59:59Z",
+        "2024-01-26T19:00:00Z",
+        "2024-01-28T13:00:00Z",
+    )
+]
+
+
+class TestTariff(unittest.TestCase):
+    """
+    Test suite for the compiled Tariff, comparing it with the reference implementation of the fee rules.
+
+    Methods:
+        test_distance_fee: Tests the distance fee, including distances beyond the lookup table.
+        test_small_order_surcharge: Tests the small order surcharge.
+        test_item_surcharge: Tests the item surcharge, including item counts beyond the lookup table.
+        test_rush_fee: Tests the rush multiplier.
+        test_total_fee: Tests the total delivery fee over the full boundary grid.
+        test_table_bounds: Tests that the size of the lookup tables does not change the fees.
+    """
+
+    def test_distance_fee(self):
+        """
+        Test that the distance fee equals the reference one for every boundary distance.
+        """
+        for delivery_distance in DELIVERY_DISTANCES:
+            self.assertEqual(
+                DEFAULT_TARIFF.distance_fee(delivery_distance),
+                reference_fees.distance_fee(delivery_distance),
+            )
+
+    def test_small_order_surcharge(self):
+        """
+        Test that the small order surcharge equals the reference one for every boundary cart value.
+        """
+        for cart_value in CART_VALUES:
+            self.assertEqual(
+                DEFAULT_TARIFF.small_order_surcharge(cart_value),
+                reference_fees.small_order_surcharge(cart_value),
+            )
+
+    def test_item_surcharge(self):
+        """
+        Test that the item surcharge equals the reference one for every boundary item count.
+        """
+        for number_of_items in NUMBERS_OF_ITEMS:
+            self.assertEqual(
+                DEFAULT_TARIFF.item_surcharge(number_of_items),
+                reference_fees.item_surcharge(number_of_items),
+            )
+
+    def test_rush_fee(self):
+        """
+        Test that the rush multiplier is applied like in the reference, at every boundary time.
+        """
+        for fee, time in itertools.product(range(0, 2000, 7), TIMES):
+            self.assertEqual(
+                DEFAULT_TARIFF.rush_fee(fee, time), reference_fees.friday_rush(fee, time)
+            )
+
+    def test_total_fee(self):
+        """
+        Test that the total delivery fee equals the reference one over the full boundary grid.
+        """
+        for row in itertools.product(
+            CART_VALUES, DELIVERY_DISTANCES, NUMBERS_OF_ITEMS, TIMES
+        ):
+            self.assertEqual(
+                DEFAULT_TARIFF.total_fee(*row), reference_fees.total_delivery_fee(*row)
+            )
+
+    def test_table_bounds(self):
+        """
+        Test that a tariff without lookup tables prices like the default one.
+        """
+        tariff = Tariff(max_table_items=0, max_table_intervals=0)
+        for row in itertools.product(
+            CART_VALUES, DELIVERY_DISTANCES, NUMBERS_OF_ITEMS, TIMES[:4]
+        ):
+            self.assertEqual(tariff.total_fee(*row), DEFAULT_TARIFF.total_fee(*row))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+import unittest
+import json
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# This allows for importing modules from the parent directory. It is done just for the purpose of running this test.
+# Usually this is handled by test frameworks, but for the current scenario, we can go with the following.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pydantic import ValidationError
+from fee_calculator.Order import Order
+from fee_calculator.app import app
+from fee_calculator.bulk import price_chunk
+from fee_calculator.fast_order import FastOrder
+from fee_calculator.tariff import DEFAULT_TARIFF, Tariff
+from fee_calculator.venues import TariffRegistry, load_registry
+
+ORDER = {
+    "cart_value": 790,
+    "delivery_distance": 2235,
+    "number_of_items": 4,
+    "time": "2024-01-15T13:00:00Z",
+}
+VENUES_FILE = {
+    "version": "2024-02",
+    "schedules": {
+        "helsinki": {"base_delivery_fee": 2.5},
+        "espoo": {"base_delivery_fee": 1, "fee_per_additional_interval": 0.5},
+    },
+    "venues": {"venue-1": "helsinki", "venue-2": "espoo", "venue-3": "helsinki"},
+}
+
+
+def use_venues(registry):
+    """
+    Replace VENUES with the registry wherever it is used, until the end of the test.
+    """
+    return [
+        mock.patch(f"fee_calculator.{module}.VENUES", registry)
+        for module in ("fees", "Order", "fast_order", "columnar")
+    ]
+
+
+class TestVenues(unittest.TestCase):
+    """
+    Test suite for the per-venue fee schedules.
+
+    Methods:
+        setUp: Writes a venues file and registers its venues for the test.
+        test_lookup: Tests the lookup of many venues sharing a few schedules.
+        test_duplicate_venue: Tests that a venue cannot be registered twice.
+        test_load_registry: Tests that a venues file is compiled into shared, versioned schedules.
+        test_invalid_registry: Tests that invalid venues files are rejected.
+        test_order_pricing: Tests that orders with a venue are priced with its schedule.
+        test_endpoints: Tests POST / and POST /quote with and without a venue.
+        test_bulk: Tests that bulk rows are priced with the schedule of their venue, and POST /batch rejects venues.
+    """
+
+    def setUp(self):
+        """
+        Write a venues file to a temporary directory and use its registry as VENUES, both undone after each test.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "venues.json")
+        with open(self.path, "w") as file:
+            json.dump(VENUES_FILE, file)
+        self.registry = load_registry(self.path)
+        for patch in use_venues(self.registry):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.app = app.test_client()
+
+    def test_lookup(self):
+        """
+        Test that every venue gets its own schedule, the schedules are shared and unknown venues get None.
+        """
+        tariffs = [Tariff(base_delivery_fee=fee) for fee in (1, 2, 3)]
+        venues = [(f"venue-{index}", tariffs[index % 3]) for index in range(5000)]
+        registry = TariffRegistry(venues)
+        self.assertEqual(len(registry), 5000)
+        self.assertEqual(len(registry.schedules), 3)
+        for venue_id, tariff in venues:
+            self.assertIs(registry.get(venue_id), tariff)
+            self.assertIn(venue_id, registry)
+        for venue_id in ("venue-5000", "venue-", "", "vénue-1"):
+            self.assertIsNone(registry.get(venue_id))
+            self.assertNotIn(venue_id, registry)
+        self.assertEqual(list(registry), [venue_id for venue_id, _ in venues])
+        self.assertIsNone(TariffRegistry(()).get("venue-1"))
+
+    def test_duplicate_venue(self):
+        """
+        Test that a venue given twice is rejected.
+        """
+        with self.assertRaises(ValueError):
+            TariffRegistry([("venue-1", DEFAULT_TARIFF), ("venue-1", DEFAULT_TARIFF)])
+
+    def test_load_registry(self):
+        """
+        Test that the schedules are compiled once, with the version of the file and their name.
+        """
+        self.assertEqual(self.registry.version, "2024-02")
+        self.assertEqual(len(self.registry.schedules), 2)
+        self.assertIs(self.registry.get("venue-1"), self.registry.get("venue-3"))
+        self.assertEqual(self.registry.get("venue-1").version, "2024-02/helsinki")
+        self.assertEqual(self.registry.get("venue-1").base_delivery_fee, 250)
+        self.assertEqual(self.registry.get("venue-2").fee_per_additional_interval, 50)
+
+    def test_invalid_registry(self):
+        """
+        Test that unknown schedules, versioned schedules, invalid settings and missing keys are rejected.
+        """
+        for change in (
+            {"venues": {"venue-1": "vantaa"}},
+            {"venues": {"venue-1": 1}},
+            {"schedules": {"helsinki": {"version": "v2"}}},
+            {"schedules": {"helsinki": {"base_delivery_fee": -1}}},
+            {"version": ""},
+            {"venues": ["venue-1"]},
+        ):
+            with open(self.path, "w") as file:
+                json.dump({**VENUES_FILE, **change}, file)
+            with self.assertRaises(ValueError):
+                load_registry(self.path)
+
+        with open(self.path, "w") as file:
+            json.dump({"version": "2024-02", "venues": {}}, file)
+        with self.assertRaises(ValueError):
+            load_registry(self.path)
+
+    def test_order_pricing(self):
+        """
+        Test that Order and FastOrder are priced with the schedule of their venue, and unknown venues rejected.
+        """
+        for venue_id, fee in ((None, 710), ("venue-1", 760), ("venue-2", 460)):
+            data = {**ORDER, "venue_id": venue_id}
+            for order in (Order(**data), FastOrder.validate(data)):
+                self.assertEqual(order.venue_id, venue_id)
+                self.assertEqual(order.calculate_total_delivery_fee(), fee)
+                self.assertEqual(order.calculate_distance_fee(), fee - 210)
+            # An explicit tariff has precedence over the venue
+            self.assertEqual(Order(**data).calculate_total_delivery_fee(DEFAULT_TARIFF), 710)
+
+        for venue_id in ("venue-4", 1):
+            self.assertIsNone(FastOrder.validate({**ORDER, "venue_id": venue_id}))
+            with self.assertRaises(ValidationError):
+                Order(**ORDER, venue_id=venue_id)
+
+    def test_endpoints(self):
+        """
+        Test that POST / and POST /quote price with the schedule of the venue and report its version.
+        """
+        for venue_id, fee, version in (
+            (None, 710, "default"),
+            ("venue-1", 760, "2024-02/helsinki"),
+            ("venue-2", 460, "2024-02/espoo"),
+        ):
+            data = ORDER if venue_id is None else {**ORDER, "venue_id": venue_id}
+            response_data = json.loads(self.app.post("/", json=data).data)
+            self.assertEqual(response_data, {"delivery_fee": fee, "pricing_version": version})
+            response_data = json.loads(self.app.post("/quote", json=data).data)
+            self.assertEqual(response_data["total"], fee)
+            self.assertEqual(response_data["pricing_version"], version)
+
+        response = self.app.post("/", json={**ORDER, "venue_id": "venue-4"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("venue_id", json.loads(response.data)["Validation Error"])
+
+
+    def test_bulk(self):
+        """
+        Test that the rows of a bulk chunk get the fee of POST / for their venue, and that a venue_id column of
+        POST /batch, priced with a single schedule, is rejected.
+        """
+        venue_ids = [None, "venue-1", "venue-2", "venue-4", "venue-1", None]
+        records = [ORDER if venue_id is None else {**ORDER, "venue_id": venue_id} for venue_id in venue_ids]
+        priced, rejects = price_chunk(list(enumerate(records, start=1)))
+        self.assertEqual([fee for _, fee in priced], [710, 760, 460, 760, 710])
+        self.assertEqual([reject["line"] for reject in rejects], [4])
+        for record, fee in priced:
+            self.assertEqual(json.loads(self.app.post("/", json=record).data)["delivery_fee"], fee)
+
+        columns = {field: [value, value] for field, value in ORDER.items()}
+        response = self.app.post("/batch", json={**columns, "venue_id": ["venue-1", "venue-2"]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("venue_id", json.loads(response.data)["Validation Error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
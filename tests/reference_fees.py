@@ -0,0 +1,62 @@
+"""
+Reference implementation of the fee rules, as they were written in Order before they were compiled into a Tariff.
+
+The formulas are kept verbatim, so the tests and benchmarks can compare the current implementation against them.
+"""
+from math import ceil
+from fee_calculator.constants import *
+
+
+def distance_fee(delivery_distance):
+    distance_fee = BASE_DELIVERY_FEE
+
+    if delivery_distance > BASE_DISTANCE:
+        excess_distance = delivery_distance - BASE_DISTANCE
+        extra_distance_intervals = ceil(excess_distance / ADDITIONAL_DISTANCE_INTERVAL)
+        excess_fee = FEE_PER_ADDITIONAL_INTERVAL * extra_distance_intervals
+        distance_fee += excess_fee
+
+    return distance_fee * CENTS_PER_EUR
+
+
+def small_order_surcharge(cart_value):
+    small_order_surcharge = 0
+
+    if cart_value < (SMALL_ORDER_CART_VALUE * CENTS_PER_EUR):
+        small_order_surcharge = (SMALL_ORDER_CART_VALUE * CENTS_PER_EUR) - cart_value
+
+    return small_order_surcharge
+
+
+def item_surcharge(number_of_items):
+    excess_item_surcharge = 0
+
+    if number_of_items >= SURCHARGEABLE_ITEMS_THRESHOLD:
+        excess_items = number_of_items - (SURCHARGEABLE_ITEMS_THRESHOLD - 1)
+        excess_item_surcharge = EXCESS_CHARGE_PER_ITEM * excess_items
+
+    if number_of_items > BULK_ITEMS_THRESHOLD:
+        excess_item_surcharge += BULK_FEE * CENTS_PER_EUR
+
+    return excess_item_surcharge
+
+
+def friday_rush(fee, time):
+    if (time.isoweekday() == FRIDAY) and (RUSH_HOUR_START <= time.hour < RUSH_HOUR_END):
+        return round(fee * RUSH_FEE_MULTIPLIER)
+    else:
+        return fee
+
+
+def total_delivery_fee(cart_value, delivery_distance, number_of_items, time):
+    if cart_value >= (FREE_DELIVERY_CART_VALUE * CENTS_PER_EUR):
+        return 0
+
+    fee = 0
+    fee += distance_fee(delivery_distance)
+    fee += small_order_surcharge(cart_value)
+    fee += item_surcharge(number_of_items)
+    fee = friday_rush(fee, time)
+    fee = min(fee, (MAX_POSSIBLE_DELIVERY_FEE * CENTS_PER_EUR))
+
+    return fee